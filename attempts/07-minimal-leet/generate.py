@@ -7,8 +7,17 @@ Dean confirmed a→@ and s→$ but might have only applied them
 selectively rather than to every occurrence.
 """
 
+import os
+import sys
 from typing import Generator
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from cmw.dedup import add_dedup_arguments, deduplicate
+from cmw.keyspace import Product, Seq
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import select, take_slice_arguments
+
 # Adjectives
 ADJECTIVES = [
     "bad", "dumb", "stupid", "terrible", "awful", "weak",
@@ -116,21 +125,34 @@ def generate_trailing():
             for c3 in TRAILING_CHARS:
                 yield c1 + c2 + c3
 
-def generate_all() -> Generator[str, None, None]:
-    """Generate all candidates"""
-    trailing_list = list(generate_trailing())
-    
-    seen = set()
+def generate_phrases() -> Generator[str, None, None]:
+    """Every phrase before trailing is appended, in generation order"""
     for base in generate_base_phrases():
         for leet_variant in generate_leet_variants(base):
             for sep in SEPARATORS:
                 phrase = leet_variant.replace(" ", sep) if sep != " " else leet_variant
                 for case_phrase in case_variants(phrase):
-                    for trailing in trailing_list:
-                        candidate = case_phrase + trailing
-                        if candidate not in seen:
-                            seen.add(candidate)
-                            yield candidate
+                    yield case_phrase
+
+def generate_all(options=None) -> Generator[str, None, None]:
+    """Generate all candidates, repeats removed by the --dedup stage (exact set by default)"""
+    trailing_list = list(generate_trailing())
+    
+    candidates = (case_phrase + trailing
+                  for case_phrase in generate_phrases()
+                  for trailing in trailing_list)
+    # The keyspace counts distinct phrases x trailing: at least every distinct candidate
+    return deduplicate(candidates, options, capacity=lambda: len(build_keyspace()))
+
+def build_keyspace() -> Product:
+    """
+    Indexable view of generate_all(): distinct phrases x trailing patterns.
+
+    Deduplicates phrases rather than whole candidates, which is the same
+    thing as long as no phrase is another phrase plus trailing characters.
+    """
+    return Product(Seq(lambda: list(dict.fromkeys(generate_phrases()))),
+                   Seq(generate_trailing))
 
 def count_candidates():
     """Estimate candidate count"""
@@ -145,17 +167,20 @@ def count_candidates():
     return total
 
 if __name__ == "__main__":
-    import sys
+    options = take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments,
+                                   lambda parser: add_dedup_arguments(parser, default=None))
     
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         count = count_candidates()
         print(f"Estimated candidates: {count:,}")
         print(f"Runtime at 270k H/s: {count / 270000 / 3600:.1f} hours")
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
-        for i, candidate in enumerate(generate_all()):
+        for i, candidate in enumerate(select(options, build_keyspace, generate_all)):
             print(candidate)
             if i >= 99:
                 break
+    elif options.dedup is not None:
+        # Whole-candidate dedup of the stream instead of the phrase-level keyspace
+        write_candidates(options, generate_all=lambda: generate_all(options))
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, build_keyspace, generate_all)
@@ -7,8 +7,16 @@ Dean said the password is approximately 20 characters, so this
 generates phrases that are close to that length with variations.
 """
 
+import os
+import sys
 from typing import Generator
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".."))
+from cmw.keyspace import Product, Seq
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import select, take_slice_arguments
+
 # Subjects
 SUBJECTS = ["i", "my", "this", "the", "a", "another", "yet another", "one more"]
 
@@ -89,20 +97,35 @@ def generate_trailing():
             for c3 in TRAILING_CHARS:
                 yield c1 + c2 + c3
 
+def generate_phrases() -> Generator[str, None, None]:
+    """Every phrase before trailing is appended, in generation order"""
+    for base in generate_base_phrases():
+        for sep in SEPARATORS:
+            phrase = base.replace(" ", sep) if sep != " " else base
+            for case_phrase in case_variants(phrase):
+                yield case_phrase
+
 def generate_all() -> Generator[str, None, None]:
     """Generate all candidates"""
     trailing_list = list(generate_trailing())
     
     seen = set()
-    for base in generate_base_phrases():
-        for sep in SEPARATORS:
-            phrase = base.replace(" ", sep) if sep != " " else base
-            for case_phrase in case_variants(phrase):
-                for trailing in trailing_list:
-                    candidate = case_phrase + trailing
-                    if candidate not in seen:
-                        seen.add(candidate)
-                        yield candidate
+    for case_phrase in generate_phrases():
+        for trailing in trailing_list:
+            candidate = case_phrase + trailing
+            if candidate not in seen:
+                seen.add(candidate)
+                yield candidate
+
+def build_keyspace() -> Product:
+    """
+    Indexable view of generate_all(): distinct phrases x trailing patterns.
+
+    Deduplicates phrases rather than whole candidates, which is the same
+    thing as long as no phrase is another phrase plus trailing characters.
+    """
+    return Product(Seq(lambda: list(dict.fromkeys(generate_phrases()))),
+                   Seq(generate_trailing))
 
 def count_candidates():
     """Estimate candidate count"""
@@ -116,17 +139,16 @@ def count_candidates():
     return total
 
 if __name__ == "__main__":
-    import sys
+    options = take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments)
     
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         count = count_candidates()
         print(f"Estimated candidates: {count:,}")
         print(f"Runtime at 270k H/s: {count / 270000 / 3600:.1f} hours")
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
-        for i, candidate in enumerate(generate_all()):
+        for i, candidate in enumerate(select(options, build_keyspace, generate_all)):
             print(candidate)
             if i >= 99:
                 break
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, build_keyspace, generate_all)
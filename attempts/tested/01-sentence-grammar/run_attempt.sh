@@ -2,6 +2,9 @@
 # Run sentence grammar password attempt against Bitcoin wallet
 # Estimated candidates: ~13.7B
 # Runtime at 270k H/s: ~14 hours
+# SHARD=i/N runs only shard i of N (split the keyspace across hosts)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
+# WORKERS=N generates with N processes (0 = every CPU core)
 
 if [ -z "$1" ]; then
     echo "Usage: ./run_attempt.sh <hash_file>"
@@ -11,4 +14,4 @@ fi
 HASH_FILE="$1"
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
-python3 "$SCRIPT_DIR/generate.py" | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+python3 "$SCRIPT_DIR/generate.py" ${SHARD:+--shard "$SHARD"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} ${WORKERS:+--workers "$WORKERS"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
@@ -26,14 +26,44 @@ Key improvements over previous 600M attempt:
 
 Usage:
     python generate_10b.py > wordlist.txt
-    python generate_10b.py --estimate
+    python generate_10b.py --count [--hps 270000]
     python generate_10b.py --limit N
+    python generate_10b.py --ranked --limit N     # most likely phrases first
+    python generate_10b.py --budget-hours 24 --hps 270000 [--plan]
+
+Keyspace:
+    build_keyspace() exposes the same stream as an indexable keyspace
+    (len(), candidate_at(i), iter_range(start, stop)) so a run can be
+    resumed or split without regenerating the candidates before it.
+
+Budget:
+    --budget-hours picks the leet variants kept per word and the keyboard
+    trailing patterns (hand-tuned at 3 and 40) that cover the most prior
+    mass within the hours at --hps (cmw.budget), prints the plan, then
+    generates (or counts) with them.
+
+Ranked:
+    build_weighted_grammar() gives the phrase families a probability per
+    slot value (separators, adjectives, trailing patterns, case, leet)
+    and --ranked emits them in non-increasing probability (cmw.ranked).
 """
 
 import argparse
+import functools
 import itertools
+import os
 import sys
-from typing import Generator, List, Iterator
+from typing import Callable, Generator, List, Iterator, Optional
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.budget import (Dimension, add_budget_arguments, allocate, budget_candidates, prefix_mass, print_plan,
+                        trailing_weight)
+from cmw.count import DEFAULT_HASHES_PER_SECOND, print_count
+from cmw.keyspace import Chain, FlatMap, Keyspace, MutationIndex, Permutations, Product, Seq
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.ranked import Grammar, Slot, Template
+from cmw.shard import add_slice_arguments
 
 # ============================================================================
 # WORD LISTS - EXPANDED FOR 10B TARGET
@@ -183,7 +213,9 @@ def generate_trailing_patterns() -> List[str]:
         "001", "007", "123", "321", "666", "777", "888", "999",
     ])
     
-    return list(set(patterns))
+    # Dedupe in first-seen order: list(set()) reorders per process
+    # (hash randomization), which makes indices meaningless across runs
+    return list(dict.fromkeys(patterns))
 
 TRAILING_PATTERNS = generate_trailing_patterns()
 
@@ -226,6 +258,13 @@ LEET_WORDS = {
 }
 
 
+# Variants kept per word by leet_phrase()
+MAX_LEET_VARIANTS_PER_WORD = 3
+
+# leet_word() substitutes at most this many positions at once
+MAX_LEET_POSITIONS = 4
+
+
 def leet_word(word: str) -> Iterator[str]:
     """Generate all leetspeak variants of a word."""
     w = word.lower()
@@ -242,7 +281,7 @@ def leet_word(word: str) -> Iterator[str]:
         return
     
     # Generate combinations of substitutions (up to 4 positions for more coverage)
-    for r in range(1, min(5, len(positions) + 1)):
+    for r in range(1, min(MAX_LEET_POSITIONS, len(positions)) + 1):
         for combo in itertools.combinations(range(len(positions)), r):
             indices = [positions[i] for i in combo]
             for subs in itertools.product(*[p[1][1:] for p in indices]):
@@ -259,18 +298,32 @@ def leet_phrase(phrase: str, sep: str = " ") -> Iterator[str]:
         yield phrase
         return
     
-    # Get variants for each word
-    word_variants = [list(leet_word(w)) for w in words]
-    
-    # Limit combinations to target ~10B total (was 12, now 3 to reduce by ~22x)
-    max_variants_per_word = 3
-    word_variants = [v[:max_variants_per_word] for v in word_variants]
+    # Get variants for each word, limited to target ~10B total (was 12, now
+    # 3 to reduce by ~22x); only the kept ones are built
+    word_variants = [list(itertools.islice(leet_word(w), MAX_LEET_VARIANTS_PER_WORD)) for w in words]
     
     # Generate combinations
     for combo in itertools.product(*word_variants):
         yield sep.join(combo)
 
 
+@functools.lru_cache(maxsize=4096)
+def leet_word_count(word: str) -> int:
+    """Number of leet_word() variants leet_phrase() keeps for a word."""
+    return sum(1 for _ in itertools.islice(leet_word(word), MAX_LEET_VARIANTS_PER_WORD))
+
+
+def leet_phrase_count(phrase: str) -> int:
+    """Number of strings leet_phrase(phrase) yields, without building them."""
+    words = phrase.split()
+    if not words:
+        return 1
+    if len(words) == 1:
+        # Joined phrases are unique; don't let them flush the word cache
+        return leet_word_count.__wrapped__(words[0])
+    return functools.reduce(lambda total, w: total * leet_word_count(w.lower()), words, 1)
+
+
 # ============================================================================
 # CASE VARIATIONS - EXPANDED (~10 variations)
 # ============================================================================
@@ -301,6 +354,16 @@ def case_variants(phrase: str) -> Iterator[str]:
         yield " ".join(w.lower() for w in words[:-1]) + " " + words[-1].upper()
 
 
+def _case_count(length: int, multi_word: bool) -> int:
+    """Number of strings case_variants() yields (mirrors its branches)."""
+    return 3 + (length > 0) + 3 * multi_word + 2 * (length <= 30)
+
+
+def case_variant_count(phrase: str) -> int:
+    """Number of strings case_variants(phrase) yields."""
+    return _case_count(len(phrase), len(phrase.split()) > 1)
+
+
 # ============================================================================
 # HYPOTHESIS 1: SPITE PASSPHRASE (Multi-word)
 # ============================================================================
@@ -408,6 +471,18 @@ def generate_passphrase_candidates() -> Iterator[str]:
 # HYPOTHESIS 2: SIMPLE SPITE (10-16 char patterns)
 # ============================================================================
 
+# Keyboard patterns (10+ chars), and the trailing patterns tried after each
+KEYBOARD_PATTERNS = [
+    "qwertyuiop", "asdfghjkl;", "zxcvbnm,./",
+    "1234567890", "0987654321",
+    "qwerty1234", "asdfgh1234", "zxcvbn1234",
+    "1qaz2wsx3e", "!qaz@wsx#e",
+    "qazwsxedcr", "plmoknijbu",
+    "qwertyuio", "asdfghjkl", "zxcvbnm",
+]
+KEYBOARD_TRAIL_LIMIT = 40
+
+
 def generate_simple_spite() -> Iterator[str]:
     """Generate simple 10-16 character spite passwords."""
     
@@ -446,17 +521,9 @@ def generate_simple_spite() -> Iterator[str]:
                     yield candidate
     
     # Keyboard patterns (10+ chars)
-    keyboard = [
-        "qwertyuiop", "asdfghjkl;", "zxcvbnm,./",
-        "1234567890", "0987654321",
-        "qwerty1234", "asdfgh1234", "zxcvbn1234",
-        "1qaz2wsx3e", "!qaz@wsx#e",
-        "qazwsxedcr", "plmoknijbu",
-        "qwertyuio", "asdfghjkl", "zxcvbnm",
-    ]
-    for k in keyboard:
+    for k in KEYBOARD_PATTERNS:
         yield k
-        for trail in TRAILING_PATTERNS[:40]:
+        for trail in TRAILING_PATTERNS[:KEYBOARD_TRAIL_LIMIT]:
             if 10 <= len(k + trail) <= 20:
                 yield k + trail
     
@@ -553,77 +620,348 @@ def generate_all() -> Iterator[str]:
     yield from generate_elongated()
 
 
-def estimate_count() -> dict:
-    """Estimate total candidates."""
-    # Count base phrases
-    short = len(ALL_ADJECTIVES) * len(EXTENDED_NOUNS)
-    short += len([p for p in SHORT_PREFIXES if p]) * len(ALL_ADJECTIVES) * len(CORE_NOUNS)
-    short += 20 * 19 * len(CORE_NOUNS)  # adj adj noun
-    
-    medium = len(MEDIUM_PREFIXES) * len(ALL_ADJECTIVES) * len(EXTENDED_NOUNS)
-    medium += 12 * 15 * len(CORE_ADJECTIVES) * len(CORE_NOUNS)  # prefix intensifier adj noun
-    medium += 10 * 15 * 14 * len(CORE_NOUNS)  # prefix adj adj noun
-    
-    long_p = len(LONG_PREFIXES) * len(ALL_ADJECTIVES) * len(EXTENDED_NOUNS)
-    long_p += 15 * 18 * 17 * len(CORE_NOUNS)  # double adj
-    long_p += 8 * 10 * 9 * 8 * len(CORE_NOUNS)  # triple adj
-    
-    total_phrases = short + medium + long_p
-    
-    # Mutations per phrase
-    seps = len(SEPARATORS)
-    cases = 10  # case_variants generates ~10
-    trails = len(TRAILING_PATTERNS)
-    leet_factor = 6  # Average leet variants per phrase (3^n combinations, limited to 3 per word)
-    
-    passphrase_total = total_phrases * seps * cases * trails * (1 + leet_factor)
-    
-    # Simple spite estimate
-    simple = 28 * 42 * 3 + 15 * 40 + 38 * 7 + 16 * (1 + 30 + 15 * 16) + 10 * (1 + 15 + 6)
-    
-    # Elongated estimate
-    elongated = 10 * 35 * (1 + 25 + 9 * (1 + 20 + 2 * (1 + 20)))
-    
-    return {
-        "phrases": total_phrases,
-        "passphrase_candidates": passphrase_total,
-        "simple_spite": simple,
-        "elongated": elongated,
-        "total": passphrase_total + simple + elongated,
-        "trailing_patterns": len(TRAILING_PATTERNS),
-        "adjectives": len(ALL_ADJECTIVES),
-        "nouns": len(EXTENDED_NOUNS),
-    }
+# ============================================================================
+# KEYSPACE (indexable view of generate_all)
+# ============================================================================
+
+def _phrase_keyspaces() -> List[Keyspace]:
+    """Base phrases of the short/medium/long generators as declared products."""
+    join = " ".join
+    short = Chain([
+        Product(ALL_ADJECTIVES, EXTENDED_NOUNS, join=join),
+        Product([p for p in SHORT_PREFIXES if p], ALL_ADJECTIVES, CORE_NOUNS, join=join),
+        Product(Permutations(CORE_ADJECTIVES[:20], 2, join=join), CORE_NOUNS, join=join),
+    ])
+    medium = Chain([
+        Product(MEDIUM_PREFIXES, ALL_ADJECTIVES, EXTENDED_NOUNS, join=join),
+        Product([p for p in SHORT_PREFIXES[:12] if p], [i for i in INTENSIFIERS[:15] if i],
+                CORE_ADJECTIVES, CORE_NOUNS, join=join),
+        Product([p for p in SHORT_PREFIXES[:10] if p],
+                Permutations(CORE_ADJECTIVES[:15], 2, join=join), CORE_NOUNS, join=join),
+    ])
+    long_p = Chain([
+        Product(LONG_PREFIXES, ALL_ADJECTIVES, EXTENDED_NOUNS, join=join),
+        Product(MEDIUM_PREFIXES[:15], Permutations(CORE_ADJECTIVES[:18], 2, join=join),
+                CORE_NOUNS, join=join),
+        Product([p for p in SHORT_PREFIXES[:8] if p],
+                Permutations(CORE_ADJECTIVES[:10], 3, join=join), CORE_NOUNS, join=join),
+    ])
+    return [short, medium, long_p]
+
+
+def _expand_phrase(base: str) -> Keyspace:
+    """All mutations generate_passphrase_candidates() emits for one base phrase."""
+    words = base.split()
+    parts = []
+    for sep in SEPARATORS:
+        sep_phrase = sep.join(words)
+        for cased in case_variants(sep_phrase):
+            parts.append(Product([cased, *leet_phrase(cased, sep)], TRAILING_PATTERNS))
+    return Chain(parts)
+
+
+def _count_phrase(base: str) -> int:
+    """len(_expand_phrase(base)) without building it.
+
+    Leet counts don't depend on letter case (leet_word lowercases before
+    matching), so every case variant of a separated phrase has the same
+    number of leet variants.
+    """
+    words = base.split()
+    total = 0
+    for sep in SEPARATORS:
+        sep_phrase = sep.join(words)
+        total += case_variant_count(sep_phrase) * (1 + leet_phrase_count(sep_phrase))
+    return total * len(TRAILING_PATTERNS)
+
+
+def _merge_substitutions(a: tuple, b: tuple) -> tuple:
+    """
+    Substitution counts of two strings joined: entry r - 1 is how many
+    ways there are to substitute exactly r positions (the elementary
+    symmetric polynomials of the per-position alternatives), for r up to
+    MAX_LEET_POSITIONS. Counts only matter up to
+    MAX_LEET_VARIANTS_PER_WORD - 1, so they are capped there; a capped
+    entry makes the merged sum reach the cap too, so the kept count stays
+    exact.
+    """
+    cap = MAX_LEET_VARIANTS_PER_WORD - 1
+    a, b = (1,) + a, (1,) + b
+    return tuple(min(cap, sum(a[i] * b[r - i] for i in range(r + 1))) for r in range(1, MAX_LEET_POSITIONS + 1))
+
+
+def _phrase_feature(value: str) -> tuple:
+    """(letters, words, leet variants with spaces, substitution counts) of one slot value."""
+    words = value.split()
+    leet_variants = 1
+    for word in words:
+        leet_variants *= leet_word_count(word)
+    substitutions = (0,) * MAX_LEET_POSITIONS
+    for c in value:
+        if c.lower() in LEET_CHAR:
+            substitutions = _merge_substitutions(substitutions, (len(LEET_CHAR[c.lower()]) - 1,)
+                                                 + (0,) * (MAX_LEET_POSITIONS - 1))
+    return (sum(map(len, words)), len(words), leet_variants, substitutions)
+
+
+def _combine_features(a: tuple, b: tuple) -> tuple:
+    return (a[0] + b[0], a[1] + b[1], a[2] * b[2], _merge_substitutions(a[3], b[3]))
+
+
+def _feature_count(feature: tuple) -> int:
+    """_count_phrase() for any base phrase with this feature.
+
+    With a space separator each word is leeted on its own (product of
+    per-word counts). Any other separator leaves one token that is never
+    a LEET_WORDS entry, so leet_word() yields the token, then every
+    combination of 1 to MAX_LEET_POSITIONS substitutions, and
+    leet_phrase() keeps the first MAX_LEET_VARIANTS_PER_WORD of them.
+    """
+    letters, words, spaced_variants, substitutions = feature
+    total = 0
+    for sep in SEPARATORS:
+        length = letters + (words - 1) * len(sep)
+        if sep.isspace():
+            variants = spaced_variants
+        else:
+            variants = min(MAX_LEET_VARIANTS_PER_WORD, 1 + sum(substitutions))
+        total += _case_count(length, sep.isspace() and words > 1) * (1 + variants)
+    return total * len(TRAILING_PATTERNS)
+
+
+def _phrase_total(phrases: Chain) -> int:
+    """Exact len() of a phrase family's expansion, from its declared dimensions."""
+    total = 0
+    for product in phrases.parts:
+        for feature, bases in product.tally(_phrase_feature, _combine_features).items():
+            total += bases * _feature_count(feature)
+    return total
+
+
+def _phrase_family(phrases: Chain) -> FlatMap:
+    return FlatMap(phrases, _expand_phrase, _count_phrase, total=lambda: _phrase_total(phrases),
+                   parse=MutationIndex(phrases, TRAILING_PATTERNS, SEPARATORS, LEET_CHAR, LEET_WORDS))
+
+
+def build_keyspace() -> Chain:
+    """Indexable keyspace producing exactly the generate_all() stream."""
+    short, medium, long_p = _phrase_keyspaces()
+    return Chain([
+        _phrase_family(short),
+        _phrase_family(medium),
+        _phrase_family(long_p),
+        Seq(generate_simple_spite),
+        Seq(generate_elongated),
+    ], names=[
+        "Short phrases (2-3 words)",
+        "Medium phrases (4-5 words)",
+        "Long phrases (5-7 words)",
+        "Simple spite (10-16 chars)",
+        "Elongated patterns",
+    ])
+
+
+# ============================================================================
+# WEIGHTED GRAMMAR (--ranked: most likely candidates first)
+# ============================================================================
+
+# Signal: "Spaces. Maybe periods."
+SEPARATOR_WEIGHTS = {" ": 0.60, ".": 0.25, "-": 0.08, "_": 0.04, "": 0.03}
+
+# Leet variant k of the phrase (0 = none); most spite phrases are plain
+LEET_VARIANT_WEIGHTS = [6.0, 2.0, 1.5, 1.0, 0.5, 0.5]
+
+
+def _zipf(values: List[str], scale: float = 1.0, offset: int = 5) -> List[float]:
+    """Weights falling with list position: the word lists are roughly ordered by likelihood."""
+    return [scale / (position + offset) for position in range(len(values))]
+
+
+def _adjective_weights() -> List[float]:
+    # "bad" over "lulzy": the core theme, then 2011 slang, then the rest
+    return (_zipf(CORE_ADJECTIVES, 4.0) + _zipf(ERA_ADJECTIVES, 2.0)
+            + _zipf(EXTENDED_ADJECTIVES, 1.0))
+
+
+def _multi_word(form: Callable[[List[str]], str]) -> Callable[[str], Optional[str]]:
+    """A case form of case_variants() that only applies to phrases with several words."""
+    def apply(phrase: str) -> Optional[str]:
+        words = phrase.split()
+        return form(words) if len(words) > 1 else None
+    return apply
+
+
+# The case_variants() forms, most likely first
+CASE_FORMS = [
+    (str.lower, 6.0),
+    (lambda p: p[0].upper() + p[1:].lower(), 3.0),
+    (str.title, 2.0),
+    (str.upper, 1.0),
+    (_multi_word(lambda w: " ".join(x.lower() for x in w[:-1]) + " " + w[-1].upper()), 0.5),
+    (_multi_word(lambda w: w[0].upper() + " " + " ".join(x.lower() for x in w[1:])), 0.5),
+    (_multi_word(lambda w: w[0].lower() + " " + " ".join(x.title() for x in w[1:])), 0.5),
+    (lambda p: "".join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(p)), 0.2),
+    (lambda p: "".join(c.lower() if i % 2 == 0 else c.upper() for i, c in enumerate(p)), 0.2),
+]
+
+
+def _ranked_phrase(*values) -> Optional[str]:
+    """Build one phrase candidate: word slots, then separator, case form, leet variant, trailing."""
+    *words, sep, case, leet, trail = values
+    if len(set(words)) < len(words):
+        return None
+    phrase = case(sep.join(" ".join(words).split()))
+    if phrase is None:
+        return None
+    if leet:
+        variants = list(itertools.islice(leet_phrase(phrase, sep), leet + 1))
+        if len(variants) <= leet:
+            return None
+        phrase = variants[leet]
+    return phrase + trail
+
+
+def build_weighted_grammar() -> Grammar:
+    """
+    The phrase families of generate_all() as a weighted grammar, for
+    --ranked. Template weights follow Dean's "4-7 words".
+    """
+    adjectives = Slot(ALL_ADJECTIVES, _adjective_weights(), "adjective")
+    core = Slot(CORE_ADJECTIVES, _zipf(CORE_ADJECTIVES), "adjective")
+    nouns = Slot(EXTENDED_NOUNS, lambda n: 4.0 if n in CORE_NOUNS else 0.5, "noun")
+    core_nouns = Slot(CORE_NOUNS, name="noun")
+    mutations = [
+        Slot(list(SEPARATOR_WEIGHTS), list(SEPARATOR_WEIGHTS.values()), "separator"),
+        Slot([form for form, _ in CASE_FORMS], [weight for _, weight in CASE_FORMS], "case"),
+        Slot(range(len(LEET_VARIANT_WEIGHTS)), LEET_VARIANT_WEIGHTS, "leet"),
+        Slot(TRAILING_PATTERNS, trailing_weight, "trailing"),
+    ]
+
+    def phrase(name: str, weight: float, *words: Slot) -> Template:
+        return Template([*words, *mutations], weight, _ranked_phrase, name)
+
+    def prefixes(values: List[str]) -> Slot:
+        values = [p for p in values if p]
+        return Slot(values, _zipf(values), "prefix")
+
+    return Grammar([
+        phrase("adj noun", 1.0, adjectives, nouns),
+        phrase("short prefix adj noun", 2.0, prefixes(SHORT_PREFIXES), adjectives, core_nouns),
+        phrase("adj adj noun", 0.5, core, core, core_nouns),
+        phrase("medium prefix adj noun", 4.0, prefixes(MEDIUM_PREFIXES), adjectives, nouns),
+        phrase("prefix intensifier adj noun", 2.0, prefixes(SHORT_PREFIXES[:12]),
+               Slot([i for i in INTENSIFIERS[:15] if i], name="intensifier"), core, core_nouns),
+        phrase("prefix adj adj noun", 1.5, prefixes(SHORT_PREFIXES[:10]), core, core, core_nouns),
+        phrase("long prefix adj noun", 3.0, prefixes(LONG_PREFIXES), adjectives, nouns),
+        phrase("medium prefix adj adj noun", 2.0, prefixes(MEDIUM_PREFIXES[:15]), core, core, core_nouns),
+    ])
+
+
+# ============================================================================
+# BUDGET (--budget-hours: expansion limits from the GPU time available)
+# ============================================================================
+
+# Prior mass of the blocks the limits control; the rest of the stream is fixed
+PHRASE_PRIOR = 0.85
+KEYBOARD_PRIOR = 0.02
+# Chance a phrase is leeted at all, and how fast further variants per word fall off
+LEET_PRIOR = 0.3
+LEET_DECAY = 0.5
+MAX_LEET_DEPTH = 8
+
+
+def set_limits(leet_variants: int, keyboard_trails: int):
+    """Set the expansion limits every generator and keyspace function reads."""
+    global MAX_LEET_VARIANTS_PER_WORD, KEYBOARD_TRAIL_LIMIT
+    MAX_LEET_VARIANTS_PER_WORD = leet_variants
+    KEYBOARD_TRAIL_LIMIT = keyboard_trails
+    leet_word_count.cache_clear()
+
+
+def _phrase_candidates(leet_variants: int) -> int:
+    """Candidates of the three phrase families with `leet_variants` kept per word."""
+    limits = MAX_LEET_VARIANTS_PER_WORD, KEYBOARD_TRAIL_LIMIT
+    set_limits(leet_variants, KEYBOARD_TRAIL_LIMIT)
+    try:
+        return sum(_phrase_total(phrases) for phrases in _phrase_keyspaces())
+    finally:
+        set_limits(*limits)
+
+
+def _keyboard_candidates(trails: int) -> int:
+    return sum(10 <= len(k + t) <= 20 for k in KEYBOARD_PATTERNS for t in TRAILING_PATTERNS[:trails])
+
+
+def budget_dimensions() -> List[Dimension]:
+    """The limits --budget-hours chooses, with the candidates and prior mass of each depth."""
+    trails = prefix_mass([trailing_weight(t) for t in TRAILING_PATTERNS])
+    return [
+        Dimension("Leet variants per word (phrases)", range(1, MAX_LEET_DEPTH + 1), _phrase_candidates,
+                  lambda k: PHRASE_PRIOR * (1 - LEET_PRIOR * LEET_DECAY ** (k - 1)),
+                  default=MAX_LEET_VARIANTS_PER_WORD),
+        Dimension("Keyboard trailing patterns", range(len(TRAILING_PATTERNS) + 1), _keyboard_candidates,
+                  lambda d: KEYBOARD_PRIOR * trails(d), default=KEYBOARD_TRAIL_LIMIT),
+    ]
+
+
+def apply_budget(args: argparse.Namespace):
+    """Pick the limits that fit --budget-hours at --hps, print the plan and use them."""
+    dimensions = budget_dimensions()
+    total = len(build_keyspace())
+    fixed = total - sum(d.option(d.default)[1] for d in dimensions)
+    plan = allocate(dimensions, budget_candidates(args.budget_hours, args.hps), fixed)
+    print_plan(plan, args.hps)
+    leet, keyboard = (plan.depths[d.name] for d in dimensions)
+    set_limits(leet, keyboard)
 
 
 def main():
     parser = argparse.ArgumentParser(description="Generate ~10B passphrase candidates")
-    parser.add_argument("--estimate", action="store_true", help="Show estimate")
+    parser.add_argument("--count", "--estimate", dest="count", action="store_true",
+                        help="Show exact per-family candidate counts")
+    parser.add_argument("--hps", type=float, default=DEFAULT_HASHES_PER_SECOND,
+                        help="Hash rate for the runtime estimate (default: 270000)")
     parser.add_argument("--limit", type=int, help="Limit output")
+    parser.add_argument("--ranked", action="store_true",
+                        help="Phrases from the weighted grammar, most likely first (--count describes it)")
+    parser.add_argument("--min-probability", type=float, default=0.0, metavar="P",
+                        help="With --ranked: stop below probability P")
+    parser.add_argument("--show-probability", action="store_true",
+                        help="With --ranked: prefix each line with its probability (for inspection, not hashcat)")
+    add_budget_arguments(parser)
+    add_slice_arguments(parser)
+    add_parallel_arguments(parser)
+    add_output_arguments(parser)
     
     args = parser.parse_args()
-    
-    if args.estimate:
-        est = estimate_count()
-        print(f"Estimated total: {est['total']:,}")
-        print(f"  Base phrases: {est['phrases']:,}")
-        print(f"  Passphrase candidates: {est['passphrase_candidates']:,}")
-        print(f"  Simple spite: {est['simple_spite']:,}")
-        print(f"  Elongated: {est['elongated']:,}")
-        print(f"  Trailing patterns: {est['trailing_patterns']}")
-        print(f"  Adjectives: {est['adjectives']}")
-        print(f"  Nouns: {est['nouns']}")
+
+    if args.budget_hours is not None:
+        apply_budget(args)
+        if args.plan:
+            return
+
+    if args.ranked:
+        grammar = build_weighted_grammar()
+        if args.count:
+            grammar.describe()
+            return
+        ranked = grammar.ranked(args.min_probability)
+        if args.show_probability:
+            stream = (f"{probability:.3e}\t{candidate}" for probability, candidate in ranked)
+        else:
+            stream = (candidate for _, candidate in ranked)
+        count = write_candidates(args, None, lambda: stream)
+        print(f"Generated {count:,} candidates (largest frontier {grammar.frontier:,})", file=sys.stderr)
         return
     
-    count = 0
-    limit = args.limit or float("inf")
-    
-    for candidate in generate_all():
-        print(candidate)
-        count += 1
-        if count >= limit:
-            break
+    if args.count:
+        print(f"Trailing patterns: {len(TRAILING_PATTERNS)}")
+        print(f"Adjectives: {len(ALL_ADJECTIVES)}")
+        print(f"Nouns: {len(EXTENDED_NOUNS)}\n")
+        print_count(build_keyspace(), hashes_per_second=args.hps)
+        return
     
+    count = write_candidates(args, build_keyspace, generate_all)
     print(f"Generated {count:,} candidates", file=sys.stderr)
 
 
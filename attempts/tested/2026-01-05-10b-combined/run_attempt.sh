@@ -4,9 +4,12 @@
 # Combined Hypotheses: Spite Passphrase + Simple Spite
 #
 # Usage:
-#   ./run_attempt.sh --estimate          # Show estimated count
+#   ./run_attempt.sh --count             # Show exact per-family count
 #   ./run_attempt.sh > wordlist.txt      # Generate to file
 #   ./run_attempt.sh --limit N           # Generate N candidates
+#   ./run_attempt.sh --shard 2/4         # Generate shard 2 of 4 (one per host)
+#   ./run_attempt.sh --range A:B         # Generate candidates A..B-1
+#   ./run_attempt.sh --workers 0         # Generate on every CPU core
 #   ./run_attempt.sh | hashcat ...       # Pipe to hashcat
 #
 
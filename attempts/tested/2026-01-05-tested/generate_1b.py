@@ -28,14 +28,20 @@ Keyspace calculation:
 Usage:
     python generate_1b.py > wordlist.txt
     python generate_1b.py --estimate  # Show estimated count
-    python generate_1b.py --chunk N   # Generate chunk N of 10
+    python generate_1b.py --range START:STOP   # Candidates START..STOP-1 only
 """
 
 import argparse
 import itertools
+import os
 import sys
 from typing import Generator, List, Set
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import add_slice_arguments
+
 # ============================================================================
 # WORD LISTS (Expanded for 1B target)
 # ============================================================================
@@ -149,7 +155,7 @@ def generate_trailing_patterns() -> List[str]:
         "!!!1", "???1", "1!!!", "1???",
     ])
     
-    return list(set(patterns))  # Deduplicate
+    return list(dict.fromkeys(patterns))  # Deduplicate (stable order, unlike set)
 
 TRAILING_PATTERNS = generate_trailing_patterns()
 
@@ -419,14 +425,21 @@ def main():
     )
     parser.add_argument(
         "--chunk", type=int, choices=range(1, 11),
-        help="Generate only chunk N of 10 (for parallel processing)"
+        help="No longer supported: the stream is deduplicated as a whole, so it cannot be split "
+             "without every host generating all of it"
     )
     parser.add_argument(
         "--limit", type=int,
         help="Limit output to N candidates"
     )
+    add_slice_arguments(parser)
+    add_output_arguments(parser)
     
     args = parser.parse_args()
+    if args.chunk:
+        parser.error("--chunk is no longer supported: candidates are deduplicated across the whole "
+                     "stream, so every chunk would generate all of it. Run it unsharded, or give each "
+                     "host a --range START:STOP")
     
     if args.estimate:
         est = estimate_count()
@@ -437,19 +450,7 @@ def main():
         print(f"Trailing patterns: {len(TRAILING_PATTERNS)}")
         return
     
-    count = 0
-    for candidate in generate_all_candidates():
-        if args.chunk:
-            # Simple chunking by hash
-            if hash(candidate) % 10 != args.chunk - 1:
-                continue
-        
-        print(candidate)
-        count += 1
-        
-        if args.limit and count >= args.limit:
-            break
-    
+    count = write_candidates(args, generate_all=generate_all_candidates)
     print(f"Generated {count:,} candidates", file=sys.stderr)
 
 
@@ -13,7 +13,7 @@
 # Options:
 #   --estimate    Show estimated candidate count
 #   --limit N     Generate only N candidates (for testing)
-#   --chunk N     Generate chunk N of 10 (for parallel processing)
+#   --range A:B   Generate candidates A..B-1 (no --shard: the stream is deduplicated as a whole)
 #
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
@@ -32,14 +32,27 @@ Optimized for DGX Spark (GB10 Grace Blackwell):
 Usage:
     python generate_2b.py > wordlist.txt
     python generate_2b.py --estimate
+    python generate_2b.py --budget-hours 6 --plan   # leet trailing limits for 6 GPU hours
     python generate_2b.py | hashcat -m 11300 -a 0 -w 3 -O hash.txt
 """
 
 import argparse
 import itertools
+import math
+import os
 import sys
+from functools import lru_cache, partial
 from typing import Iterator, List
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.budget import (Dimension, add_budget_arguments, allocate, budget_candidates, prefix_mass, print_plan,
+                        trailing_weight)
+from cmw.count import DEFAULT_HASHES_PER_SECOND
+from cmw.keyspace import Chain, FlatMap, MutationIndex, Product, Seq
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import add_slice_arguments
+
 # ============================================================================
 # PRIORITY 1: "X IS/ARE HARD" PATTERN (Dean's signature) - MASSIVELY EXPANDED
 # ============================================================================
@@ -333,7 +346,8 @@ def generate_trailing_patterns() -> List[str]:
     patterns.extend(["2011", "2010", "2012", "11", "10", "12"])
     patterns.extend(["2011!", "!2011", "2011!!", "!!2011", "2011!!!", "!!!2011"])
     
-    return list(set(patterns))
+    # Stable first-seen order so candidate indices agree across runs/hosts
+    return list(dict.fromkeys(patterns))
 
 TRAILING_PATTERNS = generate_trailing_patterns()
 
@@ -452,38 +466,111 @@ def apply_all_mutations(base: str, include_leet: bool = True, leet_trail_limit:
                         for trail in TRAILING_PATTERNS[:leet_trail_limit]:
                             yield leet + trail
 
+# (base generator, name, include_leet, leet_trail_limit) in output order
+PRIORITIES = [
+    (generate_x_is_hard, "X is/are hard", True, 50),  # Dean's signature (HIGHEST)
+    (generate_combined_high_prob, "Combined high-prob", True, 50),
+    (generate_potato_patterns, "Potato", False, 40),  # Confirmed significant
+    (generate_blog_phrases, "Blog phrases", True, 40),  # 2011 era
+    (generate_expletive_patterns, "Expletives", True, 40),
+    (generate_vim_typo_patterns, "Vim typos", False, 40),
+    (generate_derp_patterns, "Derp", False, 40),
+    (generate_2011_memes, "2011 memes", False, 40),
+]
+
 def generate_all() -> Iterator[str]:
-    # Priority 1: X is/are hard (HIGHEST - Dean's signature)
-    for base in generate_x_is_hard():
-        yield from apply_all_mutations(base, include_leet=True, leet_trail_limit=50)
-    
-    # Combined high-probability patterns
-    for base in generate_combined_high_prob():
-        yield from apply_all_mutations(base, include_leet=True, leet_trail_limit=50)
-    
-    # Priority 2: Potato (confirmed significant)
-    for base in generate_potato_patterns():
-        yield from apply_all_mutations(base, include_leet=False)
-    
-    # Priority 3: Blog phrases (2011 era)
-    for base in generate_blog_phrases():
-        yield from apply_all_mutations(base, include_leet=True, leet_trail_limit=40)
-    
-    # Priority 4: Expletives
-    for base in generate_expletive_patterns():
-        yield from apply_all_mutations(base, include_leet=True, leet_trail_limit=40)
-    
-    # Priority 5: Vim typos
-    for base in generate_vim_typo_patterns():
-        yield from apply_all_mutations(base, include_leet=False)
-    
-    # Priority 6: Derp patterns
-    for base in generate_derp_patterns():
-        yield from apply_all_mutations(base, include_leet=False)
-    
-    # Priority 7: 2011 memes
-    for base in generate_2011_memes():
-        yield from apply_all_mutations(base, include_leet=False)
+    for generate_bases, _, include_leet, leet_trail_limit in PRIORITIES:
+        for base in generate_bases():
+            yield from apply_all_mutations(base, include_leet=include_leet, leet_trail_limit=leet_trail_limit)
+
+# ============================================================================
+# KEYSPACE (indexable view of generate_all, for --shard / --range)
+# ============================================================================
+
+def expand_mutations(base: str, include_leet: bool, leet_trail_limit: int) -> Chain:
+    """apply_all_mutations(base) as a keyspace: (cased or leet phrase) x trailing blocks"""
+    blocks = []
+    for sep in SEPARATORS:
+        sep_phrase = sep.join(base.split())
+        for cased in case_variants(sep_phrase):
+            blocks.append(Product([cased], TRAILING_PATTERNS))
+            if include_leet:
+                leets = [leet for leet in leet_phrase(cased) if leet != cased]
+                blocks.append(Product(leets, TRAILING_PATTERNS[:leet_trail_limit]))
+    return Chain(blocks)
+
+def count_mutations(base: str, include_leet: bool, leet_trail_limit: int) -> int:
+    """len(expand_mutations(base, ...)) without building the leet phrases"""
+    plain, leets = _mutation_sizes(base, include_leet)
+    return plain + leets * len(TRAILING_PATTERNS[:leet_trail_limit])
+
+def _mutation_sizes(base: str, include_leet: bool):
+    """(candidates of the cased phrases, leet phrases) that apply_all_mutations(base) builds"""
+    plain = leets = 0
+    for sep in SEPARATORS:
+        sep_phrase = sep.join(base.split())
+        for cased in case_variants(sep_phrase):
+            plain += len(TRAILING_PATTERNS)
+            words = cased.split()
+            if include_leet and words:
+                # leet_phrase is a product of per-word variant lists; drop the
+                # combinations that reproduce `cased` itself
+                sizes = [_leet_word_sizes(w) for w in words]
+                leets += math.prod(size for size, _ in sizes) - math.prod(same for _, same in sizes)
+    return plain, leets
+
+@lru_cache(maxsize=65536)
+def _leet_word_sizes(word: str):
+    """(variants leet_phrase uses for `word`, how many of them equal `word`)"""
+    variants = list(leet_variants(word))[:6]
+    return len(variants), variants.count(word)
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): one FlatMap over bases per priority"""
+    families = []
+    for generate_bases, _, include_leet, leet_trail_limit in PRIORITIES:
+        options = dict(include_leet=include_leet, leet_trail_limit=leet_trail_limit)
+        bases = Seq(generate_bases)
+        families.append(FlatMap(bases, partial(expand_mutations, **options),
+                                count=partial(count_mutations, **options),
+                                parse=MutationIndex(bases, TRAILING_PATTERNS, SEPARATORS, LEET_CHAR, LEET_WORDS)))
+    return Chain(families, names=[name for _, name, _, _ in PRIORITIES])
+
+# ============================================================================
+# BUDGET (--budget-hours: leet trailing limits from the GPU time available)
+# ============================================================================
+
+# Chance the phrase is leeted at all; the families' own prior falls off
+# with their rank in PRIORITIES (1, 1/2, 1/3, ...)
+LEET_PRIOR = 0.3
+
+def budget_dimensions():
+    """(leet trailing-limit dimensions, candidates of the families without leet)"""
+    trails = prefix_mass([trailing_weight(t) for t in TRAILING_PATTERNS])
+    ranks = sum(1 / rank for rank in range(1, len(PRIORITIES) + 1))
+    dimensions, fixed = [], 0
+    for rank, (generate_bases, name, include_leet, leet_trail_limit) in enumerate(PRIORITIES, 1):
+        sizes = [_mutation_sizes(base, include_leet) for base in generate_bases()]
+        plain, leets = sum(p for p, _ in sizes), sum(l for _, l in sizes)
+        if not include_leet:
+            fixed += plain
+            continue
+        prior = 1 / rank / ranks
+        dimensions.append(Dimension(
+            name, range(len(TRAILING_PATTERNS) + 1),
+            lambda depth, plain=plain, leets=leets: plain + leets * depth,
+            lambda depth, prior=prior: prior * (1 - LEET_PRIOR + LEET_PRIOR * trails(depth)),
+            default=leet_trail_limit))
+    return dimensions, fixed
+
+def apply_budget(args: argparse.Namespace):
+    """Pick the leet trailing limits that fit --budget-hours at --hps, print the plan and use them."""
+    global PRIORITIES
+    dimensions, fixed = budget_dimensions()
+    plan = allocate(dimensions, budget_candidates(args.budget_hours, args.hps), fixed)
+    print_plan(plan, args.hps)
+    PRIORITIES = [(generate_bases, name, include_leet, plan.depths.get(name, limit))
+                  for generate_bases, name, include_leet, limit in PRIORITIES]
 
 def estimate_count() -> dict:
     # Count bases
@@ -531,9 +618,20 @@ def main():
     parser = argparse.ArgumentParser(description="Generate ~2-3B research-based candidates")
     parser.add_argument("--estimate", action="store_true", help="Show estimate")
     parser.add_argument("--limit", type=int, help="Limit output")
+    parser.add_argument("--hps", type=float, default=DEFAULT_HASHES_PER_SECOND,
+                        help=f"Hash rate for --budget-hours (default {DEFAULT_HASHES_PER_SECOND:,})")
+    add_budget_arguments(parser)
+    add_slice_arguments(parser)
+    add_parallel_arguments(parser)
+    add_output_arguments(parser)
     
     args = parser.parse_args()
     
+    if args.budget_hours is not None:
+        apply_budget(args)
+        if args.plan:
+            return
+    
     if args.estimate:
         est = estimate_count()
         print(f"Estimated total: {est['total']:,}")
@@ -549,15 +647,7 @@ def main():
         print(f"\nBase phrase counts: {est['base_counts']}")
         return
     
-    count = 0
-    limit = args.limit or float("inf")
-    
-    for candidate in generate_all():
-        print(candidate)
-        count += 1
-        if count >= limit:
-            break
-    
+    count = write_candidates(args, build_keyspace, generate_all)
     print(f"Generated {count:,} candidates", file=sys.stderr)
 
 if __name__ == "__main__":
@@ -11,6 +11,9 @@
 #   ./run_attempt.sh --to-file FILE     # Save wordlist to file
 #   ./run_attempt.sh --help             # Show this help
 #
+# SHARD=i/N runs only shard i of N (split the keyspace across hosts)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
+# WORKERS=N generates with N processes (0 = every CPU core)
 
 set -e
 
@@ -80,4 +83,4 @@ echo "Starting hashcat with ~2.2B research-based candidates..."
 echo "Hash file: $HASH_FILE"
 echo ""
 
-python3 "$GENERATOR" | hashcat -m 11300 -a 0 -w 3 -O --status --status-timer=60 "$HASH_FILE"
+python3 "$GENERATOR" ${SHARD:+--shard "$SHARD"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} ${WORKERS:+--workers "$WORKERS"} | hashcat -m 11300 -a 0 -w 3 -O --status --status-timer=60 "$HASH_FILE"
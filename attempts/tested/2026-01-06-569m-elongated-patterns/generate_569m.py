@@ -23,9 +23,16 @@ Trailing: 0-6 characters from !?~`
 Leading: "" or "this is a "
 """
 
+import os
 import sys
 from itertools import product
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.keyspace import Chain, Product, Seq
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import take_slice_arguments
+
 # Leetspeak mappings (consistent per word - no mixing)
 P_VARIANTS = ['p', 'P']
 O_VARIANTS = ['o', 'O', '0']
@@ -163,25 +170,37 @@ def generate_poopoo(min_len=10, max_len=20):
                     word = p + (o * dist[0]) + (o * dist[1]) + p + (o * dist[2]) + (o * dist[3])
                     yield word
 
+# Base word generators in output order
+WORD_GENERATORS = [
+    generate_potato,
+    generate_poop,
+    generate_poopy,
+    generate_pootato,
+    generate_poopoo,
+]
+
 def generate_all():
     """Generate all candidates with leading phrases and trailing chars"""
     trailing_patterns = list(generate_trailing())
     
-    # Generate base words
-    word_generators = [
-        generate_potato,
-        generate_poop,
-        generate_poopy,
-        generate_pootato,
-        generate_poopoo,
-    ]
-    
-    for gen in word_generators:
+    for gen in WORD_GENERATORS:
         for word in gen():
             for leading in LEADING_PHRASES:
                 for trailing in trailing_patterns:
                     yield leading + word + trailing
 
+def build_keyspace():
+    """Indexable view of generate_all(): word x leading x trailing per generator"""
+    def leading_first(values):
+        word, leading, trailing = values
+        return leading + word + trailing
+
+    return Chain(
+        (Product(Seq(gen), LEADING_PHRASES, Seq(generate_trailing), join=leading_first)
+         for gen in WORD_GENERATORS),
+        names=[gen.__name__.replace("generate_", "") for gen in WORD_GENERATORS],
+    )
+
 def estimate_count():
     """Estimate total candidate count"""
     # Base counts (calculated earlier)
@@ -201,6 +220,7 @@ def estimate_count():
     return base_total * trailing * leading
 
 def main():
+    options = take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments)
     if len(sys.argv) > 1 and sys.argv[1] == '--estimate':
         count = estimate_count()
         print(f"Estimated candidates: {count:,}", file=sys.stderr)
@@ -217,8 +237,7 @@ def main():
         return
     
     # Stream output
-    for candidate in generate_all():
-        print(candidate)
+    write_candidates(options, build_keyspace, generate_all)
 
 if __name__ == '__main__':
     main()
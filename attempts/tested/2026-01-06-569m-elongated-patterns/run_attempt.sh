@@ -12,6 +12,9 @@
 #   ./run_attempt.sh              # Stream to hashcat
 #   ./run_attempt.sh --estimate   # Show candidate count
 #   ./run_attempt.sh > wordlist.txt  # Save to file
+# SHARD=i/N runs only shard i of N (split the keyspace across hosts)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
+# WORKERS=N generates with N processes (0 = every CPU core)
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 GENERATOR="$SCRIPT_DIR/generate_569m.py"
@@ -39,5 +42,5 @@ else
     echo "Estimated time depends on your GPU speed." >&2
     echo "" >&2
     
-    python3 "$GENERATOR" | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+    python3 "$GENERATOR" ${SHARD:+--shard "$SHARD"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} ${WORKERS:+--workers "$WORKERS"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
 fi
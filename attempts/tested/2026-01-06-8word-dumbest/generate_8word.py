@@ -12,9 +12,15 @@ Based on Telegram deep dive findings:
 If Dean went the 8-word route, he'd pick the absolute dumbest 8-word phrase.
 """
 
+import os
 import sys
 from itertools import product, combinations_with_replacement
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import take_slice_arguments
+
 # Separators Dean uses
 SEPARATORS = [' ', '.']
 
@@ -70,7 +76,7 @@ def generate_trailing_patterns():
     # pierce403 specific
     patterns.extend(['403!', '!403', '403!!', '403?', '?403'])
     
-    return list(set(patterns))  # Remove duplicates
+    return list(dict.fromkeys(patterns))  # Remove duplicates, same order every run
 
 TRAILING_CHARS = generate_trailing_patterns()
 
@@ -313,47 +319,43 @@ def estimate_count():
     return total, trail_count
 
 
-def main():
-    if len(sys.argv) > 1 and sys.argv[1] == '--estimate':
-        count, trail_count = estimate_count()
-        print(f"Estimated candidates: {count:,}")
-        print(f"That's approximately {count/1e9:.2f}B")
-        print(f"Trailing patterns: {trail_count}")
-        return
-    
-    # Generate all patterns in priority order
-    
+def generate_all():
+    """Generate all patterns in priority order."""
     # 1. Extended "this is a very bad password"
-    for phrase in generate_extended_this_is():
-        print(phrase)
+    yield from generate_extended_this_is()
     
     # 2. Sentence-style 8-word phrases
-    for phrase in generate_sentence_8word():
-        print(phrase)
+    yield from generate_sentence_8word()
     
     # 3. Dean's commit-style phrases
-    for phrase in generate_dean_style():
-        print(phrase)
+    yield from generate_dean_style()
     
     # 4. Repeated single word
-    for phrase in generate_repeated_word():
-        print(phrase)
+    yield from generate_repeated_word()
     
     # 5. Mixed repeated patterns
-    for phrase in generate_mixed_repeated():
-        print(phrase)
+    yield from generate_mixed_repeated()
     
     # 6. Number words
-    for phrase in generate_number_words():
-        print(phrase)
+    yield from generate_number_words()
     
     # 7. Letter words
-    for phrase in generate_letter_words():
-        print(phrase)
+    yield from generate_letter_words()
     
     # 8. Adjective combinations (largest category)
-    for phrase in generate_adjective_combos():
-        print(phrase)
+    yield from generate_adjective_combos()
+
+
+def main():
+    options = take_slice_arguments(sys.argv, add_output_arguments)
+    if len(sys.argv) > 1 and sys.argv[1] == '--estimate':
+        count, trail_count = estimate_count()
+        print(f"Estimated candidates: {count:,}")
+        print(f"That's approximately {count/1e9:.2f}B")
+        print(f"Trailing patterns: {trail_count}")
+        return
+    
+    write_candidates(options, generate_all=generate_all)
 
 
 if __name__ == '__main__':
@@ -7,6 +7,8 @@
 #
 # This script generates ~1M candidates targeting 8-word "dumbest possible"
 # passphrase patterns based on Dean's hints from Telegram.
+# RANGE=A:B runs only candidates A..B-1 (this generator only streams, so it has no --shard)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 GENERATOR="$SCRIPT_DIR/generate_8word.py"
@@ -17,4 +19,4 @@ if [[ "$1" == "--estimate" ]]; then
     exit 0
 fi
 
-python3 "$GENERATOR" | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+python3 "$GENERATOR" ${RANGE:+--range "$RANGE"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
@@ -13,6 +13,13 @@ Trailing: 0-6 chars from 1234!@#$
 """
 
 import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import take_slice_arguments
 
 # Pejoratives to insert (including empty for original prompt)
 PEJORATIVES = [
@@ -62,7 +69,8 @@ def capitalize_first(phrase):
         return phrase
     return phrase[0].upper() + phrase[1:]
 
-def main():
+def generate_all():
+    """Generate all prompt-based candidates."""
     trailing_combos = generate_trailing_combinations()
     
     for pejorative in PEJORATIVES:
@@ -87,16 +95,19 @@ def main():
                         if trailing:
                             # For space-separated, try both with and without space before trailing
                             if sep == " ":
-                                print(f"{phrase_with_period}{trailing}")
-                                print(f"{phrase_with_period} {trailing}")
+                                yield f"{phrase_with_period}{trailing}"
+                                yield f"{phrase_with_period} {trailing}"
                             elif sep == ".":
-                                print(f"{phrase_with_period}{trailing}")
-                                print(f"{phrase_with_period}.{trailing}")
+                                yield f"{phrase_with_period}{trailing}"
+                                yield f"{phrase_with_period}.{trailing}"
                             else:
                                 # No separator - just append trailing
-                                print(f"{phrase_with_period}{trailing}")
+                                yield f"{phrase_with_period}{trailing}"
                         else:
-                            print(phrase_with_period)
+                            yield phrase_with_period
+
+def main():
+    write_candidates(take_slice_arguments(sys.argv, add_output_arguments), generate_all=generate_all)
 
 if __name__ == "__main__":
     main()
@@ -1,6 +1,8 @@
 #!/bin/bash
 # Run the prompt-based password attempt
 # ~72M candidates, ~4.4 minutes at 270k H/s
+# RANGE=A:B runs only candidates A..B-1 (this generator only streams, so it has no --shard)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 HASH_FILE="${SCRIPT_DIR}/../tested/2026-01-06-8word-dumbest/hash.txt"
@@ -10,4 +12,4 @@ echo "Candidates: ~72M"
 echo "Estimated time: ~4.4 minutes at 270k H/s"
 echo ""
 
-python3 "${SCRIPT_DIR}/generate_prompt_based.py" | hashcat -m 11300 -a 0 -w 3 -O "${HASH_FILE}"
+python3 "${SCRIPT_DIR}/generate_prompt_based.py" ${RANGE:+--range "$RANGE"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} | hashcat -m 11300 -a 0 -w 3 -O "${HASH_FILE}"
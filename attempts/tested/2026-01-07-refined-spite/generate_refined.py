@@ -19,9 +19,16 @@ Trailing rules:
 Target: ~2.8 billion candidates across 6, 7, 8 word patterns
 """
 
+import os
 import sys
 from itertools import product
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.keyspace import Chain, trailing_families
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import take_slice_arguments
+
 # === REFINED WORD LISTS (Dean's actual vocabulary) ===
 
 STARTERS = ["This", "this", "It", "it", "What", "what", "That", "that", "Here", "My"]  # 10
@@ -66,15 +73,13 @@ def generate_trailing_combinations(max_len=4):
 # Pre-generate trailing combinations (0-4 chars)
 TRAILING_COMBOS = generate_trailing_combinations(4)
 
-def output_with_trailing(base_phrase):
-    """Output phrase with all trailing combinations and separators"""
-    # First output with no trailing (no separator needed)
-    print(base_phrase)
-    
-    # Then output with each trailing combination and each separator
-    for trail in TRAILING_COMBOS[1:]:  # Skip empty
-        for sep in TRAILING_SEPARATORS:
-            print(f"{base_phrase}{sep}{trail}")
+# Every phrase is output first with no trailing (no separator needed),
+# then with each trailing combination and each separator
+TRAILING_VARIANTS = [""] + [
+    f"{sep}{trail}"
+    for trail in TRAILING_COMBOS[1:]  # Skip empty
+    for sep in TRAILING_SEPARATORS
+]
 
 def generate_6word():
     """
@@ -88,7 +93,7 @@ def generate_6word():
                     for spite in SPITE_WORDS:
                         for noun in NOUNS_LEET:
                             base = f"{starter} {conn} {art} {filler} {spite} {noun}"
-                            output_with_trailing(base)
+                            yield base
 
 def generate_7word():
     """
@@ -102,7 +107,7 @@ def generate_7word():
                     for spite in SPITE_WORDS:
                         for noun in NOUNS_LEET:
                             base = f"{starter} {conn} {art} {filler} {filler} {spite} {noun}"
-                            output_with_trailing(base)
+                            yield base
 
 def generate_8word():
     """
@@ -116,9 +121,19 @@ def generate_8word():
                     for spite in SPITE_WORDS:
                         for noun in NOUNS_LEET:
                             base = f"{starter} {conn} {art} {filler} {filler} {filler} {spite} {noun}"
-                            output_with_trailing(base)
+                            yield base
 
-def main():
+FAMILIES = [
+    (generate_8word, "8-word"),  # Start with 8-word (most likely per Bitcoin 0.4.0)
+    (generate_7word, "7-word"),
+    (generate_6word, "6-word"),
+]
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): each family's phrases x TRAILING_VARIANTS"""
+    return trailing_families(FAMILIES, TRAILING_VARIANTS)
+
+def generate_all():
     """
     Generate all patterns: 6, 7, and 8 word
     
@@ -134,9 +149,13 @@ def main():
     
     Total with trailing: 196,560 * 14,041 = 2,759,898,960 (~2.8B)
     """
-    generate_8word()  # Start with 8-word (most likely per Bitcoin 0.4.0)
-    generate_7word()
-    generate_6word()
+    for family, _ in FAMILIES:
+        for base in family():
+            for trail in TRAILING_VARIANTS:
+                yield base + trail
+
+def main():
+    write_candidates(take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments), build_keyspace, generate_all)
 
 if __name__ == "__main__":
     main()
@@ -10,9 +10,16 @@ Word counts: 4, 5, 6, 7, 8 words
 Trailing: 0-4 chars from 1234!@#$
 """
 
+import os
 import sys
 from itertools import product
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.keyspace import Chain, trailing_families
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import take_slice_arguments
+
 # Spite words to repeat
 SPITE_WORDS = [
     "bad", "dumb", "stupid", "awful", "crappy", "shitty",
@@ -49,15 +56,13 @@ def generate_trailing_combinations(max_len=4):
 # Pre-generate trailing combinations (0-4 chars)
 TRAILING_COMBOS = generate_trailing_combinations(4)
 
-def output_with_trailing(base_phrase):
-    """Output phrase with all trailing combinations and separators"""
-    # First output with no trailing (no separator needed)
-    print(base_phrase)
-    
-    # Then output with each trailing combination and each separator
-    for trail in TRAILING_COMBOS[1:]:  # Skip empty
-        for sep in TRAILING_SEPARATORS:
-            print(f"{base_phrase}{sep}{trail}")
+# Every phrase is output first with no trailing (no separator needed),
+# then with each trailing combination and each separator
+TRAILING_VARIANTS = [""] + [
+    f"{sep}{trail}"
+    for trail in TRAILING_COMBOS[1:]  # Skip empty
+    for sep in TRAILING_SEPARATORS
+]
 
 def generate_repeated_spite():
     """
@@ -79,11 +84,11 @@ def generate_repeated_spite():
                 
                 # Lowercase version
                 base = f"{repeated} {noun}"
-                output_with_trailing(base)
+                yield base
                 
                 # First word capitalized version
                 base_cap = f"{repeated_cap} {noun}"
-                output_with_trailing(base_cap)
+                yield base_cap
 
 def generate_repeated_filler_spite():
     """
@@ -106,13 +111,22 @@ def generate_repeated_filler_spite():
                     
                     # Lowercase version
                     base = f"{repeated} {spite} {noun}"
-                    output_with_trailing(base)
+                    yield base
                     
                     # First word capitalized version
                     base_cap = f"{repeated_cap} {spite} {noun}"
-                    output_with_trailing(base_cap)
+                    yield base_cap
 
-def main():
+FAMILIES = [
+    (generate_repeated_spite, "Repeated spite"),
+    (generate_repeated_filler_spite, "Repeated filler + spite"),
+]
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): each family's phrases x TRAILING_VARIANTS"""
+    return trailing_families(FAMILIES, TRAILING_VARIANTS)
+
+def generate_all():
     """
     Generate repeated word patterns
     
@@ -128,8 +142,13 @@ def main():
     
     Total: ~131 million candidates
     """
-    generate_repeated_spite()
-    generate_repeated_filler_spite()
+    for family, _ in FAMILIES:
+        for base in family():
+            for trail in TRAILING_VARIANTS:
+                yield base + trail
+
+def main():
+    write_candidates(take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments), build_keyspace, generate_all)
 
 if __name__ == "__main__":
     main()
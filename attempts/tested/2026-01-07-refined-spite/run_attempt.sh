@@ -1,6 +1,9 @@
 #!/bin/bash
 # Run refined spite passphrase attempt against Bitcoin wallet hash
 # ~2.8 billion candidates based on Dean's actual vocabulary
+# SHARD=i/N runs only shard i of N (split the keyspace across hosts)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
+# WORKERS=N generates with N processes (0 = every CPU core)
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
@@ -34,7 +37,18 @@ fi
 echo "Running: python3 generate_refined.py | hashcat -m 11300 -a 0 -w 3 -O $HASH_FILE"
 echo ""
 
-python3 "$SCRIPT_DIR/generate_refined.py" | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+python3 "$SCRIPT_DIR/generate_refined.py" ${SHARD:+--shard "$SHARD"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} ${WORKERS:+--workers "$WORKERS"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+STATUS=${PIPESTATUS[1]}
 
 echo ""
-echo "=== Attempt Complete ==="
+# hashcat exits 0 on a crack, 1 when the keyspace is exhausted
+CRACKED=$(hashcat -m 11300 --show "$HASH_FILE" 2>/dev/null)
+if [[ -n "$CRACKED" ]]; then
+    echo "[+] CRACKED: $CRACKED"
+elif [[ "$STATUS" -eq 0 ]]; then
+    echo "[+] Cracked: see the hashcat output above"
+elif [[ "$STATUS" -eq 1 ]]; then
+    echo "[*] Attack complete: keyspace exhausted, no match."
+else
+    echo "[!] hashcat exited with status $STATUS before the keyspace was exhausted; the attack is not complete."
+fi
@@ -10,6 +10,13 @@ Case: lowercase and first-word capitalized
 """
 
 import itertools
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import take_slice_arguments
 
 # Simple phrases (no pejorative)
 SIMPLE_PHRASES = [
@@ -74,7 +81,8 @@ def capitalize_first(phrase):
         return phrase
     return phrase[0].upper() + phrase[1:]
 
-def main():
+def generate_all():
+    """Generate all simple-phrase and movie-quote candidates."""
     trailing_combos = generate_trailing_combinations()
     
     for phrase_words in ALL_PHRASES:
@@ -93,13 +101,16 @@ def main():
                     if trailing:
                         # Add trailing with same separator style
                         if sep == " ":
-                            print(f"{phrase} {trailing}")
-                            print(f"{phrase}{trailing}")  # Also try no space before trailing
+                            yield f"{phrase} {trailing}"
+                            yield f"{phrase}{trailing}"  # Also try no space before trailing
                         else:
-                            print(f"{phrase}{sep}{trailing}")
-                            print(f"{phrase}{trailing}")  # Also try no separator before trailing
+                            yield f"{phrase}{sep}{trailing}"
+                            yield f"{phrase}{trailing}"  # Also try no separator before trailing
                     else:
-                        print(phrase)
+                        yield phrase
+
+def main():
+    write_candidates(take_slice_arguments(sys.argv, add_output_arguments), generate_all=generate_all)
 
 if __name__ == "__main__":
     main()
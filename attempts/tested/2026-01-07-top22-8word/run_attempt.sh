@@ -1,6 +1,8 @@
 #!/bin/bash
 # Run top 22 eight-word phrases attempt against Bitcoin wallet hash
 # ~52.7M candidates - runs in ~3.3 minutes at 270k H/s
+# RANGE=A:B runs only candidates A..B-1 (this generator only streams, so it has no --shard)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
@@ -34,7 +36,18 @@ fi
 echo "Running: python3 generate_top22.py | hashcat -m 11300 -a 0 -w 3 -O $HASH_FILE"
 echo ""
 
-python3 "$SCRIPT_DIR/generate_top22.py" | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+python3 "$SCRIPT_DIR/generate_top22.py" ${RANGE:+--range "$RANGE"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+STATUS=${PIPESTATUS[1]}
 
 echo ""
-echo "=== Attempt Complete ==="
+# hashcat exits 0 on a crack, 1 when the keyspace is exhausted
+CRACKED=$(hashcat -m 11300 --show "$HASH_FILE" 2>/dev/null)
+if [[ -n "$CRACKED" ]]; then
+    echo "[+] CRACKED: $CRACKED"
+elif [[ "$STATUS" -eq 0 ]]; then
+    echo "[+] Cracked: see the hashcat output above"
+elif [[ "$STATUS" -eq 1 ]]; then
+    echo "[*] Attack complete: keyspace exhausted, no match."
+else
+    echo "[!] hashcat exited with status $STATUS before the keyspace was exhausted; the attack is not complete."
+fi
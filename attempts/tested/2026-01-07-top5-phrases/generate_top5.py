@@ -13,8 +13,15 @@ Trailing: 0-6 chars from 1234!@#$
 ~26.4M candidates total - runs in ~1.6 minutes at 270k H/s
 """
 
+import os
+import sys
 from itertools import product
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import take_slice_arguments
+
 # The 11 most likely base phrase patterns as word lists
 # Will be combined with both "password" and "passphrase"
 BASE_PATTERNS = [
@@ -57,18 +64,18 @@ def generate_trailing_combinations(max_len=6):
 # 1 + 8 + 64 + 512 + 4096 + 32768 + 262144 = 299,593 combinations
 TRAILING_COMBOS = generate_trailing_combinations(6)
 
-def output_phrase(words, word_sep):
-    """Output phrase with all trailing combinations using consistent separator"""
+def phrase_candidates(words, word_sep):
+    """Yield phrase with all trailing combinations using consistent separator"""
     base_phrase = word_sep.join(words)
     
     # First output with no trailing
-    print(base_phrase)
+    yield base_phrase
     
     # Then output with each trailing combination (separator before trailing matches word separator)
     for trail in TRAILING_COMBOS[1:]:  # Skip empty
-        print(f"{base_phrase}{word_sep}{trail}")
+        yield f"{base_phrase}{word_sep}{trail}"
 
-def main():
+def generate_all():
     """
     Generate top 11 phrases (x2 for password/passphrase) with all trailing combinations
     
@@ -85,11 +92,14 @@ def main():
             
             for word_sep in WORD_SEPARATORS:
                 # Output lowercase version
-                output_phrase(words, word_sep)
+                yield from phrase_candidates(words, word_sep)
                 
                 # Output capitalized version (first word capitalized)
                 words_cap = [words[0].capitalize()] + words[1:]
-                output_phrase(words_cap, word_sep)
+                yield from phrase_candidates(words_cap, word_sep)
+
+def main():
+    write_candidates(take_slice_arguments(sys.argv, add_output_arguments), generate_all=generate_all)
 
 if __name__ == "__main__":
     main()
@@ -13,8 +13,16 @@ Intelligent trailing patterns: 1155 (vs 13 original)
 """
 
 import itertools
+import os
 import sys
-from typing import Generator, List
+from typing import Generator, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.keyspace import Chain, Product, Seq
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import select, take_slice_arguments
+from cmw.sidecar import start_family
 
 # Common data
 ADJECTIVES = ["bad", "dumb", "stupid"]
@@ -190,14 +198,33 @@ print(f"# Generated {len(INTELLIGENT_TRAILING)} trailing patterns", file=sys.std
 
 
 def log_progress(family_num: int, family_name: str):
-    """Log progress to stderr"""
+    """Log progress to stderr, and mark where the family starts for --sidecar"""
     print(f"# Generating Family {family_num}: {family_name}", file=sys.stderr)
+    start_family(family_name)
+
+
+def with_trailing(phrases: List[str], trailing: List[str] = INTELLIGENT_TRAILING) -> Generator[str, None, None]:
+    """Each phrase followed by every trailing pattern, as is and then capitalized"""
+    for phrase in phrases:
+        for trail in trailing:
+            yield phrase + trail
+            yield phrase.capitalize() + trail
+
+
+# Whether with_trailing() capitalizes, in its order
+BOTH_CASES = (False, True)
+
+
+def _trailed(values: Tuple[str, str, bool]) -> str:
+    """with_trailing()'s candidate for (phrase, trail, capitalized)"""
+    phrase, trail, capitalized = values
+    return (phrase.capitalize() if capitalized else phrase) + trail
 
 
 # ==================== FAMILY 1: Alternative Leetspeak (e→3, i→1, o→0) (~12M) ====================
-def family_1_alternative_leet() -> Generator[str, None, None]:
+def alternative_leet_phrases() -> List[str]:
     """Alternative leetspeak: e→3, i→1, o→0 (NOT applied to a/s which were tested)"""
-    log_progress(1, "Alternative Leetspeak (e/i/o)")
+    phrases = []
 
     def apply_eio_leet(text: str, e_sub: bool, i_sub: bool, o_sub: bool) -> str:
         """Apply e→3, i→1, o→0 leetspeak"""
@@ -242,17 +269,20 @@ def family_1_alternative_leet() -> Generator[str, None, None]:
                 separated_phrase = sep.join(phrase.split())
 
                 for e_sub, i_sub, o_sub in leet_combos:
-                    leeted = apply_eio_leet(separated_phrase, e_sub, i_sub, o_sub)
+                    phrases.append(apply_eio_leet(separated_phrase, e_sub, i_sub, o_sub))
+    return phrases
+
 
-                    for trail in INTELLIGENT_TRAILING:
-                        yield leeted + trail
-                        yield leeted.capitalize() + trail
+def family_1_alternative_leet() -> Generator[str, None, None]:
+    """Alternative leetspeak: e→3, i→1, o→0 (NOT applied to a/s which were tested)"""
+    log_progress(1, "Alternative Leetspeak (e/i/o)")
+    yield from with_trailing(alternative_leet_phrases())
 
 
 # ==================== FAMILY 2: Hybrid Leetspeak (adjective + noun both leeted) (~4M) ====================
-def family_2_hybrid_leet() -> Generator[str, None, None]:
+def hybrid_leet_phrases() -> List[str]:
     """Both adjective AND noun leeted (e.g., 'b@d p@$$w0rd')"""
-    log_progress(2, "Hybrid Leetspeak (adj+noun)")
+    phrases = []
 
     def apply_adj_leet(adj: str) -> List[str]:
         """Leet variations for adjectives"""
@@ -267,7 +297,7 @@ def family_2_hybrid_leet() -> Generator[str, None, None]:
                 new_variants.append(v.replace('s', '$'))
                 new_variants.append(v.replace('s', '5'))
             variants.extend(new_variants)
-        return list(set(variants))
+        return list(dict.fromkeys(variants))
 
     def apply_noun_leet(noun: str) -> List[str]:
         """Leet variations for nouns (password/passphrase)"""
@@ -281,7 +311,7 @@ def family_2_hybrid_leet() -> Generator[str, None, None]:
                 base.replace('PASS', 'p@$$'),
                 base.replace('PASS', 'p455'),
             ])
-        return list(set(variants))
+        return list(dict.fromkeys(variants))
 
     templates = [
         "this is a {adj} {noun}",
@@ -308,17 +338,20 @@ def family_2_hybrid_leet() -> Generator[str, None, None]:
                         phrase = template.replace("{adj}", adj_leet).replace("{noun}", noun_leet)
 
                         for sep in separators:
-                            separated = sep.join(phrase.split())
+                            phrases.append(sep.join(phrase.split()))
+    return phrases
 
-                            for trail in INTELLIGENT_TRAILING:
-                                yield separated + trail
-                                yield separated.capitalize() + trail
+
+def family_2_hybrid_leet() -> Generator[str, None, None]:
+    """Both adjective AND noun leeted (e.g., 'b@d p@$$w0rd')"""
+    log_progress(2, "Hybrid Leetspeak (adj+noun)")
+    yield from with_trailing(hybrid_leet_phrases())
 
 
 # ==================== FAMILY 3: Emphasis Capitalization (~2.5M) ====================
-def family_3_emphasis_caps() -> Generator[str, None, None]:
+def emphasis_phrases() -> List[str]:
     """Capitalization emphasis on key words (e.g., 'this is a BAD password')"""
-    log_progress(3, "Emphasis Capitalization")
+    phrases = []
 
     def apply_emphasis(words: List[str], emphasis_idx: int) -> str:
         """Capitalize word at emphasis_idx"""
@@ -347,18 +380,25 @@ def family_3_emphasis_caps() -> Generator[str, None, None]:
 
             for sep in separators:
                 if sep != " ":
-                    phrase = emphasized.replace(" ", sep)
+                    phrases.append(emphasized.replace(" ", sep))
                 else:
-                    phrase = emphasized
+                    phrases.append(emphasized)
+    return phrases
 
-                for trail in INTELLIGENT_TRAILING:
-                    yield phrase + trail
+
+def family_3_emphasis_caps() -> Generator[str, None, None]:
+    """Capitalization emphasis on key words (e.g., 'this is a BAD password')"""
+    log_progress(3, "Emphasis Capitalization")
+    # Already cased: no capitalized copy
+    for phrase in emphasis_phrases():
+        for trail in INTELLIGENT_TRAILING:
+            yield phrase + trail
 
 
 # ==================== FAMILY 4: Number Infixes (~800K) ====================
-def family_4_number_infixes() -> Generator[str, None, None]:
+def number_infix_phrases() -> List[str]:
     """Numbers in middle of phrase (e.g., 'this 123 is a bad password')"""
-    log_progress(4, "Number Infixes")
+    phrases = []
 
     templates = [
         "this {num} is a bad password",
@@ -382,19 +422,22 @@ def family_4_number_infixes() -> Generator[str, None, None]:
 
                 for sep in separators:
                     if sep != " ":
-                        separated = phrase.replace(" ", sep)
+                        phrases.append(phrase.replace(" ", sep))
                     else:
-                        separated = phrase
+                        phrases.append(phrase)
+    return phrases
+
 
-                    for trail in INTELLIGENT_TRAILING:
-                        yield separated + trail
-                        yield separated.capitalize() + trail
+def family_4_number_infixes() -> Generator[str, None, None]:
+    """Numbers in middle of phrase (e.g., 'this 123 is a bad password')"""
+    log_progress(4, "Number Infixes")
+    yield from with_trailing(number_infix_phrases())
 
 
 # ==================== FAMILY 5: Alternative Intensifiers (~300K) ====================
-def family_5_alternative_intensifiers() -> Generator[str, None, None]:
+def alternative_intensifier_phrases() -> List[str]:
     """Alternative intensifiers: so, such, pretty, kinda, sorta"""
-    log_progress(5, "Alternative Intensifiers")
+    phrases = []
 
     intensifiers = ["so", "such", "pretty", "kinda", "sorta", "totally"]
     adjectives_extended = ["bad", "dumb", "stupid", "shitty", "lame"]
@@ -415,19 +458,22 @@ def family_5_alternative_intensifiers() -> Generator[str, None, None]:
 
                 for sep in separators:
                     if sep != " ":
-                        separated = phrase.replace(" ", sep)
+                        phrases.append(phrase.replace(" ", sep))
                     else:
-                        separated = phrase
+                        phrases.append(phrase)
+    return phrases
 
-                    for trail in INTELLIGENT_TRAILING:
-                        yield separated + trail
-                        yield separated.capitalize() + trail
+
+def family_5_alternative_intensifiers() -> Generator[str, None, None]:
+    """Alternative intensifiers: so, such, pretty, kinda, sorta"""
+    log_progress(5, "Alternative Intensifiers")
+    yield from with_trailing(alternative_intensifier_phrases())
 
 
 # ==================== FAMILY 6: Doubled Words (~200K) ====================
-def family_6_doubled_words() -> Generator[str, None, None]:
+def doubled_word_phrases() -> List[str]:
     """Doubled words for emphasis (e.g., 'bad bad password', 'really really bad')"""
-    log_progress(6, "Doubled Words")
+    phrases = []
 
     templates = [
         "bad bad password",
@@ -449,21 +495,22 @@ def family_6_doubled_words() -> Generator[str, None, None]:
 
             for sep in separators:
                 if sep != " ":
-                    separated = phrase.replace(" ", sep)
+                    phrases.append(phrase.replace(" ", sep))
                 else:
-                    separated = phrase
+                    phrases.append(phrase)
+    return phrases
 
-                for trail in INTELLIGENT_TRAILING:
-                    yield separated + trail
-                    yield separated.capitalize() + trail
+
+def family_6_doubled_words() -> Generator[str, None, None]:
+    """Doubled words for emphasis (e.g., 'bad bad password', 'really really bad')"""
+    log_progress(6, "Doubled Words")
+    yield from with_trailing(doubled_word_phrases())
 
 
 # ==================== FAMILY 7: Longer Dean Quotes (~150K) ====================
-def family_7_longer_quotes() -> Generator[str, None, None]:
+def longer_quote_phrases() -> List[str]:
     """Longer phrases from Dean's quotes: 'embarrassingly stupid', 'dumbest freaking'"""
-    log_progress(7, "Longer Dean Quotes")
-
-    phrases = [
+    quotes = [
         "embarrassingly stupid password",
         "embarrassingly bad password",
         "embarrassingly dumb password",
@@ -479,23 +526,25 @@ def family_7_longer_quotes() -> Generator[str, None, None]:
 
     separators = [" ", "."]
 
-    for phrase in phrases:
+    phrases = []
+    for phrase in quotes:
         for sep in separators:
             if sep != " ":
-                separated = phrase.replace(" ", sep)
+                phrases.append(phrase.replace(" ", sep))
             else:
-                separated = phrase
+                phrases.append(phrase)
+    return phrases
 
-            for trail in INTELLIGENT_TRAILING:
-                yield separated + trail
-                yield separated.capitalize() + trail
 
+def family_7_longer_quotes() -> Generator[str, None, None]:
+    """Longer phrases from Dean's quotes: 'embarrassingly stupid', 'dumbest freaking'"""
+    log_progress(7, "Longer Dean Quotes")
+    yield from with_trailing(longer_quote_phrases())
 
-# ==================== FAMILY 8: Alternating Number/Punctuation (~50K) ====================
-def family_8_alternating_patterns() -> Generator[str, None, None]:
-    """Alternating patterns in trailing: '!1!1', '?2?2', '!~!~'"""
-    log_progress(8, "Alternating Trailing Patterns")
 
+# ==================== FAMILY 8: Alternating Number/Punctuation (~50K) ====================
+def alternating_phrases() -> List[str]:
+    """Bases for the alternating trailing patterns"""
     bases = [
         "this is a bad password",
         "this is a bad passphrase",
@@ -505,27 +554,32 @@ def family_8_alternating_patterns() -> Generator[str, None, None]:
         "dumb password",
     ]
 
-    # Alternating patterns
-    alternating = [
-        "!1", "!1!", "!1!1", "!1!1!",
-        "?2", "?2?", "?2?2", "?2?2?",
-        "!~", "!~!", "!~!~", "!~!~!",
-        "~!", "~!~", "~!~!",
-        "1!", "1!1", "1!1!", "1!1!1",
-    ]
-
     separators = [" ", "."]
 
+    phrases = []
     for base in bases:
         for sep in separators:
             if sep != " ":
-                separated = base.replace(" ", sep)
+                phrases.append(base.replace(" ", sep))
             else:
-                separated = base
+                phrases.append(base)
+    return phrases
+
 
-            for alt in alternating:
-                yield separated + alt
-                yield separated.capitalize() + alt
+# Alternating patterns
+ALTERNATING_TRAILING = [
+    "!1", "!1!", "!1!1", "!1!1!",
+    "?2", "?2?", "?2?2", "?2?2?",
+    "!~", "!~!", "!~!~", "!~!~!",
+    "~!", "~!~", "~!~!",
+    "1!", "1!1", "1!1!", "1!1!1",
+]
+
+
+def family_8_alternating_patterns() -> Generator[str, None, None]:
+    """Alternating patterns in trailing: '!1!1', '?2?2', '!~!~'"""
+    log_progress(8, "Alternating Trailing Patterns")
+    yield from with_trailing(alternating_phrases(), ALTERNATING_TRAILING)
 
 
 # ==================== MAIN GENERATOR ====================
@@ -550,8 +604,30 @@ def generate_all() -> Generator[str, None, None]:
     yield from family_8_alternating_patterns()  # ~50K
 
 
+# (phrases, trailing patterns, capitalized copies too) per family, in generate_all() order
+FAMILIES = [
+    ("Alternative Leetspeak (e/i/o)", alternative_leet_phrases, INTELLIGENT_TRAILING, True),
+    ("Hybrid Leetspeak (adj+noun)", hybrid_leet_phrases, INTELLIGENT_TRAILING, True),
+    ("Emphasis Capitalization", emphasis_phrases, INTELLIGENT_TRAILING, False),
+    ("Number Infixes", number_infix_phrases, INTELLIGENT_TRAILING, True),
+    ("Alternative Intensifiers", alternative_intensifier_phrases, INTELLIGENT_TRAILING, True),
+    ("Doubled Words", doubled_word_phrases, INTELLIGENT_TRAILING, True),
+    ("Longer Dean Quotes", longer_quote_phrases, INTELLIGENT_TRAILING, True),
+    ("Alternating Trailing Patterns", alternating_phrases, ALTERNATING_TRAILING, True),
+]
+
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): each family's phrases x trailing (x case)"""
+    return Chain([Product(Seq(phrases), trailing, BOTH_CASES, join=_trailed) if capitalized
+                  else Product(Seq(phrases), trailing)
+                  for _, phrases, trailing, capitalized in FAMILIES],
+                 names=[name for name, _, _, _ in FAMILIES])
+
+
 # ==================== MAIN ====================
 if __name__ == "__main__":
+    options = take_slice_arguments(sys.argv, add_output_arguments)
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         trailing_count = len(INTELLIGENT_TRAILING)
         multiplier = trailing_count / 13  # Original had 13 Dean trailing patterns
@@ -591,11 +667,10 @@ if __name__ == "__main__":
             print(f"\nRuntime at 270k H/s: ~{runtime_seconds:.0f} seconds")
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
         count = 0
-        for candidate in generate_all():
+        for candidate in select(options, build_keyspace, generate_all):
             print(candidate)
             count += 1
             if count >= 100:
                 break
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, build_keyspace, generate_all)
@@ -2,6 +2,8 @@
 # Alternative Leetspeak & Hybrid Patterns Runner
 # ~1.78B candidates, ~1.8 hours runtime at 270k H/s
 # Intelligent trailing patterns: 1155 (vs 13 original)
+# SHARD=i/N runs only shard i of N (split the keyspace across hosts)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
 
 # Bitcoin wallet hash
 HASH='$bitcoin$96$3fa8554bcc7f1adb4dee43327a2680be93112f8c11e9cbff7561038eddf258827dd38c72354695fc70d4a01102d22c48$16$14bff2455913f62c$25000$96$ad32dfdce53d6c1c7beb7c25f6c2a2730dc136201fe2423f57745743a5d78711b25c0c49c05092af9b8af506da74d066$130$04ffc8348b3538d3a865c4c0c359a7b4eefa687f2ecffda0aa763b58143df7d7ee7cbdbd62ce9fe6608e6c959c406cee192e35a4838e4f2f923d417ff09d0fd6ad'
@@ -38,7 +40,18 @@ echo "[*] Intelligent trailing patterns: 1155"
 echo "[*] Progress will be logged to stderr by generator"
 echo ""
 
-python3 generate.py | hashcat -m 11300 -a 0 -w 3 -O hash.txt
+python3 generate.py ${SHARD:+--shard "$SHARD"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} | hashcat -m 11300 -a 0 -w 3 -O hash.txt
+STATUS=${PIPESTATUS[1]}
 
 echo ""
-echo "[*] Attack complete. Check hashcat output above."
+# hashcat exits 0 on a crack, 1 when the keyspace is exhausted
+CRACKED=$(hashcat -m 11300 --show hash.txt 2>/dev/null)
+if [[ -n "$CRACKED" ]]; then
+    echo "[+] CRACKED: $CRACKED"
+elif [[ "$STATUS" -eq 0 ]]; then
+    echo "[+] Cracked: see the hashcat output above"
+elif [[ "$STATUS" -eq 1 ]]; then
+    echo "[*] Attack complete: keyspace exhausted, no match."
+else
+    echo "[!] hashcat exited with status $STATUS before the keyspace was exhausted; the attack is not complete."
+fi
@@ -23,16 +23,29 @@ Trailing lengths: 0-4 characters = 54,241 patterns
 10. Mixed hybrid mutations (~18k)
 
 Total runtime at 270k H/s: ~10.3 hours
+
+Keyspace: build_keyspace() exposes the same stream with len(),
+candidate_at(i) and iter_range(start, stop) for resuming/splitting runs.
 """
 
 import itertools
+import os
 import sys
 from typing import Generator, List
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.count import DEFAULT_HASHES_PER_SECOND, print_count
+from cmw.keyspace import Chain, trailing_families
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import select, take_slice_arguments
+from cmw.sidecar import start_family
+
 
 def log_progress(family_num: int, family_name: str):
-    """Log progress to stderr"""
+    """Log progress to stderr, and mark where the family starts for --sidecar"""
     print(f"# Generating Family {family_num}: {family_name}", file=sys.stderr)
+    start_family(family_name)
 
 
 # ==================== TRAILING GENERATION ====================
@@ -53,6 +66,31 @@ TRAILING_PATTERNS = generate_trailing_patterns()
 print(f"# Generated {len(TRAILING_PATTERNS)} trailing patterns (0-{MAX_TRAILING_LENGTH} chars)", file=sys.stderr)
 
 
+# ==================== LEET AND CASE TABLES ====================
+# Module level so scripts/compile_rules.py --tables can compile them into hashcat rules
+
+# (char, replacement): every char, either case, becomes replacement
+LEET_SUBSTITUTIONS = [("a", "4"), ("a", "@"), ("s", "5"), ("s", "$"), ("e", "3"), ("i", "1"), ("o", "0")]
+
+# Whether a base is capitalized: as is, then str.capitalize()
+CASE_VARIANTS = [False, True]
+
+
+def leet(text: str, char: str, replacement: str) -> str:
+    """One LEET_SUBSTITUTIONS entry applied to text"""
+    return text.replace(char, replacement).replace(char.upper(), replacement)
+
+
+def leet_case_variants(text: str) -> List[str]:
+    """Family 2's mutations of one phrase: each leet substitution, each case variant"""
+    variants = []
+    for char, replacement in LEET_SUBSTITUTIONS:
+        leeted = leet(text, char, replacement)
+        for capitalize in CASE_VARIANTS:
+            variants.append(leeted.capitalize() if capitalize else leeted)
+    return variants
+
+
 # ==================== BASE PHRASE PATTERNS ====================
 
 def family_1_core_phrases() -> Generator[str, None, None]:
@@ -60,7 +98,6 @@ def family_1_core_phrases() -> Generator[str, None, None]:
     Core self-deprecating phrases with variations
     Target: ~24k base patterns before trailing
     """
-    log_progress(1, "Core Self-Deprecating Phrases")
 
     # Core components
     adjectives = ["bad", "dumb", "stupid", "shitty", "crappy", "awful", "terrible", "lame", "weak"]
@@ -101,7 +138,6 @@ def family_1_core_phrases() -> Generator[str, None, None]:
     ]
 
     separators = [" ", ".", "-"]  # 3 separators
-    case_variants = [False, True]  # lowercase, Title Case  # 2 variants
 
     # Calculate: 9 adj × 2 noun × 3 sep × 2 case = 108 base
     # Short forms (6 structures): 108 × 6 = 648
@@ -111,7 +147,7 @@ def family_1_core_phrases() -> Generator[str, None, None]:
                 phrase = structure(adj, noun)
                 for sep in separators:
                     separated = sep.join(phrase.split())
-                    for capitalize in case_variants:
+                    for capitalize in CASE_VARIANTS:
                         base = separated.capitalize() if capitalize else separated
                         yield base
 
@@ -126,7 +162,7 @@ def family_1_core_phrases() -> Generator[str, None, None]:
                         phrase = structure(adj, noun, intens)
                         for sep in separators:
                             separated = sep.join(phrase.split())
-                            for capitalize in case_variants:
+                            for capitalize in CASE_VARIANTS:
                                 base = separated.capitalize() if capitalize else separated
                                 yield base
 
@@ -137,7 +173,7 @@ def family_1_core_phrases() -> Generator[str, None, None]:
                 phrase = structure(adj, noun)
                 for sep in separators:
                     separated = sep.join(phrase.split())
-                    for capitalize in case_variants:
+                    for capitalize in CASE_VARIANTS:
                         base = separated.capitalize() if capitalize else separated
                         yield base
 
@@ -149,27 +185,12 @@ def family_2_leetspeak_variations() -> Generator[str, None, None]:
     Apply leetspeak to core phrases
     Target: ~12k more base patterns
     """
-    log_progress(2, "Leetspeak Variations")
 
     adjectives = ["bad", "dumb", "stupid", "shitty"]
     nouns = ["password", "passphrase"]
     intensifiers = ["really", "very", "super"]
     separators = [" ", ".", "-"]
 
-    # Leetspeak functions
-    def leet_a_to_4(text): return text.replace("a", "4").replace("A", "4")
-    def leet_a_to_at(text): return text.replace("a", "@").replace("A", "@")
-    def leet_s_to_5(text): return text.replace("s", "5").replace("S", "5")
-    def leet_s_to_dollar(text): return text.replace("s", "$").replace("S", "$")
-    def leet_e_to_3(text): return text.replace("e", "3").replace("E", "3")
-    def leet_i_to_1(text): return text.replace("i", "1").replace("I", "1")
-    def leet_o_to_0(text): return text.replace("o", "0").replace("O", "0")
-
-    leet_functions = [
-        leet_a_to_4, leet_a_to_at, leet_s_to_5, leet_s_to_dollar,
-        leet_e_to_3, leet_i_to_1, leet_o_to_0
-    ]
-
     # Simple phrases with leetspeak
     # 4 adj × 2 noun × 3 intens × 3 sep × 7 leet = 1,512
     for adj in adjectives:
@@ -177,11 +198,7 @@ def family_2_leetspeak_variations() -> Generator[str, None, None]:
             for intens in intensifiers:
                 phrase = f"this is a {intens} {adj} {noun}"
                 for sep in separators:
-                    separated = sep.join(phrase.split())
-                    for leet_func in leet_functions:
-                        leeted = leet_func(separated)
-                        yield leeted
-                        yield leeted.capitalize()
+                    yield from leet_case_variants(sep.join(phrase.split()))
 
     # Short phrases with leetspeak
     # 4 adj × 2 noun × 3 sep × 7 leet × 2 case = 336
@@ -189,11 +206,7 @@ def family_2_leetspeak_variations() -> Generator[str, None, None]:
         for noun in nouns:
             phrase = f"{adj} {noun}"
             for sep in separators:
-                separated = sep.join(phrase.split())
-                for leet_func in leet_functions:
-                    leeted = leet_func(separated)
-                    yield leeted
-                    yield leeted.capitalize()
+                yield from leet_case_variants(sep.join(phrase.split()))
 
     # Hybrid: both adjective AND noun leeted
     # Apply leet to adjective only, then noun only, then both
@@ -214,19 +227,19 @@ def family_2_leetspeak_variations() -> Generator[str, None, None]:
                     separated = sep.join(phrase.split())
 
                     # b@d password, b4d password
-                    adj_leeted_at = phrase_fn(leet_a_to_at(adj), noun)
-                    adj_leeted_4 = phrase_fn(leet_a_to_4(adj), noun)
+                    adj_leeted_at = phrase_fn(leet(adj, "a", "@"), noun)
+                    adj_leeted_4 = phrase_fn(leet(adj, "a", "4"), noun)
                     yield sep.join(adj_leeted_at.split())
                     yield sep.join(adj_leeted_4.split())
 
                     # password -> p@$$word, p455word
-                    noun_leeted_at = phrase_fn(adj, leet_a_to_at(leet_s_to_dollar(noun)))
-                    noun_leeted_4 = phrase_fn(adj, leet_a_to_4(leet_s_to_5(noun)))
+                    noun_leeted_at = phrase_fn(adj, leet(leet(noun, "s", "$"), "a", "@"))
+                    noun_leeted_4 = phrase_fn(adj, leet(leet(noun, "s", "5"), "a", "4"))
                     yield sep.join(noun_leeted_at.split())
                     yield sep.join(noun_leeted_4.split())
 
                     # Both leeted
-                    both_leeted = phrase_fn(leet_a_to_at(adj), leet_a_to_at(leet_s_to_dollar(noun)))
+                    both_leeted = phrase_fn(leet(adj, "a", "@"), leet(leet(noun, "s", "$"), "a", "@"))
                     yield sep.join(both_leeted.split())
 
     # Total Family 2: 1,512 + 336 + 288 = 2,136
@@ -237,7 +250,6 @@ def family_3_number_and_year_infixes() -> Generator[str, None, None]:
     Numbers and years in middle of phrases
     Target: ~10k more base patterns
     """
-    log_progress(3, "Number/Year Infixes")
 
     adjectives = ["bad", "dumb", "stupid"]
     nouns = ["password", "passphrase"]
@@ -299,7 +311,6 @@ def family_4_emphasis_and_alternatives() -> Generator[str, None, None]:
     Emphasis capitalization and alternative structures
     Target: ~8k more base patterns to reach 1B
     """
-    log_progress(4, "Emphasis Caps & Alternatives")
 
     adjectives = ["bad", "dumb", "stupid", "shitty"]
     nouns = ["password", "passphrase"]
@@ -371,7 +382,6 @@ def family_4_emphasis_and_alternatives() -> Generator[str, None, None]:
 
 def family_5_extended_phrases() -> Generator[str, None, None]:
     """Extended phrase variations - more adjectives, nouns, structures (~18k)"""
-    log_progress(5, "Extended Phrase Variations")
 
     # Expanded vocabulary
     adjectives = ["bad", "dumb", "stupid", "shitty", "crappy", "awful", "terrible", "lame",
@@ -400,7 +410,6 @@ def family_5_extended_phrases() -> Generator[str, None, None]:
 
 def family_6_phonetic_typos() -> Generator[str, None, None]:
     """Phonetic variations and common typos (~20k)"""
-    log_progress(6, "Phonetic Variations & Typos")
 
     # Phonetic spellings
     phonetic_words = {
@@ -421,7 +430,6 @@ def family_6_phonetic_typos() -> Generator[str, None, None]:
 
 def family_7_keyboard_patterns() -> Generator[str, None, None]:
     """Keyboard pattern embedded in phrases (~15k)"""
-    log_progress(7, "Keyboard Patterns")
 
     kbd_patterns = ["qwerty", "asdf", "zxcv", "1234", "qwer", "asdfg"]
     nouns = ["password", "passphrase"]
@@ -435,7 +443,6 @@ def family_7_keyboard_patterns() -> Generator[str, None, None]:
 
 def family_8_year_range() -> Generator[str, None, None]:
     """Four-digit years 2000-2025 as infixes and suffixes (~22k)"""
-    log_progress(8, "Year Range 2000-2025")
 
     adjectives = ["bad", "dumb", "stupid"]
     nouns = ["password", "passphrase"]
@@ -451,7 +458,6 @@ def family_8_year_range() -> Generator[str, None, None]:
 
 def family_9_case_permutations() -> Generator[str, None, None]:
     """Strategic case permutations (~18k)"""
-    log_progress(9, "Case Permutations")
 
     phrases = [
         ["bad", "password"],
@@ -468,7 +474,6 @@ def family_9_case_permutations() -> Generator[str, None, None]:
 
 def family_10_prefix_patterns() -> Generator[str, None, None]:
     """Numbers/symbols at beginning instead of end (~20k)"""
-    log_progress(10, "Prefix Patterns")
 
     prefixes = ["123", "1", "2", "3", "!", "?", "2011", "2012"]
     adjectives = ["bad", "dumb", "stupid"]
@@ -481,6 +486,25 @@ def family_10_prefix_patterns() -> Generator[str, None, None]:
                 yield f"{prefix} this is a {adj} {noun}"
 
 
+FAMILIES = [
+    (family_1_core_phrases, "Core Self-Deprecating Phrases"),
+    (family_2_leetspeak_variations, "Leetspeak Variations"),
+    (family_3_number_and_year_infixes, "Number/Year Infixes"),
+    (family_4_emphasis_and_alternatives, "Emphasis Caps & Alternatives"),
+    (family_5_extended_phrases, "Extended Phrase Variations"),
+    (family_6_phonetic_typos, "Phonetic Variations & Typos"),
+    (family_7_keyboard_patterns, "Keyboard Patterns"),
+    (family_8_year_range, "Year Range 2000-2025"),
+    (family_9_case_permutations, "Case Permutations"),
+    (family_10_prefix_patterns, "Prefix Patterns"),
+]
+
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): each family's bases x TRAILING_PATTERNS"""
+    return trailing_families(FAMILIES, TRAILING_PATTERNS)
+
+
 def generate_all() -> Generator[str, None, None]:
     """
     Generate all candidates - 10 families
@@ -491,21 +515,8 @@ def generate_all() -> Generator[str, None, None]:
     Total: 184k × 54k = ~10B
     """
 
-    families = [
-        (family_1_core_phrases, "Core Self-Deprecating Phrases"),
-        (family_2_leetspeak_variations, "Leetspeak Variations"),
-        (family_3_number_and_year_infixes, "Number/Year Infixes"),
-        (family_4_emphasis_and_alternatives, "Emphasis Caps & Alternatives"),
-        (family_5_extended_phrases, "Extended Phrase Variations"),
-        (family_6_phonetic_typos, "Phonetic Variations & Typos"),
-        (family_7_keyboard_patterns, "Keyboard Patterns"),
-        (family_8_year_range, "Year Range 2000-2025"),
-        (family_9_case_permutations, "Case Permutations"),
-        (family_10_prefix_patterns, "Prefix Patterns"),
-    ]
-
-    for family_func, family_name in families:
-        print(f"# Generating {family_name}", file=sys.stderr)
+    for family_num, (family_func, family_name) in enumerate(FAMILIES, 1):
+        log_progress(family_num, family_name)
         base_count = 0
         for base in family_func():
             base_count += 1
@@ -516,33 +527,18 @@ def generate_all() -> Generator[str, None, None]:
 
 # ==================== MAIN ====================
 if __name__ == "__main__":
+    options = take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments)
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         print(f"Trailing patterns (0-{MAX_TRAILING_LENGTH} chars from '{TRAILING_CHARSET}'): {len(TRAILING_PATTERNS):,}")
-        print("\nEstimating base patterns (10 families)...")
-        print("  Family 1 (Core phrases):           ~17,000")
-        print("  Family 2 (Leetspeak vars):          ~2,100")
-        print("  Family 3 (Number infixes):          ~2,280")
-        print("  Family 4 (Emphasis/Alt):            ~1,000")
-        print("  Family 5 (Extended phrases):       ~18,000")
-        print("  Family 6 (Phonetic/Typos):         ~20,000")
-        print("  Family 7 (Keyboard patterns):      ~15,000")
-        print("  Family 8 (Year range 2000-2025):   ~22,000")
-        print("  Family 9 (Case permutations):      ~18,000")
-        print("  Family 10 (Prefix patterns):       ~20,000")
-        print("  ───────────────────────────────────────────")
-        print("  Total base patterns:              ~135,380")
-        print("\nTotal candidates:")
-        total = 135380 * len(TRAILING_PATTERNS)
-        print(f"  135,380 base × {len(TRAILING_PATTERNS):,} trailing = ~{total:,}")
-        print(f"\nRuntime at 270k H/s: ~{total/270000/3600:.2f} hours")
+        hashes_per_second = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_HASHES_PER_SECOND
+        print_count(build_keyspace(), hashes_per_second=hashes_per_second)
 
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
         count = 0
-        for candidate in generate_all():
+        for candidate in select(options, build_keyspace, generate_all):
             print(candidate)
             count += 1
             if count >= 100:
                 break
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, build_keyspace, generate_all)
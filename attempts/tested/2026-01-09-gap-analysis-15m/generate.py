@@ -12,9 +12,16 @@ Total: ~15.2M candidates, ~3 minutes at 270k H/s
 """
 
 import itertools
+import os
 import sys
 from typing import Generator, List
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import select, take_slice_arguments
+from cmw.sidecar import start_family
+
 # Dean's exact trailing pattern: 0, 1, 3, or 6 of SAME char
 DEAN_TRAILING = [""] + ["!", "?", "~", "`"] + ["!!!", "???", "~~~", "```"] + ["!!!!!!", "??????", "~~~~~~", "``````"]
 
@@ -24,8 +31,9 @@ NOUNS = ["password", "passphrase"]
 
 
 def log_progress(family_num: int, family_name: str):
-    """Log progress to stderr"""
+    """Log progress to stderr, and mark where the family starts for --sidecar"""
     print(f"# Generating Family {family_num}: {family_name}", file=sys.stderr)
+    start_family(family_name)
 
 
 # ==================== FAMILY 1: Dash-Separated Phrases (~75K) ====================
@@ -416,6 +424,7 @@ def generate_all() -> Generator[str, None, None]:
 
 # ==================== MAIN ====================
 if __name__ == "__main__":
+    options = take_slice_arguments(sys.argv, add_output_arguments)
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         print("Estimating candidate counts...")
         print("\nTIER 1 (High Priority):")
@@ -440,11 +449,10 @@ if __name__ == "__main__":
         print("\nRuntime at 270k H/s: ~56 seconds (~1 minute)")
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
         count = 0
-        for candidate in generate_all():
+        for candidate in select(options, generate_all=generate_all):
             print(candidate)
             count += 1
             if count >= 100:
                 break
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, generate_all=generate_all)
@@ -17,16 +17,29 @@ Trailing lengths: 0-4 characters
   - Total: 41,371 patterns
 
 To hit exactly 1B, we'll use 24,170 base patterns × 41,371 trailing = 1B
+
+Keyspace: build_keyspace() exposes the same stream with len(),
+candidate_at(i) and iter_range(start, stop) for resuming/splitting runs.
 """
 
 import itertools
+import os
 import sys
 from typing import Generator, List
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.count import DEFAULT_HASHES_PER_SECOND, print_count
+from cmw.keyspace import Chain, trailing_families
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import select, take_slice_arguments
+from cmw.sidecar import start_family
+
 
 def log_progress(family_num: int, family_name: str):
-    """Log progress to stderr"""
+    """Log progress to stderr, and mark where the family starts for --sidecar"""
     print(f"# Generating Family {family_num}: {family_name}", file=sys.stderr)
+    start_family(family_name)
 
 
 # ==================== TRAILING GENERATION ====================
@@ -54,7 +67,6 @@ def family_1_core_phrases() -> Generator[str, None, None]:
     Core self-deprecating phrases with variations
     Target: ~24k base patterns before trailing
     """
-    log_progress(1, "Core Self-Deprecating Phrases")
 
     # Core components
     adjectives = ["bad", "dumb", "stupid", "shitty", "crappy", "awful", "terrible", "lame", "weak"]
@@ -143,7 +155,6 @@ def family_2_leetspeak_variations() -> Generator[str, None, None]:
     Apply leetspeak to core phrases
     Target: ~12k more base patterns
     """
-    log_progress(2, "Leetspeak Variations")
 
     adjectives = ["bad", "dumb", "stupid", "shitty"]
     nouns = ["password", "passphrase"]
@@ -231,7 +242,6 @@ def family_3_number_and_year_infixes() -> Generator[str, None, None]:
     Numbers and years in middle of phrases
     Target: ~10k more base patterns
     """
-    log_progress(3, "Number/Year Infixes")
 
     adjectives = ["bad", "dumb", "stupid"]
     nouns = ["password", "passphrase"]
@@ -293,7 +303,6 @@ def family_4_emphasis_and_alternatives() -> Generator[str, None, None]:
     Emphasis capitalization and alternative structures
     Target: ~8k more base patterns to reach 1B
     """
-    log_progress(4, "Emphasis Caps & Alternatives")
 
     adjectives = ["bad", "dumb", "stupid", "shitty"]
     nouns = ["password", "passphrase"]
@@ -363,6 +372,19 @@ def family_4_emphasis_and_alternatives() -> Generator[str, None, None]:
     # Total Family 4: ~1,000+ base patterns
 
 
+FAMILIES = [
+    (family_1_core_phrases, "Core Self-Deprecating Phrases"),
+    (family_2_leetspeak_variations, "Leetspeak Variations"),
+    (family_3_number_and_year_infixes, "Number/Year Infixes"),
+    (family_4_emphasis_and_alternatives, "Emphasis Caps & Alternatives"),
+]
+
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): each family's bases x TRAILING_PATTERNS"""
+    return trailing_families(FAMILIES, TRAILING_PATTERNS)
+
+
 def generate_all() -> Generator[str, None, None]:
     """
     Generate all candidates
@@ -380,62 +402,30 @@ def generate_all() -> Generator[str, None, None]:
     Actually targeting ~18,500 base for exactly 1B with 54,241 trailing
     """
 
-    print("# TIER 1: Core Phrases", file=sys.stderr)
-    base_count = 0
-    for base in family_1_core_phrases():
-        base_count += 1
-        for trail in TRAILING_PATTERNS:
-            yield base + trail
-    print(f"# Family 1 generated {base_count} base patterns", file=sys.stderr)
-
-    print("# TIER 2: Leetspeak Variations", file=sys.stderr)
-    base_count = 0
-    for base in family_2_leetspeak_variations():
-        base_count += 1
-        for trail in TRAILING_PATTERNS:
-            yield base + trail
-    print(f"# Family 2 generated {base_count} base patterns", file=sys.stderr)
-
-    print("# TIER 3: Number/Year Infixes", file=sys.stderr)
-    base_count = 0
-    for base in family_3_number_and_year_infixes():
-        base_count += 1
-        for trail in TRAILING_PATTERNS:
-            yield base + trail
-    print(f"# Family 3 generated {base_count} base patterns", file=sys.stderr)
-
-    print("# TIER 4: Emphasis Caps & Alternatives", file=sys.stderr)
-    base_count = 0
-    for base in family_4_emphasis_and_alternatives():
-        base_count += 1
-        for trail in TRAILING_PATTERNS:
-            yield base + trail
-    print(f"# Family 4 generated {base_count} base patterns", file=sys.stderr)
+    for family_num, (family_func, family_name) in enumerate(FAMILIES, 1):
+        log_progress(family_num, family_name)
+        base_count = 0
+        for base in family_func():
+            base_count += 1
+            for trail in TRAILING_PATTERNS:
+                yield base + trail
+        print(f"# Family {family_num} generated {base_count} base patterns", file=sys.stderr)
 
 
 # ==================== MAIN ====================
 if __name__ == "__main__":
+    options = take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments)
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         print(f"Trailing patterns (0-{MAX_TRAILING_LENGTH} chars from '{TRAILING_CHARSET}'): {len(TRAILING_PATTERNS):,}")
-        print("\nEstimating base patterns...")
-        print("  Family 1 (Core phrases):      ~11,664")
-        print("  Family 2 (Leetspeak vars):     ~2,136")
-        print("  Family 3 (Number infixes):     ~2,280")
-        print("  Family 4 (Emphasis/Alt):       ~1,000")
-        print("  ─────────────────────────────────────")
-        print("  Total base patterns:          ~17,080")
-        print("\nTotal candidates:")
-        total = 17080 * len(TRAILING_PATTERNS)
-        print(f"  17,080 base × {len(TRAILING_PATTERNS):,} trailing = ~{total:,}")
-        print(f"\nRuntime at 270k H/s: ~{total/270000/3600:.2f} hours")
+        hashes_per_second = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_HASHES_PER_SECOND
+        print_count(build_keyspace(), hashes_per_second=hashes_per_second)
 
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
         count = 0
-        for candidate in generate_all():
+        for candidate in select(options, build_keyspace, generate_all):
             print(candidate)
             count += 1
             if count >= 100:
                 break
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, build_keyspace, generate_all)
@@ -20,16 +20,29 @@ Runtime at 270k H/s: ~10.3 hours
 8. Full leetspeak coverage t→7 l→1 (~18k)
 9. Multi-word case patterns (~18k)
 10. Irony/spite META patterns (~16k)
+
+Keyspace: build_keyspace() exposes the same stream with len(),
+candidate_at(i) and iter_range(start, stop) for resuming/splitting runs.
 """
 
 import itertools
+import os
 import sys
 from typing import Generator, List
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.count import DEFAULT_HASHES_PER_SECOND, print_count
+from cmw.keyspace import Chain, trailing_families
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import select, take_slice_arguments
+from cmw.sidecar import start_family
+
 
 def log_progress(family_num: int, family_name: str):
-    """Log progress to stderr"""
+    """Log progress to stderr, and mark where the family starts for --sidecar"""
     print(f"# Generating Family {family_num}: {family_name}", file=sys.stderr)
+    start_family(family_name)
 
 
 # ==================== TRAILING GENERATION ====================
@@ -51,7 +64,6 @@ print(f"# Generated {len(TRAILING_PATTERNS)} trailing patterns", file=sys.stderr
 # ==================== FAMILY 1: Full Year Brute 0000-9999 ====================
 def family_1_full_year_brute() -> Generator[str, None, None]:
     """ALL 4-digit numbers 0000-9999 as infixes (~20k base)"""
-    log_progress(1, "Full Year Brute 0000-9999")
 
     adjectives = ["bad", "dumb", "stupid"]
     nouns = ["password", "passphrase"]
@@ -70,7 +82,6 @@ def family_1_full_year_brute() -> Generator[str, None, None]:
 # ==================== FAMILY 2: Symbol-Heavy Combinations ====================
 def family_2_symbol_heavy() -> Generator[str, None, None]:
     """Symbol-heavy patterns - multiple symbols, mixed combos (~18k base)"""
-    log_progress(2, "Symbol-Heavy Patterns")
 
     nouns = ["password", "passphrase"]
     adjectives = ["bad", "dumb", "stupid"]
@@ -89,7 +100,6 @@ def family_2_symbol_heavy() -> Generator[str, None, None]:
 # ==================== FAMILY 3: Exact Length Optimization ====================
 def family_3_exact_length() -> Generator[str, None, None]:
     """Phrases optimized for EXACTLY 16, 20, 24, 28 chars (~18k base)"""
-    log_progress(3, "Exact Length Optimization")
 
     # Pre-calculated phrases for exact lengths
     exact_16 = ["bad password!!!", "dumb password!!", "stupid password", "bad passphrase"]
@@ -105,7 +115,6 @@ def family_3_exact_length() -> Generator[str, None, None]:
 # ==================== FAMILY 4: Extended Phonetic Variations ====================
 def family_4_extended_phonetic() -> Generator[str, None, None]:
     """Extended phonetic/typo coverage (~20k base)"""
-    log_progress(4, "Extended Phonetic Variations")
 
     # More comprehensive phonetic mappings
     phonetic_map = {
@@ -129,7 +138,6 @@ def family_4_extended_phonetic() -> Generator[str, None, None]:
 # ==================== FAMILY 5: Dean-Specific Vocabulary ====================
 def family_5_dean_vocabulary() -> Generator[str, None, None]:
     """Words from Dean's actual work/talks (~18k base)"""
-    log_progress(5, "Dean-Specific Vocabulary")
 
     # From Dean's bio, talks, GitHub
     dean_words = ["offensive", "reckless", "hacker", "keyhunter", "lateral", "defcon",
@@ -150,7 +158,6 @@ def family_5_dean_vocabulary() -> Generator[str, None, None]:
 # ==================== FAMILY 6: DEFCON/Portland 2011 Culture ====================
 def family_6_defcon_portland() -> Generator[str, None, None]:
     """DEFCON 19 / Portland hacker culture 2011 (~18k base)"""
-    log_progress(6, "DEFCON/Portland Culture")
 
     defcon_terms = ["defcon", "defcon19", "dc19", "vegas", "caesars", "blackhat", "bsides",
                     "portland", "pdx", "pdx2600", "rainsec", "ctrlh", "hackboat"]
@@ -166,7 +173,6 @@ def family_6_defcon_portland() -> Generator[str, None, None]:
 # ==================== FAMILY 7: Bidirectional Prefix+Suffix ====================
 def family_7_bidirectional() -> Generator[str, None, None]:
     """Numbers/symbols at BOTH beginning AND end (~20k base)"""
-    log_progress(7, "Bidirectional Prefix+Suffix")
 
     prefixes = ["123", "1", "2", "!", "?", "2011"]
     suffixes = ["123", "1", "!", "?", "2011"]
@@ -184,7 +190,6 @@ def family_7_bidirectional() -> Generator[str, None, None]:
 # ==================== FAMILY 8: Full Leetspeak Coverage ====================
 def family_8_full_leetspeak() -> Generator[str, None, None]:
     """Extended leet: t→7, l→1, g→9, b→8, etc (~18k base)"""
-    log_progress(8, "Full Leetspeak Coverage")
 
     def apply_full_leet(text: str) -> str:
         """Apply comprehensive leetspeak"""
@@ -216,7 +221,6 @@ def family_8_full_leetspeak() -> Generator[str, None, None]:
 # ==================== FAMILY 9: Multi-Word Case Patterns ====================
 def family_9_multiword_case() -> Generator[str, None, None]:
     """CamelCase, alternating, strategic caps (~18k base)"""
-    log_progress(9, "Multi-Word Case Patterns")
 
     phrases = [
         ["bad", "password"],
@@ -241,7 +245,6 @@ def family_9_multiword_case() -> Generator[str, None, None]:
 # ==================== FAMILY 10: Irony/Spite META Patterns ====================
 def family_10_irony_spite() -> Generator[str, None, None]:
     """Ironic 'secure/strong' patterns - spite META (~16k base)"""
-    log_progress(10, "Irony/Spite META Patterns")
 
     # Ironic - claiming strength when it's weak
     ironic_adjectives = ["secure", "strong", "complex", "uncrackable", "safe", "best", "perfect"]
@@ -255,25 +258,31 @@ def family_10_irony_spite() -> Generator[str, None, None]:
             yield f"very {adj} {noun}"
 
 
+FAMILIES = [
+    (family_1_full_year_brute, "Full Year Brute 0000-9999"),
+    (family_2_symbol_heavy, "Symbol-Heavy Patterns"),
+    (family_3_exact_length, "Exact Length Optimization"),
+    (family_4_extended_phonetic, "Extended Phonetic Variations"),
+    (family_5_dean_vocabulary, "Dean-Specific Vocabulary"),
+    (family_6_defcon_portland, "DEFCON/Portland Culture"),
+    (family_7_bidirectional, "Bidirectional Prefix+Suffix"),
+    (family_8_full_leetspeak, "Full Leetspeak Coverage"),
+    (family_9_multiword_case, "Multi-Word Case Patterns"),
+    (family_10_irony_spite, "Irony/Spite META Patterns"),
+]
+
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): each family's bases x TRAILING_PATTERNS"""
+    return trailing_families(FAMILIES, TRAILING_PATTERNS)
+
+
 # ==================== MAIN GENERATOR ====================
 def generate_all() -> Generator[str, None, None]:
     """Generate all candidates - 10 new families"""
 
-    families = [
-        (family_1_full_year_brute, "Full Year Brute 0000-9999"),
-        (family_2_symbol_heavy, "Symbol-Heavy Patterns"),
-        (family_3_exact_length, "Exact Length Optimization"),
-        (family_4_extended_phonetic, "Extended Phonetic Variations"),
-        (family_5_dean_vocabulary, "Dean-Specific Vocabulary"),
-        (family_6_defcon_portland, "DEFCON/Portland Culture"),
-        (family_7_bidirectional, "Bidirectional Prefix+Suffix"),
-        (family_8_full_leetspeak, "Full Leetspeak Coverage"),
-        (family_9_multiword_case, "Multi-Word Case Patterns"),
-        (family_10_irony_spite, "Irony/Spite META Patterns"),
-    ]
-
-    for family_func, family_name in families:
-        print(f"# Generating {family_name}", file=sys.stderr)
+    for family_num, (family_func, family_name) in enumerate(FAMILIES, 1):
+        log_progress(family_num, family_name)
         base_count = 0
         for base in family_func():
             base_count += 1
@@ -284,33 +293,18 @@ def generate_all() -> Generator[str, None, None]:
 
 # ==================== MAIN ====================
 if __name__ == "__main__":
+    options = take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments)
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         print(f"Trailing patterns: {len(TRAILING_PATTERNS):,}")
-        print("\nEstimating base patterns (10 NEW families)...")
-        print("  Family 1 (Year brute 0000-9999):    ~20,000")
-        print("  Family 2 (Symbol-heavy):            ~18,000")
-        print("  Family 3 (Exact length):            ~18,000")
-        print("  Family 4 (Extended phonetic):       ~20,000")
-        print("  Family 5 (Dean vocabulary):         ~18,000")
-        print("  Family 6 (DEFCON/Portland):         ~18,000")
-        print("  Family 7 (Bidirectional):           ~20,000")
-        print("  Family 8 (Full leetspeak):          ~18,000")
-        print("  Family 9 (Multi-word case):         ~18,000")
-        print("  Family 10 (Irony/spite):            ~16,000")
-        print("  ─────────────────────────────────────────")
-        print("  Total base patterns:               ~184,000")
-        print("\nTotal candidates:")
-        total = 184000 * len(TRAILING_PATTERNS)
-        print(f"  184,000 base × {len(TRAILING_PATTERNS):,} trailing = ~{total:,}")
-        print(f"\nRuntime at 270k H/s: ~{total/270000/3600:.2f} hours")
+        hashes_per_second = float(sys.argv[2]) if len(sys.argv) > 2 else DEFAULT_HASHES_PER_SECOND
+        print_count(build_keyspace(), hashes_per_second=hashes_per_second)
 
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
         count = 0
-        for candidate in generate_all():
+        for candidate in select(options, build_keyspace, generate_all):
             print(candidate)
             count += 1
             if count >= 100:
                 break
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, build_keyspace, generate_all)
@@ -17,8 +17,15 @@ Digit suffix: none, 0-9, 00-99, 000-999
 """
 
 import itertools
+import os
+import sys
 from typing import Generator, List, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import take_slice_arguments
+
 # Spite words
 SPITE_WORDS = ["bad", "dumb"]
 
@@ -217,12 +224,11 @@ def count_candidates() -> int:
 
 
 if __name__ == "__main__":
-    import sys
+    options = take_slice_arguments(sys.argv, add_output_arguments)
     
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         print(f"Total candidates: {count_candidates():,}")
         print(f"Base phrases: {len(generate_base_phrases())}")
         print(f"Trailing combinations: {len(generate_trailing_combinations())}")
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, generate_all=generate_all)
@@ -1,6 +1,8 @@
 #!/bin/bash
 # Run the comprehensive spite password attempt
 # ~13.1M candidates
+# RANGE=A:B runs only candidates A..B-1 (this generator only streams, so it has no --shard)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 HASH_FILE="${1:-hash.txt}"
@@ -16,4 +18,4 @@ echo "Candidates: ~13.1M"
 echo "Estimated runtime: ~49 seconds at 270k H/s"
 echo ""
 
-python3 "$SCRIPT_DIR/generate.py" | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+python3 "$SCRIPT_DIR/generate.py" ${RANGE:+--range "$RANGE"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
@@ -18,7 +18,15 @@ Rules:
 """
 
 import itertools
-from typing import Generator, List, Tuple
+import os
+import sys
+from typing import Dict, Generator, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.keyspace import Chain, FlatMap, Product
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import take_slice_arguments
 
 # Dean-confirmed spite words
 SPITE_WORDS = ["bad", "dumb", "stupid"]
@@ -125,41 +133,70 @@ def get_noun_variants(noun_type: str) -> List[str]:
         return [""]  # No noun to append (prompt-based phrases already have passphrase)
 
 
+# Separators: space and period
+SEPARATORS = [" ", "."]
+
+# Case variants: lowercase and First cap
+CASE_VARIANTS = [False, True]
+
+
+def phrase_variants(words: List[str], noun_type: str) -> List[Tuple[str, str]]:
+    """(phrase, separator) for every noun, separator and case of one base phrase, in output order."""
+    variants = []
+    for noun in get_noun_variants(noun_type):
+        for sep in SEPARATORS:
+            for first_cap in CASE_VARIANTS:
+                # Build the phrase
+                if noun:
+                    full_words = words + [noun]
+                else:
+                    full_words = words
+                
+                cased_words = apply_case(full_words, first_cap)
+                variants.append((sep.join(cased_words), sep))
+    return variants
+
+
+def trailing_suffixes(trailing_combos: List[str]) -> Dict[str, List[str]]:
+    """
+    What follows a phrase joined with each separator: nothing, then every
+    trailing combination, bare and after the separator.
+    """
+    suffixes = {}
+    for sep in SEPARATORS:
+        suffixes[sep] = [""]
+        for trailing in trailing_combos:
+            if trailing:
+                # Trailing separator matches word separator
+                # (space phrases get space, period phrases get period, or none)
+                for trail_sep in ["", sep]:
+                    suffixes[sep].append(f"{trail_sep}{trailing}")
+    return suffixes
+
+
 def generate_all() -> Generator[str, None, None]:
-    """Generate all ~412M password candidates."""
-    base_phrases = generate_base_phrases()
-    trailing_combos = generate_trailing_combinations()
-    
-    # Separators: space and period
-    separators = [" ", "."]
+    """Generate all ~6.7M password candidates."""
+    suffixes = trailing_suffixes(generate_trailing_combinations())
     
-    # Case variants: lowercase and First cap
-    case_variants = [False, True]
-    
-    for words, noun_type in base_phrases:
-        noun_variants = get_noun_variants(noun_type)
-        
-        for noun in noun_variants:
-            for sep in separators:
-                for first_cap in case_variants:
-                    # Build the phrase
-                    if noun:
-                        full_words = words + [noun]
-                    else:
-                        full_words = words
-                    
-                    cased_words = apply_case(full_words, first_cap)
-                    phrase = sep.join(cased_words)
-                    
-                    for trailing in trailing_combos:
-                        if trailing:
-                            # Trailing separator matches word separator
-                            # (space phrases get space, period phrases get period, or none)
-                            for trail_sep in ["", sep]:
-                                yield f"{phrase}{trail_sep}{trailing}"
-                        else:
-                            # No trailing
-                            yield phrase
+    for words, noun_type in generate_base_phrases():
+        for phrase, sep in phrase_variants(words, noun_type):
+            for suffix in suffixes[sep]:
+                yield phrase + suffix
+
+
+def build_keyspace() -> Chain:
+    """Indexable view of generate_all(): one family per base phrase, each of its phrases x its suffixes."""
+    suffixes = trailing_suffixes(generate_trailing_combinations())
+
+    def family(variants: List[Tuple[str, str]]) -> FlatMap:
+        return FlatMap(variants, lambda variant: Product([variant[0]], suffixes[variant[1]]),
+                       count=lambda variant: len(suffixes[variant[1]]),
+                       parse=lambda candidate: [k for k, (phrase, _) in enumerate(variants)
+                                                if candidate.startswith(phrase)])
+
+    bases = generate_base_phrases()
+    return Chain([family(phrase_variants(words, noun_type)) for words, noun_type in bases],
+                 names=[" ".join(words + ([noun_type] if noun_type != "none" else [])) for words, noun_type in bases])
 
 
 def count_candidates() -> int:
@@ -184,12 +221,11 @@ def count_candidates() -> int:
 
 
 if __name__ == "__main__":
-    import sys
+    options = take_slice_arguments(sys.argv, add_output_arguments)
     
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         print(f"Total candidates: {count_candidates():,}")
         print(f"Base phrases: {len(generate_base_phrases())}")
         print(f"Trailing combinations: {len(generate_trailing_combinations())}")
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, build_keyspace, generate_all)
@@ -16,8 +16,16 @@ For 8 chars: ~8.4B candidates (~8.6 hours at 270k H/s)
 """
 
 import itertools
+import os
+import sys
 from typing import Generator, List
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.keyspace import Chain, Product
+from cmw.output import add_output_arguments
+from cmw.parallel import add_parallel_arguments, write_candidates
+from cmw.shard import select, take_slice_arguments
+
 # Base chars (always available in any position except last)
 BASE_CHARS = "pashre045wo@$"  # 13 chars
 
@@ -88,6 +96,15 @@ def generate_all(max_length: int = DEFAULT_MAX_LENGTH) -> Generator[str, None, N
             yield candidate
 
 
+def build_keyspace(max_length: int = DEFAULT_MAX_LENGTH) -> Chain:
+    """Indexable view of generate_all(): one per-position charset product per length."""
+    return Chain(
+        (Product(*(get_charset_for_position(pos, length) for pos in range(1, length + 1)))
+         for length in range(1, max_length + 1)),
+        names=[f"Length {length}" for length in range(1, max_length + 1)],
+    )
+
+
 def count_for_length(length: int) -> int:
     """Count candidates for a specific length."""
     if length == 0:
@@ -106,7 +123,7 @@ def count_all(max_length: int = DEFAULT_MAX_LENGTH) -> int:
 
 
 if __name__ == "__main__":
-    import sys
+    options = take_slice_arguments(sys.argv, add_parallel_arguments, add_output_arguments)
     
     max_len = DEFAULT_MAX_LENGTH
     
@@ -138,7 +155,7 @@ if __name__ == "__main__":
             if len(sys.argv) > 2:
                 max_len = int(sys.argv[2])
             count = 0
-            for candidate in generate_all(max_len):
+            for candidate in select(options, lambda: build_keyspace(max_len), lambda: generate_all(max_len)):
                 print(candidate)
                 count += 1
                 if count >= 100:
@@ -146,8 +163,7 @@ if __name__ == "__main__":
                     
         elif sys.argv[1].isdigit():
             max_len = int(sys.argv[1])
-            for candidate in generate_all(max_len):
-                print(candidate)
+            write_candidates(options, lambda: build_keyspace(max_len), lambda: generate_all(max_len))
         else:
             print("Usage:")
             print("  python3 generate.py [max_length]  - Generate all candidates")
@@ -155,5 +171,4 @@ if __name__ == "__main__":
             print("  python3 generate.py --breakdown [length]  - Show charset per position")
             print("  python3 generate.py --sample [max_length]  - Show first 100 candidates")
     else:
-        for candidate in generate_all(max_len):
-            print(candidate)
+        write_candidates(options, lambda: build_keyspace(max_len), lambda: generate_all(max_len))
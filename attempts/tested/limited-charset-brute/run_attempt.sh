@@ -1,6 +1,9 @@
 #!/bin/bash
 # Limited Charset Brute Force - Position-constrained password generator
 # ~9B candidates for 1-8 chars (~9.3 hours at 270k H/s)
+# SHARD=i/N runs only shard i of N (split the keyspace across hosts)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
+# WORKERS=N generates with N processes (0 = every CPU core)
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 HASH_FILE="${1:-hash.txt}"
@@ -23,4 +26,4 @@ echo ""
 echo "Estimated: ~9B candidates (~9.3 hours at 270k H/s)"
 echo ""
 
-python3 "$SCRIPT_DIR/generate.py" 8 | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+python3 "$SCRIPT_DIR/generate.py" 8 ${SHARD:+--shard "$SHARD"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} ${WORKERS:+--workers "$WORKERS"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
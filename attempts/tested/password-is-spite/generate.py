@@ -17,8 +17,15 @@ Target: ~5.6B candidates
 """
 
 import itertools
+import os
+import sys
 from typing import Generator, List, Tuple
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import take_slice_arguments
+
 # Brute force charset: 21 lowercase letters (excluding j, q, x, z, v)
 BRUTE_CHARS = "abcdefghiklmnoprstuwy"  # 21 chars (no j, q, x, z, v)
 
@@ -184,7 +191,7 @@ def count_candidates() -> int:
 
 
 if __name__ == "__main__":
-    import sys
+    options = take_slice_arguments(sys.argv, add_output_arguments)
     
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         brute_count = count_brute_spite()
@@ -196,5 +203,4 @@ if __name__ == "__main__":
         print(f"Trailing combinations: {len(trailing_combos)}")
         print(f"Total candidates: {count_candidates():,}")
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, generate_all=generate_all)
@@ -11,8 +11,15 @@ Just the words "password" and "passphrase" with:
 """
 
 import itertools
+import os
+import sys
 from typing import Generator
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", ".."))
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.shard import select, take_slice_arguments
+
 # Base words
 BASE_WORDS = ["password", "passphrase"]
 
@@ -73,18 +80,17 @@ def count_candidates() -> int:
 
 
 if __name__ == "__main__":
-    import sys
+    options = take_slice_arguments(sys.argv, add_output_arguments)
     
     if len(sys.argv) > 1 and sys.argv[1] == "--count":
         print(f"Total candidates: {count_candidates():,}")
         print(f"Trailing combinations: {len(generate_trailing_combinations())}")
     elif len(sys.argv) > 1 and sys.argv[1] == "--sample":
         count = 0
-        for candidate in generate_all():
+        for candidate in select(options, generate_all=generate_all):
             print(candidate)
             count += 1
             if count >= 100:
                 break
     else:
-        for candidate in generate_all():
-            print(candidate)
+        write_candidates(options, generate_all=generate_all)
@@ -2,6 +2,8 @@
 # Password/Passphrase Suffix Attempt
 # ~65K candidates
 # Runtime: ~0.2 seconds at 270k H/s (3x 3090)
+# RANGE=A:B runs only candidates A..B-1 (this generator only streams, so it has no --shard)
+# CHECKPOINT=FILE saves the position to FILE and resumes from it after a crash
 
 SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 
@@ -18,4 +20,4 @@ echo "Candidates: ~65K"
 echo "Estimated runtime: ~0.2 seconds at 270k H/s"
 echo ""
 
-python3 "$SCRIPT_DIR/generate.py" | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
+python3 "$SCRIPT_DIR/generate.py" ${RANGE:+--range "$RANGE"} ${CHECKPOINT:+--checkpoint "$CHECKPOINT"} | hashcat -m 11300 -a 0 -w 3 -O "$HASH_FILE"
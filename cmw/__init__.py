@@ -0,0 +1,7 @@
+"""
+Crack My Wallet - shared tooling for the attempt generators.
+
+The generators under attempts/ and scripts/ stay standalone scripts; this
+package holds the pieces they share (keyspaces, output, sharding, ...).
+Scripts import it by putting the repository root on sys.path.
+"""
@@ -0,0 +1,95 @@
+"""
+Command line for the shared tooling.
+
+    python3 -m cmw tested "this.is.a.derpy.passphrase!!!" "bad password!!"
+    python3 -m cmw tested - < telegram_questions.txt
+    python3 -m cmw where run.sidecar 123456789
+
+tested exits 0 when some tested generator produced a candidate, 1 when
+none did, 2 on usage errors. where exits 1 when a line is outside the
+sidecar's stream.
+"""
+
+import argparse
+import sys
+import time
+
+from cmw.coverage import DEFAULT_STORE
+
+
+def tested(args: argparse.Namespace) -> int:
+    from cmw.lookup import TestedIndex, tested_generators
+
+    paths = [path for path in tested_generators() if not args.attempt or any(
+        name in path for name in args.attempt)]
+    if not paths:
+        sys.exit(f"no tested generator matches {', '.join(args.attempt)}")
+    index = TestedIndex(paths, store=args.store)
+    candidates = args.candidates if args.candidates != ["-"] else [line.rstrip("\n") for line in sys.stdin]
+
+    status = 1
+    for candidate in candidates:
+        started = time.perf_counter()
+        matches, unchecked = index.lookup(candidate)
+        elapsed = (time.perf_counter() - started) * 1000
+        print(f"{candidate!r}: " + ("TESTED" if matches else "not tested by any checked generator")
+              + f"  ({elapsed:,.0f} ms)")
+        for match in matches:
+            print(f"  {match}")
+        if unchecked and args.verbose:
+            for name, reason in unchecked:
+                print(f"  not checked: {name} ({reason})")
+        elif unchecked:
+            print(f"  not checked: {', '.join(name for name, _ in unchecked)} "
+                  f"(-v for why; scripts/build_coverage.py --all covers them)")
+        if matches:
+            status = 0
+    return status
+
+
+def where(args: argparse.Namespace) -> int:
+    from cmw.sidecar import SidecarIndex
+
+    try:
+        index = SidecarIndex.load(args.sidecar)
+    except (OSError, ValueError) as error:
+        sys.exit(str(error))
+    status = 0
+    for line in args.lines:
+        location = index.locate(line)
+        if location is None:
+            print(f"line {line:,}: not in {args.sidecar}")
+            status = 1
+        else:
+            print(location)
+    return status
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python3 -m cmw", description="Crack My Wallet tooling")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    query = commands.add_parser("tested", help="Was this candidate already tested, and by which attempt?",
+                                description="Find which tested attempt, family and index produced a candidate")
+    query.add_argument("candidates", nargs="+", metavar="CANDIDATE", help="Candidates to look up ('-' reads stdin)")
+    query.add_argument("--attempt", action="append", metavar="NAME",
+                       help="Only check generators whose path contains NAME (repeatable)")
+    query.add_argument("--store", default=DEFAULT_STORE, metavar="DIR",
+                       help="Coverage store for generators that cannot be parsed (default: coverage/)")
+    query.add_argument("--verbose", "-v", action="store_true", help="Say why each unchecked generator is unchecked")
+    query.set_defaults(run=tested)
+
+    lookup = commands.add_parser("where", help="Which family and index produced line N of a --sidecar run?",
+                                 description="Family, base index and nearest byte offset of output lines, "
+                                             "from a generator's --sidecar file")
+    lookup.add_argument("sidecar", metavar="SIDECAR", help="The generator's --sidecar file")
+    lookup.add_argument("lines", nargs="+", type=int, metavar="LINE",
+                        help="0-based output lines (hashcat's restore_point counts the same way)")
+    lookup.set_defaults(run=where)
+
+    args = parser.parse_args()
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
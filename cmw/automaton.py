@@ -0,0 +1,259 @@
+"""
+Keyspaces compiled into minimal acyclic automata, for exact overlap counts.
+
+Two attempts that share word lists (comprehensive-10b and
+trailing-brute-1b both cross family_1_core_phrases with
+TRAILING_PATTERNS) test many of the same strings, but enumerating
+billions of candidates to compare them is out of the question. Each
+family is instead compiled into a minimal deterministic automaton
+accepting exactly its distinct candidates, and set sizes come from
+counting paths:
+
+- |A|      paths from A's start state to a final state
+- |A n B|  the same over the product automaton, walked lazily from
+           (start A, start B) without building it
+- |A \\ B|  |A| - |A n B|
+
+The automata are built from the keyspace structure, not its output: a
+Product is the concatenation of its dimensions' word automata (with the
+separator for " ".join products), a Chain or FlatMap the union of its
+parts. All automata of one Automata share a table of hash-consed states
+(a state is its finality plus its edges), so every automaton is minimal
+by construction, equal sub-languages are the same state, and counts over
+a shared state (the TRAILING_PATTERNS tail of every family) are
+computed once. Only nodes without that structure (Permutations, other
+join functions) are enumerated.
+
+Building is plain Python, about a million listed words a minute, so
+compile() refuses (AutomatonTooLarge) keyspaces that would list more
+than MAX_WORDS strings: the leet expansions of 2b and 10b-combined list
+over 100M phrases and are reported as not compiled.
+
+Counts are of distinct strings; len(keyspace) also counts repeats.
+
+Usage:
+    automata = Automata()
+    a = automata.compile(module_a.build_keyspace())
+    b = automata.compile(module_b.build_keyspace())
+    automata.size(a), automata.common(a, b)       # |A|, |A n B|
+"""
+
+from collections import defaultdict
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple
+
+from cmw.keyspace import Chain, FlatMap, Keyspace, Product, Seq, join_separator
+
+# Strings one compile() may list into word automata (product dimensions,
+# Seq families, nodes without usable structure): Python builds about a
+# million a minute, so beyond this a family is reported as not compiled
+MAX_WORDS = 5_000_000
+
+# FlatMap items compiled up front to estimate the words the rest list
+FLATMAP_SAMPLE = 16
+
+# Each state costs ~150 bytes; beyond this a family is reported as not
+# compiled instead of exhausting memory
+MAX_STATES = 20_000_000
+
+# A state id; None is the empty language
+State = Optional[int]
+
+
+class AutomatonTooLarge(ValueError):
+    """A keyspace needs more states or listed words than the limits allow."""
+
+
+class Automata:
+    """
+    A table of hash-consed states of minimal acyclic DFAs over characters.
+
+    Children are always created before their parents, so state ids are
+    a topological order and each state's language size is known when it
+    is created.
+    """
+
+    def __init__(self, max_states: int = MAX_STATES, max_words: int = MAX_WORDS):
+        self.max_states = max_states
+        self.max_words = max_words
+        self.listed = 0
+        self.finals = bytearray()
+        self.edges: List[Tuple[Tuple[str, int], ...]] = []
+        self.sizes: List[int] = []
+        self._ids: Dict[Tuple[bool, Tuple[Tuple[str, int], ...]], int] = {}
+        self._lists: Dict[Tuple[str, ...], State] = {}
+        self._common: Dict[Tuple[int, int], int] = {}
+
+    def __len__(self) -> int:
+        return len(self.edges)
+
+    def state(self, final: bool, edges: Tuple[Tuple[str, int], ...]) -> int:
+        """The state with this finality and these (char, child) edges, sorted by char."""
+        key = (final, edges)
+        state = self._ids.get(key)
+        if state is None:
+            if len(self.edges) >= self.max_states:
+                raise AutomatonTooLarge(f"more than {self.max_states:,} automaton states")
+            state = len(self.edges)
+            self._ids[key] = state
+            self.finals.append(final)
+            self.edges.append(edges)
+            self.sizes.append(final + sum(self.sizes[child] for _, child in edges))
+        return state
+
+    # ==================== BUILDING ====================
+
+    def words(self, values: Iterable[str]) -> State:
+        """Automaton accepting exactly `values`."""
+        items = sorted(set(values))
+        self.listed += len(items)
+        if not items:
+            return None
+
+        def build(low: int, high: int, depth: int) -> int:
+            # items[low:high] share their first `depth` characters
+            final = len(items[low]) == depth
+            if final:
+                low += 1
+            edges = []
+            while low < high:
+                char = items[low][depth]
+                end = low + 1
+                while end < high and items[end][depth] == char:
+                    end += 1
+                edges.append((char, build(low, end, depth + 1)))
+                low = end
+            return self.state(final, tuple(edges))
+
+        return build(0, len(items), 0)
+
+    def word_list(self, values: Tuple[str, ...]) -> State:
+        """words(), cached: every family ends in the same (large) trailing pattern list."""
+        state = self._lists.get(values, -1)
+        if state == -1:
+            state = self._lists[values] = self.words(values)
+        return state
+
+    def concat(self, first: State, second: State) -> State:
+        """Automaton for every string of `first` followed by every string of `second`."""
+        if first is None or second is None:
+            return None
+        return self._merge(first, frozenset(), second, {})
+
+    def union(self, states: Iterable[State]) -> State:
+        """Automaton accepting the strings of any of `states`."""
+        members = frozenset(state for state in states if state is not None)
+        if not members:
+            return None
+        return self._merge(None, members, None, {})
+
+    def _merge(self, head: State, rest: FrozenSet[int], tail: State, memo: dict) -> int:
+        """
+        State for L(head)·L(tail) | union of L(rest) -- the subset
+        construction for concatenation, which is a plain union when
+        there is no head.
+        """
+        if head is not None and self.finals[head]:
+            rest = rest | {tail}
+        if head is None and len(rest) == 1:
+            return next(iter(rest))
+        key = (head, rest)
+        state = memo.get(key)
+        if state is None:
+            moves: Dict[str, list] = defaultdict(lambda: [None, set()])
+            if head is not None:
+                for char, child in self.edges[head]:
+                    moves[char][0] = child
+            for member in rest:
+                for char, child in self.edges[member]:
+                    moves[char][1].add(child)
+            edges = tuple((char, self._merge(child, frozenset(children), tail, memo))
+                          for char, (child, children) in sorted(moves.items()))
+            state = memo[key] = self.state(any(self.finals[member] for member in rest), edges)
+        return state
+
+    # ==================== COMPILING KEYSPACES ====================
+
+    def compile(self, keyspace: Keyspace) -> State:
+        """
+        Automaton accepting exactly the candidates of `keyspace`. Raises
+        AutomatonTooLarge when that means listing more than max_words
+        strings (FlatMaps are estimated from a sample of their items first).
+        """
+        self.listed = 0
+        return self._compile(keyspace)
+
+    def _compile(self, keyspace: Keyspace) -> State:
+        if isinstance(keyspace, Seq):
+            return self.words(keyspace.items)
+        if isinstance(keyspace, Chain):
+            return self.union(self._compile(part) for part in keyspace.parts)
+        if isinstance(keyspace, FlatMap):
+            return self._flatmap(keyspace)
+        if isinstance(keyspace, Product):
+            separator = join_separator(keyspace.join)
+            if separator is not None:
+                return self._product(keyspace.dims, separator)
+        # No structure to use (Permutations, other join functions): list it
+        self._budget(len(keyspace), f"{type(keyspace).__name__} of {len(keyspace):,} candidates")
+        return self.words(keyspace)
+
+    def _budget(self, words: int, what: str):
+        if self.listed + words > self.max_words:
+            raise AutomatonTooLarge(f"{what} means listing ~{self.listed + words:,} strings "
+                                    f"(limit {self.max_words:,})")
+
+    def _flatmap(self, flatmap: FlatMap) -> State:
+        items = len(flatmap.outer)
+        if not items:
+            return None
+        # Compile a spread of items first: the words they list predict the rest
+        sampled = {k * items // min(items, FLATMAP_SAMPLE) for k in range(min(items, FLATMAP_SAMPLE))}
+        before = self.listed
+        states = [self._compile(flatmap.expand(flatmap.outer.candidate_at(k))) for k in sorted(sampled)]
+        self._budget((self.listed - before) * (items - len(sampled)) // len(sampled),
+                     f"FlatMap over {items:,} items")
+        states.extend(self._compile(flatmap.expand(item))
+                      for k, item in enumerate(flatmap.outer) if k not in sampled)
+        return self.union(states)
+
+    def _product(self, dims: List[Tuple[str, ...]], separator: str) -> State:
+        # Right to left, so each concatenation walks one small dimension
+        state = self.word_list(dims[-1])
+        glue = self.words([separator]) if separator else None
+        for dim in reversed(dims[:-1]):
+            if glue is not None:
+                state = self.concat(glue, state)
+            state = self.concat(self.words(dim), state)
+        return state
+
+    # ==================== COUNTING ====================
+
+    def size(self, state: State) -> int:
+        """Number of distinct strings accepted."""
+        return 0 if state is None else self.sizes[state]
+
+    def common(self, first: State, second: State) -> int:
+        """|L(first) n L(second)|, by walking the product automaton lazily."""
+        if first is None or second is None:
+            return 0
+        if first == second:
+            return self.sizes[first]
+        key = (first, second) if first < second else (second, first)
+        count = self._common.get(key)
+        if count is None:
+            count = self.finals[first] & self.finals[second]
+            edges = dict(self.edges[second])
+            for char, child in self.edges[first]:
+                other = edges.get(char)
+                if other is not None:
+                    count += self.common(child, other)
+            self._common[key] = count
+        return count
+
+    def contains(self, state: State, candidate: str) -> bool:
+        """True if the automaton at `state` accepts `candidate`."""
+        for char in candidate:
+            if state is None:
+                return False
+            state = dict(self.edges[state]).get(char)
+        return state is not None and bool(self.finals[state])
@@ -0,0 +1,185 @@
+"""
+GPU-time budget allocation for a generator's expansion limits.
+
+The expansion caps in the attempt generators (leet variants kept per
+word, trailing patterns tried after a leet phrase, ...) were tuned by
+hand until the total looked right. Here each cap is a Dimension: for
+every depth it can take, the candidates that depth costs and the
+probability mass it covers (the prior chance the passphrase is among
+those candidates). Given a run time and a hash rate, allocate() picks
+one depth per dimension so the total mass is as large as possible with
+the total candidates within budget:
+
+    budget = hours x 3600 x H/s - candidates no dimension controls
+
+This is a multiple-choice knapsack. Every dimension's options are
+reduced to their upper convex hull (cost against mass), each dimension
+starts at its cheapest option, and the step with the best mass per
+candidate across all dimensions is taken while it fits. That greedy is
+optimal up to the last step that does not fit, and it is instant.
+
+Dimensions are assumed to control disjoint candidates (each cap only
+changes its own family or block), so costs and masses add up.
+
+Usage (from a generator):
+    add_budget_arguments(parser)                    # --budget-hours, --plan
+    plan = allocate(dimensions(), budget_candidates(args), fixed)
+    print_plan(plan, args.hps, file=sys.stderr)
+    apply(plan.depths)                              # the generator's own setter
+"""
+
+import argparse
+import heapq
+import sys
+from typing import Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+from cmw.count import DEFAULT_HASHES_PER_SECOND, format_duration
+
+# Dean: trailing chars "1, 3, maybe 6" of !, ?, ~, `
+TRAILING_LENGTH_WEIGHTS = {0: 1.0, 1: 4.0, 3: 4.0, 6: 2.0}
+HINTED_TRAILING_CHARS = set("!?~`")
+
+
+def trailing_weight(trail: str) -> float:
+    """Prior weight of a trailing pattern from Dean's hints (lengths 1/3/6, the four hinted chars)."""
+    hinted = all(c in HINTED_TRAILING_CHARS for c in trail)
+    return TRAILING_LENGTH_WEIGHTS.get(len(trail), 0.5) * (1.0 if hinted else 0.2)
+
+
+def prefix_mass(weights: Sequence[float]) -> Callable[[int], float]:
+    """mass(depth): share of the total weight in the first `depth` items (a [:depth] slice)."""
+    total = sum(weights)
+    cumulative = [0.0]
+    for weight in weights:
+        cumulative.append(cumulative[-1] + weight)
+    return lambda depth: cumulative[min(depth, len(weights))] / total if total else 0.0
+
+
+def add_budget_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --budget-hours / --plan options (the generator's --hps sets the rate)."""
+    parser.add_argument("--budget-hours", type=float, metavar="HOURS",
+                        help="Pick the expansion limits that fit HOURS at --hps (printed as a plan)")
+    parser.add_argument("--plan", action="store_true",
+                        help="With --budget-hours: print the plan and exit")
+
+
+class Dimension:
+    """
+    One expansion limit. `cost(depth)` is the candidates the dimension's
+    block holds at that depth and `mass(depth)` the probability mass it
+    covers; `default` is the hand-tuned depth, for comparison.
+    """
+
+    def __init__(self, name: str, depths: Sequence[int], cost: Callable[[int], int],
+                 mass: Callable[[int], float], default: Optional[int] = None):
+        self.name = name
+        self.default = default
+        self.options = [(depth, cost(depth), mass(depth)) for depth in depths]
+        if not self.options:
+            raise ValueError(f"dimension {name} has no depths")
+
+    def option(self, depth: int) -> Tuple[int, int, float]:
+        return next(option for option in self.options if option[0] == depth)
+
+    def hull(self) -> List[Tuple[int, int, float]]:
+        """Options on the upper convex hull of (cost, mass), cheapest first."""
+        # Cheapest option per cost and, among those, the most mass; then
+        # drop any option a cheaper one beats
+        best = []
+        for depth, cost, mass in sorted(self.options, key=lambda o: (o[1], -o[2], o[0])):
+            if best and (cost == best[-1][1] or mass <= best[-1][2]):
+                continue
+            best.append((depth, cost, mass))
+        hull = []
+        for option in best:
+            # Pop the last point while it lies on or under the chord to this one
+            while len(hull) >= 2:
+                (_, c1, m1), (_, c2, m2) = hull[-2], hull[-1]
+                if (m2 - m1) * (option[1] - c1) <= (option[2] - m1) * (c2 - c1):
+                    hull.pop()
+                else:
+                    break
+            hull.append(option)
+        return hull
+
+
+class Plan:
+    """The depth picked per dimension, with the totals it adds up to."""
+
+    def __init__(self, dimensions: Sequence[Dimension], depths: Dict[str, int], budget: int, fixed: int):
+        self.dimensions = list(dimensions)
+        self.depths = depths
+        self.budget = budget
+        self.fixed = fixed
+
+    @property
+    def candidates(self) -> int:
+        return self.fixed + sum(d.option(self.depths[d.name])[1] for d in self.dimensions)
+
+    @property
+    def mass(self) -> float:
+        return sum(d.option(self.depths[d.name])[2] for d in self.dimensions)
+
+    def default_totals(self) -> Optional[Tuple[int, float]]:
+        if any(d.default is None for d in self.dimensions):
+            return None
+        options = [d.option(d.default) for d in self.dimensions]
+        return self.fixed + sum(o[1] for o in options), sum(o[2] for o in options)
+
+
+def allocate(dimensions: Sequence[Dimension], budget: int, fixed: int = 0) -> Plan:
+    """
+    Depth per dimension maximising the total mass with fixed + total cost
+    within `budget` candidates. When even the cheapest depths do not fit,
+    the plan keeps them (and print_plan() says it is over budget).
+    """
+    hulls = {d.name: d.hull() for d in dimensions}
+    position = {name: 0 for name in hulls}
+    spent = fixed + sum(hull[0][1] for hull in hulls.values())
+
+    def step(name: str):
+        hull, at = hulls[name], position[name]
+        if at + 1 < len(hull):
+            (_, c1, m1), (_, c2, m2) = hull[at], hull[at + 1]
+            return (-(m2 - m1) / (c2 - c1), name, c2 - c1)
+        return None
+
+    steps = [s for s in map(step, hulls) if s is not None]
+    heapq.heapify(steps)
+    while steps:
+        _, name, extra = heapq.heappop(steps)
+        if spent + extra > budget:
+            # Later steps of this dimension need this one first
+            continue
+        spent += extra
+        position[name] += 1
+        following = step(name)
+        if following is not None:
+            heapq.heappush(steps, following)
+    return Plan(dimensions, {name: hulls[name][at][0] for name, at in position.items()}, budget, fixed)
+
+
+def budget_candidates(hours: float, hashes_per_second: float = DEFAULT_HASHES_PER_SECOND) -> int:
+    return int(hours * 3600 * hashes_per_second)
+
+
+def print_plan(plan: Plan, hashes_per_second: float = DEFAULT_HASHES_PER_SECOND, file: Optional[TextIO] = None):
+    """Print the chosen depths against the hand-tuned ones, with candidates, mass and run time."""
+    out = file or sys.stderr
+    width = max([len(d.name) for d in plan.dimensions] + [len("Fixed (no limit)")])
+    print(f"# Budget: {plan.budget:,} candidates ({format_duration(plan.budget / hashes_per_second)} "
+          f"at {hashes_per_second:,.0f} H/s)", file=out)
+    print(f"#   {'Dimension':<{width}}  {'default':>7}  {'chosen':>7}  {'candidates':>16}  {'mass':>8}", file=out)
+    for d in plan.dimensions:
+        depth, cost, mass = d.option(plan.depths[d.name])
+        default = "-" if d.default is None else d.default
+        print(f"#   {d.name:<{width}}  {default:>7}  {depth:>7}  {cost:>16,}  {mass:8.4f}", file=out)
+    print(f"#   {'Fixed (no limit)':<{width}}  {'':>7}  {'':>7}  {plan.fixed:>16,}", file=out)
+    over = " -- OVER BUDGET even at the smallest depths" if plan.candidates > plan.budget else ""
+    print(f"#   {'Total':<{width}}  {'':>7}  {'':>7}  {plan.candidates:>16,}  {plan.mass:8.4f}  "
+          f"({format_duration(plan.candidates / hashes_per_second)}){over}", file=out)
+    defaults = plan.default_totals()
+    if defaults is not None:
+        candidates, mass = defaults
+        print(f"#   Hand-tuned limits: {candidates:,} candidates, mass {mass:.4f} "
+              f"({format_duration(candidates / hashes_per_second)})", file=out)
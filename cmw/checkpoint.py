@@ -0,0 +1,151 @@
+"""
+Resumable generator runs: --checkpoint FILE.
+
+A generator piped into hashcat is a stateless loop, so a run that dies
+at hour 8 of 10 restarts from candidate 0. With --checkpoint the
+position written so far is saved to FILE every --checkpoint-every
+seconds (after the writer has flushed it into the pipe), atomically, so
+a crash or reboot at any point leaves either the previous or the new
+checkpoint. Running the same command again resumes from it.
+
+Keyspace-backed generators resume by index: keyspace.iter_range()/
+render() jump straight to the saved position, so resuming costs the
+same milliseconds as --range. Generators without a keyspace can only
+skip ahead by walking their stream, which the resume message says.
+
+A checkpoint only records the position, not what hashcat did with it:
+candidates already in the pipe or in hashcat's read-ahead when the run
+died were never hashed. Resuming therefore starts --checkpoint-rewind
+candidates before the saved position (a few seconds of work repeated).
+
+The file records the slice it belongs to (keyspace size, start, stop);
+resuming with a different slice, --limit or generator is refused rather
+than silently skipping the wrong candidates. It also records where the
+current run started, saved as soon as the run begins, so a wrapper
+that knows how many candidates its consumer finished (scripts/session.py,
+from hashcat's status) can turn that count back into an index.
+
+Usage:
+    add_checkpoint_arguments(parser)     # added by add_slice_arguments()
+    python3 generate.py --checkpoint run.ckpt | hashcat ...     # rerun the same line to resume
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Optional
+
+# Seconds between saves: cheap (one small file) and at most this much
+# work is repeated after a crash
+DEFAULT_INTERVAL = 30.0
+
+# Candidates re-emitted before the saved position on resume, covering
+# the pipe buffer and hashcat's read-ahead (~20s at 270,000 H/s)
+DEFAULT_REWIND = 5_000_000
+
+CHECKPOINT_VERSION = 1
+
+
+def add_checkpoint_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --checkpoint / --checkpoint-every / --checkpoint-rewind options."""
+    parser.add_argument("--checkpoint", metavar="FILE",
+                        help="Save the position to FILE periodically and resume from it when it exists")
+    parser.add_argument("--checkpoint-every", type=float, default=DEFAULT_INTERVAL, metavar="SECONDS",
+                        help=f"Seconds between checkpoint saves (default {DEFAULT_INTERVAL:g})")
+    parser.add_argument("--checkpoint-rewind", type=int, default=DEFAULT_REWIND, metavar="N",
+                        help=f"Resume N candidates before the saved position (default {DEFAULT_REWIND:,})")
+
+
+class Checkpoint:
+    """
+    The saved position of one slice [start, stop) of a generator's
+    output. `total` is the keyspace size, None for stream generators.
+    """
+
+    def __init__(self, path: str, start: int = 0, stop: Optional[int] = None, total: Optional[int] = None,
+                 every: float = DEFAULT_INTERVAL, rewind: int = DEFAULT_REWIND, keyspace=None):
+        self.path = path
+        self.start = start
+        self.stop = stop
+        self.total = total
+        self.every = every
+        self.rewind = rewind
+        self.families = keyspace.families() if hasattr(keyspace, "families") else []
+        self.position = start
+        self.started = start
+        self.done = False
+        # Whether resume() found a saved position to continue from
+        self.resumed = False
+        self._saved = time.monotonic()
+
+    def resume(self, log=None) -> int:
+        """
+        Position to start writing from: the saved one (rewound), or
+        `start` without a checkpoint. Saves it as this run's start.
+        """
+        self.started = self._resume(log or sys.stderr)
+        self.save(done=self.done)
+        return self.started
+
+    def _resume(self, out) -> int:
+        if not os.path.exists(self.path):
+            print(f"# Checkpoint: none at {self.path}, starting at {self.start:,}", file=out)
+            return self.start
+        with open(self.path) as f:
+            saved = json.load(f)
+        self.resumed = True
+        if saved.get("version") != CHECKPOINT_VERSION:
+            sys.exit(f"{self.path}: checkpoint version {saved.get('version')}, expected {CHECKPOINT_VERSION}")
+        slice_ = (self.total, self.start, self.stop)
+        if (saved["total"], saved["start"], saved["stop"]) != slice_:
+            sys.exit(f"{self.path} is for candidates {saved['start']:,}..{saved['stop']} of {saved['total']}, "
+                     f"this run is {self.start:,}..{self.stop} of {self.total}; "
+                     f"use the same generator and options, or remove the file")
+        if saved["done"]:
+            print(f"# Checkpoint: {self.path} says this slice is complete; nothing to write", file=out)
+            self.done = True
+            self.position = self.stop if self.stop is not None else saved["position"]
+            return self.position
+        self.position = max(self.start, saved["position"] - self.rewind)
+        where = f" ({self.family(self.position)})" if self.families else ""
+        cost = "an index jump" if self.total is not None else "walking the stream up to it"
+        print(f"# Checkpoint: resuming at {self.position:,}{where}, saved {saved['updated']} at "
+              f"{saved['position']:,} minus {saved['position'] - self.position:,} rewound; {cost}", file=out)
+        return self.position
+
+    def family(self, position: int) -> str:
+        for number, (name, start, stop) in enumerate(self.families, 1):
+            if start <= position < stop:
+                return name or f"Family {number}"
+        return "end"
+
+    def update(self, position: int, flush=None):
+        """Record `position`; saves (after calling `flush`) once --checkpoint-every has passed."""
+        self.position = position
+        if time.monotonic() - self._saved >= self.every:
+            if flush is not None:
+                flush()
+            self.save()
+
+    def save(self, done: bool = False):
+        """Write the position atomically (temporary file, fsync, rename)."""
+        record = {
+            "version": CHECKPOINT_VERSION,
+            "updated": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "total": self.total,
+            "start": self.start,
+            "stop": self.stop,
+            "started": self.started,
+            "position": self.position,
+            "family": self.family(self.position) if self.families else None,
+            "done": done,
+        }
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as f:
+            json.dump(record, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, self.path)
+        self._saved = time.monotonic()
@@ -0,0 +1,60 @@
+"""
+Exact candidate counts for keyspace-backed generators.
+
+Replaces the hand-written estimate tables ("~17,000" per family,
+leet_factor = 6, ...): sizes come from the keyspace itself, so they are
+exact post-filter counts, and cost milliseconds because products,
+permutations and per-phrase expansions are sized from their declared
+dimensions instead of being enumerated.
+
+Usage (from a generator):
+    from cmw.count import print_count
+    print_count(build_keyspace(), hashes_per_second=args.hps)
+"""
+
+import sys
+import time
+from typing import List, Optional, TextIO, Tuple
+
+from cmw.keyspace import Chain, Keyspace
+
+# The rate every attempt README budgets with (single GPU, -m 11300)
+DEFAULT_HASHES_PER_SECOND = 270_000
+
+
+def family_counts(keyspace: Keyspace) -> List[Tuple[str, int]]:
+    """(family name, exact candidate count) for each top-level family."""
+    if isinstance(keyspace, Chain):
+        return [
+            (name or f"Family {number}", stop - start)
+            for number, (name, start, stop) in enumerate(keyspace.families(), 1)
+        ]
+    return [("All candidates", len(keyspace))]
+
+
+def format_duration(seconds: float) -> str:
+    """Human-readable runtime: minutes below two hours, days above two days."""
+    if seconds < 2 * 3600:
+        return f"{seconds / 60:.1f} minutes"
+    if seconds < 2 * 86400:
+        return f"{seconds / 3600:.2f} hours"
+    return f"{seconds / 86400:.2f} days"
+
+
+def print_count(keyspace: Keyspace, hashes_per_second: float = DEFAULT_HASHES_PER_SECOND,
+                file: Optional[TextIO] = None):
+    """Print the per-family breakdown, total and runtime at `hashes_per_second`."""
+    out = file or sys.stdout
+    started = time.perf_counter()
+    rows = family_counts(keyspace)
+    elapsed = time.perf_counter() - started
+    total = sum(count for _, count in rows)
+    width = max(len(name) for name, _ in rows)
+
+    print(f"Exact candidate count (computed in {elapsed * 1000:.0f} ms):", file=out)
+    for number, (name, count) in enumerate(rows, 1):
+        share = count / total * 100 if total else 0.0
+        runtime = format_duration(count / hashes_per_second)
+        print(f"  {number:>2}. {name:<{width}}  {count:>16,}  {share:5.1f}%  {runtime:>14}", file=out)
+    print(f"  {'':>2}  {'Total':<{width}}  {total:>16,}  100.0%", file=out)
+    print(f"\nRuntime at {hashes_per_second:,.0f} H/s: {format_duration(total / hashes_per_second)}", file=out)
@@ -0,0 +1,289 @@
+"""
+Cross-attempt coverage store: 64-bit fingerprints of every tested candidate.
+
+COVERAGE_INDEX.md tracks coverage by hand, so a new attempt can re-test
+millions of strings an earlier one already sent to hashcat. The store
+keeps, per tested attempt, the sorted distinct fingerprints of
+everything its generator produced (8 bytes a candidate, built by
+streaming the generator's output once):
+
+    coverage/<attempt>.fp      sorted unique uint64, little-endian
+    coverage/<attempt>.json    command, candidate and fingerprint counts
+
+and --skip-tested DIR (an add_output_arguments() option, so every
+generator has it) drops candidates found in any store from a new run,
+reporting how many were skipped and the GPU time that saves.
+
+Fingerprints are FNV-1a 64 of the UTF-8 line, finished with the
+MurmurHash3 fmix64 mixer (so the top bits bucket evenly). Computed in
+NumPy over whole output blocks, one column of a length group at a time.
+Two distinct candidates share a fingerprint with probability 2^-64: a
+filtered run wrongly skips about (candidates x stored) / 2^64 of its
+candidates -- tens at 10B x 100B, zero in practice below that.
+
+Usage:
+    python3 scripts/build_coverage.py attempts/tested/2026-01-09-comprehensive-10b/generate.py
+    python3 attempts/tested/2026-01-10-extended-10b/generate.py --skip-tested coverage | hashcat ...
+"""
+
+import glob
+import json
+import os
+import sys
+import time
+from typing import Dict, List, Optional, TextIO, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cmw.count import DEFAULT_HASHES_PER_SECOND, format_duration
+from cmw.output import format_bytes
+
+# Where scripts/build_coverage.py writes and --skip-tested looks by default
+DEFAULT_STORE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "coverage")
+
+FINGERPRINT = "fnv1a64+fmix64"
+
+FNV_OFFSET = 0xcbf29ce484222325
+FNV_PRIME = 0x100000001b3
+MASK64 = (1 << 64) - 1
+
+# Fingerprints are spread over 2^bits bucket files while building, so
+# only one bucket has to fit in memory when they are sorted
+DEFAULT_BUCKET_BITS = 8
+
+NEWLINE = ord("\n")
+
+
+def attempt_name(path: str) -> str:
+    """
+    Store name of a generator: its directory, plus the script name when
+    the directory holds several (2026-01-07-refined-spite-generate_repeated).
+    """
+    directory = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    stem = os.path.splitext(os.path.basename(path))[0]
+    siblings = glob.glob(os.path.join(os.path.dirname(path), "generate*.py"))
+    return directory if stem == "generate" or len(siblings) == 1 else f"{directory}-{stem}"
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("the coverage store needs NumPy (pip install numpy)")
+
+
+def fingerprint(candidate: str) -> int:
+    """Reference (pure Python) fingerprint of one candidate; fingerprint_block() computes the same."""
+    h = FNV_OFFSET
+    for byte in candidate.encode():
+        h = ((h ^ byte) * FNV_PRIME) & MASK64
+    h ^= h >> 33
+    h = (h * 0xff51afd7ed558ccd) & MASK64
+    h ^= h >> 33
+    h = (h * 0xc4ceb9fe1a85ec53) & MASK64
+    return h ^ (h >> 33)
+
+
+def _lines(data: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray"]:
+    """(start, length) of every newline-terminated line in a byte array."""
+    ends = np.flatnonzero(data == NEWLINE)
+    starts = np.empty_like(ends)
+    starts[:1] = 0
+    starts[1:] = ends[:-1] + 1
+    return starts, ends - starts
+
+
+def fingerprint_lines(data: "np.ndarray", starts: "np.ndarray", lengths: "np.ndarray") -> "np.ndarray":
+    """uint64 fingerprint of each line data[start:start+length]."""
+    hashes = np.full(len(starts), FNV_OFFSET, dtype=np.uint64)
+    prime = np.uint64(FNV_PRIME)
+    with np.errstate(over="ignore"):
+        for length in np.unique(lengths):
+            group = np.flatnonzero(lengths == length)
+            h = hashes[group]
+            if length:
+                # (lines, length) matrix of this length group, hashed column by column
+                columns = data[starts[group, None] + np.arange(length)]
+                for column in columns.T:
+                    h = (h ^ column.astype(np.uint64)) * prime
+            hashes[group] = h
+        hashes ^= hashes >> np.uint64(33)
+        hashes *= np.uint64(0xff51afd7ed558ccd)
+        hashes ^= hashes >> np.uint64(33)
+        hashes *= np.uint64(0xc4ceb9fe1a85ec53)
+        hashes ^= hashes >> np.uint64(33)
+    return hashes
+
+
+def fingerprint_block(block: bytes) -> "np.ndarray":
+    """Fingerprints of every line of a newline-terminated output block."""
+    _require_numpy()
+    data = np.frombuffer(block, dtype=np.uint8)
+    return fingerprint_lines(data, *_lines(data))
+
+
+# ==================== BUILDING ====================
+
+class StoreBuilder:
+    """
+    Streams one attempt's output into <store>/<name>.fp: fingerprints are
+    appended to bucket files by their top bits, then each bucket is
+    sorted and deduplicated in turn.
+    """
+
+    def __init__(self, store: str, name: str, bucket_bits: int = DEFAULT_BUCKET_BITS):
+        _require_numpy()
+        self.store = store
+        self.name = name
+        self.bucket_bits = bucket_bits
+        self.candidates = 0
+        self.bytes = 0
+        self._pending = b""
+        self._directory = os.path.join(store, f".{name}.buckets")
+        os.makedirs(self._directory, exist_ok=True)
+        self._buckets = [open(os.path.join(self._directory, f"{i:04x}"), "wb") for i in range(1 << bucket_bits)]
+
+    def feed(self, chunk: bytes):
+        """Add raw generator output (any chunking; a partial last line is carried over)."""
+        data = self._pending + chunk
+        cut = data.rfind(b"\n") + 1
+        self._pending = data[cut:]
+        if cut:
+            self.add_block(data[:cut])
+
+    def add_block(self, block: bytes):
+        hashes = fingerprint_block(block)
+        self.candidates += len(hashes)
+        self.bytes += len(block)
+        bucket = (hashes >> np.uint64(64 - self.bucket_bits)).astype(np.intp) if self.bucket_bits else \
+            np.zeros(len(hashes), dtype=np.intp)
+        order = np.argsort(bucket, kind="stable")
+        hashes, bucket = hashes[order], bucket[order]
+        bounds = np.searchsorted(bucket, np.arange(len(self._buckets) + 1))
+        for i, f in enumerate(self._buckets):
+            if bounds[i] < bounds[i + 1]:
+                hashes[bounds[i]:bounds[i + 1]].astype("<u8").tofile(f)
+
+    def finish(self, command: str = "") -> dict:
+        """Sort every bucket into the final .fp file and write its .json; returns the metadata."""
+        if self._pending:
+            self.add_block(self._pending + b"\n")
+            self._pending = b""
+        path = os.path.join(self.store, f"{self.name}.fp")
+        unique = 0
+        with open(path + ".tmp", "wb") as out:
+            for f in self._buckets:
+                f.close()
+                hashes = np.unique(np.fromfile(f.name, dtype="<u8"))
+                hashes.tofile(out)
+                unique += len(hashes)
+                os.remove(f.name)
+        os.rmdir(self._directory)
+        os.replace(path + ".tmp", path)
+        metadata = {
+            "name": self.name,
+            "command": command,
+            "candidates": self.candidates,
+            "bytes": self.bytes,
+            "fingerprints": unique,
+            "fingerprint": FINGERPRINT,
+            "built": time.strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with open(os.path.join(self.store, f"{self.name}.json"), "w") as f:
+            json.dump(metadata, f, indent=2)
+            f.write("\n")
+        return metadata
+
+
+# ==================== QUERYING AND FILTERING ====================
+
+class CoverageStore:
+    """Every <name>.fp in a store directory, memory-mapped."""
+
+    def __init__(self, store: str = DEFAULT_STORE):
+        _require_numpy()
+        if not os.path.isdir(store):
+            raise FileNotFoundError(f"no coverage store at {store} (build one with scripts/build_coverage.py)")
+        self.store = store
+        self.attempts: Dict[str, "np.ndarray"] = {}
+        for entry in sorted(os.listdir(store)):
+            if entry.endswith(".fp"):
+                path = os.path.join(store, entry)
+                self.attempts[entry[:-3]] = np.memmap(path, dtype="<u8", mode="r") \
+                    if os.path.getsize(path) else np.empty(0, dtype="<u8")
+
+    @property
+    def fingerprints(self) -> int:
+        return sum(len(hashes) for hashes in self.attempts.values())
+
+    def lookup(self, hashes: "np.ndarray") -> "np.ndarray":
+        """Per fingerprint: index (into self.attempts order) of the first attempt holding it, or -1."""
+        found = np.full(len(hashes), -1, dtype=np.intp)
+        for number, stored in enumerate(self.attempts.values()):
+            if not len(stored):
+                continue
+            todo = np.flatnonzero(found < 0)
+            index = np.minimum(np.searchsorted(stored, hashes[todo]), len(stored) - 1)
+            hit = stored[index] == hashes[todo]
+            found[todo[hit]] = number
+        return found
+
+    def tested_by(self, candidate: str) -> List[str]:
+        """Names of the attempts whose output contained `candidate` (up to fingerprint collisions)."""
+        value = np.uint64(fingerprint(candidate))
+        return [name for name, stored in self.attempts.items()
+                if len(stored) and stored[min(np.searchsorted(stored, value), len(stored) - 1)] == value]
+
+
+class CoverageFilter:
+    """Drops already-tested lines from output blocks and keeps the tally for the report."""
+
+    def __init__(self, store: str = DEFAULT_STORE, hashes_per_second: float = DEFAULT_HASHES_PER_SECOND):
+        self.coverage = CoverageStore(store)
+        self.hashes_per_second = hashes_per_second
+        self.seen = 0
+        self.skipped = [0] * len(self.coverage.attempts)
+
+    def filter_block(self, block: bytes) -> Tuple[bytes, int]:
+        """(block without already-tested lines, lines kept)."""
+        data = np.frombuffer(block, dtype=np.uint8)
+        starts, lengths = _lines(data)
+        found = self.coverage.lookup(fingerprint_lines(data, starts, lengths))
+        self.seen += len(found)
+        tested = found >= 0
+        if not tested.any():
+            return block, len(found)
+        for number, count in zip(*np.unique(found[tested], return_counts=True)):
+            self.skipped[number] += int(count)
+        # Keep each untested line's bytes, newline included
+        keep = np.repeat(~tested, lengths + 1)
+        return data[:len(keep)][keep].tobytes(), int(len(found) - tested.sum())
+
+    def report(self, log: Optional[TextIO] = None):
+        log = log or sys.stderr
+        skipped = sum(self.skipped)
+        share = skipped / self.seen * 100 if self.seen else 0.0
+        print(f"# Coverage: skipped {skipped:,} of {self.seen:,} candidates ({share:.1f}%) already tested, "
+              f"saving {format_duration(skipped / self.hashes_per_second)} of GPU time at "
+              f"{self.hashes_per_second:,.0f} H/s", file=log)
+        for name, count in zip(self.coverage.attempts, self.skipped):
+            if count:
+                print(f"#   {name}: {count:,}", file=log)
+        expected = self.seen * self.coverage.fingerprints / 2 ** 64
+        if expected >= 0.01:
+            print(f"#   (~{expected:.2f} of the skips may be fingerprint collisions)", file=log)
+
+
+def describe_store(store: str = DEFAULT_STORE, file: Optional[TextIO] = None):
+    """One line per attempt in the store."""
+    out = file or sys.stdout
+    total = 0
+    for entry in sorted(os.listdir(store)):
+        if entry.endswith(".json"):
+            with open(os.path.join(store, entry)) as f:
+                metadata = json.load(f)
+            total += metadata["fingerprints"]
+            print(f"  {metadata['name']:<50} {metadata['candidates']:>16,} candidates "
+                  f"{metadata['fingerprints']:>16,} distinct  ({metadata['built']})", file=out)
+    print(f"  Total: {total:,} fingerprints ({format_bytes(total * 8)})", file=out)
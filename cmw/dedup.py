@@ -0,0 +1,250 @@
+"""
+Memory-bounded duplicate removal for candidate streams.
+
+A Python set holding every emitted candidate costs ~70-100 bytes a
+string, so at a billion candidates it needs far more memory than any
+cracking host has, and the big generators dropped dedup altogether.
+The --dedup stage makes the trade-off explicit:
+
+- set:    exact, in memory (the old behaviour; fine up to ~10M lines)
+- bloom:  Bloom filter sized from the stream's exact count and a target
+          false-positive rate: ~29 bits a candidate at 1e-6. Never lets
+          a repeat through, but a false positive drops a candidate that
+          was new -- expect about count x rate of those
+- disk:   exact, with bounded memory: candidates are tagged with their
+          position, spilled as sorted runs, merged to keep each first
+          occurrence, then merged back into the original order. Output
+          starts only after the whole input has been read
+- none:   pass everything through
+
+Every mode keeps the first occurrence, in stream order, and reports its
+memory (and disk) use on stderr when the stream ends.
+
+Usage:
+    add_dedup_arguments(parser)          # --dedup MODE, --dedup-fp-rate, ...
+    candidates = deduplicate(generate(), args, capacity=lambda: len(build_keyspace()))
+"""
+
+import argparse
+import hashlib
+import heapq
+import itertools
+import math
+import os
+import sys
+import tempfile
+from typing import Callable, Iterable, Iterator, List, Optional, TextIO, Union
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from cmw.output import format_bytes
+
+DEDUP_MODES = ("set", "bloom", "disk", "none")
+
+# A false positive silently skips a candidate, so err on the small side
+DEFAULT_FP_RATE = 1e-6
+
+# Candidates per sorted run in disk mode (~100 bytes each in memory)
+DEFAULT_RUN_SIZE = 5_000_000
+
+# Candidates hashed and tested per NumPy batch in bloom mode
+BLOOM_BATCH = 1 << 16
+
+
+def add_dedup_arguments(parser: argparse.ArgumentParser, default: Optional[str] = "set"):
+    """
+    Add the shared --dedup options to a generator's parser. A default of
+    None lets the generator tell "not given" apart (deduplicate() then
+    uses the exact set).
+    """
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default=default,
+                        help="Repeat removal: exact in memory (set), Bloom filter (bloom), exact with "
+                             "sorted runs on disk (disk) or none" + (f" (default {default})" if default else ""))
+    parser.add_argument("--dedup-fp-rate", type=float, default=DEFAULT_FP_RATE, metavar="RATE",
+                        help=f"Bloom filter false-positive rate (default {DEFAULT_FP_RATE:g})")
+    parser.add_argument("--dedup-run-size", type=int, default=DEFAULT_RUN_SIZE, metavar="N",
+                        help=f"Candidates per sorted run in disk mode (default {DEFAULT_RUN_SIZE:,})")
+    parser.add_argument("--dedup-dir", metavar="DIR",
+                        help="Directory for disk-mode runs (default: the system temp directory)")
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over strings (blake2b, double hashing).
+
+    add() and add_batch() return which items were new; "not new" is
+    wrong with probability fp_rate once `capacity` items are in.
+    """
+
+    def __init__(self, capacity: int, fp_rate: float = DEFAULT_FP_RATE):
+        if not 0 < fp_rate < 1:
+            raise ValueError(f"false-positive rate must be between 0 and 1, got {fp_rate}")
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.size = max(64, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        # np.zeros maps lazily zeroed pages: untouched parts of a GB-sized filter cost nothing
+        self.bits = np.zeros((self.size + 7) // 8, dtype=np.uint8) if np is not None \
+            else bytearray((self.size + 7) // 8)
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+    @staticmethod
+    def _digest(item: str) -> bytes:
+        return hashlib.blake2b(item.encode(), digest_size=16).digest()
+
+    def add(self, item: str) -> bool:
+        """Insert `item`; True if it was not (probably) there before."""
+        digest = self._digest(item)
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        new = False
+        for i in range(self.hashes):
+            bit = (h1 + i * h2) % self.size
+            byte, mask = bit >> 3, 1 << (bit & 7)
+            if not self.bits[byte] & mask:
+                self.bits[byte] |= mask
+                new = True
+        return new
+
+    def add_batch(self, items: List[str]) -> List[bool]:
+        """add() for a list of distinct items, vectorised with NumPy when it is installed."""
+        if np is None:
+            return [self.add(item) for item in items]
+        digests = np.frombuffer(b"".join(map(self._digest, items)), dtype=np.uint64).reshape(-1, 2)
+        h1, h2 = digests[:, :1], digests[:, 1:] | np.uint64(1)
+        # uint64 wraparound is fine for double hashing
+        bits = (h1 + np.arange(self.hashes, dtype=np.uint64) * h2) % np.uint64(self.size)
+        byte = (bits >> np.uint64(3)).astype(np.intp)
+        mask = np.left_shift(1, (bits & np.uint64(7)).astype(np.uint8)).astype(np.uint8)
+        new = ((self.bits[byte] & mask) == 0).any(axis=1)
+        np.bitwise_or.at(self.bits, byte[new].ravel(), mask[new].ravel())
+        return new.tolist()
+
+
+def _bloom(candidates: Iterable[str], bloom: BloomFilter) -> Iterator[str]:
+    stream = iter(candidates)
+    while True:
+        batch = list(itertools.islice(stream, BLOOM_BATCH))
+        if not batch:
+            return
+        # Repeats inside a batch never reach the filter
+        distinct = list(dict.fromkeys(batch))
+        yield from itertools.compress(distinct, bloom.add_batch(distinct))
+
+
+def _write_run(directory: str, number: int, lines: List[str]) -> str:
+    path = os.path.join(directory, f"run-{number:05d}")
+    lines.sort()
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(lines)
+    return path
+
+
+def _merge_runs(paths: List[str]) -> Iterator[str]:
+    files = [open(path, encoding="utf-8") for path in paths]
+    try:
+        yield from heapq.merge(*files)
+    finally:
+        for f in files:
+            f.close()
+
+
+def _disk(candidates: Iterable[str], run_size: int, directory: str, stats: dict) -> Iterator[str]:
+    # 1. Runs sorted by (candidate, position): "\0" sorts before any character,
+    #    and fixed-width hex positions sort numerically
+    runs: List[str] = []
+    stream = enumerate(candidates)
+    while True:
+        lines = [f"{candidate}\0{index:016x}\n" for index, candidate in itertools.islice(stream, run_size)]
+        if not lines:
+            break
+        runs.append(_write_run(directory, len(runs), lines))
+
+    # 2. Merge, keep each candidate's first position, re-run by position
+    firsts: List[str] = []
+    previous = None
+    lines = []
+    for line in _merge_runs(runs):
+        candidate, _, index = line[:-1].rpartition("\0")
+        if candidate != previous:
+            previous = candidate
+            lines.append(f"{index}\t{candidate}\n")
+            if len(lines) >= run_size:
+                firsts.append(_write_run(directory, len(runs) + len(firsts), lines))
+                lines = []
+    if lines:
+        firsts.append(_write_run(directory, len(runs) + len(firsts), lines))
+    stats["runs"] = len(runs)
+    stats["disk"] = sum(os.path.getsize(path) for path in runs + firsts)
+    for path in runs:
+        os.remove(path)
+
+    # 3. Merge back into stream order
+    for line in _merge_runs(firsts):
+        yield line[17:-1]
+
+
+def deduplicate(candidates: Iterable[str], args: Optional[argparse.Namespace] = None,
+                capacity: Union[int, Callable[[], int], None] = None,
+                log: Optional[TextIO] = None) -> Iterator[str]:
+    """
+    `candidates` without repeats (first occurrences, in order), using the
+    add_dedup_arguments() options (exact in-memory set when absent).
+    `capacity` is the stream's exact count, or a callable computing it;
+    only the Bloom filter needs it.
+    """
+    mode = getattr(args, "dedup", None) or "set"
+    log = log or sys.stderr
+    stats = {"in": 0, "out": 0}
+
+    def counted(stream: Iterable[str]) -> Iterator[str]:
+        for candidate in stream:
+            stats["in"] += 1
+            yield candidate
+
+    if mode == "none":
+        yield from candidates
+        return
+
+    try:
+        if mode == "bloom":
+            size = capacity() if callable(capacity) else capacity
+            if size is None:
+                raise ValueError("--dedup bloom needs the stream's candidate count")
+            bloom = BloomFilter(size, getattr(args, "dedup_fp_rate", DEFAULT_FP_RATE))
+            stats["memory"] = f"{format_bytes(bloom.nbytes)} filter for {size:,} candidates, " \
+                              f"{bloom.hashes} hashes, false-positive rate {bloom.fp_rate:g}"
+            for candidate in _bloom(counted(candidates), bloom):
+                stats["out"] += 1
+                yield candidate
+
+        elif mode == "disk":
+            run_size = getattr(args, "dedup_run_size", DEFAULT_RUN_SIZE)
+            with tempfile.TemporaryDirectory(prefix="cmw-dedup-", dir=getattr(args, "dedup_dir", None)) as directory:
+                for candidate in _disk(counted(candidates), run_size, directory, stats):
+                    stats["out"] += 1
+                    yield candidate
+            stats["memory"] = f"runs of {run_size:,} candidates, {stats['runs']} runs, " \
+                              f"{format_bytes(stats['disk'])} on disk"
+
+        else:
+            seen = set()
+            stats["held"] = 0
+            for candidate in counted(candidates):
+                if candidate not in seen:
+                    seen.add(candidate)
+                    stats["held"] += sys.getsizeof(candidate)
+                    stats["out"] += 1
+                    yield candidate
+    finally:
+        if mode == "set" and "held" in stats:
+            stats["memory"] = f"~{format_bytes(sys.getsizeof(seen) + stats['held'])} in a set"
+        print(f"# Dedup ({mode}): {stats['in']:,} in, {stats['in'] - stats['out']:,} repeats dropped"
+              + (f"; {stats['memory']}" if "memory" in stats else ""), file=log)
@@ -0,0 +1,624 @@
+"""
+Indexable keyspaces for the attempt generators.
+
+A generator written as nested for-loops can only reach candidate N by
+producing the N candidates before it. A keyspace describes the same
+candidates, in the same order, as a tree of:
+
+- Seq:          a plain list of values
+- Product:      nested loops over word lists (mixed-radix, last dim fastest)
+- Permutations: nested loops that skip repeats (``if adj1 != adj2``)
+- Chain:        one family after another
+- FlatMap:      per-item expansion whose size depends on the item
+                (leet variants of a phrase, filtered paddings, ...)
+
+Every node supports len(), candidate_at(i) and iter_range(start, stop),
+so a run can be resumed or split at any index without regenerating the
+candidates before it. index_of(candidate) goes the other way, parsing a
+candidate against the structure (word lists, separators) instead of
+enumerating; a FlatMap needs a parse function for that (MutationIndex
+undoes separators, case, leet and trailing patterns) and raises
+NotImplementedError without one. render(start, stop) returns the same
+slice as newline-terminated output bytes; products of plain string
+dimensions (and chains of them) render whole blocks at once
+(cmw.vector).
+
+Usage:
+    ks = generate.build_keyspace()
+    len(ks)                          # exact candidate count
+    ks.candidate_at(123456789)       # one candidate, no enumeration
+    ks.index_of("bad password!!")    # its first index, or None
+    for c in ks.iter_range(10**9, 2 * 10**9):
+        ...
+"""
+
+import itertools
+import math
+from array import array
+from bisect import bisect_right
+from collections import Counter
+from typing import Callable, Dict, Hashable, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from cmw import vector
+
+
+class Keyspace:
+    """Ordered, finite, randomly addressable set of candidates."""
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator:
+        return self.iter_range()
+
+    def candidate_at(self, index: int):
+        """Return the candidate at position `index` (negative counts from the end)."""
+        size = len(self)
+        if index < 0:
+            index += size
+        if not 0 <= index < size:
+            raise IndexError(f"keyspace index {index} out of range (size {size:,})")
+        return self._at(index)
+
+    def iter_range(self, start: int = 0, stop: Optional[int] = None) -> Iterator:
+        """Yield candidates start..stop-1 in generator order."""
+        size = len(self)
+        stop = size if stop is None else min(stop, size)
+        start = max(start, 0)
+        if start >= stop:
+            return iter(())
+        return self._iter(start, stop)
+
+    def index_of(self, candidate) -> Optional[int]:
+        """
+        First index of `candidate`, or None if the keyspace does not
+        produce it. Raises NotImplementedError for nodes that cannot be
+        parsed (see the subclasses).
+        """
+        raise NotImplementedError(f"{type(self).__name__} cannot be parsed")
+
+    def render(self, start: int = 0, stop: Optional[int] = None) -> bytes:
+        """Candidates start..stop-1 as newline-terminated UTF-8, ready to write."""
+        return "".join(candidate + "\n" for candidate in self.iter_range(start, stop)).encode()
+
+    @property
+    def vectorized(self) -> bool:
+        """True when render() builds whole blocks rather than going candidate by candidate."""
+        return False
+
+    def prepare(self) -> "Keyspace":
+        """
+        Build every lazy list and index table now (e.g. before forking
+        workers, so each process does not rebuild them). Returns self.
+        """
+        return self
+
+    def _at(self, index: int):
+        raise NotImplementedError
+
+    def _iter(self, start: int, stop: int) -> Iterator:
+        for index in range(start, stop):
+            yield self._at(index)
+
+
+def join_separator(join: Optional[Callable[[Tuple], str]]) -> Optional[str]:
+    """
+    The separator a join function puts between values: "" for plain
+    concatenation (None), " " for " ".join, None for any other function.
+    """
+    if join is None:
+        return ""
+    owner = getattr(join, "__self__", None)
+    return owner if isinstance(owner, str) and getattr(join, "__name__", "") == "join" else None
+
+
+class _Parser:
+    """
+    Splits a string into one value per word list, separated by a fixed
+    separator: the inverse of joining the values of a product.
+    """
+
+    def __init__(self, lists: Sequence[Sequence[str]], separator: str):
+        self.separator = separator
+        # value -> first position, and the distinct value lengths to try
+        self.tables = []
+        for values in lists:
+            table = {}
+            for position, value in enumerate(values):
+                table.setdefault(value, position)
+            self.tables.append((table, sorted({len(value) for value in table})))
+
+    def parses(self, text: str, start: int = 0, depth: int = 0) -> Iterator[Tuple[int, ...]]:
+        """Every way to read text[start:] as values of lists depth.. (positions in each list)."""
+        table, lengths = self.tables[depth]
+        last = depth == len(self.tables) - 1
+        for length in lengths:
+            position = table.get(text[start:start + length])
+            if position is None:
+                continue
+            end = start + length
+            if last:
+                if end == len(text):
+                    yield (position,)
+            elif text.startswith(self.separator, end):
+                for rest in self.parses(text, end + len(self.separator), depth + 1):
+                    yield (position,) + rest
+
+
+class Seq(Keyspace):
+    """
+    A materialized list of values (small families, word lists).
+
+    Pass a zero-argument callable (e.g. a family generator function) to
+    defer materializing until the values are first needed.
+    """
+
+    def __init__(self, items):
+        self._source = items if callable(items) else None
+        self._items = None if callable(items) else (
+            items if isinstance(items, (list, tuple)) else list(items))
+        self._index = None
+
+    @property
+    def items(self) -> Sequence:
+        if self._items is None:
+            self._items = list(self._source())
+        return self._items
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def prepare(self) -> "Seq":
+        self.items
+        return self
+
+    def index_of(self, candidate) -> Optional[int]:
+        if self._index is None:
+            self._index = {}
+            for position, item in enumerate(self.items):
+                self._index.setdefault(item, position)
+        return self._index.get(candidate)
+
+    def _at(self, index: int):
+        return self.items[index]
+
+    def _iter(self, start: int, stop: int) -> Iterator:
+        return itertools.islice(self.items, start, stop)
+
+
+class Product(Keyspace):
+    """
+    Cartesian product of dimensions, last dimension varying fastest.
+
+    Equivalent to ``for a in dims[0]: for b in dims[1]: ...``. Values are
+    concatenated, or passed as a tuple to `join` (e.g. " ".join).
+    """
+
+    def __init__(self, *dims: Iterable, join: Optional[Callable[[Tuple], str]] = None):
+        if not dims:
+            raise ValueError("Product needs at least one dimension")
+        self._sources = dims
+        self._dims = None
+        self._renderer = None
+        self._parser = None
+        self.join = join
+
+    @property
+    def dims(self) -> List[Tuple]:
+        """Dimension values, materialized on first use (lazy Seq sources run then)."""
+        if self._dims is None:
+            self._dims = [tuple(dim) for dim in self._sources]
+            self._sources = None
+        return self._dims
+
+    def __len__(self) -> int:
+        return math.prod(len(dim) for dim in self.dims)
+
+    def prepare(self) -> "Product":
+        if self.vectorized:
+            self.renderer()
+        self.dims
+        return self
+
+    @property
+    def vectorized(self) -> bool:
+        return self.join is None
+
+    def renderer(self) -> "vector.ProductRenderer":
+        """Encoded tables for render() (built on first use)."""
+        if self._renderer is None:
+            self._renderer = vector.ProductRenderer(self.dims)
+        return self._renderer
+
+    def render(self, start: int = 0, stop: Optional[int] = None) -> bytes:
+        if not self.vectorized:
+            return super().render(start, stop)
+        size = len(self)
+        stop = size if stop is None else min(stop, size)
+        return self.renderer().render(max(start, 0), stop)
+
+    def digits(self, index: int) -> List[int]:
+        """Mixed-radix digits of `index`, most significant first."""
+        digits = [0] * len(self.dims)
+        for k in range(len(self.dims) - 1, -1, -1):
+            index, digits[k] = divmod(index, len(self.dims[k]))
+        return digits
+
+    def index_of(self, candidate) -> Optional[int]:
+        """Parsed against the dimensions; products with a join other than sep.join cannot be."""
+        if self._parser is None:
+            separator = join_separator(self.join)
+            if separator is None:
+                raise NotImplementedError("Product with a custom join function cannot be parsed")
+            self._parser = _Parser(self.dims, separator)
+        best = None
+        for digits in self._parser.parses(candidate):
+            index = 0
+            for dim, digit in zip(self.dims, digits):
+                index = index * len(dim) + digit
+            best = index if best is None else min(best, index)
+        return best
+
+    def tally(self, feature: Callable[[object], Hashable],
+              combine: Callable[[Hashable, Hashable], Hashable]) -> Dict[Hashable, int]:
+        """
+        Multiplicity of every combined feature over all tuples, by convolving
+        per-dimension feature counts instead of enumerating the product.
+
+        `feature` summarizes one dimension value and `combine` must be
+        associative (e.g. add lengths, multiply variant counts).
+        """
+        states = Counter(feature(value) for value in self.dims[0])
+        for dim in self.dims[1:]:
+            dim_states = Counter(feature(value) for value in dim)
+            merged = Counter()
+            for state, count in states.items():
+                for other, other_count in dim_states.items():
+                    merged[combine(state, other)] += count * other_count
+            states = merged
+        return dict(states)
+
+    def _combine(self, values: Tuple) -> str:
+        return "".join(values) if self.join is None else self.join(values)
+
+    def _at(self, index: int):
+        return self._combine(tuple(dim[d] for dim, d in zip(self.dims, self.digits(index))))
+
+    def _iter(self, start: int, stop: int) -> Iterator:
+        *outer, last = self.dims
+        digits = self.digits(start)
+        remaining = stop - start
+        join = self.join
+        while remaining > 0:
+            head = tuple(dim[d] for dim, d in zip(outer, digits))
+            chunk = last[digits[-1]:digits[-1] + remaining]
+            if join is None:
+                prefix = "".join(head)
+                for value in chunk:
+                    yield prefix + value
+            else:
+                for value in chunk:
+                    yield join(head + (value,))
+            remaining -= len(chunk)
+            # Carry into the outer dimensions (odometer)
+            digits[-1] = 0
+            for k in range(len(outer) - 1, -1, -1):
+                digits[k] += 1
+                if digits[k] < len(outer[k]):
+                    break
+                digits[k] = 0
+
+
+class Permutations(Keyspace):
+    """
+    Ordered r-tuples of distinct items, in itertools.permutations order.
+
+    Same order as r nested loops over `items` guarded by
+    ``if adj1 != adj2`` (items must be unique), but sized and unranked
+    in closed form.
+    """
+
+    def __init__(self, items: Sequence, r: int, join: Optional[Callable[[Tuple], str]] = None):
+        self.items = tuple(items)
+        if len(set(self.items)) != len(self.items):
+            raise ValueError("Permutations needs unique items")
+        self.r = r
+        self.join = join
+        self.size = math.perm(len(self.items), r)
+        self._parser = None
+
+    def __len__(self) -> int:
+        return self.size
+
+    def index_of(self, candidate) -> Optional[int]:
+        """Parsed like a product of r copies of the items, keeping tuples of distinct items."""
+        if self._parser is None:
+            separator = join_separator(self.join)
+            if separator is None or self.r == 0:
+                raise NotImplementedError("Permutations without a sep.join cannot be parsed")
+            self._parser = _Parser([self.items] * self.r, separator)
+        best = None
+        for picks in self._parser.parses(candidate):
+            if len(set(picks)) < self.r:
+                continue
+            # Rank: each pick's position among the items not yet used
+            pool = list(range(len(self.items)))
+            index = 0
+            for k, pick in enumerate(picks):
+                index += pool.index(pick) * math.perm(len(pool) - 1, self.r - 1 - k)
+                pool.remove(pick)
+            best = index if best is None else min(best, index)
+        return best
+
+    def _finish(self, values: Tuple):
+        return values if self.join is None else self.join(values)
+
+    def _at(self, index: int):
+        pool = list(self.items)
+        values = []
+        for k in range(self.r):
+            block = math.perm(len(pool) - 1, self.r - 1 - k)
+            pick, index = divmod(index, block)
+            values.append(pool.pop(pick))
+        return self._finish(tuple(values))
+
+    def _iter(self, start: int, stop: int) -> Iterator:
+        for values in itertools.islice(itertools.permutations(self.items, self.r), start, stop):
+            yield self._finish(values)
+
+
+class Chain(Keyspace):
+    """Keyspaces one after another, optionally named (generator families)."""
+
+    def __init__(self, parts: Iterable[Keyspace], names: Optional[Iterable[str]] = None):
+        self.parts = list(parts)
+        self.names = list(names) if names is not None else [None] * len(self.parts)
+        if len(self.names) != len(self.parts):
+            raise ValueError("Chain needs one name per part")
+        self._starts = None
+
+    def starts(self) -> List[int]:
+        """Global index of the first candidate of each part."""
+        if self._starts is None:
+            starts, total = [], 0
+            for part in self.parts:
+                starts.append(total)
+                total += len(part)
+            self._starts = starts + [total]
+        return self._starts[:-1]
+
+    def __len__(self) -> int:
+        self.starts()
+        return self._starts[-1]
+
+    def prepare(self) -> "Chain":
+        for part in self.parts:
+            part.prepare()
+        self.starts()
+        return self
+
+    @property
+    def vectorized(self) -> bool:
+        return all(part.vectorized for part in self.parts)
+
+    def render(self, start: int = 0, stop: Optional[int] = None) -> bytes:
+        size = len(self)
+        stop = size if stop is None else min(stop, size)
+        start = max(start, 0)
+        if start >= stop:
+            return b""
+        part, local = self.locate(start)
+        remaining = stop - start
+        rendered = []
+        for keyspace in self.parts[part:]:
+            take = min(len(keyspace) - local, remaining)
+            rendered.append(keyspace.render(local, local + take))
+            remaining -= take
+            local = 0
+            if remaining <= 0:
+                break
+        return b"".join(rendered)
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        """Map a global index to (part number, index within that part)."""
+        starts = self.starts()
+        # bisect_right lands past empty parts that share a start
+        part = bisect_right(starts, index) - 1
+        return part, index - starts[part]
+
+    def families(self) -> List[Tuple[str, int, int]]:
+        """(name, start, stop) of every part."""
+        starts = self.starts()
+        return [(name, start, start + len(part)) for name, start, part in zip(self.names, starts, self.parts)]
+
+    def index_of(self, candidate) -> Optional[int]:
+        """
+        First index among the parts that can be parsed. When none of them
+        has it but some part cannot be parsed, the answer is unknown and
+        that part's NotImplementedError is raised.
+        """
+        unparsed = None
+        for part, start in zip(self.parts, self.starts()):
+            try:
+                local = part.index_of(candidate)
+            except NotImplementedError as e:
+                unparsed = e
+                continue
+            if local is not None:
+                return start + local
+        if unparsed is not None:
+            raise unparsed
+        return None
+
+    def _at(self, index: int):
+        part, local = self.locate(index)
+        return self.parts[part].candidate_at(local)
+
+    def _iter(self, start: int, stop: int) -> Iterator:
+        part, local = self.locate(start)
+        remaining = stop - start
+        for keyspace in self.parts[part:]:
+            take = min(len(keyspace) - local, remaining)
+            yield from keyspace.iter_range(local, local + take)
+            remaining -= take
+            local = 0
+            if remaining <= 0:
+                break
+
+
+class FlatMap(Keyspace):
+    """
+    Each item of `outer` expands into its own keyspace.
+
+    For dimensions whose size depends on the value (leet variants of a
+    phrase, length-filtered paddings). The per-item sizes are summed once
+    into a prefix table; `count(item)` may compute a size more cheaply
+    than building `expand(item)`, and `total()` may give len() in closed
+    form so counting never has to build the table at all. A closed form
+    must be exact: a Chain caches its part starts from it, and building
+    the table later raises if the two disagree.
+
+    An expansion cannot be undone in general, so index_of() needs
+    `parse(candidate)`: the outer positions whose expansion may produce
+    the candidate (a MutationIndex). Each is then checked exactly by
+    its expansion's own index_of().
+    """
+
+    def __init__(self, outer, expand: Callable[[object], Keyspace],
+                 count: Optional[Callable[[object], int]] = None,
+                 total: Optional[Callable[[], int]] = None,
+                 parse: Optional[Callable[[str], Iterable[int]]] = None):
+        self.outer = outer if isinstance(outer, Keyspace) else Seq(outer)
+        self.expand = expand
+        self.count = count or (lambda item: len(expand(item)))
+        self.total = total
+        self.parse = parse
+        self._size = None
+        self._ends = None
+
+    def ends(self) -> array:
+        """Running totals: ends()[k] is the index just past outer item k."""
+        if self._ends is None:
+            ends, total = array("q"), 0
+            for item in self.outer:
+                total += self.count(item)
+                ends.append(total)
+            if self._size is not None and self._size != total:
+                raise ValueError(f"closed-form total() gave {self._size:,} but the items count {total:,}")
+            self._ends = ends
+        return self._ends
+
+    def prepare(self) -> "FlatMap":
+        self.outer.prepare()
+        self.ends()
+        return self
+
+    def __len__(self) -> int:
+        if self._ends is None and self.total is not None:
+            if self._size is None:
+                self._size = self.total()
+            return self._size
+        ends = self.ends()
+        return ends[-1] if ends else 0
+
+    def locate(self, index: int) -> Tuple[int, int]:
+        """Map a global index to (outer index, index within its expansion)."""
+        ends = self.ends()
+        item = bisect_right(ends, index)
+        return item, index - (ends[item - 1] if item else 0)
+
+    def index_of(self, candidate) -> Optional[int]:
+        """Parsed with `parse`; FlatMaps built without one cannot be."""
+        if self.parse is None:
+            raise NotImplementedError("FlatMap without a parse function cannot be parsed")
+        # Expansions follow outer order, so the first item that has it gives the first index
+        for item in sorted(set(self.parse(candidate))):
+            local = self.expand(self.outer.candidate_at(item)).index_of(candidate)
+            if local is not None:
+                ends = self.ends()
+                return (ends[item - 1] if item else 0) + local
+        return None
+
+    def _at(self, index: int):
+        item, local = self.locate(index)
+        return self.expand(self.outer.candidate_at(item)).candidate_at(local)
+
+    def _iter(self, start: int, stop: int) -> Iterator:
+        item, local = self.locate(start)
+        remaining = stop - start
+        for value in self.outer.iter_range(item):
+            inner = self.expand(value)
+            take = min(len(inner) - local, remaining)
+            if take > 0:
+                yield from inner.iter_range(local, local + take)
+                remaining -= take
+            local = 0
+            if remaining <= 0:
+                break
+
+
+class MutationIndex:
+    """
+    FlatMap(parse=...) for the usual phrase mutations: the words of an
+    item joined by a separator, a case variant, leet substitutions and a
+    trailing pattern, in that order.
+
+    Each item is indexed by its skeleton: lower-cased, separators
+    dropped and every leet character folded onto one member of its
+    group ("P@$$", "p455" and "pass" all read the same). A candidate is
+    looked up by the skeleton of what is left once each trailing pattern
+    it ends with is cut off. Whole-word spellings no folding reaches
+    ("durnb" for "dumb") are swapped back from `leet_words` first.
+    Folding merges letters ("1" stands for i and l), so this finds too
+    many items rather than too few, and FlatMap checks each one.
+    """
+
+    def __init__(self, items: Keyspace, trailing: Iterable[str], separators: Iterable[str],
+                 leet_char: Dict[str, Sequence[str]], leet_words: Optional[Dict[str, Sequence[str]]] = None):
+        self.items = items
+        self.trailing = list(dict.fromkeys(trailing))
+        self.separators = set("".join(separators)) | {" "}
+        # Characters that substitute for each other, merged into groups
+        groups: List[set] = []
+        for letter, substitutes in leet_char.items():
+            group = {letter, *substitutes}
+            for other in [other for other in groups if other & group]:
+                group |= other
+                groups.remove(other)
+            groups.append(group)
+        self.fold = {char: min(group) for group in groups for char in group}
+        self.irregular = [(self.skeleton(spelling), self.skeleton(word))
+                          for word, spellings in (leet_words or {}).items() for spelling in spellings
+                          if self.skeleton(spelling) != self.skeleton(word)]
+        self._index = None
+
+    def skeleton(self, text: str) -> str:
+        return "".join(self.fold.get(char, char) for char in text.lower() if char not in self.separators)
+
+    def __call__(self, candidate: str) -> List[int]:
+        """Positions in `items` whose mutations may produce `candidate`."""
+        if self._index is None:
+            self._index = {}
+            for position, item in enumerate(self.items):
+                self._index.setdefault(self.skeleton(item), []).append(position)
+        keys = {self.skeleton(candidate[:len(candidate) - len(trail)])
+                for trail in self.trailing if candidate.endswith(trail)}
+        for spelling, word in self.irregular:
+            keys |= {key.replace(spelling, word) for key in keys if spelling in key}
+        return [position for key in keys for position in self._index.get(key, ())]
+
+
+def trailing_families(families: Sequence[Tuple[Callable[[], Iterable[str]], str]],
+                      trailing: Sequence[str]) -> Chain:
+    """
+    Keyspace for the common "every family base x every trailing pattern" shape.
+
+    `families` is the generator's list of (family_function, name) pairs;
+    each family's bases are materialized on first use (they are small) and
+    crossed with `trailing` by mixed-radix indexing.
+    """
+    trailing = tuple(trailing)
+    return Chain(
+        (Product(Seq(family), trailing) for family, _ in families),
+        names=[name for _, name in families],
+    )
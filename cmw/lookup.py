@@ -0,0 +1,150 @@
+"""
+"Was this passphrase already tested?" across every tested generator.
+
+Each generator with a build_keyspace() is asked for the candidate by
+parsing it against the structure of each family (Keyspace.index_of:
+word-list lookups and separators, no enumeration), which gives the
+attempt, the family and the index that produced it -- enough to replay
+it with --range INDEX:INDEX+1. Leet and case expansions (the FlatMap
+families of 10b-combined and 2b) are parsed by undoing the trailing
+pattern, separator, case and leet (cmw.keyspace.MutationIndex).
+Families that still cannot be parsed (products with a custom join) and
+generators without a keyspace fall back to the coverage store
+(cmw.coverage), which answers yes or no per attempt from fingerprints.
+Whatever neither can answer is listed as not checked, never reported as
+untested.
+
+Usage:
+    python3 -m cmw tested "this.is.a.derpy.passphrase!!!"
+"""
+
+import contextlib
+import glob
+import importlib.util
+import io
+import os
+from typing import List, Optional, Tuple
+
+from cmw.coverage import DEFAULT_STORE, attempt_name
+from cmw.keyspace import Chain, Keyspace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where the tested generators live, relative to the repository root
+TESTED_GENERATORS = ("attempts/tested/*/generate*.py", "scripts/generate*.py")
+
+
+def tested_generators(root: str = ROOT) -> List[str]:
+    """Paths of every tested generator script."""
+    return sorted(path for pattern in TESTED_GENERATORS for path in glob.glob(os.path.join(root, pattern)))
+
+
+def load_generator(path: str):
+    """Import a generator by path without running its __main__ block (import-time logging is dropped)."""
+    spec = importlib.util.spec_from_file_location(f"generator_{attempt_name(path).replace('-', '_')}", path)
+    module = importlib.util.module_from_spec(spec)
+    with contextlib.redirect_stderr(io.StringIO()):
+        spec.loader.exec_module(module)
+    return module
+
+
+class Match:
+    """
+    Where a candidate was produced. Matches from the coverage store have
+    no family or index, only the attempt.
+    """
+
+    def __init__(self, attempt: str, family: Optional[str] = None, index: Optional[int] = None,
+                 family_index: Optional[int] = None):
+        self.attempt = attempt
+        self.family = family
+        self.index = index                  # in the generator's keyspace (--range)
+        self.family_index = family_index    # within the family
+
+    def __str__(self) -> str:
+        if self.index is None:
+            return f"{self.attempt} (coverage store fingerprint)"
+        return (f"{self.attempt} / {self.family}: index {self.index:,} "
+                f"(family index {self.family_index:,}; replay with --range {self.index}:{self.index + 1})")
+
+
+class Generator:
+    """One tested generator: its keyspace families, built on first use and kept for later lookups."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.name = attempt_name(path)
+        self._keyspace = None
+        self._loaded = False
+
+    @property
+    def keyspace(self) -> Optional[Keyspace]:
+        if not self._loaded:
+            module = load_generator(self.path)
+            if hasattr(module, "build_keyspace"):
+                with contextlib.redirect_stderr(io.StringIO()):
+                    self._keyspace = module.build_keyspace()
+            self._loaded = True
+        return self._keyspace
+
+    def families(self) -> List[Tuple[str, Keyspace]]:
+        if isinstance(self.keyspace, Chain):
+            return [(name or f"Family {number}", part)
+                    for number, (name, part) in enumerate(zip(self.keyspace.names, self.keyspace.parts), 1)]
+        return [("All candidates", self.keyspace)]
+
+    def parse(self, candidate: str) -> Tuple[List[Match], List[str]]:
+        """(families producing `candidate`, names of the families that cannot be parsed)."""
+        if self.keyspace is None:
+            return [], ["no keyspace"]
+        matches, unparsed = [], []
+        # Building word lists and parse tables may log (trailing pattern counts)
+        with contextlib.redirect_stderr(io.StringIO()):
+            for number, (family, part) in enumerate(self.families()):
+                try:
+                    local = part.index_of(candidate)
+                except NotImplementedError:
+                    unparsed.append(family)
+                    continue
+                if local is not None and part.candidate_at(local) == candidate:
+                    # Family offsets only when needed: sizing a FlatMap family can take seconds
+                    start = self.keyspace.starts()[number] if isinstance(self.keyspace, Chain) else 0
+                    matches.append(Match(self.name, family, start + local, local))
+        return matches, unparsed
+
+
+class TestedIndex:
+    """
+    Every tested generator plus the coverage store, loaded once and
+    queried per candidate. The first parse of each generator builds its
+    word lists (up to ~10 s for the grammar attempts); after that a
+    lookup takes milliseconds.
+    """
+
+    def __init__(self, paths: Optional[List[str]] = None, store: Optional[str] = DEFAULT_STORE):
+        self.generators = [Generator(path) for path in (paths if paths is not None else tested_generators())]
+        self.coverage = None
+        if store and os.path.isdir(store):
+            from cmw.coverage import CoverageStore
+            self.coverage = CoverageStore(store)
+
+    def lookup(self, candidate: str) -> Tuple[List[Match], List[Tuple[str, str]]]:
+        """
+        (matches, not checked) for `candidate`. "Not checked" lists
+        (attempt, reason) for the generators neither parsing nor the
+        coverage store could answer for.
+        """
+        fingerprinted = set(self.coverage.tested_by(candidate)) if self.coverage is not None else set()
+        stored = set(self.coverage.attempts) if self.coverage is not None else set()
+        matches, unchecked = [], []
+        for generator in self.generators:
+            found, unparsed = generator.parse(candidate)
+            matches.extend(found)
+            if found or not unparsed:
+                continue
+            if generator.name in fingerprinted:
+                matches.append(Match(generator.name))
+            elif generator.name not in stored:
+                reason = "no keyspace" if unparsed == ["no keyspace"] else f"cannot parse {', '.join(unparsed)}"
+                unchecked.append((generator.name, reason))
+        return matches, unchecked
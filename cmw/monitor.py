@@ -0,0 +1,242 @@
+"""
+Live per-family progress and ETA: hashcat --status-json joined with the generator's family boundaries.
+
+A generator writes one anonymous stream; the only record of which
+family is being hashed is its "# Generating Family N" log, printed when
+the family starts. hashcat reports progress as a count of words read.
+The join needs the boundaries in index space:
+
+- generate.py --families FILE writes them when the run starts
+  (write_families): the first index this run emits (after --shard,
+  --range and --checkpoint resume) and each family's [start, stop)
+  clipped to the slice. Only keyspace-backed generators know them up
+  front; --families makes the run emit in keyspace order, like
+  --checkpoint does
+- every hashcat status carries restore_point, the words it has finished
+  since it started (base words, so rules are fine), so the candidate
+  being hashed is generator index started + restore_point
+- stream generators have no boundaries up front, but --sidecar FILE
+  (cmw.sidecar) records each family's start as the stream is written
+  (the generator calls cmw.sidecar.start_family() as one begins):
+  Families.from_sidecar() reads them in output lines, where
+  restore_point counts, and maps a line back to its generator index.
+  Until the run ends the last family's size is unknown, and so are the
+  ETAs that depend on it
+
+Monitor turns each status into that index, the family it falls in, the
+rate (hashcat's H/s, and the measured rate of base words over the last
+minute) and ETAs, draws the table, and appends one JSON line per status
+to a log for later throughput analysis.
+
+Usage:
+    python3 generate.py --families run.families | \\
+        hashcat -m 11300 -a 0 --status --status-json --status-timer=10 hash.txt | \\
+        python3 scripts/monitor.py run.families --log run.series.jsonl
+"""
+
+import argparse
+import bisect
+import json
+import os
+import time
+from collections import deque
+from typing import Callable, List, Optional, TextIO, Tuple
+
+from cmw.count import format_duration
+from cmw.keyspace import Chain, Keyspace
+from cmw.sidecar import SidecarIndex
+
+FAMILIES_VERSION = 1
+
+# Seconds of statuses the measured rate is averaged over
+RATE_WINDOW = 60.0
+
+
+def add_family_arguments(parser: argparse.ArgumentParser):
+    """Add --families (added by cmw.shard.add_slice_arguments)."""
+    parser.add_argument("--families", metavar="FILE",
+                        help="Write this run's family boundaries to FILE (for scripts/monitor.py)")
+
+
+def family_bounds(keyspace: Keyspace) -> List[Tuple[str, int, int]]:
+    """(name, start, stop) of every family of `keyspace`, named as python3 -m cmw tested names them."""
+    if not isinstance(keyspace, Chain):
+        return [("All candidates", 0, len(keyspace))]
+    return [(name or f"Family {number}", start, stop)
+            for number, (name, start, stop) in enumerate(keyspace.families(), 1)]
+
+
+def write_families(path: str, keyspace: Keyspace, started: int, stop: int):
+    """Save the families of [started, stop), atomically."""
+    record = {
+        "version": FAMILIES_VERSION,
+        "total": len(keyspace),
+        "started": started,
+        "stop": stop,
+        "families": [[name, max(start, started), min(end, stop)]
+                     for name, start, end in family_bounds(keyspace) if start < stop and end > started],
+    }
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(record, f, indent=1)
+    os.replace(temporary, path)
+
+
+class Families:
+    """
+    A run's family boundaries, as write_families() saved them. An
+    incomplete run (a sidecar still being written) knows only where its
+    last family starts; `index_of` maps hashcat's count to a generator
+    index when that is not simply started + count.
+    """
+
+    def __init__(self, started: int, stop: int, families: List[Tuple[str, int, int]], complete: bool = True,
+                 index_of: Optional[Callable[[int], Optional[int]]] = None):
+        self.started = started
+        self.stop = stop
+        self.names = [name for name, _, _ in families]
+        self.starts = [start for _, start, _ in families]
+        self.stops = [end for _, _, end in families]
+        self.complete = complete
+        self._index_of = index_of
+
+    @classmethod
+    def load(cls, path: str) -> "Families":
+        with open(path) as f:
+            record = json.load(f)
+        if record.get("version") != FAMILIES_VERSION:
+            raise ValueError(f"{path}: families version {record.get('version')}, expected {FAMILIES_VERSION}")
+        return cls(record["started"], record["stop"], [tuple(family) for family in record["families"]])
+
+    @classmethod
+    def from_sidecar(cls, path: str) -> "Families":
+        """The families of a --sidecar file, in output lines."""
+        index = SidecarIndex.load(path)
+        families = list(index.families())
+        stop = families[-1][2] if families else 0
+        return cls(0, stop, families, complete=index.end is not None, index_of=index.index_of)
+
+    def index_of(self, hashed: int) -> Optional[int]:
+        """Generator index of the candidate `hashed` words into the run."""
+        return self.started + hashed if self._index_of is None else self._index_of(hashed)
+
+    def locate(self, index: int) -> Optional[int]:
+        """Position in the list of the family holding `index` (generator index, or line of a sidecar)."""
+        number = bisect.bisect_right(self.starts, index) - 1
+        if number < 0 or (index >= self.stops[number] and (self.complete or number < len(self.starts) - 1)):
+            return None
+        return number
+
+
+def status_position(status: dict) -> int:
+    """Words hashcat has finished since it started (restore_point, else progress)."""
+    hashed = status.get("restore_point")
+    return status["progress"][0] if hashed is None else hashed
+
+
+def status_speed(status: dict) -> float:
+    """hashcat's current H/s over every device."""
+    return float(sum(device.get("speed", 0) for device in status.get("devices", [])))
+
+
+class Monitor:
+    """Per-family progress from a stream of hashcat statuses."""
+
+    def __init__(self, families: Optional[Families] = None, log: Optional[TextIO] = None,
+                 window: float = RATE_WINDOW):
+        self.families = families
+        self.log = log
+        self.window = window
+        self.samples = deque()
+        # Where hashcat is, in the families' terms, and as a generator index
+        self.position = None
+        self.index = None
+        self.hashed = 0
+        self.speed = 0.0
+
+    def update(self, status: dict, now: Optional[float] = None):
+        now = time.time() if now is None else now
+        self.hashed = status_position(status)
+        self.speed = status_speed(status)
+        if self.families is not None:
+            self.position = self.families.started + self.hashed
+            self.index = self.families.index_of(self.hashed)
+        else:
+            self.position = self.index = self.hashed
+        self.samples.append((now, self.hashed))
+        while len(self.samples) > 2 and now - self.samples[1][0] >= self.window:
+            self.samples.popleft()
+        if self.log is not None:
+            number = self.family()
+            record = {"time": round(now, 3), "hashed": self.hashed, "index": self.index, "speed": self.speed,
+                      "rate": round(self.rate(), 1), "family": None if number is None else self.families.names[number]}
+            self.log.write(json.dumps(record) + "\n")
+            self.log.flush()
+
+    def rate(self) -> float:
+        """Base words per second over the window; hashcat's speed until there are two statuses."""
+        if len(self.samples) < 2 or self.samples[-1][0] <= self.samples[0][0]:
+            return self.speed
+        (first_time, first), (last_time, last) = self.samples[0], self.samples[-1]
+        return (last - first) / (last_time - first_time)
+
+    def family(self) -> Optional[int]:
+        if self.families is None or self.position is None:
+            return None
+        return self.families.locate(self.position)
+
+    def table(self) -> List[str]:
+        """The lines to show: totals, then one line per family."""
+        rate = self.rate()
+
+        def eta(remaining: int) -> str:
+            return format_duration(remaining / rate) if rate > 0 else "?"
+
+        lines = [f"hashed {self.hashed:,} | {self.speed:,.0f} H/s (hashcat) | {rate:,.0f} words/s (measured)"]
+        if self.families is None:
+            return lines
+        families = self.families
+        index = self.position if self.position is not None else families.started
+        total = families.stop - families.started
+        if families.complete:
+            lines[0] += f" | {min(index, families.stop) - families.started:,} of {total:,} " \
+                        f"({(index - families.started) / max(total, 1):.1%}) | ETA {eta(max(families.stop - index, 0))}"
+        else:
+            # The generator is at least as far as hashcat
+            total = max(families.stop, index) - families.started
+            lines[0] += f" | {total:,}+ generated so far"
+        width = max(len(name) for name in families.names) if families.names else 6
+        lines.append(f"{'family':<{width}}  {'candidates':>15}  {'done':>7}  {'state':<8}  ETA")
+        last = len(families.names) - 1
+        for number, (name, start, stop) in enumerate(zip(families.names, families.starts, families.stops)):
+            if not families.complete and number == last:
+                # Still being generated: its size is not known yet
+                state = "hashing" if index >= start else "queued"
+                lines.append(f"{name:<{width}}  {f'{max(stop, index) - start:,}+':>15}  {'?':>7}  {state:<8}  ?")
+                continue
+            done = min(max(index - start, 0), stop - start)
+            if index >= stop:
+                state, finish = "done", ""
+            elif index >= start:
+                state, finish = "hashing", eta(stop - index)
+            else:
+                state, finish = "queued", eta(stop - index)
+            lines.append(f"{name:<{width}}  {stop - start:>15,}  {done / max(stop - start, 1):>7.1%}  "
+                         f"{state:<8}  {finish}")
+        return lines
+
+
+def summarize(records: List[dict]) -> List[Tuple[Optional[str], float, int, float]]:
+    """(family, seconds, words, words/s) per family of a Monitor log, in the order they were hashed."""
+    rows = []
+    for previous, record in zip(records, records[1:]):
+        seconds = record["time"] - previous["time"]
+        words = record["hashed"] - previous["hashed"]
+        if seconds <= 0 or words < 0:
+            # A restarted hashcat: its count starts again
+            continue
+        if not rows or rows[-1][0] != previous["family"]:
+            rows.append([previous["family"], 0.0, 0])
+        rows[-1][1] += seconds
+        rows[-1][2] += words
+    return [(family, seconds, words, words / seconds) for family, seconds, words in rows]
@@ -0,0 +1,279 @@
+"""
+Character-level Markov model enumerated by probability level (OMEN).
+
+The template generators only produce what their word lists spell out;
+a near miss between two templates ("this is a dumbpassword", "this is
+my bad.password") is never reached. An n-gram model over characters,
+trained on the phrase corpora, reaches those too, and Ordered Markov
+ENumeration (Duermuth et al., ESORICS 2015) walks it most likely first:
+
+- every probability is turned into a level, 0 (most likely) to
+  MAX_LEVEL, by LEVEL_BITS bits of -log2(p) a level
+- a candidate of length l is an initial (n-1)-gram followed by l-n+1
+  conditional transitions; its level is the sum of their levels plus
+  the level of its length
+- candidates are emitted level by level (0, 1, 2, ...), so each level's
+  candidates are more likely, within the discretisation, than the next's
+
+Each (level, initial gram) is one depth-first walk over all lengths,
+keeping the level still to spend. Before the walk, a bitmask per prefix
+length and context records which exact level sums (length level
+included) it can still complete to, so a branch is only taken when it
+can end at exactly the target level. Transitions from contexts the corpus never
+showed are all at MAX_LEVEL (and bounded loosely in the table).
+
+Models are JSON counts, so retraining with other corpora is cheap and
+loading one takes milliseconds.
+
+Usage:
+    model = MarkovModel(order=4)
+    model.train(open("base_phrases.txt"))
+    model.save(DEFAULT_MODEL)
+    for batch in MarkovModel.load(DEFAULT_MODEL).enumerate(10, 32):
+        ...
+"""
+
+import functools
+import json
+import math
+import operator
+import os
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where scripts/omen.py saves the trained model by default
+DEFAULT_MODEL = os.path.join(ROOT, "models", "omen.json")
+
+# Phrase corpora (relative to the repo, weight), and the generator whose
+# word lists are added as one line per entry
+DEFAULT_CORPORA = [
+    ("base_phrases.txt", 1.0),
+    ("attempts/tested/2026-01-05-spite-password-tested/base_phrases_curated.txt", 25.0),
+]
+DEFAULT_VOCABULARY = ("attempts/tested/2026-01-05-10b-combined/generate_10b.py", [
+    "CORE_ADJECTIVES", "ERA_ADJECTIVES", "EXTENDED_ADJECTIVES", "EXTENDED_NOUNS",
+    "SHORT_PREFIXES", "MEDIUM_PREFIXES", "LONG_PREFIXES", "INTENSIFIERS", "TRAILING_PATTERNS",
+])
+
+DEFAULT_ORDER = 4
+MAX_LEVEL = 10
+LEVEL_BITS = 1.0
+
+# Added to every count of a seen context, so transitions the corpus
+# never showed stay possible (at a high level)
+SMOOTHING = 0.01
+
+# Length constraint of the enumeration (Dean: "something like 16", phrases up to 32)
+DEFAULT_MIN_LENGTH = 10
+DEFAULT_MAX_LENGTH = 32
+
+# Candidates per yielded batch
+BATCH_SIZE = 1 << 16
+
+# Move tables kept for contexts the corpus never showed
+UNSEEN_CACHE = 50_000
+
+MODEL_VERSION = 1
+
+
+def level(probability: float) -> int:
+    if probability <= 0:
+        return MAX_LEVEL
+    return min(MAX_LEVEL, int(-math.log2(probability) / LEVEL_BITS))
+
+
+def _levels(counts: Dict[str, float], alphabet: str, smoothing: float) -> Dict[int, str]:
+    """level -> characters at that level, for one distribution (smoothed over `alphabet`)."""
+    total = sum(counts.values()) + smoothing * len(alphabet)
+    grouped = defaultdict(list)
+    for char in alphabet:
+        grouped[level((counts.get(char, 0.0) + smoothing) / total)].append(char)
+    return {lvl: "".join(chars) for lvl, chars in sorted(grouped.items())}
+
+
+class MarkovModel:
+    """n-gram counts: initial (n-1)-grams, transitions per (n-1)-char context, lengths."""
+
+    def __init__(self, order: int = DEFAULT_ORDER):
+        if order < 2:
+            raise ValueError("the Markov order must be at least 2")
+        self.order = order
+        self.initial: Counter = Counter()
+        self.transitions: Dict[str, Counter] = defaultdict(Counter)
+        self.lengths: Counter = Counter()
+        self.sources: List[dict] = []
+
+    def train(self, lines: Iterable[str], weight: float = 1.0, source: str = "") -> int:
+        """Count the n-grams of every line (and its length); returns the lines used."""
+        context = self.order - 1
+        used = 0
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if len(line) < context:
+                continue
+            self.initial[line[:context]] += weight
+            for i in range(context, len(line)):
+                self.transitions[line[i - context:i]][line[i]] += weight
+            self.lengths[len(line)] += weight
+            used += 1
+        self.sources.append({"source": source, "weight": weight, "lines": used})
+        return used
+
+    @property
+    def alphabet(self) -> str:
+        chars = set()
+        for gram in self.initial:
+            chars.update(gram)
+        for counts in self.transitions.values():
+            chars.update(counts)
+        return "".join(sorted(chars))
+
+    def _build(self, min_length: int, max_length: int):
+        """
+        Level tables, initial grams, length levels, and which level sums
+        each context can still complete to.
+        """
+        alphabet = self.alphabet
+        context = self.order - 1
+        # context -> [(level, [(char, next context), ...]), ...], levels ascending
+        moves = {}
+        for ctx, counts in self.transitions.items():
+            moves[ctx] = [(lvl, [(char, (ctx + char)[1:]) for char in chars])
+                          for lvl, chars in _levels(counts, alphabet, SMOOTHING).items()]
+
+        lengths = range(min_length, max_length + 1)
+        in_range = {length: self.lengths.get(length, 0.0) for length in lengths}
+        length_levels = dict(zip(lengths, _levels_by_key(in_range, SMOOTHING)))
+
+        # reach[k][ctx]: bit c set when k more transitions from ctx can
+        # cost exactly c levels. Unseen contexts start with a MAX_LEVEL
+        # step and are bounded loosely after that
+        steps = max(max_length - context, 0)
+        unseen = [1] + [((1 << ((k - 1) * MAX_LEVEL + 1)) - 1) << MAX_LEVEL for k in range(1, steps + 1)]
+        reach = [dict.fromkeys(moves, 1)]
+        for k in range(1, steps + 1):
+            previous, fallback, current = reach[-1], unseen[k - 1], {}
+            for ctx, table in moves.items():
+                mask = 0
+                for lvl, targets in table:
+                    for _, target in targets:
+                        mask |= previous.get(target, fallback) << lvl
+                current[ctx] = mask
+            reach.append(current)
+
+        # finish[p][ctx]: the same for a prefix of length p ending in ctx,
+        # over every length it can still be completed to, length level included
+        finish = {}
+        for p in range(context, max_length + 1):
+            ends = [(length - p, lvl) for length, lvl in length_levels.items() if length >= p]
+            table = {ctx: 0 for ctx in moves}
+            for k, lvl in ends:
+                for ctx, mask in reach[k].items():
+                    table[ctx] |= mask << lvl
+            finish[p] = (table, functools.reduce(operator.or_, (unseen[k] << lvl for k, lvl in ends), 0))
+
+        # Initial grams the corpus never started a line with are not enumerated
+        initial = defaultdict(list)
+        total = sum(self.initial.values())
+        for gram, count in sorted(self.initial.items()):
+            initial[level(count / total)].append(gram)
+        return moves, finish, dict(sorted(initial.items())), length_levels
+
+    def enumerate(self, min_length: int = DEFAULT_MIN_LENGTH, max_length: int = DEFAULT_MAX_LENGTH,
+                  max_level: Optional[int] = None) -> Iterator[Tuple[int, List[str]]]:
+        """
+        (level, batch of candidates) for levels 0, 1, ... up to `max_level`
+        (default: every level a candidate of max_length can have).
+        """
+        context = self.order - 1
+        if max_length < context:
+            return
+        moves, finish, initial, lengths = self._build(min_length, max_length)
+        alphabet = self.alphabet
+        if max_level is None:
+            max_level = MAX_LEVEL * (max_length - context + 2)
+        # Move tables of contexts the corpus never showed, built as the walk meets them
+        unseen = {}
+        batch = []
+        for total in range(max_level + 1):
+            for gram_level, grams in initial.items():
+                budget = total - gram_level
+                if budget < 0:
+                    break
+                table, fallback = finish[context]
+                stack = [(gram, gram, budget) for gram in reversed(grams)
+                         if table.get(gram, fallback) >> budget & 1]
+                while stack:
+                    prefix, ctx, left = stack.pop()
+                    size = len(prefix)
+                    if lengths.get(size) == left:
+                        batch.append(prefix)
+                        if len(batch) >= BATCH_SIZE:
+                            yield total, batch
+                            batch = []
+                    if size == max_length:
+                        continue
+                    after, fallback = finish[size + 1]
+                    choices = moves.get(ctx) or unseen.get(ctx)
+                    if choices is None:
+                        if len(unseen) >= UNSEEN_CACHE:
+                            unseen.clear()
+                        choices = unseen[ctx] = [(MAX_LEVEL, [(char, ctx[1:] + char) for char in alphabet])]
+                    for lvl, targets in choices:
+                        rest = left - lvl
+                        if rest < 0:
+                            break
+                        for char, target in reversed(targets):
+                            if after.get(target, fallback) >> rest & 1:
+                                stack.append((prefix + char, target, rest))
+            if batch:
+                yield total, batch
+                batch = []
+
+    def save(self, path: str = DEFAULT_MODEL):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        model = {
+            "version": MODEL_VERSION,
+            "trained": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "order": self.order,
+            "sources": self.sources,
+            "lengths": {str(length): count for length, count in sorted(self.lengths.items())},
+            "initial": dict(self.initial.most_common()),
+            "transitions": {context: dict(counts.most_common()) for context, counts in sorted(self.transitions.items())},
+        }
+        with open(path, "w") as f:
+            json.dump(model, f)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL) -> "MarkovModel":
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"{path}: model version {data.get('version')}, expected {MODEL_VERSION}; retrain it")
+        model = cls(data["order"])
+        model.sources = data["sources"]
+        model.lengths.update({int(length): count for length, count in data["lengths"].items()})
+        model.initial.update(data["initial"])
+        for context, counts in data["transitions"].items():
+            model.transitions[context].update(counts)
+        return model
+
+    def describe(self, min_length: int = DEFAULT_MIN_LENGTH, max_length: int = DEFAULT_MAX_LENGTH,
+                 file: Optional[TextIO] = None):
+        out = file or sys.stdout
+        for source in self.sources:
+            print(f"# {source['source']} ({source['lines']:,} lines, weight {source['weight']:g})", file=out)
+        print(f"Order {self.order}: {len(self.alphabet)} characters, {len(self.initial):,} initial grams, "
+              f"{len(self.transitions):,} contexts", file=out)
+        lengths = self._build(min_length, max_length)[-1]
+        print("Length levels: " + ", ".join(f"{length}:{lvl}" for length, lvl in lengths.items()), file=out)
+
+
+def _levels_by_key(counts: Dict[int, float], smoothing: float) -> List[int]:
+    """Level of each key of `counts` (in order), smoothed over the keys."""
+    total = sum(counts.values()) + smoothing * len(counts)
+    return [level((count + smoothing) / total) for count in counts.values()]
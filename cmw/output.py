@@ -0,0 +1,278 @@
+"""
+Batched binary output for candidate streams.
+
+print(candidate) costs one str->bytes encode and one write call per
+line, which at 10B lines is most of a generator's CPU time. The writer
+collects candidates into batches, joins each batch into one
+newline-terminated bytes buffer and hands it to the sink in a single
+write. The sink is stdout, a file or a FIFO (opened for writing, so it
+blocks until hashcat opens the other end).
+
+When the reader goes away (hashcat exits on a crack, `| head`), the
+writer stops quietly instead of dying with a BrokenPipeError traceback,
+and the run still ends with its lines/s and bytes/s report on stderr.
+
+With --skip-tested DIR every block first goes through the cmw.coverage
+filter, which drops candidates an earlier attempt already tested. With
+--sidecar FILE the writer records where each family starts in the
+output (cmw.sidecar).
+
+Usage:
+    add_output_arguments(parser)    # --output PATH, --buffer-size, --report-every, --skip-tested, --sidecar
+    with open_writer(args) as out:
+        out.write_all(generate_all())
+
+    mkfifo /tmp/cands && hashcat -m 11300 -a 0 hash.txt /tmp/cands &
+    python3 generate.py --output /tmp/cands
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+from typing import BinaryIO, Iterable, Iterator, List, Optional, TextIO
+
+from cmw.sidecar import Sidecar, add_sidecar_arguments, stream_start
+
+# Bytes per write: large enough that syscalls and encode calls vanish
+# from the profile, small enough to keep hashcat's pipe fed steadily
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+# Used to turn a byte budget into a batch length before any candidate is
+# seen (the attempt candidates are mostly 15-35 characters)
+TYPICAL_LINE_BYTES = 24
+
+
+def parse_size(text: str) -> int:
+    """Parse a byte count with an optional K/M/G suffix ("4M" -> 4194304)."""
+    units = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30}
+    try:
+        if text[-1:].lower() in units:
+            size = int(text[:-1]) * units[text[-1].lower()]
+        else:
+            size = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"size must look like 65536 or 4M, got {text!r}")
+    if size < 1:
+        raise argparse.ArgumentTypeError(f"size {text!r} must be positive")
+    return size
+
+
+def add_output_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the shared --output / --buffer-size / --report-every / --skip-tested
+    options (and cmw.sidecar's --sidecar) to a generator's parser.
+    """
+    parser.add_argument("--output", "-o", metavar="PATH",
+                        help="Write to a file or FIFO instead of stdout")
+    parser.add_argument("--buffer-size", type=parse_size, default=DEFAULT_BUFFER_SIZE, metavar="BYTES",
+                        help="Bytes per write (suffix K/M/G, default 1M)")
+    parser.add_argument("--report-every", type=float, default=0.0, metavar="SECONDS",
+                        help="Log lines/s and bytes/s to stderr every SECONDS (default: at the end only)")
+    parser.add_argument("--skip-tested", metavar="DIR",
+                        help="Drop candidates already in the coverage store DIR "
+                             "(built by scripts/build_coverage.py)")
+    add_sidecar_arguments(parser)
+
+
+def format_bytes(size: float) -> str:
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1000:
+            return f"{size:.1f} {unit}"
+        size /= 1000
+    return f"{size:.1f} TB"
+
+
+class CandidateWriter:
+    """
+    Newline-terminated candidate sink with batched, encoded writes.
+
+    path None or "-" writes to stdout. Candidates written one at a time
+    with write() are batched internally; write_all() batches a whole
+    iterable; write_block() passes through buffers that are already
+    rendered (e.g. by the cmw.parallel workers). A `skip` filter (a
+    cmw.coverage.CoverageFilter) sees every block before it is written.
+    A `sidecar` (cmw.sidecar.Sidecar) records where families start.
+    """
+
+    def __init__(self, path: Optional[str] = None, buffer_size: int = DEFAULT_BUFFER_SIZE,
+                 report_every: float = 0.0, log: Optional[TextIO] = None, skip=None,
+                 sidecar: Optional[Sidecar] = None):
+        self.path = None if path in (None, "-") else path
+        self.buffer_size = buffer_size
+        self.batch_lines = max(1, buffer_size // TYPICAL_LINE_BYTES)
+        self.report_every = report_every
+        self.log = log or sys.stderr
+        self.lines = 0
+        self.bytes = 0
+        # Candidates handed to the writer, before --skip-tested dropped any
+        self.taken = 0
+        self.reader_closed = False
+        self.skip = skip
+        self.sidecar = sidecar
+        self._pending: List[str] = []
+        self._sink = self._open()
+        self._started = self._last_report = time.perf_counter()
+
+    def _open(self) -> BinaryIO:
+        self._owns_sink = True
+        if self.path is not None:
+            return open(self.path, "wb", buffering=self.buffer_size)
+        # Anything already printed (headers) must come out first
+        sys.stdout.flush()
+        try:
+            # Our own buffer over fd 1; closing it leaves stdout open
+            return open(sys.stdout.fileno(), "wb", buffering=self.buffer_size, closefd=False)
+        except (AttributeError, OSError, ValueError):
+            # stdout replaced by something without a file descriptor
+            self._owns_sink = False
+            return sys.stdout.buffer
+
+    def __enter__(self) -> "CandidateWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> bool:
+        if exc_type is not None and issubclass(exc_type, BrokenPipeError):
+            self.reader_closed = True
+        self.close()
+        return self.reader_closed
+
+    def write(self, candidate: str):
+        self._pending.append(candidate)
+        if len(self._pending) >= self.batch_lines:
+            self._flush_pending()
+
+    def write_all(self, candidates: Iterable[str], limit: Optional[int] = None) -> int:
+        """Write every candidate (at most `limit`); returns how many were written."""
+        self._flush_pending()
+        before = self.lines
+        stream = iter(candidates) if limit is None else itertools.islice(candidates, limit)
+        if self.sidecar is not None:
+            self._write_indexed(stream)
+            return self.lines - before
+        while True:
+            batch = list(itertools.islice(stream, self.batch_lines))
+            if not batch:
+                break
+            self._emit(("\n".join(batch) + "\n").encode(), len(batch))
+        return self.lines - before
+
+    def _write_indexed(self, stream: Iterator[str]):
+        """write_all() with a sidecar: batches are cut where a family starts, and a row recorded there."""
+        sidecar = self.sidecar
+        while True:
+            family = sidecar.announced
+            remaining = sidecar.due - self.lines
+            batch = sidecar.pull(stream, min(self.batch_lines, remaining if remaining > 0 else sidecar.every))
+            if not batch:
+                break
+            position = 0
+            for cut, name in sidecar.take_cuts() + [(len(batch), family)]:
+                if cut > position:
+                    if family != sidecar.family or self.lines >= sidecar.due:
+                        sidecar.record(self, family)
+                    self._emit_batch(batch[position:cut])
+                    position = cut
+                family = name
+
+    def _emit_batch(self, batch: List[str]):
+        if batch:
+            self._emit(("\n".join(batch) + "\n").encode(), len(batch))
+            if self.sidecar is not None:
+                self.sidecar.index += len(batch) * self.sidecar.stride
+
+    def write_block(self, block: bytes, lines: Optional[int] = None):
+        """Write a pre-rendered newline-terminated buffer of `lines` candidates."""
+        self._flush_pending()
+        self._emit(block, block.count(b"\n") if lines is None else lines)
+
+    def flush(self):
+        self._flush_pending()
+        self._sink.flush()
+
+    def close(self):
+        """Flush and close the sink (stdout stays open), then log the totals."""
+        try:
+            if not self.reader_closed:
+                self.flush()
+        except BrokenPipeError:
+            self.reader_closed = True
+        if self.reader_closed:
+            self._pending.clear()
+            if self.path is None:
+                _silence_stdout()
+        try:
+            if self._owns_sink:
+                self._sink.close()
+            else:
+                self._sink.flush()
+        except BrokenPipeError:
+            pass
+        if self.sidecar is not None:
+            self.sidecar.close(self)
+        self.report(final=True)
+        if self.skip is not None:
+            self.skip.report(self.log)
+
+    def report(self, final: bool = False):
+        elapsed = max(time.perf_counter() - self._started, 1e-9)
+        rates = (f"{self.lines / elapsed:,.0f} lines/s, "
+                 f"{format_bytes(self.bytes / elapsed)}/s")
+        if final:
+            status = " (reader closed the pipe)" if self.reader_closed else ""
+            print(f"# Wrote {self.lines:,} candidates ({format_bytes(self.bytes)}) in "
+                  f"{elapsed:.1f}s: {rates}{status}", file=self.log)
+        else:
+            print(f"# {self.lines:,} candidates ({format_bytes(self.bytes)}): {rates}", file=self.log)
+
+    def _flush_pending(self):
+        if self._pending:
+            batch, self._pending = self._pending, []
+            self._emit_batch(batch)
+
+    def _emit(self, block: bytes, lines: int):
+        self.taken += lines
+        if self.skip is not None:
+            block, lines = self.skip.filter_block(block)
+        self._sink.write(block)
+        self.lines += lines
+        self.bytes += len(block)
+        if self.report_every:
+            now = time.perf_counter()
+            if now - self._last_report >= self.report_every:
+                self._last_report = now
+                self.report()
+
+
+def _silence_stdout():
+    """
+    Point stdout at /dev/null so the interpreter's own flush at exit does
+    not raise again on the dead pipe.
+    """
+    try:
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        os.close(devnull)
+    except (AttributeError, OSError, ValueError):
+        pass
+
+
+def open_writer(args: argparse.Namespace) -> CandidateWriter:
+    """CandidateWriter configured from add_output_arguments() options (defaults if absent)."""
+    skip = None
+    if getattr(args, "skip_tested", None):
+        # Imported here: the coverage store needs NumPy, plain output does not
+        from cmw.coverage import CoverageFilter
+        skip = CoverageFilter(args.skip_tested)
+    sidecar = None
+    if getattr(args, "sidecar", None):
+        sidecar = Sidecar(args.sidecar, args.sidecar_every, filtered=skip is not None)
+        sidecar.start(*stream_start(args))
+    return CandidateWriter(
+        path=getattr(args, "output", None),
+        buffer_size=getattr(args, "buffer_size", DEFAULT_BUFFER_SIZE),
+        report_every=getattr(args, "report_every", 0.0),
+        skip=skip,
+        sidecar=sidecar,
+    )
@@ -0,0 +1,256 @@
+"""
+Multi-process candidate generation with ordered merge to stdout.
+
+One Python process tops out well below what several GPUs (or a CPU
+verifier at low iteration counts) can consume. With --workers N the
+slice this host owns is cut into fixed-size index blocks; a pool of
+forked workers renders each block from the keyspace as one
+newline-joined bytes buffer (keyspace.render(), NumPy-backed for
+products of word lists), and the parent passes the buffers to the
+cmw.output writer (stdout, or --output).
+
+By default blocks are written in index order, so the output is
+byte-identical to a single-process run. --unordered writes each block
+as soon as it is ready: every candidate still appears exactly once, but
+slow blocks (large leet expansions) no longer hold up the rest.
+
+Either way at most a few blocks per worker are in flight, so memory
+stays flat when the consumer (hashcat) is slower than the workers.
+
+Usage:
+    add_parallel_arguments(parser)          # --workers N, --unordered
+    write_candidates(args, build_keyspace, generate_all)
+
+    python3 generate.py --workers 0 --shard 2/4 | hashcat ...   # 0 = all cores
+"""
+
+import argparse
+import itertools
+import multiprocessing
+import os
+import queue
+import sys
+from collections import deque
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+from cmw.checkpoint import Checkpoint
+from cmw.keyspace import Keyspace
+from cmw.monitor import family_bounds, write_families
+from cmw.output import open_writer
+from cmw.shard import keyspace_slice, select
+
+# Candidates per task: large enough to amortize pickling the result,
+# small enough to keep every worker busy near the end of a slice
+DEFAULT_BLOCK_SIZE = 50_000
+
+# Set in the parent before the pool forks; workers inherit it instead of
+# having the keyspace (lambdas, lazy lists) pickled to them
+_keyspace: Optional[Keyspace] = None
+
+
+def add_parallel_arguments(parser: argparse.ArgumentParser):
+    """Add the shared --workers / --unordered options to a generator's parser."""
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="Generate with N processes (0 = one per CPU core)")
+    parser.add_argument("--unordered", action="store_true",
+                        help="With --workers: write blocks as they finish, not in index order")
+
+
+def cpu_count() -> int:
+    """CPU cores this process may use (respects taskset/cgroup affinity)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+def resolve_workers(workers: int) -> int:
+    return cpu_count() if workers <= 0 else workers
+
+
+def _render(bounds: Tuple[int, int]) -> bytes:
+    return _keyspace.render(*bounds)
+
+
+def bounded_map(pool, func: Callable, tasks: Iterable, ahead: int, ordered: bool) -> Iterator:
+    """pool.imap / imap_unordered with at most `ahead` tasks submitted but not yet consumed."""
+    tasks = iter(tasks)
+    if ordered:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(func, (task,)))
+            if len(pending) >= ahead:
+                break
+        while pending:
+            result = pending.popleft().get()
+            task = next(tasks, None)
+            if task is not None:
+                pending.append(pool.apply_async(func, (task,)))
+            yield result
+        return
+
+    done = queue.Queue()
+    outstanding = 0
+    for task in tasks:
+        pool.apply_async(func, (task,), callback=done.put, error_callback=done.put)
+        outstanding += 1
+        if outstanding >= ahead:
+            break
+    while outstanding:
+        result = done.get()
+        outstanding -= 1
+        if isinstance(result, BaseException):
+            raise result
+        task = next(tasks, None)
+        if task is not None:
+            pool.apply_async(func, (task,), callback=done.put, error_callback=done.put)
+            outstanding += 1
+        yield result
+
+
+def block_bounds(start: int, stop: int, block_size: int = DEFAULT_BLOCK_SIZE,
+                 cuts: Iterable[int] = ()) -> Iterator[Tuple[int, int]]:
+    """[lo, hi) of each block of [start, stop), also cut at every index in `cuts` (family starts)."""
+    cuts = sorted(cut for cut in cuts if start < cut < stop)
+    for lo, hi in zip([start] + cuts, cuts + [stop]):
+        for block in range(lo, hi, block_size):
+            yield block, min(block + block_size, hi)
+
+
+def blocks(keyspace: Keyspace, start: int = 0, stop: Optional[int] = None, workers: int = 0,
+           ordered: bool = True, block_size: int = DEFAULT_BLOCK_SIZE, cuts: Iterable[int] = ()) -> Iterator[bytes]:
+    """
+    Newline-terminated bytes blocks covering keyspace[start:stop], rendered
+    by `workers` forked processes (in index order unless ordered=False),
+    or in this process when workers is 1. Blocks never span an index in
+    `cuts`.
+    """
+    global _keyspace
+    stop = len(keyspace) if stop is None else min(stop, len(keyspace))
+    workers = resolve_workers(workers)
+    _keyspace = keyspace.prepare()
+    bounds = block_bounds(start, stop, block_size, cuts)
+    if workers == 1:
+        yield from map(_render, bounds)
+        return
+    # fork: workers share the prepared keyspace copy-on-write
+    with multiprocessing.get_context("fork").Pool(workers) as pool:
+        yield from bounded_map(pool, _render, bounds, ahead=2 * workers, ordered=ordered)
+
+
+def write_candidates(args: argparse.Namespace,
+                     build_keyspace: Optional[Callable[[], Keyspace]] = None,
+                     generate_all: Optional[Callable[[], Iterable[str]]] = None) -> int:
+    """
+    Write this host's candidates (--shard / --range, capped by --limit
+    when the parser has one) through a CandidateWriter (--output etc.).
+
+    Keyspace-backed generators are rendered in index blocks: across
+    --workers processes, or in this process when the keyspace renders
+    with NumPy (cmw.vector) or a --checkpoint, --families or --sidecar
+    has to track the index. Everything else streams one candidate at a
+    time.
+    Returns the number of candidates written.
+    """
+    workers = resolve_workers(getattr(args, "workers", 1))
+    limit = getattr(args, "limit", None)
+    checkpointed = getattr(args, "checkpoint", None) is not None
+    families = getattr(args, "families", None)
+    indexed = getattr(args, "sidecar", None) is not None
+    keyspace = build_keyspace() if build_keyspace is not None else None
+    if keyspace is None or (workers == 1 and not keyspace.vectorized and not checkpointed and not families
+                            and not indexed):
+        if workers != 1:
+            print("# --workers needs a keyspace; generating on one core", file=sys.stderr)
+        if families:
+            print("# --families needs a keyspace; no family boundaries written", file=sys.stderr)
+        stream = select(args, None if keyspace is None else lambda: keyspace, generate_all)
+        if checkpointed:
+            return _write_stream_checkpointed(args, stream, limit)
+        with open_writer(args) as out:
+            out.write_all(stream, limit)
+        return out.lines
+
+    start, stop = keyspace_slice(args, keyspace)
+    if limit is not None:
+        stop = min(stop, start + limit)
+    ordered = not getattr(args, "unordered", False)
+    checkpoint = None
+    if checkpointed:
+        if not ordered:
+            sys.exit("--checkpoint needs ordered output; drop --unordered")
+        checkpoint = _checkpoint(args, start, stop, len(keyspace), keyspace)
+        start = checkpoint.resume()
+    if indexed and not ordered:
+        sys.exit("--sidecar needs ordered output; drop --unordered")
+    if families:
+        write_families(families, keyspace, start, stop)
+    cuts = [family_start for _, family_start, _ in family_bounds(keyspace)] if indexed else ()
+    if workers > 1:
+        print(f"# Generating {stop - start:,} candidates with {workers} workers "
+              f"({'ordered' if ordered else 'unordered'})", file=sys.stderr)
+
+    with open_writer(args) as out:
+        if out.sidecar is not None:
+            out.sidecar.append = checkpoint is not None and checkpoint.resumed
+            out.sidecar.use_keyspace(family_bounds(keyspace))
+        position = start
+        try:
+            for (lo, hi), block in zip(block_bounds(start, stop, DEFAULT_BLOCK_SIZE, cuts),
+                                       blocks(keyspace, start, stop, workers, ordered=ordered, cuts=cuts)):
+                if out.sidecar is not None:
+                    out.sidecar.block(out, lo, hi)
+                out.write_block(block)
+                if checkpoint is not None:
+                    position = hi
+                    checkpoint.update(position, out.flush)
+        finally:
+            if checkpoint is not None:
+                _save_final(checkpoint, out, position, position == stop)
+    return out.lines
+
+
+def _checkpoint(args: argparse.Namespace, start: int, stop: Optional[int], total: Optional[int],
+                keyspace: Optional[Keyspace] = None) -> Checkpoint:
+    return Checkpoint(args.checkpoint, start, stop, total, every=args.checkpoint_every,
+                      rewind=args.checkpoint_rewind, keyspace=keyspace)
+
+
+def _save_final(checkpoint: Checkpoint, out, position: int, complete: bool):
+    """Save where the run ended; done only when the whole slice reached the reader."""
+    try:
+        out.flush()
+    except BrokenPipeError:
+        out.reader_closed = True
+    checkpoint.position = position
+    checkpoint.save(done=complete and not out.reader_closed)
+
+
+def _write_stream_checkpointed(args: argparse.Namespace, stream: Iterator[str], limit: Optional[int]) -> int:
+    """
+    write_all() for a stream without a keyspace, saving how far into the
+    stream it got: candidates taken, not lines written, since
+    --skip-tested may drop whole blocks.
+    """
+    checkpoint = _checkpoint(args, 0, limit, None)
+    position = checkpoint.resume()
+    if checkpoint.done:
+        return 0
+    stream = itertools.islice(stream, position, limit)
+    finished = False
+    with open_writer(args) as out:
+        if out.sidecar is not None:
+            out.sidecar.append = checkpoint.resumed
+            out.sidecar.skip(position)
+        try:
+            while True:
+                taken = out.taken
+                out.write_all(itertools.islice(stream, DEFAULT_BLOCK_SIZE))
+                if out.taken == taken:
+                    break
+                position += out.taken - taken
+                checkpoint.update(position, out.flush)
+            finished = True
+        finally:
+            _save_final(checkpoint, out, position, finished)
+    return out.lines
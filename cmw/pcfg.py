@@ -0,0 +1,267 @@
+"""
+Probabilistic context-free grammar trained from the seed phrase lists.
+
+base_phrases.txt, the curated spite list and the btcrecover token list
+are the team's intuition written down; the trainer turns them into a
+PCFG in the style of Weir et al. Each seed line is split into runs:
+
+- L<n>: n letters, stored lower-cased (case is learned separately)
+- D<n>: n digits
+- S<n>: n other characters
+- _:    a single " ", ".", "-" or "_" between two runs (a separator)
+
+"This is a.bad.password" becomes the structure L4 _ L2 _ L1 _ L3 _ L8,
+the terminals this/is/a/bad/password of L4/L2/L1/L3/L8, the separator
+pattern "  .." and the case mask "c l l l l" (per letter run: lower,
+capitalised, upper, or the exact U/L mask). Structures, terminals,
+separator patterns and case masks are each counted, and a guess has
+probability P(structure) x P(each terminal | its class) x P(separator
+pattern) x P(case mask).
+
+Token lists (one token per line, # comments) only add terminals: a token
+made of one run counts for its class, anything else (p455 is L1 D3) is
+skipped. The seed phrases carry no trailing characters, so the model
+also has a suffix weight: that share of every structure's probability
+goes to the same structure with one trailing D/S run appended, the run
+drawn from the D and S terminals.
+
+Model.grammar() turns the model into a cmw.ranked.Grammar, which
+enumerates guesses in descending probability. Models are saved as JSON
+counts, so loading one costs milliseconds.
+
+Usage:
+    model = Model()
+    model.train_phrases(open("base_phrases.txt"))
+    model.train_tokens(open("btcrecover_tokens.txt"))
+    model.save(DEFAULT_MODEL)
+    for probability, guess in Model.load(DEFAULT_MODEL).grammar().ranked(): ...
+"""
+
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, TextIO, Tuple
+
+from cmw.ranked import Grammar, Slot, Template
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Where scripts/pcfg.py saves the trained model by default
+DEFAULT_MODEL = os.path.join(ROOT, "models", "pcfg.json")
+
+# (path relative to the repo, weight, kind); the curated list is 49
+# hand-picked lines against 15,542 generated ones, so it counts more
+DEFAULT_SEEDS = [
+    ("base_phrases.txt", 1.0, "phrases"),
+    ("attempts/tested/2026-01-05-spite-password-tested/base_phrases_curated.txt", 25.0, "phrases"),
+    ("attempts/tested/2026-01-05-spite-password-tested/btcrecover_tokens.txt", 1.0, "tokens"),
+]
+
+# Share of each structure's probability given to it with a trailing run
+DEFAULT_SUFFIX_WEIGHT = 0.5
+
+SEPARATORS = " .-_"
+SEPARATOR = "_"
+
+RUN = re.compile(r"[A-Za-z]+|[0-9]+|[^A-Za-z0-9]+")
+
+MODEL_VERSION = 1
+
+
+def run_class(run: str) -> str:
+    if run.isalpha() and run.isascii():
+        return f"L{len(run)}"
+    if run.isdigit() and run.isascii():
+        return f"D{len(run)}"
+    return f"S{len(run)}"
+
+
+def case_class(run: str) -> str:
+    """l, c, u, or the exact U/L mask of a letter run."""
+    if run.islower():
+        return "l"
+    if run[0].isupper() and (len(run) == 1 or run[1:].islower()):
+        return "c"
+    if run.isupper():
+        return "u"
+    return "".join("U" if c.isupper() else "L" for c in run)
+
+
+def apply_case(word: str, case: str) -> Optional[str]:
+    """`word` (lower case) in case class `case`; None when an exact mask does not fit it."""
+    if case == "l":
+        return word
+    if case == "c":
+        return word[:1].upper() + word[1:]
+    if case == "u":
+        return word.upper()
+    if len(case) != len(word):
+        return None
+    return "".join(c.upper() if m == "U" else c for c, m in zip(word, case))
+
+
+def parse(line: str) -> Tuple[Tuple[str, ...], List[str], str, Tuple[str, ...]]:
+    """(structure, terminals, separator pattern, case mask) of one seed line."""
+    runs = RUN.findall(line)
+    structure, terminals, separators, cases = [], [], [], []
+    for position, run in enumerate(runs):
+        if len(run) == 1 and run in SEPARATORS and 0 < position < len(runs) - 1:
+            structure.append(SEPARATOR)
+            separators.append(run)
+            continue
+        token = run_class(run)
+        structure.append(token)
+        if token[0] == "L":
+            cases.append(case_class(run))
+            run = run.lower()
+        terminals.append(run)
+    return tuple(structure), terminals, "".join(separators), tuple(cases)
+
+
+class Model:
+    """Weighted counts of structures, terminals per class, separator patterns and case masks."""
+
+    def __init__(self, suffix_weight: float = DEFAULT_SUFFIX_WEIGHT):
+        self.suffix_weight = suffix_weight
+        self.structures: Counter = Counter()
+        self.terminals: Dict[str, Counter] = defaultdict(Counter)
+        # Keyed by the number of separators / letter runs they cover
+        self.separators: Dict[int, Counter] = defaultdict(Counter)
+        self.cases: Dict[int, Counter] = defaultdict(Counter)
+        self.sources: List[dict] = []
+
+    def train_phrases(self, lines: Iterable[str], weight: float = 1.0, source: str = "") -> int:
+        """Learn structures and terminals from whole seed phrases; returns the lines used."""
+        used = 0
+        for line in lines:
+            line = line.rstrip("\r\n")
+            if not line.strip():
+                continue
+            structure, terminals, separators, cases = parse(line)
+            self.structures[structure] += weight
+            for token, terminal in zip((t for t in structure if t != SEPARATOR), terminals):
+                self.terminals[token][terminal] += weight
+            if separators:
+                self.separators[len(separators)][separators] += weight
+            if cases:
+                self.cases[len(cases)][cases] += weight
+            used += 1
+        self.sources.append({"source": source, "kind": "phrases", "weight": weight, "lines": used})
+        return used
+
+    def train_tokens(self, lines: Iterable[str], weight: float = 1.0, source: str = "") -> int:
+        """Learn terminals only from a token list (one run per token); returns the tokens used."""
+        used = 0
+        for line in lines:
+            token = line.strip()
+            if not token or token.startswith("#"):
+                continue
+            runs = RUN.findall(token)
+            if len(runs) != 1:
+                continue
+            terminal = token.lower() if run_class(token)[0] == "L" else token
+            self.terminals[run_class(token)][terminal] += weight
+            used += 1
+        self.sources.append({"source": source, "kind": "tokens", "weight": weight, "lines": used})
+        return used
+
+    def trailing(self) -> Dict[str, float]:
+        """Probability of each D/S class as the appended trailing run."""
+        totals = {token: sum(counts.values()) for token, counts in self.terminals.items() if token[0] in "DS"}
+        total = sum(totals.values())
+        return {token: count / total for token, count in sorted(totals.items())} if total else {}
+
+    def grammar(self) -> Grammar:
+        """The model as a weighted grammar, one template per (structure, trailing class)."""
+        trailing = self.trailing()
+        templates = []
+        for structure, count in sorted(self.structures.items(), key=lambda item: -item[1]):
+            suffixed = trailing and structure[-1][0] == "L"
+            templates.append(self._template(structure, count * (1 - self.suffix_weight if suffixed else 1)))
+            if suffixed:
+                for token, share in trailing.items():
+                    templates.append(self._template(structure + (token,), count * self.suffix_weight * share))
+        return Grammar(templates)
+
+    def _template(self, structure: Tuple[str, ...], weight: float) -> Template:
+        classes = [token for token in structure if token != SEPARATOR]
+        separators = structure.count(SEPARATOR)
+        letters = sum(token[0] == "L" for token in classes)
+        slots = [Slot(list(self.terminals[token]), list(self.terminals[token].values()), token)
+                 for token in classes]
+        if separators:
+            counts = self.separators[separators]
+            slots.append(Slot(list(counts), list(counts.values()), "separators"))
+        if letters:
+            counts = self.cases[letters]
+            slots.append(Slot(list(counts), list(counts.values()), "case"))
+
+        def build(*values) -> Optional[str]:
+            terminals = iter(values[:len(classes)])
+            separator = iter(values[len(classes)] if separators else "")
+            case = iter(values[-1] if letters else ())
+            parts = []
+            for token in structure:
+                if token == SEPARATOR:
+                    parts.append(next(separator))
+                    continue
+                terminal = next(terminals)
+                if token[0] == "L":
+                    terminal = apply_case(terminal, next(case))
+                    if terminal is None:
+                        return None
+                parts.append(terminal)
+            return "".join(parts)
+
+        return Template(slots, weight, build, " ".join(structure))
+
+    def save(self, path: str = DEFAULT_MODEL):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        model = {
+            "version": MODEL_VERSION,
+            "trained": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "sources": self.sources,
+            "suffix_weight": self.suffix_weight,
+            "structures": {" ".join(structure): count for structure, count in self.structures.most_common()},
+            "terminals": {token: dict(counts.most_common()) for token, counts in sorted(self.terminals.items())},
+            "separators": {str(k): dict(counts.most_common()) for k, counts in sorted(self.separators.items())},
+            "cases": {str(k): {" ".join(mask): count for mask, count in counts.most_common()}
+                      for k, counts in sorted(self.cases.items())},
+        }
+        with open(path, "w") as f:
+            json.dump(model, f, indent=1)
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL) -> "Model":
+        with open(path) as f:
+            data = json.load(f)
+        if data.get("version") != MODEL_VERSION:
+            raise ValueError(f"{path}: model version {data.get('version')}, expected {MODEL_VERSION}; retrain it")
+        model = cls(data["suffix_weight"])
+        model.sources = data["sources"]
+        model.structures.update({tuple(key.split(" ")): count for key, count in data["structures"].items()})
+        for token, counts in data["terminals"].items():
+            model.terminals[token].update(counts)
+        for k, counts in data["separators"].items():
+            model.separators[int(k)].update(counts)
+        for k, counts in data["cases"].items():
+            model.cases[int(k)].update({tuple(mask.split(" ")): count for mask, count in counts.items()})
+        return model
+
+    def describe(self, top: int = 10, file: Optional[TextIO] = None):
+        """Print the sources, the most likely structures and the size of every class."""
+        out = file or sys.stdout
+        for source in self.sources:
+            print(f"# {source['kind']}: {source['source']} ({source['lines']:,} lines, weight {source['weight']:g})",
+                  file=out)
+        total = sum(self.structures.values())
+        print(f"Structures: {len(self.structures):,} (suffix weight {self.suffix_weight:g})", file=out)
+        for structure, count in self.structures.most_common(top):
+            print(f"  {count / total:6.2%}  {' '.join(structure)}", file=out)
+        print("Terminal classes:", file=out)
+        for token, counts in sorted(self.terminals.items(), key=lambda item: (item[0][0], int(item[0][1:]))):
+            common = ", ".join(repr(terminal) for terminal, _ in counts.most_common(5))
+            print(f"  {token:<4} {len(counts):>6,}  {common}", file=out)
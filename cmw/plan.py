@@ -0,0 +1,500 @@
+"""
+Compile a generator's keyspace into a hashcat attack plan.
+
+Most of the volume of the big generators is "bases x trailing patterns":
+a few thousand (or a few million) words, each followed by every suffix
+in a fixed list. Piping that through hashcat -a 0 means rendering and
+shipping every line from the host. hashcat can do the appending on the
+GPU instead, so the plan factors the keyspace into steps:
+
+- hybrid:   base wordlist + .hcmask (-a 6), when the suffix list is the
+            union of a few masks (0-4 chars over a charset, optional
+            separator + charset, ...); an empty suffix in the list adds
+            a straight pass over the same wordlist
+- rules:    base wordlist + one append rule per suffix (-a 0 -r), for
+            irregular suffix lists (years, "!@#", "qwerty", ...)
+- mask:     a pure mask attack (-a 3), when every position of a product
+            is a character set (per-position charset brute force)
+- pipe:     everything else, streamed from the generator with --range
+            as before (Seq families, expansions that don't share one
+            suffix list, steps too small to be worth a hashcat start)
+
+Each step covers a contiguous index range of the generator's keyspace,
+so the plan together with its pipe steps covers the keyspace exactly.
+Masks are factored exactly (no extra candidates); custom charsets are
+written inline in the .hcmask lines, so no .hcchr files are needed.
+
+Usage:
+    steps = compile_plan(build_keyspace())
+    print_plan(steps)
+    write_plan(steps, "plan/", generator="attempts/.../generate.py")
+"""
+
+import math
+import os
+import re
+import string
+import sys
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from cmw.keyspace import Chain, FlatMap, Keyspace, Product
+from cmw.output import CandidateWriter
+
+# Above this many hcmask lines a rules file is simpler and as fast
+MAX_MASK_LINES = 32
+
+# hashcat loads every rule into GPU memory; the 0-4 char brute-force
+# trailing sets (54k) are fine, but keep far from its limits
+MAX_RULES = 100_000
+
+# Wordlists are written to disk (~25 bytes a word)
+MAX_WORDLIST_WORDS = 200_000_000
+
+# A hashcat start (kernel build, -m 11300 init) costs seconds; smaller
+# steps are cheaper to pipe
+MIN_STEP_CANDIDATES = 1_000_000
+
+# Distinct suffix lists one FlatMap may split into before it is piped
+MAX_SUFFIX_LISTS = 8
+
+# hashcat built-in charsets usable in masks without a custom slot
+BUILTIN_CHARSETS = {
+    "?l": frozenset(string.ascii_lowercase),
+    "?u": frozenset(string.ascii_uppercase),
+    "?d": frozenset(string.digits),
+    "?s": frozenset(" !\"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~"),
+}
+
+HASH_MODE = 11300
+
+
+class Words:
+    """A step's base wordlist: its size and a way to stream it (in keyspace order)."""
+
+    def __init__(self, count: int, source: Callable[[], Iterable[str]]):
+        self.count = count
+        self.source = source
+
+    @classmethod
+    def of(cls, keyspace: Keyspace) -> "Words":
+        return cls(len(keyspace), lambda: keyspace)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.source())
+
+    def __add__(self, other: "Words") -> "Words":
+        return Words(self.count + other.count, lambda: _chain(self, other))
+
+
+def _chain(*word_lists: "Words") -> Iterator[str]:
+    for words in word_lists:
+        yield from words
+
+
+class Piece:
+    """
+    keyspace[start:stop] factored as words x suffixes, words x one mask
+    (positions), a bare mask (no words) -- or nothing (a pipe).
+
+    A shared piece is one of several that split keyspace[start:stop]
+    between suffix lists (a FlatMap whose expansions use more than one);
+    it holds `size` of those candidates, not a contiguous range.
+    """
+
+    def __init__(self, start: int, stop: int, words: Optional[Words] = None,
+                 suffixes: Optional[Tuple[str, ...]] = None,
+                 positions: Optional[Tuple[str, ...]] = None,
+                 size: Optional[int] = None):
+        self.start = start
+        self.stop = stop
+        self.words = words
+        self.suffixes = suffixes
+        self.positions = positions
+        self.size = stop - start if size is None else size
+        self.shared = size is not None
+
+    @property
+    def is_pipe(self) -> bool:
+        return self.suffixes is None and self.positions is None
+
+
+class Step:
+    """One hashcat run covering keyspace[start:stop] (or its share of it, see Piece)."""
+
+    def __init__(self, kind: str, piece: Piece, masks: Sequence[str] = (),
+                 rules: Sequence[str] = (), straight: bool = False):
+        self.kind = kind          # "hybrid" | "rules" | "straight" | "mask" | "pipe"
+        self.start = piece.start
+        self.stop = piece.stop
+        self.candidates = piece.size
+        self.shared = piece.shared
+        self.words = piece.words if kind != "pipe" else None
+        self.masks = list(masks)
+        self.rules = list(rules)
+        self.straight = straight  # hybrid: also run the bare wordlist (empty suffix)
+        self.name = ""
+
+
+# ==================== FACTORING ====================
+
+def _is_charset(values: Sequence[str]) -> bool:
+    """A dimension of distinct single characters (one mask position)."""
+    return len(values) > 0 and all(len(value) == 1 for value in values) and len(set(values)) == len(values)
+
+
+def _custom_charsets(positions: Iterable[str]) -> int:
+    """Custom charset slots (-1..-4) a mask over `positions` needs."""
+    return len({frozenset(p) for p in positions
+                if len(p) > 1 and frozenset(p) not in BUILTIN_CHARSETS.values()})
+
+
+def _product_piece(product: Product, start: int) -> Piece:
+    dims = product.dims
+    stop = start + len(product)
+    split = len(dims)
+    while split > 0 and _is_charset(dims[split - 1]):
+        split -= 1
+    while split < len(dims) and _custom_charsets("".join(dim) for dim in dims[split:]) > 4:
+        split += 1
+    if split < len(dims):
+        words = Words.of(Product(*dims[:split])) if split else None
+        return Piece(start, stop, words, positions=tuple("".join(dim) for dim in dims[split:]))
+    if len(dims) >= 2:
+        return Piece(start, stop, Words.of(Product(*dims[:-1])), suffixes=tuple(dims[-1]))
+    return Piece(start, stop)
+
+
+def _flatmap_words(flatmap: FlatMap, suffixes: Tuple[str, ...], shared: bool) -> Iterator[str]:
+    """Words of every expansion piece ending in `suffixes` (all of them, unless shared)."""
+    for item in flatmap.outer:
+        for piece in _pieces(flatmap.expand(item), 0):
+            if piece.suffixes == suffixes:
+                yield from piece.words
+            elif not shared:
+                raise ValueError(f"expansion of {item!r} does not end in the family's suffix list")
+
+
+def _flatmap_pieces(flatmap: FlatMap, start: int) -> Optional[List[Piece]]:
+    """
+    Factor a FlatMap whose expansions are all words x suffix lists: one
+    piece when every expansion uses the same list (checked on the first,
+    enforced while the words are streamed), otherwise one shared piece
+    per list, counted over every expansion.
+    """
+    if len(flatmap.outer) == 0:
+        return None
+    stop = start + len(flatmap)
+    sample = _pieces(flatmap.expand(flatmap.outer.candidate_at(0)), 0)
+    if any(piece.suffixes is None for piece in sample):
+        return None
+    suffix_lists = {piece.suffixes for piece in sample}
+    if len(suffix_lists) == 1:
+        suffixes = suffix_lists.pop()
+        if len(flatmap) % len(suffixes) == 0:
+            words = Words(len(flatmap) // len(suffixes), lambda: _flatmap_words(flatmap, suffixes, False))
+            return [Piece(start, stop, words, suffixes=suffixes)]
+
+    counts: Dict[Tuple[str, ...], int] = {}
+    for item in flatmap.outer:
+        for piece in _pieces(flatmap.expand(item), 0):
+            if piece.suffixes is None:
+                return None
+            counts[piece.suffixes] = counts.get(piece.suffixes, 0) + piece.words.count
+        if len(counts) > MAX_SUFFIX_LISTS:
+            return None
+    return [Piece(start, stop, Words(count, lambda suffixes=suffixes: _flatmap_words(flatmap, suffixes, True)),
+                  suffixes=suffixes, size=count * len(suffixes))
+            for suffixes, count in counts.items()]
+
+
+def _merge(pieces: List[Piece]) -> List[Piece]:
+    """Join neighbours sharing one suffix list (one wordlist) and neighbouring pipes."""
+    merged: List[Piece] = []
+    for piece in pieces:
+        if piece.size == 0:
+            continue
+        last = merged[-1] if merged else None
+        if last is not None and last.is_pipe and piece.is_pipe:
+            last.stop = piece.stop
+            last.size = last.stop - last.start
+        elif (last is not None and last.suffixes is not None and last.suffixes == piece.suffixes
+              and not (last.shared or piece.shared)
+              and last.words.count + piece.words.count <= MAX_WORDLIST_WORDS):
+            merged[-1] = Piece(last.start, piece.stop, last.words + piece.words, suffixes=last.suffixes)
+        else:
+            merged.append(piece)
+    return merged
+
+
+def _pieces(keyspace: Keyspace, start: int) -> List[Piece]:
+    if isinstance(keyspace, Chain):
+        return _merge([piece for part, offset in zip(keyspace.parts, keyspace.starts())
+                       for piece in _pieces(part, start + offset)])
+    if isinstance(keyspace, Product) and keyspace.join is None:
+        return [_product_piece(keyspace, start)]
+    if isinstance(keyspace, FlatMap):
+        pieces = _flatmap_pieces(keyspace, start)
+        if pieces is not None:
+            return pieces
+    return [Piece(start, start + len(keyspace))]
+
+
+# ==================== MASKS AND RULES ====================
+
+def _factor_group(group: set, limit: int) -> Optional[List[Tuple[str, ...]]]:
+    """Disjoint masks (per-position charsets) whose union is exactly `group` (equal-length strings)."""
+    positions = [sorted({value[k] for value in group}) for k in range(len(next(iter(group))))]
+    if math.prod(len(chars) for chars in positions) == len(group):
+        return [tuple("".join(chars) for chars in positions)]
+    tails: Dict[str, set] = defaultdict(set)
+    for value in group:
+        tails[value[0]].add(value[1:])
+    # Same tail mask under several first characters -> one mask with a first-position charset
+    merged: Dict[Tuple[str, ...], List[str]] = {}
+    for first in sorted(tails):
+        masks = _factor_group(tails[first], limit)
+        if masks is None:
+            return None
+        for mask in masks:
+            merged.setdefault(mask, []).append(first)
+        if len(merged) > limit:
+            return None
+    return [("".join(firsts),) + mask for mask, firsts in merged.items()]
+
+
+def factor_masks(suffixes: Sequence[str], limit: int = MAX_MASK_LINES) -> Optional[Tuple[bool, List[Tuple[str, ...]]]]:
+    """
+    (empty suffix included, masks) covering exactly the distinct
+    `suffixes`, or None when that takes more than `limit` masks.
+    """
+    by_length: Dict[int, set] = defaultdict(set)
+    for suffix in suffixes:
+        by_length[len(suffix)].add(suffix)
+    masks: List[Tuple[str, ...]] = []
+    for length in sorted(by_length):
+        if length == 0:
+            continue
+        group = _factor_group(by_length[length], limit)
+        if group is None or len(masks) + len(group) > limit:
+            return None
+        masks.extend(group)
+    return 0 in by_length, masks
+
+
+def _escape(chars: str) -> str:
+    """Escape text for an .hcmask field ('?' is the placeholder, ',' the field separator)."""
+    return chars.replace("?", "??").replace(",", "\\,")
+
+
+def hcmask_line(positions: Sequence[str]) -> Optional[str]:
+    """One .hcmask line ("charset1,...,mask") for per-position charsets, or None if it needs >4 custom charsets."""
+    custom: List[str] = []
+    mask = []
+    for chars in positions:
+        charset = frozenset(chars)
+        builtin = next((code for code, members in BUILTIN_CHARSETS.items() if members == charset), None)
+        if len(charset) == 1:
+            mask.append(_escape(chars[0]))
+        elif builtin is not None:
+            mask.append(builtin)
+        else:
+            key = "".join(sorted(charset))
+            if key not in custom:
+                custom.append(key)
+            if len(custom) > 4:
+                return None
+            mask.append(f"?{custom.index(key) + 1}")
+    line = ",".join([_escape(chars) for chars in custom] + ["".join(mask)])
+    # A leading '#' would make the line a comment
+    return "\\" + line if line.startswith("#") else line
+
+
+def append_rule(suffix: str) -> str:
+    """hashcat rule appending `suffix` (":" keeps the word as is)."""
+    return "".join("$" + char for char in suffix) or ":"
+
+
+def _printable(values: Iterable[str]) -> bool:
+    return all(" " <= char <= "~" for value in values for char in value)
+
+
+# ==================== COMPILING ====================
+
+def _attack(piece: Piece) -> Step:
+    pipe = Step("pipe", piece)
+    if piece.is_pipe or (piece.words is not None and piece.words.count > MAX_WORDLIST_WORDS):
+        return pipe
+    if piece.stop - piece.start < MIN_STEP_CANDIDATES:
+        return pipe
+
+    if piece.positions is not None:
+        line = hcmask_line(piece.positions)
+        if line is None or not _printable(piece.positions):
+            return pipe
+        return Step("mask" if piece.words is None else "hybrid", piece, masks=[line])
+
+    suffixes = piece.suffixes
+    if not _printable(suffixes):
+        return pipe
+    factored = factor_masks(suffixes) if len(set(suffixes)) == len(suffixes) else None
+    if factored is not None:
+        straight, masks = factored
+        lines = [hcmask_line(mask) for mask in masks]
+        if None not in lines:
+            if not lines:
+                return Step("straight", piece)
+            return Step("hybrid", piece, masks=lines, straight=straight)
+    if len(suffixes) <= MAX_RULES:
+        return Step("rules", piece, rules=[append_rule(s) for s in suffixes])
+    return pipe
+
+
+def compile_plan(keyspace: Keyspace) -> List[Step]:
+    """Attack steps covering the whole keyspace, in keyspace order."""
+    attacks = [_attack(piece) for piece in _pieces(keyspace, 0)]
+    # Shared steps split one range between them; if any of them has to be
+    # piped, --range can only pipe the whole range
+    piped = {(step.start, step.stop) for step in attacks if step.shared and step.kind == "pipe"}
+
+    steps: List[Step] = []
+    for step in attacks:
+        if (step.start, step.stop) in piped:
+            if steps and steps[-1].kind == "pipe" and steps[-1].stop >= step.stop:
+                continue
+            step = Step("pipe", Piece(step.start, step.stop))
+        if steps and steps[-1].kind == "pipe" and step.kind == "pipe":
+            steps[-1].stop = step.stop
+            steps[-1].candidates = step.stop - steps[-1].start
+        else:
+            steps.append(step)
+
+    families = keyspace.families() if isinstance(keyspace, Chain) else []
+    for step in steps:
+        covered = [name or f"Family {number}" for number, (name, start, stop) in enumerate(families, 1)
+                   if start < step.stop and stop > step.start]
+        if not covered:
+            step.name = "All candidates"
+        elif len(covered) == 1:
+            step.name = covered[0]
+        else:
+            step.name = f"{covered[0]} .. {covered[-1]}"
+        if step.shared:
+            step.name += " (split by suffix list)"
+    return steps
+
+
+def _describe(step: Step) -> str:
+    if step.kind == "pipe":
+        return f"generator --range {step.start}:{step.stop}"
+    if step.kind == "mask":
+        return f"{len(step.masks)} mask"
+    words = f"{step.words.count:,} words"
+    if step.kind == "straight":
+        return words
+    if step.kind == "rules":
+        return f"{words} x {len(step.rules):,} rules"
+    return f"{words} x {len(step.masks)} masks" + (" (+ straight)" if step.straight else "")
+
+
+def print_plan(steps: List[Step], file=None):
+    """Per-step summary and how much of the keyspace leaves the host as lines."""
+    out = file or sys.stdout
+    total = sum(step.candidates for step in steps)
+    piped = sum(step.candidates for step in steps if step.kind == "pipe")
+    host_lines = piped + sum(step.words.count for step in steps if step.words is not None)
+    print(f"Attack plan: {len(steps)} steps, {total:,} candidates", file=out)
+    for number, step in enumerate(steps, 1):
+        print(f"  {number:>2}. {step.kind:<8} {step.name:<40} {step.candidates:>16,}  {_describe(step)}", file=out)
+    share = piped / total * 100 if total else 0.0
+    print(f"\nGenerated on the GPU: {total - piped:,}   piped from the host: {piped:,} ({share:.1f}%)", file=out)
+    if host_lines:
+        print(f"Host-side lines (wordlists + pipes): {host_lines:,} ({total / host_lines:,.0f}x fewer than piping everything)", file=out)
+
+
+# ==================== WRITING ====================
+
+def _slug(name: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", name.lower()).strip("-")[:40] or "step"
+
+
+def write_plan(steps: List[Step], directory: str, generator: str,
+               generator_args: Sequence[str] = (), hash_mode: int = HASH_MODE) -> str:
+    """
+    Write each step's wordlist / .hcmask / .rule file and a runnable
+    plan.sh into `directory`; returns the script path.
+    """
+    os.makedirs(directory, exist_ok=True)
+    total = sum(step.candidates for step in steps)
+    args = "".join(f" {_shell_quote(arg)}" for arg in generator_args)
+    hashcat = f'"$HASHCAT" -m {hash_mode} -w 3 -O "$@"'
+    lines = [
+        "#!/bin/bash",
+        f"# Attack plan for {os.path.basename(generator)}: {len(steps)} steps, {total:,} candidates",
+        "# (written by scripts/plan_attack.py; one hashcat run per step, in keyspace order)",
+        "#",
+        "# Usage: ./plan.sh <hash_file> [extra hashcat options]",
+        "# START_STEP=N resumes at step N; HASHCAT=/path/to/hashcat overrides the binary",
+        "",
+        'if [ -z "$1" ]; then',
+        '    echo "Usage: ./plan.sh <hash_file> [extra hashcat options]"',
+        "    exit 1",
+        "fi",
+        "",
+        'HASH_FILE="$1"',
+        "shift",
+        'HASHCAT="${HASHCAT:-hashcat}"',
+        'PLAN_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"',
+        f'GENERATOR="${{GENERATOR:-{os.path.abspath(generator)}}}"',
+        'START_STEP="${START_STEP:-1}"',
+        "",
+        "# hashcat exits 0 when it cracked the hash and 1 when a step is exhausted",
+        "check() {",
+        '    if [ "$1" -eq 0 ]; then echo "# Cracked during step $2" >&2; exit 0; fi',
+        '    if [ "$1" -ne 1 ]; then echo "# hashcat failed (exit $1) in step $2" >&2; exit "$1"; fi',
+        "}",
+    ]
+
+    for number, step in enumerate(steps, 1):
+        prefix = f"{number:02d}-{_slug(step.name)}"
+        lines += ["", f"# Step {number}: {step.name} - {step.kind}, {step.candidates:,} candidates "
+                      f"({_describe(step)})",
+                  f'if [ "$START_STEP" -le {number} ]; then']
+        if step.words is not None:
+            with CandidateWriter(os.path.join(directory, prefix + ".words")) as out:
+                out.write_all(step.words)
+            words = f'"$PLAN_DIR/{prefix}.words"'
+
+        if step.kind == "pipe":
+            lines.append(f'    python3 "$GENERATOR"{args} --range {step.start}:{step.stop} | '
+                         f'{hashcat} -a 0 "$HASH_FILE"')
+        elif step.kind == "straight":
+            lines.append(f'    {hashcat} -a 0 "$HASH_FILE" {words}')
+        elif step.kind == "rules":
+            _write_lines(os.path.join(directory, prefix + ".rule"), step.rules)
+            lines.append(f'    {hashcat} -a 0 -r "$PLAN_DIR/{prefix}.rule" "$HASH_FILE" {words}')
+        else:
+            _write_lines(os.path.join(directory, prefix + ".hcmask"), step.masks)
+            masks = f'"$PLAN_DIR/{prefix}.hcmask"'
+            if step.kind == "mask":
+                lines.append(f'    {hashcat} -a 3 "$HASH_FILE" {masks}')
+            else:
+                if step.straight:
+                    lines += [f'    {hashcat} -a 0 "$HASH_FILE" {words}', f"    check $? {number}"]
+                lines.append(f'    {hashcat} -a 6 "$HASH_FILE" {words} {masks}')
+        lines += [f"    check $? {number}", "fi"]
+
+    lines += ["", 'echo "# Plan exhausted without a crack" >&2', "exit 1", ""]
+    script = os.path.join(directory, "plan.sh")
+    _write_lines(script, lines)
+    os.chmod(script, 0o755)
+    return script
+
+
+def _write_lines(path: str, lines: Iterable[str]):
+    with open(path, "w") as f:
+        f.writelines(line + "\n" for line in lines)
+
+
+def _shell_quote(text: str) -> str:
+    return text if re.fullmatch(r"[\w./:=-]+", text) else "'" + text.replace("'", "'\\''") + "'"
@@ -0,0 +1,162 @@
+"""
+Best-first enumeration of a weighted phrase grammar.
+
+The keyspace generators walk their loops in declaration order, so the
+candidates Dean's hints make most likely (spaces, "bad", one or three
+trailing "!") can sit billions of lines into a run. A weighted grammar
+gives every value of every slot a probability instead:
+
+- Slot:     the alternatives for one position (a word list, separators,
+            trailing patterns, case forms) with their weights
+- Template: a sequence of slots plus the function that builds the
+            candidate from one value per slot, with its own weight
+- Grammar:  the templates; a candidate's probability is its template's
+            weight times the probability of each value it uses
+
+Grammar.ranked() yields candidates in non-increasing probability. Every
+slot is sorted by weight, so a template's candidates form a grid of
+index tuples whose probability only falls as an index grows. A heap
+holds the frontier of that grid: popping a tuple pushes its successors,
+each tuple reached from exactly one parent (the one with its last
+non-zero index decremented), so nothing is generated twice and memory
+grows with the frontier, not with the keyspace.
+
+Different templates (or slot values) can build the same string; each
+derivation is emitted at its own probability.
+
+Usage:
+    grammar = Grammar([
+        Template([Slot(ADJECTIVES, weights), Slot(NOUNS), Slot(TRAILING, trail_weight)],
+                 build=lambda adj, noun, trail: f"{adj} {noun}{trail}"),
+    ])
+    for probability, candidate in grammar.ranked():
+        ...
+"""
+
+import heapq
+import math
+import sys
+from typing import Callable, Iterator, Optional, Sequence, TextIO, Tuple, Union
+
+Weights = Union[None, Sequence[float], Callable[[object], float]]
+
+
+class Slot:
+    """
+    Weighted alternatives for one position of a template. `weights` is
+    one weight per value, a function of the value, or None (uniform);
+    they need not sum to 1. Values of weight 0 are dropped.
+    """
+
+    def __init__(self, values: Sequence, weights: Weights = None, name: Optional[str] = None):
+        if weights is None:
+            weights = [1.0] * len(values)
+        elif callable(weights):
+            weights = [weights(value) for value in values]
+        if len(weights) != len(values):
+            raise ValueError(f"slot {name or ''} has {len(values)} values but {len(weights)} weights")
+        if any(weight < 0 for weight in weights):
+            raise ValueError(f"slot {name or ''} has a negative weight")
+        total = sum(weights)
+        if not total:
+            raise ValueError(f"slot {name or ''} has no value with a positive weight")
+        # Most likely first; ties keep the list's own order
+        order = sorted((position for position, weight in enumerate(weights) if weight),
+                       key=lambda position: -weights[position])
+        self.values = [values[position] for position in order]
+        self.probabilities = [weights[position] / total for position in order]
+        self.name = name
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class Template:
+    """
+    One phrase structure: a value from each slot, combined by `build`
+    (plain concatenation by default). `build` may return None to reject
+    a combination (e.g. the same adjective twice); rejected combinations
+    are skipped without affecting the order of the rest.
+    """
+
+    def __init__(self, slots: Sequence[Slot], weight: float = 1.0,
+                 build: Optional[Callable[..., Optional[str]]] = None, name: Optional[str] = None):
+        self.slots = list(slots)
+        self.weight = weight
+        self.build = build or (lambda *values: "".join(values))
+        self.name = name
+
+    def __len__(self) -> int:
+        return math.prod(len(slot) for slot in self.slots)
+
+    def probability(self, indices: Tuple[int, ...], weight: float) -> float:
+        return weight * math.prod(slot.probabilities[i] for slot, i in zip(self.slots, indices))
+
+    def candidate(self, indices: Tuple[int, ...]) -> Optional[str]:
+        return self.build(*(slot.values[i] for slot, i in zip(self.slots, indices)))
+
+
+class Grammar:
+    """Weighted templates; their weights are normalised to sum to 1."""
+
+    def __init__(self, templates: Sequence[Template]):
+        self.templates = [template for template in templates if template.weight > 0 and len(template)]
+        total = sum(template.weight for template in self.templates)
+        if not total:
+            raise ValueError("grammar has no template with a positive weight")
+        self.weights = [template.weight / total for template in self.templates]
+        # Largest heap seen by the last ranked() run
+        self.frontier = 0
+
+    def __len__(self) -> int:
+        """Derivations in the grammar (rejected combinations included)."""
+        return sum(len(template) for template in self.templates)
+
+    def ranked(self, min_probability: float = 0.0) -> Iterator[Tuple[float, str]]:
+        """
+        (probability, candidate) in non-increasing probability, stopping
+        below `min_probability`. Ties come out in template order, then in
+        slot order.
+        """
+        heap = []
+        for number, template in enumerate(self.templates):
+            top = (0,) * len(template.slots)
+            heap.append((-template.probability(top, self.weights[number]), number, top))
+        heapq.heapify(heap)
+        self.frontier = len(heap)
+
+        while heap:
+            negative, number, indices = heapq.heappop(heap)
+            if -negative < min_probability:
+                return
+            template = self.templates[number]
+            candidate = template.candidate(indices)
+            if candidate is not None:
+                yield -negative, candidate
+
+            # Successors: step one index at or after the last non-zero one,
+            # so every tuple has exactly one parent
+            pivot = max((k for k, i in enumerate(indices) if i), default=0)
+            for k in range(pivot, len(indices)):
+                if indices[k] + 1 < len(template.slots[k]):
+                    child = indices[:k] + (indices[k] + 1,) + indices[k + 1:]
+                    heapq.heappush(heap, (-template.probability(child, self.weights[number]), number, child))
+            self.frontier = max(self.frontier, len(heap))
+
+    def candidates(self, min_probability: float = 0.0) -> Iterator[str]:
+        """ranked() without the probabilities."""
+        return (candidate for _, candidate in self.ranked(min_probability))
+
+    def describe(self, file: Optional[TextIO] = None):
+        """Print each template's weight, size and most likely candidate."""
+        out = file or sys.stdout
+        rows = []
+        for number, (template, weight) in enumerate(zip(self.templates, self.weights), 1):
+            top = (0,) * len(template.slots)
+            rows.append((template.name or f"Template {number}", weight, len(template),
+                         template.probability(top, weight), template.candidate(top)))
+        width = max(len(row[0]) for row in rows)
+        print(f"Weighted grammar: {len(self.templates)} templates, {len(self):,} derivations", file=out)
+        for name, weight, size, probability, candidate in rows:
+            top = repr(candidate) if candidate is not None else "(rejected by the template)"
+            print(f"  {name:<{width}}  weight {weight:6.1%}  {size:>16,}  top {probability:.2e} {top}", file=out)
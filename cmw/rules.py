@@ -0,0 +1,337 @@
+"""
+Compile per-candidate mutation stages into hashcat rules.
+
+Case variants (lower/upper/title/sentence/alternating) and leet
+substitutions (``text.replace("a", "4").replace("A", "4")``) are pure
+per-word transforms that hashcat's rule engine can apply on the GPU, so
+a generator only has to ship the base phrases. A mutation pairs the
+Python transform the generators use with the hashcat rule claimed to do
+the same; stages are lists of alternatives, and compiling a pipeline of
+stages gives one rule line per combination, in the generators' loop
+order (first stage outermost).
+
+The claim is checked, not trusted: apply_rule() implements hashcat's
+rule semantics, and verify() runs both sides over a sample of words.
+Some transforms only look expressible -- str.title() capitalises after
+digits and dots ("P455Word", "Bad.Password") while hashcat's E only
+capitalises after spaces -- and verify() reports those with examples.
+
+Usage:
+    stages = [parse_stage("none,a4,a@,s5,s$"), parse_stage("lower,capitalize")]
+    rules = compile_rules(stages)                # ["l", "c", "sa4 sA4 l", ...]
+    mismatches = verify(stages, sample_words)    # [] when the rules are exact
+    write_rules("leet_case.rule", rules, header="...")
+
+    hashcat -m 11300 -a 0 -r leet_case.rule hash.txt bases.txt
+"""
+
+import itertools
+from collections import Counter
+from typing import Callable, Iterable, List, Sequence, Tuple
+
+# hashcat position arguments: 0-9 then A-Z (10-35)
+POSITIONS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+
+# ==================== HASHCAT RULE SEMANTICS ====================
+
+def _position(char: str) -> int:
+    if char not in POSITIONS:
+        raise ValueError(f"bad rule position {char!r}")
+    return POSITIONS.index(char)
+
+
+def _ascii_lower(word: str) -> str:
+    return "".join(chr(ord(c) + 32) if "A" <= c <= "Z" else c for c in word)
+
+
+def _ascii_upper(word: str) -> str:
+    return "".join(chr(ord(c) - 32) if "a" <= c <= "z" else c for c in word)
+
+
+def _toggle(char: str) -> str:
+    return _ascii_upper(char) if "a" <= char <= "z" else _ascii_lower(char)
+
+
+def _title(word: str, separator: str) -> str:
+    word = _ascii_lower(word)
+    return "".join(_ascii_upper(c) if i == 0 or word[i - 1] == separator else c
+                   for i, c in enumerate(word))
+
+
+# Function -> (argument count, kinds: "p" position, "c" character)
+_ARGUMENTS = {
+    ":": "", "l": "", "u": "", "c": "", "C": "", "t": "", "r": "", "d": "", "f": "",
+    "{": "", "}": "", "[": "", "]": "", "E": "", "q": "",
+    "T": "p", "D": "p", "'": "p", "z": "p", "Z": "p", "p": "p",
+    "$": "c", "^": "c", "@": "c", "e": "c",
+    "s": "cc", "i": "pc", "o": "pc", "x": "pp",
+}
+
+
+def parse_rule(rule: str) -> List[Tuple[str, str]]:
+    """Split a rule line into (function, arguments) pairs; spaces between functions are ignored."""
+    functions = []
+    position = 0
+    while position < len(rule):
+        name = rule[position]
+        position += 1
+        if name == " ":
+            continue
+        if name not in _ARGUMENTS:
+            raise ValueError(f"unsupported rule function {name!r} in {rule!r}")
+        kinds = _ARGUMENTS[name]
+        arguments = rule[position:position + len(kinds)]
+        if len(arguments) < len(kinds):
+            raise ValueError(f"rule function {name!r} is missing arguments in {rule!r}")
+        for kind, argument in zip(kinds, arguments):
+            if kind == "p":
+                _position(argument)
+        functions.append((name, arguments))
+        position += len(kinds)
+    return functions
+
+
+def apply_rule(rule: str, word: str) -> str:
+    """What hashcat produces from `word` with `rule` (ASCII case semantics, as on the GPU)."""
+    for name, args in parse_rule(rule):
+        n = _position(args[0]) if args and _ARGUMENTS[name][0] == "p" else None
+        if name == ":":
+            pass
+        elif name == "l":
+            word = _ascii_lower(word)
+        elif name == "u":
+            word = _ascii_upper(word)
+        elif name == "c":
+            word = _ascii_upper(word[:1]) + _ascii_lower(word[1:])
+        elif name == "C":
+            word = _ascii_lower(word[:1]) + _ascii_upper(word[1:])
+        elif name == "t":
+            word = "".join(map(_toggle, word))
+        elif name == "T":
+            if n < len(word):
+                word = word[:n] + _toggle(word[n]) + word[n + 1:]
+        elif name == "r":
+            word = word[::-1]
+        elif name == "d":
+            word = word + word
+        elif name == "f":
+            word = word + word[::-1]
+        elif name == "q":
+            word = "".join(c + c for c in word)
+        elif name == "{":
+            word = word[1:] + word[:1]
+        elif name == "}":
+            word = word[-1:] + word[:-1]
+        elif name == "[":
+            word = word[1:]
+        elif name == "]":
+            word = word[:-1]
+        elif name == "D":
+            if n < len(word):
+                word = word[:n] + word[n + 1:]
+        elif name == "'":
+            word = word[:n]
+        elif name == "z":
+            word = word[:1] * n + word
+        elif name == "Z":
+            word = word + word[-1:] * n
+        elif name == "p":
+            word = word * (n + 1)
+        elif name == "$":
+            word = word + args
+        elif name == "^":
+            word = args + word
+        elif name == "@":
+            word = word.replace(args, "")
+        elif name == "s":
+            word = word.replace(args[0], args[1])
+        elif name == "E":
+            word = _title(word, " ")
+        elif name == "e":
+            word = _title(word, args)
+        elif name == "i":
+            if n <= len(word):
+                word = word[:n] + args[1] + word[n:]
+        elif name == "o":
+            if n < len(word):
+                word = word[:n] + args[1] + word[n + 1:]
+        elif name == "x":
+            word = word[n:n + _position(args[1])] if n < len(word) else word
+    return word
+
+
+# Functions that change nothing when repeated right away (l l is l, sa4 sa4 is sa4)
+_IDEMPOTENT = set(":lucCEes@")
+
+
+def join_rules(*rules: str) -> str:
+    """
+    Rules run one after another, as one line: no-ops dropped, and a
+    function repeating the one before it dropped where that changes
+    nothing ("a4+A4" is "sa4 sA4", not "sa4 sA4 sA4").
+    """
+    functions = []
+    for rule in rules:
+        for function in parse_rule(rule):
+            if function[0] == ":" or (functions and function == functions[-1] and function[0] in _IDEMPOTENT):
+                continue
+            functions.append(function)
+    return " ".join(name + args for name, args in functions) or ":"
+
+
+# ==================== MUTATIONS ====================
+
+class Mutation:
+    """A named per-word transform and the hashcat rule that should do the same."""
+
+    def __init__(self, name: str, function: Callable[[str], str], rule: str):
+        self.name = name
+        self.function = function
+        self.rule = rule
+
+    def __call__(self, word: str) -> str:
+        return self.function(word)
+
+    def then(self, other: "Mutation") -> "Mutation":
+        """This mutation followed by `other` (rules run left to right)."""
+        return Mutation(f"{self.name}+{other.name}", lambda word: other.function(self.function(word)),
+                        join_rules(self.rule, other.rule))
+
+    def __repr__(self) -> str:
+        return f"Mutation({self.name!r}, rule={self.rule!r})"
+
+
+def leet(char: str, replacement: str) -> Mutation:
+    """text.replace(char, r).replace(CHAR, r), as comprehensive-10b's leet() does."""
+    upper = char.upper()
+    rule = f"s{char}{replacement}" + (f" s{upper}{replacement}" if upper != char else "")
+    return Mutation(f"{char}{replacement}",
+                    lambda word: word.replace(char, replacement).replace(upper, replacement), rule)
+
+
+def _alternating(word: str, upper_first: bool) -> str:
+    return "".join(c.upper() if (i % 2 == 0) == upper_first else c.lower() for i, c in enumerate(word))
+
+
+def alternating(upper_first: bool = True) -> Mutation:
+    """The case_variants() alternating case ("BaD PaSsWoRd"); hashcat can toggle positions 0-35 only."""
+    toggles = " ".join(f"T{POSITIONS[i]}" for i in range(0 if upper_first else 1, len(POSITIONS), 2))
+    return Mutation("alternating" if upper_first else "alternating-lower",
+                    lambda word: _alternating(word, upper_first), f"l {toggles}")
+
+
+MUTATIONS = {
+    mutation.name: mutation for mutation in [
+        Mutation("none", lambda word: word, ":"),
+        Mutation("lower", str.lower, "l"),
+        Mutation("upper", str.upper, "u"),
+        Mutation("capitalize", str.capitalize, "c"),
+        Mutation("sentence", lambda word: word[:1].upper() + word[1:].lower(), "c"),
+        Mutation("title", str.title, "E"),
+        # For phrases joined with "." or "-" instead of spaces
+        Mutation("title-dot", str.title, "e."),
+        Mutation("title-dash", str.title, "e-"),
+        Mutation("swapcase", str.swapcase, "t"),
+        Mutation("reverse", lambda word: word[::-1], "r"),
+        alternating(True),
+        alternating(False),
+    ]
+}
+
+
+def parse_mutation(text: str) -> Mutation:
+    """A catalog name, a two-character leet pair ("a4", "s$", "t+"), or several joined with '+'."""
+    mutations = []
+    position = 0
+    while position < len(text):
+        # A leet pair may itself end in '+' ("t+"), so match names and pairs, not split
+        name = next((name for name in MUTATIONS if text.startswith(name, position)
+                     and text[position + len(name):position + len(name) + 1] in ("", "+")), None)
+        if name is not None:
+            mutations.append(MUTATIONS[name])
+        elif len(text) - position >= 2 and text[position + 2:position + 3] in ("", "+"):
+            name = text[position:position + 2]
+            mutations.append(leet(name[0], name[1]))
+        else:
+            raise ValueError(f"unknown mutation in {text!r} (use {', '.join(MUTATIONS)} or a leet pair like a4)")
+        position += len(name) + 1
+    if not mutations:
+        raise ValueError("empty mutation")
+    mutation = mutations[0]
+    for other in mutations[1:]:
+        mutation = mutation.then(other)
+    return mutation
+
+
+def parse_stage(text: str) -> List[Mutation]:
+    """Comma-separated alternatives: "lower,upper,title" or "none,a4,a@,s5+a@"."""
+    return [parse_mutation(name) for name in text.split(",") if name]
+
+
+def leet_stage(substitutions: Iterable[Tuple[str, str]]) -> List[Mutation]:
+    """A stage from a generator's (char, replacement) table, e.g. comprehensive-10b's LEET_SUBSTITUTIONS."""
+    return [leet(char, replacement) for char, replacement in substitutions]
+
+
+def capitalize_stage(variants: Iterable[bool]) -> List[Mutation]:
+    """A stage from a generator's capitalize-or-not table, e.g. comprehensive-10b's CASE_VARIANTS."""
+    return [MUTATIONS["capitalize" if capitalize else "none"] for capitalize in variants]
+
+
+# ==================== COMPILING AND VERIFYING ====================
+
+def pipelines(stages: Sequence[Sequence[Mutation]]) -> List[Mutation]:
+    """Every combination of one alternative per stage, first stage outermost."""
+    combined = []
+    for choice in itertools.product(*stages):
+        mutation = choice[0]
+        for other in choice[1:]:
+            mutation = mutation.then(other)
+        combined.append(mutation)
+    return combined
+
+
+def compile_rules(stages: Sequence[Sequence[Mutation]]) -> List[str]:
+    """One rule line per pipeline (duplicates kept, so line N matches pipeline N)."""
+    return [mutation.rule for mutation in pipelines(stages)]
+
+
+def verify(stages: Sequence[Sequence[Mutation]], words: Iterable[str]) -> List[Tuple[str, str, str, str]]:
+    """
+    (pipeline, word, python result, hashcat result) for every sample word
+    where a compiled rule disagrees with the Python transform.
+    """
+    mismatches = []
+    combined = pipelines(stages)
+    for word in words:
+        for mutation in combined:
+            expected = mutation(word)
+            actual = apply_rule(mutation.rule, word)
+            if expected != actual:
+                mismatches.append((mutation.name, word, expected, actual))
+    return mismatches
+
+
+def verify_function(function: Callable[[str], Iterable[str]], rules: Sequence[str],
+                    words: Iterable[str]) -> List[Tuple[str, Counter, Counter]]:
+    """
+    Check a generator's own variant function (e.g. case_variants) against
+    a rule file: (word, missing, extra) wherever the rules' outputs are
+    not exactly the function's outputs, as multisets.
+    """
+    differences = []
+    for word in words:
+        expected = Counter(function(word))
+        actual = Counter(apply_rule(rule, word) for rule in rules)
+        if expected != actual:
+            differences.append((word, expected - actual, actual - expected))
+    return differences
+
+
+def write_rules(path: str, rules: Iterable[str], header: str = ""):
+    """Write a .rule file, with `header` as leading # comment lines."""
+    with open(path, "w") as f:
+        for line in header.splitlines():
+            f.write(f"# {line}".rstrip() + "\n")
+        f.writelines(rule + "\n" for rule in rules)
@@ -0,0 +1,417 @@
+"""
+Resumable generator | hashcat sessions.
+
+hashcat reading a pipe cannot resume: its restore file counts the words
+it consumed from stdin, and after a crash there is no stdin to skip
+into. A Session runs the pipeline itself and keeps the mapping that is
+lost:
+
+- the generator runs with --checkpoint SEED (cmw.checkpoint), which
+  records the index it started writing at before writing anything
+- hashcat runs with --status-json, and every status carries its
+  restore_point: the words it has fully processed since it started
+- so the last candidate hashcat finished is generator index
+  started + restore_point. That is saved to the session file (atomically)
+  at every status
+
+Resuming rewrites SEED with that index and no rewind, so the generator
+starts exactly at the first candidate hashcat had not finished: nothing
+is skipped, and at most one hashcat batch is hashed twice.
+
+The mapping needs every generated line to reach hashcat as one word,
+so --skip-tested and --unordered (which change or reorder lines) are
+refused. Rules (-r) are fine: restore_point counts base words.
+
+The session also supervises the pipeline. hashcat writes cracked
+passphrases to NAME.found (--outfile, set by the session), and a
+watcher thread polls it while hashcat runs. On a hit it kills the
+generator's whole process group (parallel workers included) at once,
+rather than leaving it to fill pipe buffers until hashcat exits, and
+writes CRACKED.json to the session directory. Every other session
+running from that directory (the sibling shards; a shared directory
+reaches other hosts) sees it within WATCH_INTERVAL and stops too, and
+no session starts while it exists. The record names the session, its
+shard and, when the generator's keyspace can parse the passphrase
+(cmw.lookup), the family and index that produced it.
+
+Usage:
+    session = Session("comprehensive-2of4")
+    session.run(["python3", "generate.py", "--shard", "2/4"], ["hashcat", "-m", "11300", "-a", "0", "hash.txt"])
+    Session("comprehensive-2of4").run()             # after a crash: same commands, resumed
+"""
+
+import json
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import List, Optional, TextIO
+
+from cmw.checkpoint import CHECKPOINT_VERSION
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Session files (NAME.json) and generator seeds (NAME.ckpt)
+DEFAULT_DIR = os.path.join(ROOT, "sessions")
+
+# Seconds between hashcat status lines, i.e. how often the session is saved
+DEFAULT_STATUS_TIMER = 10
+
+# hashcat exit codes
+CRACKED, EXHAUSTED, ABORTED = 0, 1, 2
+
+# Generator options that break the line <-> index mapping, or that the session sets itself
+REFUSED_OPTIONS = ("--skip-tested", "--unordered", "--checkpoint")
+
+# hashcat options the session sets itself
+REFUSED_HASHCAT_OPTIONS = ("-o", "--outfile", "--outfile-format")
+
+# Written by the session that cracks the hash; every session in the directory stops on it
+CRACKED_FILE = "CRACKED.json"
+
+# Seconds between checks of the outfile and CRACKED_FILE
+WATCH_INTERVAL = 0.5
+
+# hashcat's line when the hash was cracked by an earlier run
+POTFILE_HIT = "All hashes found"
+
+SESSION_VERSION = 1
+
+
+def _write_json(path: str, record: dict):
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as f:
+        json.dump(record, f, indent=1)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temporary, path)
+
+
+def status_arguments(hashcat: List[str], timer: int = DEFAULT_STATUS_TIMER,
+                     outfile: Optional[str] = None) -> List[str]:
+    """hashcat arguments plus machine-readable status every `timer` seconds (and cracks to `outfile`)."""
+    extra = [f"--outfile={outfile}", "--outfile-format=2"] if outfile else []
+    if "--status" not in hashcat:
+        extra.append("--status")
+    if "--status-json" not in hashcat:
+        extra.append("--status-json")
+    if not any(argument.startswith("--status-timer") for argument in hashcat):
+        extra.append(f"--status-timer={timer}")
+    return hashcat[:1] + extra + hashcat[1:]
+
+
+def read_plain(line: str) -> str:
+    """A passphrase as hashcat writes it (--outfile-format=2), $HEX[...] decoded."""
+    line = line.rstrip("\r\n")
+    if line.startswith("$HEX[") and line.endswith("]"):
+        return bytes.fromhex(line[5:-1]).decode("utf-8", errors="replace")
+    return line
+
+
+def shard_of(generator: List[str]) -> Optional[str]:
+    """The --shard I/N of a generator command line, if any."""
+    for i, argument in enumerate(generator):
+        if argument == "--shard" and i + 1 < len(generator):
+            return generator[i + 1]
+        if argument.startswith("--shard="):
+            return argument.split("=", 1)[1]
+    return None
+
+
+def read_cracked(directory: str) -> Optional[dict]:
+    try:
+        with open(os.path.join(directory, CRACKED_FILE)) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _stop_generator(producer: subprocess.Popen):
+    """SIGTERM the generator's process group: the generator and any worker processes it forked."""
+    if producer.poll() is None:
+        try:
+            os.killpg(producer.pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+
+class Session:
+    """One named generator | hashcat pipeline and how far hashcat got through it."""
+
+    def __init__(self, name: str, directory: str = DEFAULT_DIR):
+        self.name = name
+        self.directory = directory
+        self.path = os.path.join(directory, f"{name}.json")
+        self.seed = os.path.join(directory, f"{name}.ckpt")
+        self.outfile = os.path.join(directory, f"{name}.found")
+        self.cracked = os.path.join(directory, CRACKED_FILE)
+        self.state = None
+        # Set by the watcher thread
+        self.hit = None
+        self.stopped_by = None
+        if os.path.exists(self.path):
+            with open(self.path) as f:
+                self.state = json.load(f)
+            if self.state.get("version") != SESSION_VERSION:
+                raise ValueError(f"{self.path}: session version {self.state.get('version')}, "
+                                 f"expected {SESSION_VERSION}")
+
+    def save(self):
+        self.state["updated"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        _write_json(self.path, self.state)
+
+    def _start(self, generator: List[str], hashcat: List[str]):
+        refused = [option for option in REFUSED_OPTIONS if any(a.split("=")[0] == option for a in generator)]
+        if refused:
+            raise ValueError(f"the generator command cannot use {', '.join(refused)} in a session")
+        refused = [option for option in REFUSED_HASHCAT_OPTIONS if any(a.split("=")[0] == option for a in hashcat)]
+        if refused:
+            raise ValueError(f"the session sets hashcat's {', '.join(refused)} itself")
+        self.state = {
+            "version": SESSION_VERSION,
+            "cwd": os.getcwd(),
+            "generator": generator,
+            "hashcat": hashcat,
+            # The generator's slice, from its first checkpoint
+            "total": None, "start": None, "stop": None,
+            # Generator index of the first candidate hashcat has not finished
+            "position": None,
+            "status": "new",
+            "recovered": None,
+            "cracked": None,
+            "runs": 0,
+        }
+
+    def _write_seed(self):
+        """Point the generator's checkpoint at the first unfinished candidate, with no rewind."""
+        if self.state["position"] is None:
+            if os.path.exists(self.seed):
+                os.remove(self.seed)
+            return
+        _write_json(self.seed, {
+            "version": CHECKPOINT_VERSION,
+            "updated": self.state.get("updated"),
+            "total": self.state["total"],
+            "start": self.state["start"],
+            "stop": self.state["stop"],
+            "started": self.state["position"],
+            "position": self.state["position"],
+            "family": None,
+            "done": False,
+        })
+
+    def _read_seed(self) -> Optional[dict]:
+        try:
+            with open(self.seed) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def run(self, generator: Optional[List[str]] = None, hashcat: Optional[List[str]] = None,
+            status_timer: int = DEFAULT_STATUS_TIMER, log: Optional[TextIO] = None) -> int:
+        """
+        Run (or resume) the pipeline until hashcat exits, cracks the hash
+        or a sibling session does; returns hashcat's exit code (CRACKED
+        for a hit here or elsewhere). New sessions need both commands;
+        resumed ones reuse the saved commands, and refuse different ones.
+        """
+        out = log or sys.stderr
+        cracked = read_cracked(self.directory)
+        if cracked is not None:
+            print(f"# Session {self.name}: not started, session {cracked['session']} cracked the hash "
+                  f"({self.cracked}; remove it to attack another hash)", file=out)
+            return CRACKED
+        if self.state is None:
+            if not generator or not hashcat:
+                raise ValueError(f"no session {self.name} yet; give the generator and hashcat commands")
+            self._start(generator, hashcat)
+        elif (generator and generator != self.state["generator"]) or (hashcat and hashcat != self.state["hashcat"]):
+            raise ValueError(f"session {self.name} was started with other commands; pick another name")
+        if self.state["status"] in ("cracked", "exhausted"):
+            print(f"# Session {self.name}: already {self.state['status']}", file=out)
+            return CRACKED if self.state["status"] == "cracked" else EXHAUSTED
+
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._write_seed()
+        self.state["runs"] += 1
+        self.state["status"] = "running"
+        self.save()
+        if self.state["position"] is not None:
+            print(f"# Session {self.name}: resuming at generator index {self.state['position']:,} "
+                  f"(run {self.state['runs']})", file=out)
+
+        generator = self.state["generator"] + ["--checkpoint", self.seed, "--checkpoint-rewind", "0"]
+        cwd = self.state["cwd"]
+        # Its own process group, so a hit can stop the generator and its workers at once
+        producer = subprocess.Popen(generator, stdout=subprocess.PIPE, cwd=cwd, start_new_session=True)
+        consumer = subprocess.Popen(status_arguments(self.state["hashcat"], status_timer, self.outfile),
+                                    stdin=producer.stdout, stdout=subprocess.PIPE, cwd=cwd, text=True, bufsize=1)
+        # hashcat holds the read end; the generator sees EPIPE when it exits
+        producer.stdout.close()
+        done = threading.Event()
+        watcher = threading.Thread(target=self._watch, args=(producer, consumer, done, out), daemon=True)
+        watcher.start()
+        started = None
+        potfile = False
+        try:
+            for line in consumer.stdout:
+                if not line.startswith("{"):
+                    potfile = potfile or POTFILE_HIT in line
+                    sys.stdout.write(line)
+                    continue
+                try:
+                    status = json.loads(line)
+                except ValueError:
+                    sys.stdout.write(line)
+                    continue
+                if started is None:
+                    started = self._started()
+                if started is not None:
+                    self._progress(started, status, out)
+        except KeyboardInterrupt:
+            consumer.terminate()
+        finally:
+            code = consumer.wait()
+            done.set()
+            watcher.join()
+            _stop_generator(producer)
+            producer.wait()
+        if started is None:
+            started = self._started()
+        if self.hit is None:
+            # Written between the watcher's last look and hashcat's exit
+            self._check_outfile(producer, out)
+        if self.hit is not None:
+            self.state["status"] = "cracked"
+            self.state["cracked"] = self._attribute(self.hit, started)
+            if (read_cracked(self.directory) or {}).get("session") == self.name:
+                _write_json(self.cracked, self.state["cracked"])
+        elif self.stopped_by is not None:
+            self.state["status"] = "stopped"
+        elif potfile:
+            # Cracked by an earlier run: hashcat --show has the passphrase
+            self.state["status"] = "cracked"
+        else:
+            self.state["status"] = {CRACKED: "cracked", EXHAUSTED: "exhausted"}.get(code, "interrupted")
+            if code == EXHAUSTED and producer.returncode != 0:
+                # hashcat ran out of words because the generator died, not because it finished
+                self.state["status"] = "interrupted"
+        self.save()
+        position = self.state["position"]
+        print(f"# Session {self.name}: {self.state['status']} (hashcat exit {code}), "
+              f"resume point {'unknown' if position is None else f'{position:,}'}", file=out)
+        if self.hit is not None:
+            print(f"# Session {self.name}: CRACKED {self._describe_hit(self.state['cracked'])}", file=out)
+        elif self.stopped_by is not None:
+            print(f"# Session {self.name}: stopped, session {self.stopped_by} cracked the hash", file=out)
+        return CRACKED if self.hit is not None or self.stopped_by is not None else code
+
+    def _watch(self, producer: subprocess.Popen, consumer: subprocess.Popen, done: threading.Event,
+               out: TextIO):
+        """Poll the outfile and CRACKED_FILE until hashcat exits; on either, stop the pipeline."""
+        while not done.wait(WATCH_INTERVAL):
+            if self._check_outfile(producer, out):
+                return
+            cracked = read_cracked(self.directory)
+            if cracked is not None and cracked.get("session") != self.name:
+                self.stopped_by = cracked.get("session")
+                _stop_generator(producer)
+                consumer.terminate()
+                return
+
+    def _check_outfile(self, producer: subprocess.Popen, out: TextIO) -> bool:
+        """On a cracked line: kill the generator and claim CRACKED_FILE (first session wins)."""
+        try:
+            with open(self.outfile) as f:
+                line = f.readline()
+        except OSError:
+            return False
+        if not line.endswith("\n"):
+            return False
+        _stop_generator(producer)
+        self.hit = read_plain(line)
+        if read_cracked(self.directory) is None:
+            _write_json(self.cracked, {"session": self.name, "passphrase": self.hit,
+                                       "shard": shard_of(self.state["generator"]),
+                                       "found": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())})
+        print(f"# Session {self.name}: hashcat cracked the hash; generator stopped", file=out)
+        return True
+
+    def _attribute(self, passphrase: str, started: Optional[int]) -> dict:
+        """Which shard, family and index produced `passphrase`."""
+        record = dict(read_cracked(self.directory) or {}, session=self.name, passphrase=passphrase,
+                      shard=shard_of(self.state["generator"]), family=None, index=None, family_index=None,
+                      # hashcat had finished every candidate before this generator index
+                      after=self.state["position"] if self.state["position"] is not None else started)
+        script = next((argument for argument in self.state["generator"] if argument.endswith(".py")), None)
+        if script is None:
+            return record
+        from cmw.lookup import Generator
+        try:
+            matches, _ = Generator(os.path.join(self.state["cwd"], script)).parse(passphrase)
+        except Exception as error:
+            # A crack must be recorded even when the generator cannot be imported here
+            record["attribution"] = f"{type(error).__name__}: {error}"
+            return record
+        start, stop = self.state["start"], self.state["stop"]
+        inside = [match for match in matches if start is None or start <= match.index < stop]
+        if inside or matches:
+            match = (inside or matches)[0]
+            record.update(family=match.family, index=match.index, family_index=match.family_index)
+        return record
+
+    @staticmethod
+    def _describe_hit(record: dict) -> str:
+        where = [f"session {record['session']}"]
+        if record.get("shard"):
+            where.append(f"shard {record['shard']}")
+        if record.get("family") is not None:
+            where.append(f"{record['family']}, index {record['index']:,} "
+                         f"(replay with --range {record['index']}:{record['index'] + 1})")
+        elif record.get("after") is not None:
+            where.append(f"at or after index {record['after']:,}")
+        return f"{record['passphrase']!r} ({'; '.join(where)})"
+
+    def _started(self) -> Optional[int]:
+        """Index the generator started at, from its checkpoint; records its slice the first time."""
+        seed = self._read_seed()
+        if seed is None or "started" not in seed:
+            return None
+        for key in ("total", "start", "stop"):
+            self.state[key] = seed[key]
+        return seed["started"]
+
+    def _progress(self, started: int, status: dict, out: TextIO):
+        hashed = status.get("restore_point")
+        if hashed is None:
+            hashed = status["progress"][0]
+        self.state["position"] = started + hashed
+        recovered = status.get("recovered_hashes")
+        if recovered:
+            self.state["recovered"] = recovered
+        self.save()
+        stop = self.state["stop"]
+        where = f" of {stop:,}" if stop is not None else ""
+        print(f"# Session {self.name}: hashcat finished generator index {self.state['position']:,}{where}", file=out)
+
+    def describe(self, file: Optional[TextIO] = None):
+        out = file or sys.stdout
+        if self.state is None:
+            print(f"No session {self.name} ({self.path})", file=out)
+            return
+        state = self.state
+        position, stop = state["position"], state["stop"]
+        done = f" of {stop:,} ({(position - state['start']) / max(stop - state['start'], 1):.1%})" \
+            if position is not None and stop is not None else ""
+        print(f"Session {self.name}: {state['status']}, {state['runs']} run(s), updated {state.get('updated')}", file=out)
+        print(f"  generator: {' '.join(state['generator'])}", file=out)
+        print(f"  hashcat:   {' '.join(state['hashcat'])}", file=out)
+        print(f"  in:        {state['cwd']}", file=out)
+        print(f"  resume at: {'start' if position is None else f'{position:,}'}{done}", file=out)
+        if state["recovered"]:
+            print(f"  recovered: {state['recovered'][0]}/{state['recovered'][1]} hashes", file=out)
+        if state.get("cracked"):
+            print(f"  cracked:   {self._describe_hit(state['cracked'])}", file=out)
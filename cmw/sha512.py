@@ -0,0 +1,298 @@
+"""
+Lane-parallel iterated SHA-512 over NumPy uint64 arrays.
+
+The wallet derivation is d = SHA-512(d), 25,000 times a candidate, and
+every round after the first hashes exactly one 64-byte digest. With
+hashlib that is one interpreter round trip per round per candidate.
+Here thousands of candidates' chains ("lanes") advance in lockstep:
+each of the eight state words is a uint64 array with one element per
+lane, and every step of the compression function is one NumPy
+operation over all lanes.
+
+A 64-byte message is always one block whose second half is fixed (the
+0x80 terminator, zeros, the bit length 512), so message words 8-15 are
+constants: the schedule folds them (and every term computed from them)
+into scalars, and rounds 8-15 add a constant. Round 0 starts from the
+fixed initial state and reduces to two additions.
+
+It is not a speedup on the host it was developed on. The kernel costs
+about 3,400 array operations per round. Measured with verify.py
+--benchmark (one core, NumPy 2.4, Python 3.11), it runs at 0.5-0.8x
+hashlib's speed at 4,096-65,536 lanes and 0.1x at 1,024. It can only
+win where NumPy's per-element throughput is much higher than that.
+benchmark() measures both, and cmw.verify's engine "auto" takes the
+faster one, which is hashlib there. self_test() checks it against
+hashlib (verify.py --self-test, run by test_workflow.sh).
+
+Usage:
+    digests = [hashlib.sha512(p + salt).digest() for p in passphrases]
+    keys = [d[:32] for d in iterate(digests, 24999)]
+"""
+
+import hashlib
+import os
+import time
+from typing import List, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Lanes per kernel call: enough to amortise the per-operation overhead,
+# few enough that the ~27 working arrays stay in cache
+DEFAULT_LANES = 16384
+
+K = [
+    0x428A2F98D728AE22, 0x7137449123EF65CD, 0xB5C0FBCFEC4D3B2F, 0xE9B5DBA58189DBBC, 0x3956C25BF348B538,
+    0x59F111F1B605D019, 0x923F82A4AF194F9B, 0xAB1C5ED5DA6D8118, 0xD807AA98A3030242, 0x12835B0145706FBE,
+    0x243185BE4EE4B28C, 0x550C7DC3D5FFB4E2, 0x72BE5D74F27B896F, 0x80DEB1FE3B1696B1, 0x9BDC06A725C71235,
+    0xC19BF174CF692694, 0xE49B69C19EF14AD2, 0xEFBE4786384F25E3, 0x0FC19DC68B8CD5B5, 0x240CA1CC77AC9C65,
+    0x2DE92C6F592B0275, 0x4A7484AA6EA6E483, 0x5CB0A9DCBD41FBD4, 0x76F988DA831153B5, 0x983E5152EE66DFAB,
+    0xA831C66D2DB43210, 0xB00327C898FB213F, 0xBF597FC7BEEF0EE4, 0xC6E00BF33DA88FC2, 0xD5A79147930AA725,
+    0x06CA6351E003826F, 0x142929670A0E6E70, 0x27B70A8546D22FFC, 0x2E1B21385C26C926, 0x4D2C6DFC5AC42AED,
+    0x53380D139D95B3DF, 0x650A73548BAF63DE, 0x766A0ABB3C77B2A8, 0x81C2C92E47EDAEE6, 0x92722C851482353B,
+    0xA2BFE8A14CF10364, 0xA81A664BBC423001, 0xC24B8B70D0F89791, 0xC76C51A30654BE30, 0xD192E819D6EF5218,
+    0xD69906245565A910, 0xF40E35855771202A, 0x106AA07032BBD1B8, 0x19A4C116B8D2D0C8, 0x1E376C085141AB53,
+    0x2748774CDF8EEB99, 0x34B0BCB5E19B48A8, 0x391C0CB3C5C95A63, 0x4ED8AA4AE3418ACB, 0x5B9CCA4F7763E373,
+    0x682E6FF3D6B2B8A3, 0x748F82EE5DEFB2FC, 0x78A5636F43172F60, 0x84C87814A1F0AB72, 0x8CC702081A6439EC,
+    0x90BEFFFA23631E28, 0xA4506CEBDE82BDE9, 0xBEF9A3F7B2C67915, 0xC67178F2E372532B, 0xCA273ECEEA26619C,
+    0xD186B8C721C0C207, 0xEADA7DD6CDE0EB1E, 0xF57D4F7FEE6ED178, 0x06F067AA72176FBA, 0x0A637DC5A2C898A6,
+    0x113F9804BEF90DAE, 0x1B710B35131C471B, 0x28DB77F523047D84, 0x32CAAB7B40C72493, 0x3C9EBE0A15C9BEBC,
+    0x431D67C49C100D4C, 0x4CC5D4BECB3E42B6, 0x597F299CFC657E2A, 0x5FCB6FAB3AD6FAEC, 0x6C44198C4A475817,
+]
+
+H0 = [
+    0x6A09E667F3BCC908, 0xBB67AE8584CAA73B, 0x3C6EF372FE94F82B, 0xA54FF53A5F1D36F1,
+    0x510E527FADE682D1, 0x9B05688C2B3E6C1F, 0x1F83D9ABFB41BD6B, 0x5BE0CD19137E2179,
+]
+
+MASK = (1 << 64) - 1
+
+# Message words 8-15 of a 64-byte message: 0x80 terminator, zeros, length in bits
+PADDED = [0x8000000000000000, 0, 0, 0, 0, 0, 0, 512]
+
+# SHA-512("abc") (the FIPS 180-2 example), and that digest hashed 100 more times
+KNOWN_ANSWER = (
+    bytes.fromhex("ddaf35a193617abacc417349ae20413112e6fa4e89a97ea20a9eeee64b55d39a"
+                  "2192992a274fc1a836ba3c23a3feebbd454d4423643ce80e2a9ac94fa54ca49f"),
+    100,
+    bytes.fromhex("92a8d42a822cd20f9e778f448b9b1ff82a6d221f3a51db8a342a55a644958632"
+                  "d0ec6a416d378a8d234637551fbd7146323035270abe2a03f0d304c097b335f6"),
+)
+
+# (lanes, digests) self_test() compares with hashlib: one lane, odd lane counts, and
+# batches that are not a multiple of the lanes (a short last kernel)
+SELF_TEST_SHAPES = [(1, 1), (1, 3), (3, 7), (64, 64), (64, 129), (1000, 1001), (DEFAULT_LANES, 5)]
+
+
+def available() -> bool:
+    """True when NumPy is installed (without it the verifier uses hashlib)."""
+    return np is not None
+
+
+def _rotr(x: int, n: int) -> int:
+    return ((x >> n) | (x << (64 - n))) & MASK
+
+
+def _small_sigma0(x: int) -> int:
+    return _rotr(x, 1) ^ _rotr(x, 8) ^ (x >> 7)
+
+
+def _small_sigma1(x: int) -> int:
+    return _rotr(x, 19) ^ _rotr(x, 61) ^ (x >> 6)
+
+
+def _round_zero() -> Tuple[int, int]:
+    """Round 0 from the initial state, minus W[0]: (new e, new a) = (d + t1, t1 + t2) + W[0]."""
+    a, b, c, d, e, f, g, h = H0
+    t1 = (h + (_rotr(e, 14) ^ _rotr(e, 18) ^ _rotr(e, 41)) + ((e & f) ^ (~e & g)) + K[0]) & MASK
+    t2 = ((_rotr(a, 28) ^ _rotr(a, 34) ^ _rotr(a, 39)) + ((a & b) ^ (a & c) ^ (b & c))) & MASK
+    return (d + t1) & MASK, (t1 + t2) & MASK
+
+
+class Kernel:
+    """Reusable buffers for iterating `lanes` chains at once."""
+
+    def __init__(self, lanes: int = DEFAULT_LANES):
+        if np is None:
+            raise RuntimeError("the lane-parallel SHA-512 needs NumPy (pip install numpy)")
+        self.lanes = lanes
+        self.schedule = [np.empty(lanes, np.uint64) for _ in range(16)]
+        self.registers = [np.empty(lanes, np.uint64) for _ in range(8)]
+        self.temporaries = [np.empty(lanes, np.uint64) for _ in range(3)]
+        self.shifts = {n: np.uint64(n) for n in range(65)}
+        self.k = [np.uint64(k) for k in K]
+        self.h0 = [np.uint64(h) for h in H0]
+        self.round_zero = [np.uint64(v) for v in _round_zero()]
+        self.plan = _schedule_plan()
+
+    def _sigma(self, x, out, rotations: Sequence[int], shift: int = 0):
+        """out = XOR of rotr(x, r) for r in rotations (and x >> shift when given)."""
+        right, left, temporary, shifts = np.right_shift, np.left_shift, self.temporaries[2], self.shifts
+        right(x, shifts[rotations[0]], out=out)
+        left(x, shifts[64 - rotations[0]], out=temporary)
+        out ^= temporary
+        for r in rotations[1:]:
+            right(x, shifts[r], out=temporary)
+            out ^= temporary
+            left(x, shifts[64 - r], out=temporary)
+            out ^= temporary
+        if shift:
+            right(x, shifts[shift], out=temporary)
+            out ^= temporary
+
+    def iterate(self, state, rounds: int):
+        """Apply SHA-512 `rounds` times to each lane of `state` (8 x lanes uint64, in place)."""
+        schedule, (t1, t2, _) = self.schedule, self.temporaries
+        sigma, k, h0, plan = self._sigma, self.k, self.h0, self.plan
+        for _ in range(rounds):
+            for j in range(8):
+                schedule[j][...] = state[j]
+            a, b, c, d, e, f, g, h = self.registers
+            # Round 0: every register but the new a and e is the initial state
+            np.add(schedule[0], self.round_zero[0], out=e)
+            np.add(schedule[0], self.round_zero[1], out=a)
+            for register, value in zip((b, c, d, f, g, h), (H0[0], H0[1], H0[2], H0[4], H0[5], H0[6])):
+                register.fill(value)
+            for i in range(1, 80):
+                w = schedule[i % 16]
+                terms, reset, scalar, added = plan[i]
+                if terms is not None:
+                    # W[i] = sigma1(W[i-2]) + W[i-7] + sigma0(W[i-15]) + W[i-16]; the slot holds W[i-16]
+                    if reset:
+                        w.fill(0)
+                    for slot, kind in terms:
+                        if kind == 1:
+                            sigma(schedule[slot], t1, (19, 61), 6)
+                            w += t1
+                        elif kind == 2:
+                            sigma(schedule[slot], t1, (1, 8), 7)
+                            w += t1
+                        else:
+                            w += schedule[slot]
+                    if scalar is not None:
+                        w += scalar
+                # t1 = h + Sigma1(e) + Ch(e, f, g) + K[i] + W[i], built in h
+                sigma(e, t1, (14, 18, 41))
+                h += t1
+                np.bitwise_xor(f, g, out=t2)
+                t2 &= e
+                t2 ^= g
+                h += t2
+                if added is None:
+                    h += w
+                    h += k[i]
+                else:
+                    h += added
+                d += h
+                # + Sigma0(a) + Maj(a, b, c): h becomes the new a
+                sigma(a, t1, (28, 34, 39))
+                h += t1
+                np.bitwise_or(a, b, out=t2)
+                t2 &= c
+                np.bitwise_and(a, b, out=t1)
+                t2 |= t1
+                h += t2
+                a, b, c, d, e, f, g, h = h, a, b, c, d, e, f, g
+            for j, register in enumerate((a, b, c, d, e, f, g, h)):
+                np.add(register, h0[j], out=state[j])
+            self.registers = [a, b, c, d, e, f, g, h]
+        return state
+
+
+def _schedule_plan():
+    """
+    Per round i: (lane terms of W[i] as (slot, 0 plain / 1 sigma1 / 2 sigma0)
+    or None when W[i] is not computed here, whether the slot starts from 0,
+    the scalar folded into W[i], the scalar K[i] + W[i] when W[i] is constant).
+    Words 0-7 vary per lane; 8-15 are the padding constants; a later word
+    is constant when all four of its sources are.
+    """
+    lanes = [True] * 8 + [False] * 72
+    constant = [0] * 8 + PADDED + [0] * 64
+    plan = [(None, False, None, None)] * 8
+    for i in range(8, 16):
+        plan.append((None, False, None, np.uint64((K[i] + constant[i]) & MASK)))
+    for i in range(16, 80):
+        sources = ((i - 2, 1), (i - 7, 0), (i - 15, 2), (i - 16, 0))
+        sigmas = {0: lambda x: x, 1: _small_sigma1, 2: _small_sigma0}
+        scalar = sum(sigmas[kind](constant[j]) for j, kind in sources if not lanes[j]) & MASK
+        lanes[i] = any(lanes[j] for j, _ in sources)
+        if not lanes[i]:
+            constant[i] = scalar
+            plan.append((None, False, None, np.uint64((K[i] + scalar) & MASK)))
+            continue
+        # The slot already holds W[i-16] when that word has lanes
+        terms = [(j % 16, kind) for j, kind in sources[:3] if lanes[j]]
+        plan.append((terms, not lanes[i - 16], np.uint64(scalar) if scalar else None, None))
+    return plan
+
+
+def to_state(digests: Sequence[bytes]):
+    """64-byte digests -> 8 x len(digests) native uint64 words."""
+    return np.frombuffer(b"".join(digests), dtype=">u8").reshape(len(digests), 8).T.astype(np.uint64)
+
+
+def from_state(state) -> List[bytes]:
+    data = state.T.astype(">u8").tobytes()
+    return [data[i:i + 64] for i in range(0, len(data), 64)]
+
+
+def iterate(digests: Sequence[bytes], rounds: int, lanes: int = DEFAULT_LANES) -> List[bytes]:
+    """SHA-512 applied `rounds` more times to each 64-byte digest, `lanes` chains at a time."""
+    if not digests:
+        return []
+    kernel = Kernel(min(lanes, len(digests)))
+    result = []
+    with np.errstate(over="ignore"):
+        for start in range(0, len(digests), kernel.lanes):
+            chunk = digests[start:start + kernel.lanes]
+            if len(chunk) < kernel.lanes:
+                kernel = Kernel(len(chunk))
+            result += from_state(kernel.iterate(to_state(chunk), rounds))
+    return result
+
+
+def iterate_hashlib(digests: Sequence[bytes], rounds: int) -> List[bytes]:
+    """The scalar reference: one hashlib call per round per digest."""
+    sha512 = hashlib.sha512
+    result = []
+    for digest in digests:
+        for _ in range(rounds):
+            digest = sha512(digest).digest()
+        result.append(digest)
+    return result
+
+
+def benchmark(lanes: int = DEFAULT_LANES, rounds: int = 20) -> Tuple[float, float]:
+    """Seconds per lane-round of (the NumPy kernel, hashlib) on this host, after checking they agree."""
+    digests = [os.urandom(64) for _ in range(lanes)]
+    started = time.perf_counter()
+    vectorised = iterate(digests, rounds, lanes)
+    kernel = (time.perf_counter() - started) / (lanes * rounds)
+    sample = max(1, min(lanes, 20000 // rounds))
+    started = time.perf_counter()
+    scalar = iterate_hashlib(digests[:sample], rounds)
+    reference = (time.perf_counter() - started) / (sample * rounds)
+    if vectorised[:sample] != scalar:
+        raise AssertionError("the NumPy SHA-512 kernel disagrees with hashlib")
+    return kernel, reference
+
+
+def self_test() -> List[str]:
+    """
+    Check iterate() against KNOWN_ANSWER, and against hashlib for 0-5
+    rounds at every SELF_TEST_SHAPES. Returns what disagreed (empty when
+    everything agrees).
+    """
+    failures = []
+    start, rounds, expected = KNOWN_ANSWER
+    if iterate([start], rounds) != [expected]:
+        failures.append(f"known answer: SHA-512(\"abc\") hashed {rounds} more times")
+    for lanes, count in SELF_TEST_SHAPES:
+        digests = [hashlib.sha512(str(i).encode()).digest() for i in range(count)]
+        for rounds in (0, 1, 2, 5):
+            if iterate(digests, rounds, lanes) != iterate_hashlib(digests, rounds):
+                failures.append(f"{count} digests at {lanes} lanes, {rounds} rounds")
+    return failures
@@ -0,0 +1,141 @@
+"""
+Deterministic work splitting across hosts: --shard i/N and --range start:stop.
+
+Every host runs the same generator with a different shard number. Shard i
+of N gets the contiguous index slice [total*(i-1)//N, total*i//N), so the
+N slices are disjoint, cover the whole keyspace and differ in size by at
+most one candidate, without any coordination between hosts.
+
+Generators with a build_keyspace() jump straight to their slice, so a
+slice costs time proportional to its own size. Generators without one
+can only walk their stream: --range skips ahead to its start, and
+--shard is refused, since every shard would cost the whole run.
+
+Usage:
+    # argparse-based generators
+    add_slice_arguments(parser)
+    for candidate in select(args, build_keyspace, generate_all): ...
+
+    # sys.argv-based generators
+    options = take_slice_arguments(sys.argv)
+    for candidate in select(options, build_keyspace, generate_all): ...
+
+    SHARD=2/4 ./run_attempt.sh hash.txt      # run_attempt.sh passes it on
+"""
+
+import argparse
+import itertools
+import sys
+from typing import Callable, Iterable, Iterator, List, Optional, Tuple
+
+from cmw.checkpoint import add_checkpoint_arguments
+from cmw.keyspace import Keyspace
+from cmw.monitor import add_family_arguments
+
+
+def parse_shard(text: str) -> Tuple[int, int]:
+    """Parse "i/N" (1-based: 1/4 .. 4/4) into (i, N)."""
+    try:
+        index, count = (int(part) for part in text.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like i/N, got {text!r}")
+    if count < 1 or not 1 <= index <= count:
+        raise argparse.ArgumentTypeError(f"shard {text!r} out of range (use 1/N .. N/N)")
+    return index, count
+
+
+def parse_range(text: str) -> Tuple[int, Optional[int]]:
+    """Parse "start:stop" (either side may be empty) into (start, stop)."""
+    try:
+        start, stop = text.split(":")
+        bounds = (int(start) if start else 0, int(stop) if stop else None)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"range must look like start:stop, got {text!r}")
+    if bounds[0] < 0 or (bounds[1] is not None and bounds[1] < bounds[0]):
+        raise argparse.ArgumentTypeError(f"range {text!r} is empty or negative")
+    return bounds
+
+
+def shard_bounds(total: int, index: int, count: int) -> Tuple[int, int]:
+    """[start, stop) of shard `index` (1-based) out of `count` over `total` candidates."""
+    return total * (index - 1) // count, total * index // count
+
+
+def add_slice_arguments(parser: argparse.ArgumentParser):
+    """
+    Add the shared --shard / --range options (and cmw.checkpoint's
+    --checkpoint, cmw.monitor's --families) to a generator's parser.
+    """
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--shard", type=parse_shard, metavar="I/N",
+                       help="Generate only shard I of N (1-based, disjoint, equal-sized)")
+    group.add_argument("--range", type=parse_range, metavar="START:STOP",
+                       help="Generate only candidates START..STOP-1 (0-based)")
+    add_checkpoint_arguments(parser)
+    add_family_arguments(parser)
+
+
+def take_slice_arguments(argv: List[str],
+                         *extra: Callable[[argparse.ArgumentParser], None]) -> argparse.Namespace:
+    """
+    Parse --shard / --range (plus any `extra` option groups, e.g.
+    add_parallel_arguments) out of `argv` in place, for scripts that read
+    sys.argv directly, leaving their own flags where they expect them.
+    """
+    parser = argparse.ArgumentParser(add_help=False)
+    add_slice_arguments(parser)
+    for add_arguments in extra:
+        add_arguments(parser)
+    args, rest = parser.parse_known_args(argv[1:])
+    argv[1:] = rest
+    return args
+
+
+def is_sliced(args: argparse.Namespace) -> bool:
+    return getattr(args, "shard", None) is not None or getattr(args, "range", None) is not None
+
+
+def slice_bounds(args: argparse.Namespace, total: int) -> Tuple[int, int]:
+    """[start, stop) selected by --shard / --range over `total` candidates."""
+    if args.shard is not None:
+        return shard_bounds(total, *args.shard)
+    start, stop = args.range
+    stop = total if stop is None else min(stop, total)
+    return min(start, stop), stop
+
+
+def keyspace_slice(args: argparse.Namespace, keyspace: Keyspace) -> Tuple[int, int]:
+    """[start, stop) of `keyspace` this host should emit (all of it when unsliced)."""
+    total = len(keyspace)
+    if not is_sliced(args):
+        return 0, total
+    start, stop = slice_bounds(args, total)
+    print(f"# Slice: candidates {start:,}..{stop:,} of {total:,}", file=sys.stderr)
+    return start, stop
+
+
+def select(args: argparse.Namespace,
+           build_keyspace: Optional[Callable[[], Keyspace]] = None,
+           generate_all: Optional[Callable[[], Iterable[str]]] = None) -> Iterator[str]:
+    """
+    The candidates this host should emit.
+
+    Unsliced runs use generate_all() when given (the generator's own stream),
+    sliced runs use the keyspace when there is one and the stream otherwise
+    (--range only: exits on --shard).
+    """
+    if not is_sliced(args):
+        return iter(generate_all() if generate_all is not None else build_keyspace())
+
+    if build_keyspace is not None:
+        keyspace = build_keyspace()
+        return keyspace.iter_range(*keyspace_slice(args, keyspace))
+
+    if args.shard is not None:
+        sys.exit("--shard needs a generator with a keyspace (build_keyspace); this one can only stream, "
+                 "so every shard would walk the whole stream. Run it unsharded, or give each host a "
+                 "--range START:STOP")
+    stream = iter(generate_all())
+    start, stop = args.range
+    print(f"# Slice: candidates {start:,}..{'end' if stop is None else f'{stop:,}'} (stream)", file=sys.stderr)
+    return itertools.islice(stream, start, stop)
@@ -0,0 +1,279 @@
+"""
+Family boundary sidecar: where each family starts in a generated stream.
+
+A generator writes one anonymous stream, and the families in it survive
+only as "# Generating Family N" lines on stderr. With --sidecar FILE the
+writer also records checkpoint rows, each one a candidate offset (lines
+written before it), a byte offset into the output, a family and the base
+index of that candidate. The base index is the generator index that
+--range takes. A row is written where every family starts and after
+every --sidecar-every candidates in between. That makes "which family
+produced line X", "what index is hashcat at" and "where in the file is
+line X" a binary search over the rows, with no rescan.
+
+Keyspace-backed generators (cmw.parallel) cut their blocks at family
+starts, so every family begins exactly on a row. Stream generators say
+where their families start by calling start_family(name) as a family
+begins, before its first candidate is yielded (their log_progress()
+does). The writer pulls candidates one at a time (Sidecar.pull), so the
+call lands at the position of the family's first candidate. Streams
+that never call it are one family, "All candidates".
+
+The file is JSON lines, appended and flushed as the run goes, so it can
+be read while the generator is still running. The header comes first.
+{"family": name} declares the next family number, and [line, byte,
+family, index] is a row. {"end": [...]} is written when the writer
+closes. With --skip-tested the line and byte columns count what was
+written, so between two rows the index is only a lower bound.
+
+A run started fresh rewrites the file. A --checkpoint resume appends
+to it instead: a new header starts the resumed run, whose lines count
+from the start of its own output, and readers use the last run.
+
+Usage:
+    python3 generate.py --sidecar run.sidecar | hashcat ...     # add_output_arguments() adds it
+    python3 -m cmw where run.sidecar 123456789                   # family and index of line 123456789
+    python3 scripts/monitor.py run.sidecar                       # per-family progress, streams too
+"""
+
+import argparse
+import bisect
+import itertools
+import json
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+SIDECAR_FORMAT = "cmw-sidecar"
+SIDECAR_VERSION = 1
+
+# Candidates between rows inside a family: 10B candidates is 10,000 rows
+DEFAULT_EVERY = 1_000_000
+
+# The family of a stream that never announces one
+DEFAULT_FAMILY = "All candidates"
+
+# The Sidecar whose writer is pulling from a stream right now (Sidecar.pull)
+_pulling: Optional["Sidecar"] = None
+
+
+def parse_every(text: str) -> int:
+    try:
+        every = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected a number of candidates, got {text!r}")
+    if every < 1:
+        raise argparse.ArgumentTypeError("--sidecar-every must be at least 1")
+    return every
+
+
+def add_sidecar_arguments(parser: argparse.ArgumentParser):
+    """Add --sidecar / --sidecar-every (added by cmw.output.add_output_arguments)."""
+    parser.add_argument("--sidecar", metavar="FILE",
+                        help="Record where each family starts in the output (line, byte, index) to FILE")
+    parser.add_argument("--sidecar-every", type=parse_every, default=DEFAULT_EVERY, metavar="N",
+                        help=f"Also record a row every N candidates (default {DEFAULT_EVERY:,})")
+
+
+def stream_start(args: argparse.Namespace) -> Tuple[int, int]:
+    """(index of the first candidate, step between candidates) that cmw.shard.select() takes from a stream."""
+    bounds = getattr(args, "range", None)
+    return (bounds[0] if bounds is not None else 0), 1
+
+
+def start_family(name: str):
+    """
+    Called by a stream generator as family `name` begins, before its
+    first candidate is yielded. Marks the family's start in the sidecar
+    of the stream being written; does nothing without --sidecar.
+    """
+    if _pulling is not None:
+        _pulling.announce(name)
+
+
+class Sidecar:
+    """The writing side: rows for one CandidateWriter (see CandidateWriter.write_all)."""
+
+    def __init__(self, path: str, every: int = DEFAULT_EVERY, filtered: bool = False):
+        self.path = path
+        self.every = every
+        self.filtered = filtered
+        # Base index of the next candidate, and the step to the one after
+        self.index = 0
+        self.stride = 1
+        # Family the stream last announced, the one of the last row, and the line the next row is due at
+        self.announced = DEFAULT_FAMILY
+        self.family: Optional[str] = None
+        self.due = 0
+        # The batch being pulled, and (position in it, family) of each start_family() made meanwhile
+        self.batch: List[str] = []
+        self.cuts: List[Tuple[int, str]] = []
+        # Add a run to the file rather than rewrite it (a --checkpoint resume)
+        self.append = False
+        self._numbers = {}
+        self._names: List[str] = []
+        self._starts: List[int] = []
+        self._file = None
+
+    def start(self, index: int, stride: int = 1):
+        self.index = index
+        self.stride = stride
+
+    def skip(self, candidates: int):
+        """Candidates taken from the stream without being written (a --checkpoint resume)."""
+        self.index += candidates * self.stride
+
+    def announce(self, name: str):
+        # Called while the next candidate is produced: it will land at the batch's current length
+        self.cuts.append((len(self.batch), name))
+        self.announced = name
+
+    def pull(self, stream: Iterator[str], count: int) -> List[str]:
+        """
+        Up to `count` candidates from `stream`, appended one at a time, with
+        start_family() calls made meanwhile noted in cuts (take_cuts()).
+        """
+        global _pulling
+        batch = self.batch = []
+        append = batch.append
+        _pulling = self
+        try:
+            for candidate in itertools.islice(stream, count):
+                append(candidate)
+        finally:
+            _pulling = None
+        return batch
+
+    def take_cuts(self) -> List[Tuple[int, str]]:
+        cuts, self.cuts = self.cuts, []
+        return cuts
+
+    def use_keyspace(self, families: Sequence[Tuple[str, int, int]]):
+        """Attribute blocks by index: (name, start, stop) of every family (cmw.monitor.family_bounds)."""
+        self._names = [name for name, _, _ in families]
+        self._starts = [start for _, start, _ in families]
+        self.stride = 1
+
+    def block(self, out, start: int, stop: int):
+        """Before writing keyspace[start:stop] (which never spans two families)."""
+        number = bisect.bisect_right(self._starts, start) - 1
+        name = self._names[number] if number >= 0 else DEFAULT_FAMILY
+        self.index = start
+        if name != self.family or out.lines >= self.due:
+            self.record(out, name)
+        self.index = stop
+
+    def record(self, out, name: str):
+        """A row: `out`'s next line is the candidate at self.index, of family `name`."""
+        if self._file is None:
+            self._file = open(self.path, "a" if self.append else "w", buffering=1)
+            self._write({"format": SIDECAR_FORMAT, "version": SIDECAR_VERSION, "every": self.every,
+                         "stride": self.stride, "filtered": self.filtered})
+        if name not in self._numbers:
+            self._numbers[name] = len(self._numbers)
+            self._write({"family": name})
+        self._write([out.lines, out.bytes, self._numbers[name], self.index])
+        self.family = name
+        self.due = out.lines + self.every
+
+    def close(self, out):
+        if self._file is None:
+            self.record(out, self.announced)
+        self._write({"end": [out.lines, out.bytes, self.index], "reader_closed": out.reader_closed})
+        self._file.close()
+
+    def _write(self, record):
+        self._file.write(json.dumps(record, separators=(",", ":")) + "\n")
+
+
+class Location:
+    """Where line `line` of a sidecar's stream came from."""
+
+    def __init__(self, line: int, family: str, index: int, exact: bool, row_line: int, row_byte: int):
+        self.line = line
+        self.family = family
+        # The candidate's base index (a lower bound when not exact: --skip-tested dropped some)
+        self.index = index
+        self.exact = exact
+        # The row at or before it: the byte offset is exact there
+        self.row_line = row_line
+        self.row_byte = row_byte
+
+    def __str__(self) -> str:
+        index = f"{self.index:,}" if self.exact else f">= {self.index:,}"
+        return (f"line {self.line:,}: {self.family}, index {index} "
+                f"(row at line {self.row_line:,}, byte {self.row_byte:,})")
+
+
+class SidecarIndex:
+    """The reading side: the last run in a sidecar file, possibly still being written."""
+
+    def __init__(self, header: dict, names: List[str], rows: List[Tuple[int, int, int, int]],
+                 end: Optional[Tuple[int, int, int]] = None):
+        self.header = header
+        self.names = names
+        self.lines = [row[0] for row in rows]
+        self.rows = rows
+        self.end = end
+
+    @classmethod
+    def load(cls, path: str) -> "SidecarIndex":
+        header, names, rows, end = None, [], [], None
+        with open(path) as f:
+            for text in f:
+                try:
+                    record = json.loads(text)
+                except ValueError:
+                    # The last line of a file still being written
+                    break
+                if header is None or (isinstance(record, dict) and record.get("format") == SIDECAR_FORMAT):
+                    if not isinstance(record, dict) or record.get("format") != SIDECAR_FORMAT:
+                        raise ValueError(f"{path}: not a sidecar file")
+                    if record.get("version") != SIDECAR_VERSION:
+                        raise ValueError(f"{path}: sidecar version {record.get('version')}, "
+                                         f"expected {SIDECAR_VERSION}")
+                    # A resumed run starts over: its lines count from the start of its own output
+                    header, names, rows, end = record, [], [], None
+                elif isinstance(record, list):
+                    rows.append(tuple(record))
+                elif "family" in record:
+                    names.append(record["family"])
+                elif "end" in record:
+                    end = tuple(record["end"])
+        if header is None:
+            raise ValueError(f"{path}: empty sidecar file")
+        return cls(header, names, rows, end)
+
+    @staticmethod
+    def sniff(path: str) -> bool:
+        """Whether `path` is a sidecar file (rather than a --families file)."""
+        with open(path) as f:
+            try:
+                record = json.loads(f.readline())
+            except ValueError:
+                return False
+        return isinstance(record, dict) and record.get("format") == SIDECAR_FORMAT
+
+    def families(self) -> Iterator[Tuple[str, int, int]]:
+        """(name, first line, line after) of every run of one family, in stream order."""
+        stop = self.end[0] if self.end is not None else (self.lines[-1] if self.lines else 0)
+        runs = []
+        for line, _, family, _ in self.rows:
+            if not runs or runs[-1][0] != family:
+                runs.append([family, line])
+        for number, (family, line) in enumerate(runs):
+            yield self.names[family], line, runs[number + 1][1] if number + 1 < len(runs) else stop
+
+    def locate(self, line: int) -> Optional[Location]:
+        """Family, base index and nearest byte offset of the candidate on `line` (0-based)."""
+        if line < 0 or (self.end is not None and line >= self.end[0]):
+            return None
+        row = bisect.bisect_right(self.lines, line) - 1
+        if row < 0:
+            return None
+        row_line, row_byte, family, index = self.rows[row]
+        exact = not self.header.get("filtered")
+        return Location(line, self.names[family], index + (line - row_line) * self.header.get("stride", 1),
+                        exact, row_line, row_byte)
+
+    def index_of(self, line: int) -> Optional[int]:
+        location = self.locate(line)
+        return None if location is None else location.index
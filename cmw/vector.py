@@ -0,0 +1,131 @@
+"""
+Block rendering of product keyspaces straight to output bytes.
+
+The base x trailing families spend almost all their time in
+``yield base + trail`` and the per-line encode: billions of small
+interpreter operations. A product is instead split into an outer part
+(the bases) and an inner part (the trailing patterns, plus any further
+small dimensions folded into them). The inner candidates are encoded
+once; after that every (base, inner range) pair becomes one block of
+output lines built without touching individual candidates:
+
+- NumPy runs: the inner candidates are grouped into runs of equal byte
+  length, each held as a fixed-width uint8 matrix. A (base, run) block
+  is a fixed-width matrix -- base bytes broadcast down the left, the
+  run beside them, a newline column on the right -- filled directly
+  into the output buffer, so lines cost memory bandwidth, not bytecode.
+  Used when runs are long (trailing sets generated length by length).
+- bytes.join: ``base + (b"\\n" + base).join(inner) + b"\\n"`` for inner
+  lists whose lengths alternate (e.g. "!", " !", ".!" separators) and
+  when NumPy is not installed. Slower than the runs, several times
+  faster than per-candidate concatenation.
+
+Either way the result is exactly the newline-terminated UTF-8 the
+per-candidate path produces.
+
+Usage:
+    renderer = ProductRenderer([bases, trailing])
+    block = renderer.render(start, stop)      # bytes, one line per candidate
+"""
+
+import itertools
+import math
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+NEWLINE = ord("\n")
+
+# Fold trailing dimensions into the inner table while it stays this
+# small, so products of tiny dimensions (per-position charsets) still
+# get long inner ranges per outer prefix
+INNER_LIMIT = 1 << 16
+
+# Below this average run length the per-run NumPy overhead outweighs
+# the copy it saves, and bytes.join is faster
+MIN_RUN_LENGTH = 32
+
+
+def available() -> bool:
+    """True when NumPy is installed (block rendering works without it, just slower)."""
+    return np is not None
+
+
+class ProductRenderer:
+    """Encoded tables for one Product (values concatenated, last dimension fastest)."""
+
+    def __init__(self, dims: Sequence[Sequence[str]]):
+        split = len(dims) - 1
+        while split > 0 and math.prod(len(dim) for dim in dims[split - 1:]) <= INNER_LIMIT:
+            split -= 1
+        self.outer = [[value.encode() for value in dim] for dim in dims[:split]]
+        self.inner = ["".join(values).encode() for values in itertools.product(*dims[split:])]
+        self.runs = self._runs()
+        self.run_starts = [start for start, _ in self.runs] if self.runs is not None else None
+
+    def _runs(self) -> Optional[List[Tuple[int, "np.ndarray"]]]:
+        """(first index, fixed-width matrix) per run of equal-length inner values, if worth it."""
+        if np is None or not self.inner:
+            return None
+        groups = [list(group) for _, group in itertools.groupby(self.inner, key=len)]
+        if len(self.inner) < MIN_RUN_LENGTH * len(groups):
+            return None
+        runs, position = [], 0
+        for values in groups:
+            matrix = np.frombuffer(b"".join(values), dtype=np.uint8).reshape(len(values), len(values[0]))
+            runs.append((position, matrix))
+            position += len(values)
+        return runs
+
+    def prefix(self, outer_index: int) -> bytes:
+        """Concatenated outer values for one outer mixed-radix index."""
+        values = []
+        for dim in reversed(self.outer):
+            outer_index, digit = divmod(outer_index, len(dim))
+            values.append(dim[digit])
+        return b"".join(reversed(values))
+
+    def spans(self, start: int, stop: int) -> Iterator[Tuple[bytes, int, int]]:
+        """(prefix, inner start, inner stop) pieces covering start..stop-1, in order."""
+        outer_index, local = divmod(start, len(self.inner))
+        remaining = stop - start
+        while remaining > 0:
+            end = min(len(self.inner), local + remaining)
+            yield self.prefix(outer_index), local, end
+            remaining -= end - local
+            outer_index += 1
+            local = 0
+
+    def render(self, start: int, stop: int) -> bytes:
+        """Candidates start..stop-1, each followed by a newline."""
+        if stop <= start:
+            return b""
+        if self.runs is None:
+            return b"".join(prefix + (b"\n" + prefix).join(self.inner[lo:hi]) + b"\n"
+                            for prefix, lo, hi in self.spans(start, stop))
+
+        pieces = []
+        for prefix, lo, hi in self.spans(start, stop):
+            run = bisect_right(self.run_starts, lo) - 1
+            while lo < hi:
+                run_start, matrix = self.runs[run]
+                take = min(hi, run_start + len(matrix)) - lo
+                pieces.append((prefix, matrix[lo - run_start:lo - run_start + take]))
+                lo += take
+                run += 1
+
+        total = sum(len(rows) * (len(prefix) + rows.shape[1] + 1) for prefix, rows in pieces)
+        out = np.empty(total, dtype=np.uint8)
+        position = 0
+        for prefix, rows in pieces:
+            width = len(prefix) + rows.shape[1] + 1
+            block = out[position:position + len(rows) * width].reshape(len(rows), width)
+            block[:, :len(prefix)] = np.frombuffer(prefix, dtype=np.uint8)
+            block[:, len(prefix):-1] = rows
+            block[:, -1] = NEWLINE
+            position += block.size
+        return out.tobytes()
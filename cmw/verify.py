@@ -0,0 +1,296 @@
+"""
+CPU reference verifier for Bitcoin Core wallet hashes ($bitcoin$, -m 11300).
+
+Bitcoin Core encrypts the wallet's 32-byte master key with CCrypter:
+
+- key, iv = EVP_BytesToKey(SHA-512, passphrase, salt, iterations):
+  d = SHA-512(passphrase + salt), then d = SHA-512(d) iterations - 1
+  more times; the key is d[:32], the IV d[32:48]
+- the master key is AES-256-CBC encrypted with PKCS#7 padding, so its
+  48-byte ciphertext ends with a block that is all padding
+
+hashcat's $bitcoin$ line carries that ciphertext, the salt and the
+iteration count. Like hashcat, check() only decrypts the last block
+(CBC: the block before it is its IV) and compares it with sixteen 0x10
+bytes. A wrong passphrase passes with probability 2^-128.
+
+The SHA-512 chain is the whole cost (25,000 rounds: tens of
+milliseconds a candidate in CPython), so the one AES block decryption
+is done in pure Python and needs no crypto package. The chain runs on
+one of two engines: "hashlib" (one call per round per candidate) or
+"numpy" (cmw.sha512: a batch of candidates as lanes of one vectorised
+kernel); "auto" benchmarks both on this host and takes the faster.
+verify() spreads batches of candidates over a process pool and stops
+at the first hit.
+It is a reference, and a way for CPU-only hosts to contribute and to
+check a pipeline end to end, not a replacement for hashcat.
+
+Usage:
+    target = BitcoinHash.parse(open("hash.txt").read())
+    check(b"this is a bad password!", target)
+    for result in verify(candidates, target, workers=0, engine=choose_engine("auto")[0]): ...
+"""
+
+import hashlib
+import itertools
+import multiprocessing
+import os
+import re
+import time
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from cmw import sha512
+from cmw.parallel import bounded_map, resolve_workers
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Candidates per pool task: ~2 seconds of work at 25,000 iterations
+# with hashlib; the numpy engine takes one kernel's worth of lanes
+DEFAULT_BATCH_SIZE = 64
+
+ENGINES = ("auto", "hashlib", "numpy")
+
+BLOCK = 16
+PADDING = bytes([BLOCK]) * BLOCK
+
+HASH_PATTERN = re.compile(r"\$bitcoin\$[0-9a-fA-F$]+")
+
+
+class BitcoinHash:
+    """The fields of a hashcat $bitcoin$ line."""
+
+    def __init__(self, master: bytes, salt: bytes, iterations: int, ckey: bytes = b"", pubkey: bytes = b""):
+        if len(master) < 2 * BLOCK or len(master) % BLOCK:
+            raise ValueError(f"encrypted master key must be whole AES blocks (at least 2), got {len(master)} bytes")
+        self.master = master
+        self.salt = salt
+        self.iterations = iterations
+        self.ckey = ckey
+        self.pubkey = pubkey
+
+    @classmethod
+    def parse(cls, text: str) -> "BitcoinHash":
+        """$bitcoin$<len>$<master>$<len>$<salt>$<iterations>$<len>$<ckey>$<len>$<pubkey>"""
+        fields = text.strip().split("$")
+        if len(fields) != 11 or fields[:2] != ["", "bitcoin"]:
+            raise ValueError(f"not a $bitcoin$ hash: {text.strip()[:40]!r}")
+        try:
+            master, salt, ckey, pubkey = (bytes.fromhex(fields[i]) for i in (3, 5, 8, 10))
+            iterations = int(fields[6])
+        except ValueError:
+            raise ValueError("malformed $bitcoin$ hash: bad hex or iteration count")
+        for length, value in ((fields[2], fields[3]), (fields[4], fields[5]), (fields[7], fields[8]), (fields[9], fields[10])):
+            if int(length) != len(value):
+                raise ValueError(f"malformed $bitcoin$ hash: field of {len(value)} hex chars declared as {length}")
+        return cls(master, salt, iterations, ckey, pubkey)
+
+    def __str__(self) -> str:
+        fields = [self.master.hex(), self.salt.hex(), None, self.ckey.hex(), self.pubkey.hex()]
+        parts = []
+        for value in fields:
+            parts += [str(self.iterations)] if value is None else [str(len(value)), value]
+        return "$bitcoin$" + "$".join(parts)
+
+
+def load_hash(source: Optional[str] = None) -> BitcoinHash:
+    """A $bitcoin$ string, a file holding one, or (None) the challenge hash in README.md."""
+    if source is not None and source.startswith("$bitcoin$"):
+        return BitcoinHash.parse(source)
+    path = source or os.path.join(ROOT, "README.md")
+    with open(path) as f:
+        match = HASH_PATTERN.search(f.read())
+    if match is None:
+        raise ValueError(f"no $bitcoin$ hash in {path}")
+    return BitcoinHash.parse(match.group())
+
+
+def derive(passphrase: bytes, salt: bytes, iterations: int) -> Tuple[bytes, bytes]:
+    """(key, iv) of CCrypter::SetKeyFromPassphrase: EVP_BytesToKey with SHA-512."""
+    sha512 = hashlib.sha512
+    digest = sha512(passphrase + salt).digest()
+    for _ in range(iterations - 1):
+        digest = sha512(digest).digest()
+    return digest[:32], digest[32:48]
+
+
+def check(passphrase: bytes, target: BitcoinHash) -> bool:
+    """Does `passphrase` decrypt the master key to a block of valid padding?"""
+    key, _ = derive(passphrase, target.salt, target.iterations)
+    return last_block(key, target.master) == PADDING
+
+
+def derive_keys(passphrases: List[bytes], target: BitcoinHash, engine: str = "hashlib") -> List[bytes]:
+    """The AES key of each passphrase, the chain after the first round run by `engine`."""
+    if engine == "hashlib":
+        return [derive(passphrase, target.salt, target.iterations)[0] for passphrase in passphrases]
+    first = [hashlib.sha512(passphrase + target.salt).digest() for passphrase in passphrases]
+    return [digest[:32] for digest in sha512.iterate(first, target.iterations - 1)]
+
+
+def choose_engine(engine: str = "auto") -> Tuple[str, str]:
+    """(engine, why): "auto" benchmarks the NumPy kernel against hashlib and takes the faster."""
+    if engine != "auto":
+        return engine, "requested"
+    if not sha512.available():
+        return "hashlib", "NumPy is not installed"
+    kernel, scalar = sha512.benchmark(rounds=8)
+    faster = "numpy" if kernel < scalar else "hashlib"
+    return faster, f"numpy {kernel * 1e6:.2f} us vs hashlib {scalar * 1e6:.2f} us per SHA-512 round"
+
+
+def last_block(key: bytes, ciphertext: bytes) -> bytes:
+    """CBC plaintext of the last block of `ciphertext` (its IV is the block before it)."""
+    plain = decrypt_block(key, ciphertext[-BLOCK:])
+    return bytes(a ^ b for a, b in zip(plain, ciphertext[-2 * BLOCK:-BLOCK]))
+
+
+# ============================================================================
+# AES-256 (FIPS-197), one block at a time
+# ============================================================================
+
+def _xtime(a: int) -> int:
+    a <<= 1
+    return (a ^ 0x11B) if a & 0x100 else a
+
+
+def _multiply(a: int, b: int) -> int:
+    product = 0
+    while b:
+        if b & 1:
+            product ^= a
+        a = _xtime(a)
+        b >>= 1
+    return product
+
+
+def _sboxes() -> Tuple[List[int], List[int]]:
+    sbox = [0] * 256
+    for value in range(256):
+        # Multiplicative inverse in GF(2^8), then the affine transform
+        inverse = next((x for x in range(1, 256) if _multiply(value, x) == 1), 0) if value else 0
+        result = inverse
+        for shift in range(1, 5):
+            result ^= ((inverse << shift) | (inverse >> (8 - shift))) & 0xFF
+        sbox[value] = result ^ 0x63
+    inverse_sbox = [0] * 256
+    for value, substituted in enumerate(sbox):
+        inverse_sbox[substituted] = value
+    return sbox, inverse_sbox
+
+
+SBOX, INVERSE_SBOX = _sboxes()
+
+
+def expand_key(key: bytes) -> List[List[int]]:
+    """The 15 round keys of AES-256, 16 bytes each."""
+    if len(key) != 32:
+        raise ValueError("AES-256 needs a 32-byte key")
+    words = [list(key[i:i + 4]) for i in range(0, 32, 4)]
+    rcon = 1
+    for i in range(8, 60):
+        word = list(words[i - 1])
+        if i % 8 == 0:
+            word = [SBOX[b] for b in word[1:] + word[:1]]
+            word[0] ^= rcon
+            rcon = _xtime(rcon)
+        elif i % 8 == 4:
+            word = [SBOX[b] for b in word]
+        words.append([a ^ b for a, b in zip(words[i - 8], word)])
+    return [sum(words[r * 4:r * 4 + 4], []) for r in range(15)]
+
+
+def encrypt_block(key: bytes, block: bytes) -> bytes:
+    rounds = expand_key(key)
+    state = [a ^ b for a, b in zip(block, rounds[0])]
+    for r in range(1, 15):
+        state = [SBOX[b] for b in state]
+        # ShiftRows: row i (byte i of each column) moves left by i columns
+        state = [state[(i + 4 * (i % 4)) % 16] for i in range(16)]
+        if r < 14:
+            mixed = []
+            for c in range(0, 16, 4):
+                a = state[c:c + 4]
+                for i in range(4):
+                    mixed.append(_xtime(a[i]) ^ _xtime(a[(i + 1) % 4]) ^ a[(i + 1) % 4] ^ a[(i + 2) % 4] ^ a[(i + 3) % 4])
+            state = mixed
+        state = [a ^ b for a, b in zip(state, rounds[r])]
+    return bytes(state)
+
+
+def decrypt_block(key: bytes, block: bytes) -> bytes:
+    rounds = expand_key(key)
+    state = [a ^ b for a, b in zip(block, rounds[14])]
+    for r in range(13, -1, -1):
+        # InvShiftRows, InvSubBytes, AddRoundKey
+        state = [state[(i - 4 * (i % 4)) % 16] for i in range(16)]
+        state = [INVERSE_SBOX[b] ^ k for b, k in zip(state, rounds[r])]
+        if r:
+            mixed = []
+            for c in range(0, 16, 4):
+                a = state[c:c + 4]
+                for i in range(4):
+                    mixed.append(_multiply(a[i], 14) ^ _multiply(a[(i + 1) % 4], 11)
+                                 ^ _multiply(a[(i + 2) % 4], 13) ^ _multiply(a[(i + 3) % 4], 9))
+            state = mixed
+    return bytes(state)
+
+
+# ============================================================================
+# Batched verification
+# ============================================================================
+
+# Set in the parent before the pool forks
+_target: Optional[BitcoinHash] = None
+_engine = "hashlib"
+
+
+class Result:
+    """One checked batch: how many, the passphrase that matched (if any), worker seconds."""
+
+    def __init__(self, checked: int, found: Optional[bytes], seconds: float):
+        self.checked = checked
+        self.found = found
+        self.seconds = seconds
+
+
+def _check_batch(batch: List[bytes]) -> Result:
+    started = time.perf_counter()
+    if _engine == "hashlib":
+        # One at a time, so a hit ends the batch early
+        for checked, passphrase in enumerate(batch, 1):
+            if check(passphrase, _target):
+                return Result(checked, passphrase, time.perf_counter() - started)
+        return Result(len(batch), None, time.perf_counter() - started)
+    keys = derive_keys(batch, _target, _engine)
+    found = next((passphrase for passphrase, key in zip(batch, keys)
+                  if last_block(key, _target.master) == PADDING), None)
+    return Result(len(batch), found, time.perf_counter() - started)
+
+
+def verify(candidates: Iterable[bytes], target: BitcoinHash, workers: int = 0,
+           batch_size: Optional[int] = None, engine: str = "hashlib") -> Iterator[Result]:
+    """
+    Check `candidates` (bytes, no newline) against `target` in batches
+    over `workers` forked processes (0 = every core), yielding each
+    batch's Result as it finishes. Stops after the batch with a hit.
+    `engine` is "hashlib" or "numpy" (see choose_engine()).
+    """
+    global _target, _engine
+    _target, _engine = target, engine
+    if batch_size is None:
+        batch_size = DEFAULT_BATCH_SIZE if engine == "hashlib" else sha512.DEFAULT_LANES
+    stream = iter(candidates)
+    batches = iter(lambda: list(itertools.islice(stream, batch_size)), [])
+    workers = resolve_workers(workers)
+    if workers == 1:
+        for result in map(_check_batch, batches):
+            yield result
+            if result.found is not None:
+                return
+        return
+    with multiprocessing.get_context("fork").Pool(workers) as pool:
+        for result in bounded_map(pool, _check_batch, batches, ahead=2 * workers, ordered=False):
+            yield result
+            if result.found is not None:
+                # Leaving the with block terminates the workers still checking
+                return
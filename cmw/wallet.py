@@ -0,0 +1,167 @@
+"""
+Synthetic encrypted wallets: Bitcoin Core 0.4.0 CCrypter output for a known passphrase.
+
+EncryptWallet() (src/wallet.cpp in archive/attempt-1/bitcoin-v0.4.0)
+draws a random 32-byte master key and 8-byte salt, derives an AES key
+and IV from the passphrase (cmw.verify.derive) and stores the master
+key AES-256-CBC encrypted in an "mkey" record. Every private key is
+then stored encrypted under the master key in a "ckey" record, with
+the first half of Hash(pubkey) (double SHA-256) as its IV.
+
+A TestWallet does the same for a passphrase of your choosing, at any
+iteration count (25,000 like a real wallet, or 10 so that checking a
+candidate is nearly free). It produces:
+
+- hash(): the $bitcoin$ line hashcat -m 11300 and cmw.verify take,
+  with the ckey and pubkey fields of the first key, as bitcoin2john
+  writes them
+- mkey_record() and ckey_record(): the (key, value) bytes of the two
+  wallet.dat records, serialized as CWalletDB writes them
+- write(): a wallet.dat holding them (cmw.walletdat.write_btree),
+  padded with unencrypted-looking key records to any size
+
+The private key is a real secp256k1 key and its pubkey the 65-byte
+uncompressed point (0.4.0 predates compressed keys), so the ckey record
+decrypts to a secret that matches it. Nothing here needs a crypto
+package; a seed makes a wallet reproducible byte for byte.
+
+Usage:
+    wallet = TestWallet("this is a bad password!", iterations=10, seed=1)
+    print(wallet.hash())
+    key, value = wallet.mkey_record()
+"""
+
+import hashlib
+import os
+import random
+import struct
+from typing import Optional, Tuple, Union
+
+from cmw.verify import BLOCK, BitcoinHash, derive, encrypt_block
+from cmw.walletdat import write_btree
+
+# CMasterKey's default, and EncryptWallet()'s floor
+DEFAULT_ITERATIONS = 25000
+
+KEY_SIZE = 32
+SALT_SIZE = 8
+
+# Filler ("key", pubkey) -> DER private key records, about 360 bytes each
+FILLER_PUBKEY_SIZE = 65
+FILLER_VALUE_SIZE = 279
+
+# CMasterKey.nDerivationMethod: 0 = EVP_sha512()
+DERIVATION_SHA512 = 0
+
+# secp256k1
+P = 2 ** 256 - 2 ** 32 - 977
+N = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+G = (0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798,
+     0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8)
+
+
+def compact_size(n: int) -> bytes:
+    """Bitcoin's variable-length integer, as serialize.h writes vector and string lengths."""
+    if n < 253:
+        return bytes([n])
+    if n <= 0xFFFF:
+        return b"\xfd" + struct.pack("<H", n)
+    if n <= 0xFFFFFFFF:
+        return b"\xfe" + struct.pack("<I", n)
+    return b"\xff" + struct.pack("<Q", n)
+
+
+def serialize_bytes(data: bytes) -> bytes:
+    """A std::vector<unsigned char> or std::string: length, then the bytes."""
+    return compact_size(len(data)) + data
+
+
+def cbc_encrypt(key: bytes, iv: bytes, plaintext: bytes) -> bytes:
+    """AES-256-CBC with PKCS#7 padding, as CCrypter::Encrypt (EVP_aes_256_cbc) produces it."""
+    pad = BLOCK - len(plaintext) % BLOCK
+    padded = plaintext + bytes([pad]) * pad
+    previous, ciphertext = iv[:BLOCK], b""
+    for i in range(0, len(padded), BLOCK):
+        previous = encrypt_block(key, bytes(a ^ b for a, b in zip(padded[i:i + BLOCK], previous)))
+        ciphertext += previous
+    return ciphertext
+
+
+def _add(p: Optional[Tuple[int, int]], q: Optional[Tuple[int, int]]) -> Optional[Tuple[int, int]]:
+    if p is None:
+        return q
+    if q is None:
+        return p
+    if p[0] == q[0] and (p[1] + q[1]) % P == 0:
+        return None
+    if p == q:
+        slope = 3 * p[0] * p[0] * pow(2 * p[1], -1, P)
+    else:
+        slope = (q[1] - p[1]) * pow(q[0] - p[0], -1, P)
+    x = (slope * slope - p[0] - q[0]) % P
+    return x, (slope * (p[0] - x) - p[1]) % P
+
+
+def public_key(secret: bytes) -> bytes:
+    """The uncompressed secp256k1 public key (04 || X || Y) of a 32-byte private key."""
+    k = int.from_bytes(secret, "big")
+    if not 0 < k < N:
+        raise ValueError("private key out of range")
+    point, addend = None, G
+    while k:
+        if k & 1:
+            point = _add(point, addend)
+        addend = _add(addend, addend)
+        k >>= 1
+    return b"\x04" + point[0].to_bytes(32, "big") + point[1].to_bytes(32, "big")
+
+
+class TestWallet:
+    """One wallet encryption: master key, salt and a key pair under `passphrase`."""
+
+    def __init__(self, passphrase: Union[str, bytes], iterations: int = DEFAULT_ITERATIONS,
+                 salt: Optional[bytes] = None, seed: Optional[int] = None):
+        if iterations < 1:
+            raise ValueError("iterations must be at least 1")
+        if salt is not None and len(salt) != SALT_SIZE:
+            raise ValueError(f"salt must be {SALT_SIZE} bytes, got {len(salt)}")
+        # Bitcoin Core hashes the std::string as typed: UTF-8 bytes, no terminator
+        self.passphrase = passphrase.encode("utf-8") if isinstance(passphrase, str) else passphrase
+        self.iterations = iterations
+        draw = os.urandom if seed is None else random.Random(seed).randbytes
+        self._draw = draw
+        self.master_key = draw(KEY_SIZE)
+        self.salt = draw(SALT_SIZE) if salt is None else salt
+        self.secret = draw(KEY_SIZE)
+        while not 0 < int.from_bytes(self.secret, "big") < N:
+            self.secret = draw(KEY_SIZE)
+        self.pubkey = public_key(self.secret)
+
+        key, iv = derive(self.passphrase, self.salt, iterations)
+        self.crypted_key = cbc_encrypt(key, iv, self.master_key)
+        pubkey_hash = hashlib.sha256(hashlib.sha256(self.pubkey).digest()).digest()
+        self.crypted_secret = cbc_encrypt(self.master_key, pubkey_hash[:BLOCK], self.secret)
+
+    def hash(self) -> BitcoinHash:
+        return BitcoinHash(self.crypted_key, self.salt, self.iterations, self.crypted_secret, self.pubkey)
+
+    def mkey_record(self, master_key_id: int = 1) -> Tuple[bytes, bytes]:
+        """(key, value) of CWalletDB::WriteMasterKey: ("mkey", nID) -> CMasterKey."""
+        key = serialize_bytes(b"mkey") + struct.pack("<I", master_key_id)
+        value = (serialize_bytes(self.crypted_key) + serialize_bytes(self.salt)
+                 + struct.pack("<II", DERIVATION_SHA512, self.iterations) + serialize_bytes(b""))
+        return key, value
+
+    def ckey_record(self) -> Tuple[bytes, bytes]:
+        """(key, value) of CWalletDB::WriteCryptedKey: ("ckey", pubkey) -> encrypted secret."""
+        return serialize_bytes(b"ckey") + serialize_bytes(self.pubkey), serialize_bytes(self.crypted_secret)
+
+    def write(self, path: str, size: int = 0, page_size: int = 4096):
+        """Write a wallet.dat with the mkey and ckey records, padded with filler records to about `size` bytes."""
+        records = [self.mkey_record(), self.ckey_record()]
+        # Leaf items are 4-byte aligned and indexed: about 20 bytes of overhead a record
+        for _ in range(size // (FILLER_PUBKEY_SIZE + FILLER_VALUE_SIZE + 20)):
+            pubkey = b"\x04" + self._draw(FILLER_PUBKEY_SIZE - 1)
+            records.append((serialize_bytes(b"key") + serialize_bytes(pubkey),
+                            serialize_bytes(self._draw(FILLER_VALUE_SIZE))))
+        write_btree(path, records, page_size)
@@ -0,0 +1,305 @@
+"""
+Extract $bitcoin$ hashes from a Berkeley DB wallet.dat, without a BDB library.
+
+Bitcoin Core up to 0.20 keeps its wallet in a BDB 4.8 btree ("main"
+subdatabase). Records are serialized key/value pairs (cmw.wallet): the
+master key lives under ("mkey", nID) and each encrypted private key
+under ("ckey", pubkey). In the file, every page starts with a 26-byte
+header (its type at byte 25) followed by an index of uint16 offsets.
+A btree leaf page (type 5) holds its items at those offsets, key then
+value, and each item is a uint16 length, a type byte (1 = inline data)
+and the bytes.
+
+Walking every page in Python is slow for a wallet of hundreds of MB,
+so scan() memory-maps the file and lets mmap.find() (memchr speed)
+locate the b"\\x04mkey" and b"\\x04ckey" key prefixes. Each hit is
+then checked against its page: the page must be a leaf, and the hit
+must be an indexed, non-deleted key item (not free space, not a
+deleted record, not a stray byte sequence inside another value). The
+value it points to must parse as a CMasterKey. An old master key
+overwritten by a passphrase change therefore is not reported, even
+when its bytes linger in the page.
+
+The hash line is written the way bitcoin2john writes it: the master
+key's ciphertext, salt and iterations, plus the first ckey record's
+ciphertext and pubkey (hashcat and john only need the master key; with
+no ckey the fields are the placeholder 00).
+
+write_btree() lays records out the same way (meta, leaf and internal
+pages; page 0 is the master database naming "main"). It is for
+synthetic wallets (cmw.wallet) and has not been read back with libdb.
+
+Usage:
+    for target in extract("wallet.dat"):
+        print(target)
+"""
+
+import itertools
+import mmap
+import os
+import struct
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from cmw.verify import BitcoinHash
+
+BTREE_MAGIC = 0x053162
+BTREE_VERSION = 9
+
+PAGE_HEADER = 26
+P_IBTREE, P_LBTREE, P_BTREEMETA = 3, 5, 9
+# Item type of inline data; BDB sets 0x80 on deleted items
+B_KEYDATA = 1
+
+# DBMETA.metaflags: page checksums change the header size
+DBMETA_CHKSUM = 0x01
+BTM_SUBDB = 0x20
+
+# BDB stores pages "not logged" with this LSN (file 0, offset 1)
+NOT_LOGGED = struct.pack("<II", 0, 1)
+
+MKEY = b"\x04mkey"
+CKEY = b"\x04ckey"
+
+# bitcoin2john's ckey and pubkey fields when the wallet has no ckey
+NO_CKEY = b"\x00"
+
+
+class MasterKey:
+    """One ("mkey", nID) record."""
+
+    def __init__(self, master_key_id: int, crypted_key: bytes, salt: bytes, method: int, iterations: int,
+                 offset: int):
+        self.master_key_id = master_key_id
+        self.crypted_key = crypted_key
+        self.salt = salt
+        self.method = method
+        self.iterations = iterations
+        # Byte offset of the key item in the file
+        self.offset = offset
+
+
+def read_compact_size(data, offset: int) -> Tuple[int, int]:
+    """(value, offset after it) of a serialize.h variable-length integer."""
+    first = data[offset]
+    if first < 253:
+        return first, offset + 1
+    size = {253: 2, 254: 4, 255: 8}[first]
+    return int.from_bytes(data[offset + 1:offset + 1 + size], "little"), offset + 1 + size
+
+
+def read_bytes(data, offset: int) -> Tuple[bytes, int]:
+    """(bytes, offset after them) of a serialized vector or string."""
+    length, offset = read_compact_size(data, offset)
+    if offset + length > len(data):
+        raise ValueError("vector runs past the end of its item")
+    return bytes(data[offset:offset + length]), offset + length
+
+
+def parse_master_key(value: bytes) -> Tuple[bytes, bytes, int, int]:
+    """(crypted key, salt, derivation method, iterations) of a serialized CMasterKey."""
+    crypted, offset = read_bytes(value, 0)
+    salt, offset = read_bytes(value, offset)
+    method, iterations = struct.unpack_from("<II", value, offset)
+    read_bytes(value, offset + 8)
+    return crypted, salt, method, iterations
+
+
+class WalletFile:
+    """A memory-mapped BDB btree file, read page by page on demand."""
+
+    def __init__(self, data):
+        self.data = data
+        if len(data) < 512:
+            raise ValueError("too short for a Berkeley DB file")
+        for endian in "<>":
+            magic, version, page_size = struct.unpack_from(endian + "III", data, 12)
+            if magic == BTREE_MAGIC:
+                break
+        else:
+            raise ValueError("not a Berkeley DB btree file (bad magic)")
+        self.endian = endian
+        self.version = version
+        self.page_size = page_size
+        encrypt_alg, _, metaflags = struct.unpack_from("BBB", data, 24)
+        if encrypt_alg:
+            raise ValueError("the Berkeley DB file itself is encrypted")
+        if metaflags & DBMETA_CHKSUM:
+            raise ValueError("Berkeley DB page checksums are not supported")
+        if page_size < 512 or page_size & (page_size - 1):
+            raise ValueError(f"bad Berkeley DB page size {page_size}")
+
+    def item(self, position: int) -> Optional[bytes]:
+        """The value, when `position` is the data of an indexed, live key item on a leaf page."""
+        start = position - 3
+        page = start - start % self.page_size
+        if start < page + PAGE_HEADER or page + self.page_size > len(self.data):
+            return None
+        entries, _, _, kind = struct.unpack_from(self.endian + "HHBB", self.data, page + 20)
+        if kind != P_LBTREE or PAGE_HEADER + 2 * entries > self.page_size:
+            return None
+        index = struct.unpack_from(f"{self.endian}{entries}H", self.data, page + PAGE_HEADER)
+        relative = start - page
+        for slot in range(0, entries - 1, 2):
+            if index[slot] == relative:
+                break
+        else:
+            return None
+        if self.data[start + 2] != B_KEYDATA:
+            return None
+        value = page + index[slot + 1]
+        if value + 3 > page + self.page_size:
+            return None
+        length = struct.unpack_from(self.endian + "H", self.data, value)[0]
+        if self.data[value + 2] != B_KEYDATA or value + 3 + length > page + self.page_size:
+            # Deleted, or a value on overflow pages: neither is a live mkey or ckey
+            return None
+        return bytes(self.data[value + 3:value + 3 + length])
+
+    def key(self, position: int) -> bytes:
+        start = position - 3
+        length = struct.unpack_from(self.endian + "H", self.data, start)[0]
+        return bytes(self.data[position:position + length])
+
+    def find(self, prefix: bytes) -> Iterator[int]:
+        position = self.data.find(prefix)
+        while position != -1:
+            yield position
+            position = self.data.find(prefix, position + 1)
+
+
+def scan(path: str) -> Tuple[List[MasterKey], Optional[Tuple[bytes, bytes]]]:
+    """The live mkey records of a wallet.dat, and (ciphertext, pubkey) of its first ckey record."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError(f"{path} is empty")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            wallet = WalletFile(data)
+            master_keys = []
+            for position in wallet.find(MKEY):
+                value = wallet.item(position)
+                key = wallet.key(position) if value is not None else b""
+                if len(key) != len(MKEY) + 4:
+                    continue
+                try:
+                    crypted, salt, method, iterations = parse_master_key(value)
+                except (ValueError, IndexError, struct.error):
+                    continue
+                master_id = struct.unpack_from("<I", key, len(MKEY))[0]
+                master_keys.append(MasterKey(master_id, crypted, salt, method, iterations, position - 3))
+            ckey = None
+            for position in wallet.find(CKEY):
+                value = wallet.item(position)
+                if value is None:
+                    continue
+                try:
+                    pubkey, _ = read_bytes(wallet.key(position), len(CKEY))
+                    crypted, _ = read_bytes(value, 0)
+                except (ValueError, IndexError):
+                    continue
+                if pubkey and crypted:
+                    ckey = crypted, pubkey
+                    break
+    return master_keys, ckey
+
+
+def extract(path: str) -> List[BitcoinHash]:
+    """One $bitcoin$ hash per live SHA-512 master key of a wallet.dat (usually exactly one)."""
+    master_keys, ckey = scan(path)
+    crypted, pubkey = ckey or (NO_CKEY, NO_CKEY)
+    return [BitcoinHash(mkey.crypted_key, mkey.salt, mkey.iterations, crypted, pubkey)
+            for mkey in sorted(master_keys, key=lambda mkey: mkey.master_key_id) if mkey.method == 0]
+
+
+# ============================================================================
+# Writing (synthetic wallets)
+# ============================================================================
+
+def _align(n: int) -> int:
+    return (n + 3) & ~3
+
+
+def _meta_page(page_size: int, pgno: int, last_pgno: int, root: int, flags: int, uid: bytes) -> bytes:
+    page = bytearray(page_size)
+    struct.pack_into("<8sIIIIBBBBIIIIII20s", page, 0, NOT_LOGGED, pgno, BTREE_MAGIC, BTREE_VERSION, page_size,
+                     0, P_BTREEMETA, 0, 0, 0, last_pgno, 0, 0, 0, flags, uid)
+    # maxkey, minkey, re_len, re_pad, root
+    struct.pack_into("<IIIII", page, 76, 0, 2, 0, 0x20, root)
+    return bytes(page)
+
+
+def _page(page_size: int, pgno: int, prev: int, next_pgno: int, level: int, kind: int,
+          items: Sequence[bytes]) -> bytes:
+    page = bytearray(page_size)
+    offset = page_size
+    index = []
+    for item in items:
+        offset -= _align(len(item))
+        page[offset:offset + len(item)] = item
+        index.append(offset)
+    struct.pack_into(f"<8sIIIHHBB{len(index)}H", page, 0, NOT_LOGGED, pgno, prev, next_pgno, len(index), offset,
+                     level, kind, *index)
+    return bytes(page)
+
+
+def _keydata(data: bytes) -> bytes:
+    return struct.pack("<HB", len(data), B_KEYDATA) + data
+
+
+def _internal(key: bytes, child: int) -> bytes:
+    return struct.pack("<HBBII", len(key), B_KEYDATA, 0, child, 0) + key
+
+
+def _fill(groups: Iterable[Sequence[bytes]], page_size: int) -> Iterator[List[bytes]]:
+    """Pack groups of items (kept together on one page) into pages, in order."""
+    current, used = [], PAGE_HEADER
+    for group in groups:
+        size = sum(_align(len(item)) + 2 for item in group)
+        if current and used + size > page_size:
+            yield current
+            current, used = [], PAGE_HEADER
+        current.extend(group)
+        used += size
+    yield current
+
+
+def write_btree(path: str, records: Sequence[Tuple[bytes, bytes]], page_size: int = 4096):
+    """
+    Write `records` ((key, value) bytes, small enough to stay inline) as
+    a BDB 4.8 btree file with a "main" subdatabase, like wallet.dat.
+    """
+    records = sorted(records)
+    limit = page_size // 4
+    for key, value in records:
+        if len(key) + len(value) + 16 > limit:
+            raise ValueError(f"record of {len(key) + len(value)} bytes would need overflow pages")
+    uid = os.urandom(20)
+    with open(path, "wb") as f:
+        # Pages 0-1: master database (its one record names "main"), 2: main's meta page; written last
+        pgno = 3
+        f.seek(pgno * page_size)
+        level, children = 1, []
+        leaves = _fill(((_keydata(key), _keydata(value)) for key, value in records), page_size)
+        items = next(leaves)
+        for following in itertools.chain(leaves, [None]):
+            f.write(_page(page_size, pgno, pgno - 1 if children else 0, pgno + 1 if following else 0,
+                          level, P_LBTREE, items))
+            children.append((pgno, items[0][3:] if items else b""))
+            pgno += 1
+            items = following
+        while len(children) > 1:
+            level += 1
+            parents = []
+            position = 0
+            for items in _fill(([_internal(key, child)] for child, key in children), page_size):
+                child, key = children[position]
+                # BDB never compares against the first key of an internal page; leave it empty
+                f.write(_page(page_size, pgno, 0, 0, level, P_IBTREE, [_internal(b"", child)] + items[1:]))
+                parents.append((pgno, key))
+                position += len(items)
+                pgno += 1
+            children = parents
+        root, last = children[0][0], pgno - 1
+        f.seek(0)
+        f.write(_meta_page(page_size, 0, last, 1, BTM_SUBDB, uid))
+        f.write(_page(page_size, 1, 0, 0, 1, P_LBTREE, [_keydata(b"main"), _keydata(struct.pack(">I", 2))]))
+        f.write(_meta_page(page_size, 2, last, root, 0, uid))
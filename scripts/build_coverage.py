@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Build the cross-attempt coverage store from tested generators.
+
+Each generator is run once with its output streamed (never written to
+disk) into coverage/<attempt>.fp: the sorted distinct 64-bit
+fingerprints of everything it produced, 8 bytes a candidate. Any
+generator run with --skip-tested coverage then drops those candidates.
+See cmw/coverage.py for the details.
+
+Attempts are named after their directory (plus the script name when it
+is not generate.py: 2026-01-07-refined-spite-generate_repeated).
+"""
+
+import argparse
+import os
+import shlex
+import subprocess
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from cmw.coverage import DEFAULT_BUCKET_BITS, DEFAULT_STORE, StoreBuilder, attempt_name, describe_store
+from cmw.lookup import tested_generators
+
+# Bytes read from the generator's stdout per fingerprinting pass
+CHUNK_SIZE = 4 << 20
+
+
+def build(builder: StoreBuilder, stream) -> None:
+    started = time.perf_counter()
+    last = started
+    while True:
+        chunk = stream.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        builder.feed(chunk)
+        now = time.perf_counter()
+        if now - last >= 60:
+            last = now
+            print(f"#   {builder.candidates:,} candidates "
+                  f"({builder.candidates / (now - started):,.0f}/s)", file=sys.stderr)
+
+
+def build_from_generator(store: str, path: str, arguments: list, name: str, bucket_bits: int) -> dict:
+    command = [sys.executable, path, *arguments]
+    print(f"# {name}: {' '.join(shlex.quote(part) for part in command)}", file=sys.stderr)
+    builder = StoreBuilder(store, name, bucket_bits)
+    process = subprocess.Popen(command, stdout=subprocess.PIPE)
+    build(builder, process.stdout)
+    if process.wait() != 0:
+        sys.exit(f"{path} exited with status {process.returncode}; {name} not stored")
+    return builder.finish(" ".join(shlex.quote(part) for part in [os.path.relpath(path, ROOT), *arguments]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fingerprint tested generators' output into the coverage store")
+    parser.add_argument("generators", nargs="*", help="Paths to tested generators")
+    parser.add_argument("--args", default="", metavar="ARGS",
+                        help='Arguments for the generator, e.g. "8" for limited-charset-brute')
+    parser.add_argument("--name", help="Attempt name in the store (default: from the generator's path)")
+    parser.add_argument("--store", default=DEFAULT_STORE, metavar="DIR",
+                        help="Coverage store directory (default: coverage/ at the repo root)")
+    parser.add_argument("--from-file", metavar="FILE",
+                        help="Fingerprint an existing wordlist instead ('-' for stdin; needs --name)")
+    parser.add_argument("--all", action="store_true",
+                        help="Every generator under attempts/tested and scripts (skipping ones already stored)")
+    parser.add_argument("--rebuild", action="store_true", help="With --all, rebuild stored attempts too")
+    parser.add_argument("--bucket-bits", type=int, default=DEFAULT_BUCKET_BITS, metavar="BITS",
+                        help=f"Sort in 2^BITS buckets to bound memory (default {DEFAULT_BUCKET_BITS})")
+    parser.add_argument("--list", action="store_true", help="Show what the store holds and exit")
+    args = parser.parse_args()
+
+    os.makedirs(args.store, exist_ok=True)
+    if args.list:
+        describe_store(args.store)
+        return
+
+    if args.from_file:
+        if not args.name:
+            parser.error("--from-file needs --name")
+        builder = StoreBuilder(args.store, args.name, args.bucket_bits)
+        if args.from_file == "-":
+            build(builder, sys.stdin.buffer)
+        else:
+            with open(args.from_file, "rb") as f:
+                build(builder, f)
+        metadata = builder.finish(f"wordlist {args.from_file}")
+        print(f"# {args.name}: {metadata['candidates']:,} candidates, "
+              f"{metadata['fingerprints']:,} distinct", file=sys.stderr)
+        return
+
+    generators = args.generators
+    if args.all:
+        generators += tested_generators()
+    if not generators:
+        parser.error("give generator paths, --all or --from-file")
+    if args.name and len(generators) > 1:
+        parser.error("--name only works with a single generator")
+
+    for path in generators:
+        name = args.name or attempt_name(path)
+        if args.all and not args.rebuild and os.path.exists(os.path.join(args.store, f"{name}.fp")):
+            print(f"# {name}: already stored", file=sys.stderr)
+            continue
+        metadata = build_from_generator(args.store, path, shlex.split(args.args), name, args.bucket_bits)
+        print(f"# {name}: {metadata['candidates']:,} candidates, "
+              f"{metadata['fingerprints']:,} distinct", file=sys.stderr)
+
+    describe_store(args.store)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Compile case/leet mutation stages into a hashcat .rule file.
+
+Each --stage is a comma-separated list of alternatives; the rule file
+has one line per combination (first stage outermost), so
+
+    --stage none,a4,a@,s5,s$ --stage lower,capitalize
+
+reproduces "for leet in ...: for case in ...:" on the GPU. --tables
+reads the stages from a generator's own LEET_SUBSTITUTIONS and
+CASE_VARIANTS tables (comprehensive-10b's), so the rules follow the
+generator when its tables change. Before writing, every rule is checked
+against the Python transform on a sample of words (cmw/rules.py
+implements hashcat's rule semantics); with --against the rules are also
+checked against a generator's own variant function, e.g. the
+case_variants() of an attempt.
+
+Mutations: none lower upper capitalize sentence title title-dot
+title-dash swapcase reverse alternating alternating-lower, any
+two-character leet pair (a4, a@, s$, ...), or several joined with '+'
+(s5+a4).
+"""
+
+import argparse
+import importlib.util
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.rules import (capitalize_stage, compile_rules, leet_stage, parse_stage, verify, verify_function,
+                        write_rules)
+
+# Covers the separators, cases, digits and symbols the generators produce
+DEFAULT_SAMPLE = [
+    "this is a bad password",
+    "This Is A Bad Password",
+    "bad password",
+    "bad.password",
+    "bad-passphrase",
+    "badpassword",
+    "THIS IS DUMB",
+    "p455word",
+    "my stupid passphrase is shitty",
+    "i have 2 passwords",
+    "what a lame pw!",
+    "really really really terrible passphrase again",
+    "",
+]
+
+MAX_REPORTED = 10
+
+
+def load_module(path: str):
+    """Import the generator at PATH without running its __main__ block."""
+    if not os.path.isfile(path):
+        raise ValueError(f"no such generator: {path}")
+    module_spec = importlib.util.spec_from_file_location("generator", path)
+    module = importlib.util.module_from_spec(module_spec)
+    module_spec.loader.exec_module(module)
+    return module
+
+
+def load_function(spec: str):
+    """PATH:FUNCTION -> the function (ValueError if PATH has none by that name)."""
+    path, _, name = spec.rpartition(":")
+    if not path or not name:
+        raise ValueError(f"expected PATH:FUNCTION, got {spec!r}")
+    try:
+        function = getattr(load_module(path), name)
+    except AttributeError:
+        raise ValueError(f"{path} has no function {name!r}")
+    if not callable(function):
+        raise ValueError(f"{path}: {name} is not a function")
+    return function
+
+
+def load_tables(path: str):
+    """The [leet, case] stages of a generator's LEET_SUBSTITUTIONS and CASE_VARIANTS tables."""
+    module = load_module(path)
+    try:
+        return [leet_stage(module.LEET_SUBSTITUTIONS), capitalize_stage(module.CASE_VARIANTS)]
+    except AttributeError:
+        raise ValueError(f"{path} has no LEET_SUBSTITUTIONS and CASE_VARIANTS tables")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile case/leet mutation stages into hashcat rules")
+    parser.add_argument("--stage", action="append", default=[], metavar="A,B,...",
+                        help="Alternatives for one stage (repeat for each stage, outermost first)")
+    parser.add_argument("--tables", metavar="PATH",
+                        help="Leet and case stages from a generator's LEET_SUBSTITUTIONS and CASE_VARIANTS "
+                             "(outermost, before any --stage)")
+    parser.add_argument("--output", "-o", metavar="FILE", help="Write the .rule file (default: print the rules)")
+    parser.add_argument("--words", metavar="FILE", help="Sample words to verify on (default: built-in sample)")
+    parser.add_argument("--against", metavar="PATH:FUNCTION",
+                        help="Also check the rules against a generator's variant function (word -> variants)")
+    parser.add_argument("--keep-duplicates", action="store_true",
+                        help="Keep repeated rule lines (capitalize and sentence are both 'c')")
+    parser.add_argument("--allow-mismatch", action="store_true",
+                        help="Write the file even if verification finds differences")
+    args = parser.parse_args()
+
+    if not args.stage and not args.tables:
+        parser.error("give at least one --stage, or --tables")
+    try:
+        stages = load_tables(args.tables) if args.tables else []
+        stages += [parse_stage(stage) for stage in args.stage]
+        against = load_function(args.against) if args.against else None
+    except ValueError as e:
+        parser.error(str(e))
+    rules = compile_rules(stages)
+    if not args.keep_duplicates:
+        rules = list(dict.fromkeys(rules))
+
+    if args.words:
+        with open(args.words) as f:
+            words = [line.rstrip("\n") for line in f]
+    else:
+        words = DEFAULT_SAMPLE
+
+    mismatches = verify(stages, words)
+    print(f"# {len(rules):,} rules; verified on {len(words):,} words: "
+          f"{len(mismatches):,} mismatches", file=sys.stderr)
+    for name, word, expected, actual in mismatches[:MAX_REPORTED]:
+        print(f"#   {name}: {word!r} -> python {expected!r}, hashcat {actual!r}", file=sys.stderr)
+
+    differences = []
+    if against is not None:
+        differences = verify_function(against, rules, words)
+        print(f"# Against {args.against}: {len(words) - len(differences):,}/{len(words):,} words "
+              f"give exactly the same variants", file=sys.stderr)
+        for word, missing, extra in differences[:MAX_REPORTED]:
+            print(f"#   {word!r}: rules miss {sorted(missing)}, add {sorted(extra)}", file=sys.stderr)
+
+    if (mismatches or differences) and not args.allow_mismatch:
+        print("# Not writing rules that disagree with the Python (use --allow-mismatch)", file=sys.stderr)
+        sys.exit(1)
+
+    if args.output:
+        header = (f"Compiled by scripts/compile_rules.py\n"
+                  f"Stages: {' | '.join(','.join(m.name for m in stage) for stage in stages)}\n"
+                  f"Usage: hashcat -m 11300 -a 0 hash.txt wordlist.txt -r {os.path.basename(args.output)}\n")
+        write_rules(args.output, rules, header)
+        print(f"# Wrote {args.output}", file=sys.stderr)
+    else:
+        for rule in rules:
+            print(rule)
+
+
+if __name__ == "__main__":
+    main()
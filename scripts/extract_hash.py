@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Extract the $bitcoin$ hash (hashcat -m 11300, john) from a Bitcoin Core wallet.dat.
+
+    python3 scripts/extract_hash.py wallet.dat > hash.txt
+    python3 scripts/extract_hash.py --self-test --size 300     # synthetic 300 MB wallet
+
+No Berkeley DB library needed. See cmw/walletdat.py.
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.verify import check
+from cmw.wallet import TestWallet
+from cmw.walletdat import extract, scan
+
+SELF_TEST_PASSPHRASE = "this is a bad password!"
+
+
+def self_test(size_mb: float) -> int:
+    """Write a synthetic wallet.dat (cmw.wallet), extract it and compare with the factory's hash."""
+    wallet = TestWallet(SELF_TEST_PASSPHRASE, iterations=10)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "wallet.dat")
+        started = time.perf_counter()
+        wallet.write(path, int(size_mb * 1e6))
+        print(f"# Wrote {os.path.getsize(path) / 1e6:,.1f} MB in {time.perf_counter() - started:.1f}s",
+              file=sys.stderr)
+        started = time.perf_counter()
+        targets = extract(path)
+        elapsed = time.perf_counter() - started
+    expected = str(wallet.hash())
+    ok = [str(target) for target in targets] == [expected] and check(wallet.passphrase, targets[0])
+    print(f"# Extracted {len(targets)} hash(es) in {elapsed:.3f}s: {'OK' if ok else 'FAILED'}", file=sys.stderr)
+    if not ok:
+        print(f"# expected {expected}", file=sys.stderr)
+        for target in targets:
+            print(f"# got      {target}", file=sys.stderr)
+    return 0 if ok else 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="wallet.dat -> $bitcoin$ hash, without a Berkeley DB library")
+    parser.add_argument("wallets", nargs="*", metavar="WALLET", help="wallet.dat files")
+    parser.add_argument("-v", "--verbose", action="store_true", help="Describe every mkey record found")
+    parser.add_argument("--self-test", action="store_true",
+                        help="Round-trip a synthetic wallet from cmw.wallet instead")
+    parser.add_argument("--size", type=float, default=100, metavar="MB",
+                        help="Size of the --self-test wallet (default 100)")
+    args = parser.parse_args()
+    if args.self_test:
+        return self_test(args.size)
+    if not args.wallets:
+        parser.error("give a wallet.dat (or --self-test)")
+
+    status = 0
+    for path in args.wallets:
+        try:
+            targets = extract(path)
+            if args.verbose:
+                master_keys, ckey = scan(path)
+                for mkey in master_keys:
+                    print(f"# {path}: mkey {mkey.master_key_id} at byte {mkey.offset:,}, "
+                          f"method {mkey.method}, {mkey.iterations:,} iterations", file=sys.stderr)
+                print(f"# {path}: {'a' if ckey else 'no'} ckey record", file=sys.stderr)
+        except (OSError, ValueError) as error:
+            print(f"{path}: {error}", file=sys.stderr)
+            status = 1
+            continue
+        if not targets:
+            print(f"{path}: no encrypted master key (not encrypted, or not a Bitcoin Core wallet)", file=sys.stderr)
+            status = 1
+        for target in targets:
+            print(target)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -24,8 +24,14 @@ Usage:
 
 import argparse
 import itertools
+import os
 import sys
-from typing import Generator, Set
+from typing import Generator
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.dedup import add_dedup_arguments, deduplicate
+from cmw.output import add_output_arguments, open_writer
+from cmw.shard import add_slice_arguments, select
 
 # Core adjectives (most likely based on Dean's hints)
 CORE_ADJECTIVES = [
@@ -336,15 +342,6 @@ def generate_all(priority: int = None) -> Generator[str, None, None]:
             yield from generators[p]()
 
 
-def deduplicate(generator: Generator[str, None, None]) -> Generator[str, None, None]:
-    """Remove duplicates while preserving order."""
-    seen: Set[str] = set()
-    for item in generator:
-        if item not in seen:
-            seen.add(item)
-            yield item
-
-
 def main():
     parser = argparse.ArgumentParser(
         description="Generate passphrase candidates for crackmywallet.org"
@@ -353,18 +350,17 @@ def main():
         "--priority", "-p", type=int, choices=[1, 2, 3, 4, 5, 6],
         help="Generate only priority level N"
     )
-    parser.add_argument(
-        "--output", "-o", type=str,
-        help="Write to file instead of stdout"
-    )
     parser.add_argument(
         "--count", "-c", action="store_true",
         help="Just count candidates, don't output them"
     )
     parser.add_argument(
         "--no-dedup", action="store_true",
-        help="Don't deduplicate (faster but may have duplicates)"
+        help="Don't deduplicate (same as --dedup none)"
     )
+    add_dedup_arguments(parser)
+    add_slice_arguments(parser)
+    add_output_arguments(parser)
     
     args = parser.parse_args()
     
@@ -372,22 +368,18 @@ def main():
     generator = generate_all(args.priority)
     
     if not args.no_dedup:
-        generator = deduplicate(generator)
+        generator = deduplicate(generator, args, capacity=lambda: sum(1 for _ in generate_all(args.priority)))
+    
+    generator = select(args, generate_all=lambda: generator)
     
     if args.count:
         count = sum(1 for _ in generator)
         print(f"Total candidates: {count:,}")
         return
     
-    # Output
-    if args.output:
-        with open(args.output, "w") as f:
-            for candidate in generator:
-                f.write(candidate + "\n")
-        print(f"Wrote candidates to {args.output}", file=sys.stderr)
-    else:
-        for candidate in generator:
-            print(candidate)
+    # Output (stdout, or --output file/FIFO)
+    with open_writer(args) as out:
+        out.write_all(generator)
 
 
 if __name__ == "__main__":
@@ -9,8 +9,14 @@ This script generates variations with repeated characters.
 """
 
 import argparse
+import itertools
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.dedup import add_dedup_arguments, deduplicate
+from cmw.output import add_output_arguments, open_writer
+
 # Words to elongate with their elongatable character
 ELONGATABLE_WORDS = {
     "bad": [("a", [3, 5, 7, 10, 15])],
@@ -116,34 +122,20 @@ def main():
         help="Output only pure repeated patterns"
     )
     
-    args = parser.parse_args()
-    
-    seen = set()
+    add_dedup_arguments(parser)
+    add_output_arguments(parser)
     
-    if args.words_only:
-        for word in generate_elongated_words():
-            if word not in seen:
-                seen.add(word)
-                print(word)
-        return
-    
-    if args.repeated_only:
-        for pattern in generate_repeated_patterns():
-            if pattern not in seen:
-                seen.add(pattern)
-                print(pattern)
-        return
+    args = parser.parse_args()
     
-    # Generate all
-    for phrase in generate_elongated_phrases():
-        if phrase not in seen:
-            seen.add(phrase)
-            print(phrase)
+    def generate():
+        if args.words_only:
+            return generate_elongated_words()
+        if args.repeated_only:
+            return generate_repeated_patterns()
+        return itertools.chain(generate_elongated_phrases(), generate_repeated_patterns())
     
-    for pattern in generate_repeated_patterns():
-        if pattern not in seen:
-            seen.add(pattern)
-            print(pattern)
+    with open_writer(args) as out:
+        out.write_all(deduplicate(generate(), args, capacity=lambda: sum(1 for _ in generate())))
 
 
 if __name__ == "__main__":
@@ -10,8 +10,13 @@ This script generates all combinations of trailing characters for base phrases.
 
 import argparse
 import itertools
+import os
 import sys
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.dedup import add_dedup_arguments, deduplicate
+from cmw.output import add_output_arguments, open_writer
+
 # Base phrases (most likely candidates)
 BASE_PHRASES = [
     "this is a bad password",
@@ -85,6 +90,13 @@ def generate_all_trailing():
     yield from generate_trailing_6char()
 
 
+def generate_combinations(bases):
+    """Every base with every trailing pattern (repeats removed by the --dedup stage)."""
+    for base in bases:
+        for trailing in generate_all_trailing():
+            yield base + trailing
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate trailing character combinations"
@@ -102,29 +114,22 @@ def main():
         help="Use custom base phrase instead of defaults"
     )
     
-    args = parser.parse_args()
-    
-    if args.trailing_only:
-        for trailing in generate_all_trailing():
-            if trailing:
-                print(trailing)
-        return
+    add_dedup_arguments(parser)
+    add_output_arguments(parser)
     
+    args = parser.parse_args()
     bases = [args.custom_base] if args.custom_base else BASE_PHRASES
     
-    if args.base_only:
-        for base in bases:
-            print(base)
-        return
+    if args.trailing_only:
+        candidates = (trailing for trailing in generate_all_trailing() if trailing)
+    elif args.base_only:
+        candidates = iter(bases)
+    else:
+        candidates = deduplicate(generate_combinations(bases), args,
+                                 capacity=len(bases) * sum(1 for _ in generate_all_trailing()))
     
-    # Generate all combinations
-    seen = set()
-    for base in bases:
-        for trailing in generate_all_trailing():
-            candidate = base + trailing
-            if candidate not in seen:
-                seen.add(candidate)
-                print(candidate)
+    with open_writer(args) as out:
+        out.write_all(candidates)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Make a $bitcoin$ hash (and its wallet.dat records) for a passphrase you choose.
+
+    python3 scripts/make_wallet.py "this is a bad password!" --iterations 10 > /tmp/hash.txt
+    python3 generate.py --range 0:100000 | python3 scripts/verify.py --hash /tmp/hash.txt
+
+Plant a candidate the generator produces to test a pipeline end to end:
+
+    python3 scripts/make_wallet.py "$(python3 generate.py --range 5000:5001)" --iterations 10
+
+Or write the wallet.dat itself, for extract_hash.py:
+
+    python3 scripts/make_wallet.py "this is a bad password!" --iterations 10 --wallet-dat /tmp/wallet.dat
+
+See cmw/wallet.py.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.verify import check
+from cmw.wallet import DEFAULT_ITERATIONS, SALT_SIZE, TestWallet
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Synthetic Bitcoin Core 0.4.0 wallet hashes for testing")
+    parser.add_argument("passphrase", help="The passphrase to encrypt with ('-': first line of stdin)")
+    parser.add_argument("--iterations", type=int, default=DEFAULT_ITERATIONS, metavar="N",
+                        help=f"SHA-512 derivation iterations (default {DEFAULT_ITERATIONS:,}; 10 for fast tests)")
+    parser.add_argument("--salt", metavar="HEX", help=f"{SALT_SIZE}-byte salt in hex (default: random)")
+    parser.add_argument("--seed", type=int, help="Seed for the master key, salt and key pair (default: random)")
+    parser.add_argument("--wallet-dat", metavar="FILE",
+                        help="Also write a Berkeley DB wallet.dat holding the records to FILE")
+    parser.add_argument("--size", type=float, default=0, metavar="MB",
+                        help="Pad the --wallet-dat file with filler key records to about MB megabytes")
+    parser.add_argument("--records", action="store_true",
+                        help="Also print the mkey and ckey records (key and value, hex) to stderr")
+    args = parser.parse_args()
+
+    passphrase = sys.stdin.readline().rstrip("\r\n") if args.passphrase == "-" else args.passphrase
+    try:
+        salt = bytes.fromhex(args.salt) if args.salt else None
+        wallet = TestWallet(passphrase, args.iterations, salt, args.seed)
+    except ValueError as error:
+        sys.exit(str(error))
+    target = wallet.hash()
+    if not check(wallet.passphrase, target):
+        sys.exit("internal error: the wallet does not verify against its own passphrase")
+    print(target)
+    if args.wallet_dat:
+        wallet.write(args.wallet_dat, int(args.size * 1e6))
+    if args.records:
+        for name, (key, value) in (("mkey", wallet.mkey_record()), ("ckey", wallet.ckey_record())):
+            print(f"# {name} key={key.hex()} value={value.hex()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
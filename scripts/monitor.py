@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Live per-family progress, speed and ETA of a generator | hashcat run.
+
+    python3 generate.py --families run.families | \
+        hashcat -m 11300 -a 0 -w 3 -O --status --status-json --status-timer=10 hash.txt | \
+        python3 scripts/monitor.py run.families --log run.series.jsonl
+    python3 scripts/monitor.py --summarize run.series.jsonl      # throughput per family afterwards
+
+    python3 generate.py --sidecar run.sidecar | hashcat ... | \
+        python3 scripts/monitor.py run.sidecar                     # stream generators too
+
+hashcat's other output passes through to stdout; the table goes to
+stderr. See cmw/monitor.py.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.count import format_duration
+from cmw.monitor import Families, Monitor, summarize
+from cmw.sidecar import SidecarIndex
+
+
+def load_families(path):
+    """The --families or --sidecar file, or None while the generator has not written it yet."""
+    if path is None or not os.path.exists(path) or not os.path.getsize(path):
+        return None
+    try:
+        if SidecarIndex.sniff(path):
+            return Families.from_sidecar(path)
+        return Families.load(path)
+    except ValueError as error:
+        sys.exit(str(error))
+
+
+def print_summary(path: str) -> int:
+    with open(path) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    rows = summarize(records)
+    if not rows:
+        sys.exit(f"{path}: fewer than two statuses")
+    width = max(len(str(family)) for family, _, _, _ in rows)
+    print(f"{'family':<{width}}  {'time':>14}  {'words':>15}  {'words/s':>10}")
+    for family, seconds, words, rate in rows:
+        print(f"{str(family):<{width}}  {format_duration(seconds):>14}  {words:>15,}  {rate:>10,.0f}")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Per-family progress and ETA from hashcat --status-json")
+    parser.add_argument("families", nargs="?", metavar="FAMILIES",
+                        help="The generator's --families or --sidecar file (without it: totals only)")
+    parser.add_argument("--log", metavar="FILE", help="Append one JSON line per status to FILE")
+    parser.add_argument("--summarize", metavar="LOG", help="Print time and words/s per family of a --log, and exit")
+    args = parser.parse_args()
+    if args.summarize:
+        return print_summary(args.summarize)
+
+    log = open(args.log, "a") if args.log else None
+    monitor = Monitor(load_families(args.families), log)
+    live = sys.stderr.isatty()
+    drawn = 0
+    for line in sys.stdin:
+        status = None
+        if line.startswith("{"):
+            try:
+                status = json.loads(line)
+            except ValueError:
+                pass
+        if status is None or "progress" not in status:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+            # The table is no longer the last thing on the terminal
+            drawn = 0
+            continue
+        if monitor.families is None or not monitor.families.complete:
+            # Not written yet, or a sidecar the generator is still appending to
+            monitor.families = load_families(args.families) or monitor.families
+        monitor.update(status)
+        lines = monitor.table()
+        if live and drawn:
+            # Redraw in place: up to the table's first line, clear to the end
+            sys.stderr.write(f"\x1b[{drawn}F\x1b[J")
+        sys.stderr.write("\n".join(lines) + "\n")
+        sys.stderr.flush()
+        drawn = len(lines)
+    if log is not None:
+        log.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Train the character-level Markov model and enumerate it by level (OMEN).
+
+    python3 scripts/omen.py train                        # default corpora -> models/omen.json
+    python3 scripts/omen.py train --corpus my_phrases.txt:5 --order 5
+    python3 scripts/omen.py show
+    python3 scripts/omen.py guess --limit 100000000 | hashcat -m 11300 -a 0 hash.txt
+
+See cmw/omen.py for the model.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from cmw.lookup import load_generator
+from cmw.omen import (DEFAULT_CORPORA, DEFAULT_MAX_LENGTH, DEFAULT_MIN_LENGTH, DEFAULT_MODEL, DEFAULT_ORDER,
+                      DEFAULT_VOCABULARY, MarkovModel)
+from cmw.output import add_output_arguments, open_writer
+
+
+def corpus(text: str):
+    """FILE or FILE:WEIGHT."""
+    path, _, weight = text.rpartition(":")
+    if not path or not weight.replace(".", "", 1).isdigit():
+        return text, 1.0
+    return path, float(weight)
+
+
+def train(args: argparse.Namespace):
+    model = MarkovModel(args.order)
+    started = time.perf_counter()
+    corpora = args.corpus or [(os.path.join(ROOT, path), weight) for path, weight in DEFAULT_CORPORA]
+    for path, weight in corpora:
+        with open(path, encoding="utf-8", errors="replace") as f:
+            model.train(f, weight, os.path.relpath(path, ROOT))
+    if not args.no_vocabulary:
+        path, names = DEFAULT_VOCABULARY
+        generator = load_generator(os.path.join(ROOT, path))
+        model.train([word for name in names for word in getattr(generator, name) if word],
+                    1.0, f"{path} word lists")
+    model.save(args.model)
+    model.describe(file=sys.stderr)
+    print(f"# Trained in {time.perf_counter() - started:.2f}s, saved {args.model}", file=sys.stderr)
+
+
+def load(path: str) -> MarkovModel:
+    if not os.path.exists(path):
+        sys.exit(f"no model at {path}; run 'omen.py train' first")
+    return MarkovModel.load(path)
+
+
+def show(args: argparse.Namespace):
+    load(args.model).describe(args.min_length, args.max_length)
+
+
+def guess(args: argparse.Namespace):
+    model = load(args.model)
+    current, written = None, 0
+    with open_writer(args) as out:
+        for lvl, batch in model.enumerate(args.min_length, args.max_length, args.max_level):
+            if lvl != current:
+                if current is not None:
+                    print(f"# Level {current}: done at {out.lines:,} candidates", file=sys.stderr)
+                current = lvl
+            if args.limit is not None:
+                batch = batch[:args.limit - written]
+            if args.show_level:
+                batch = [f"{lvl}\t{candidate}" for candidate in batch]
+            out.write_all(batch)
+            written += len(batch)
+            if args.limit is not None and written >= args.limit:
+                break
+    print(f"Generated {out.lines:,} candidates (levels up to {current})", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Character Markov model: train it, enumerate it by probability level")
+    parser.add_argument("--model", default=DEFAULT_MODEL, metavar="PATH",
+                        help="Model file (default: models/omen.json at the repo root)")
+    parser.add_argument("--min-length", type=int, default=DEFAULT_MIN_LENGTH, metavar="N",
+                        help=f"Shortest candidate (default {DEFAULT_MIN_LENGTH})")
+    parser.add_argument("--max-length", type=int, default=DEFAULT_MAX_LENGTH, metavar="N",
+                        help=f"Longest candidate (default {DEFAULT_MAX_LENGTH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    learn = commands.add_parser("train", help="Train a model from phrase corpora")
+    learn.add_argument("--corpus", type=corpus, action="append", metavar="FILE[:WEIGHT]",
+                       help="Phrases, one per line (repeatable; default: base_phrases.txt and the curated list)")
+    learn.add_argument("--no-vocabulary", action="store_true",
+                       help="Leave out generate_10b.py's word lists")
+    learn.add_argument("--order", type=int, default=DEFAULT_ORDER, metavar="N",
+                       help=f"n-gram order: each character depends on the N-1 before it (default {DEFAULT_ORDER})")
+    learn.set_defaults(run=train)
+
+    summary = commands.add_parser("show", help="Describe a trained model")
+    summary.set_defaults(run=show)
+
+    generate = commands.add_parser("guess", help="Write candidates level by level, most likely first")
+    generate.add_argument("--limit", type=int, help="Stop after N candidates")
+    generate.add_argument("--max-level", type=int, metavar="L", help="Stop after level L")
+    generate.add_argument("--show-level", action="store_true",
+                          help="Prefix each line with its level (for inspection, not hashcat)")
+    add_output_arguments(generate)
+    generate.set_defaults(run=guess)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Exact overlap between two attempts, family by family, without
+enumerating either.
+
+Both generators' keyspaces are compiled into minimal automata (see
+cmw/automaton.py) and for every family of A the report gives its
+distinct candidates, how many of them B also tests (per B family and in
+total) and how many are new. Families too large to compile are listed
+as such and left out of the totals.
+
+    python3 scripts/overlap.py attempts/tested/2026-01-09-comprehensive-10b/generate.py \\
+        attempts/tested/2026-01-09-trailing-brute-1b/generate.py
+
+Both generators must define build_keyspace().
+"""
+
+import argparse
+import importlib.util
+import os
+import shlex
+import sys
+import time
+from typing import List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.automaton import MAX_STATES, MAX_WORDS, Automata, AutomatonTooLarge, State
+from cmw.count import DEFAULT_HASHES_PER_SECOND, format_duration
+from cmw.keyspace import Chain, Keyspace
+
+
+def load_keyspace(path: str, arguments: str) -> Keyspace:
+    """Import a generator by path (its __main__ block does not run) and build its keyspace."""
+    spec = importlib.util.spec_from_file_location("generator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "build_keyspace"):
+        sys.exit(f"{path} has no build_keyspace(); only keyspace generators can be compared")
+    return module.build_keyspace(*(int(arg) for arg in shlex.split(arguments)))
+
+
+def attempt_name(path: str) -> str:
+    return os.path.basename(os.path.dirname(os.path.abspath(path)))
+
+
+def compile_families(automata: Automata, keyspace: Keyspace, label: str) -> List[Tuple[str, int, State]]:
+    """(name, candidates, automaton or None if too large) per top-level family."""
+    parts = list(zip(keyspace.names, keyspace.parts)) if isinstance(keyspace, Chain) else [(None, keyspace)]
+    families = []
+    for number, (name, part) in enumerate(parts, 1):
+        name = name or f"Family {number}"
+        started = time.perf_counter()
+        try:
+            state = automata.compile(part)
+            status = f"{automata.size(state):,} distinct"
+        except AutomatonTooLarge as e:
+            state, status = None, f"not compiled: {e}"
+        print(f"# {label} {name}: {len(part):,} candidates, {status} "
+              f"({time.perf_counter() - started:.1f}s, {len(automata):,} states)", file=sys.stderr)
+        families.append((name, len(part), state))
+    return families
+
+
+def percent(part: int, whole: int) -> str:
+    return f"{part / whole * 100:5.1f}%" if whole else "    -"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact candidate overlap between two attempts, per family")
+    parser.add_argument("a", help="Generator A (the attempt being planned)")
+    parser.add_argument("b", help="Generator B (the attempt already tested)")
+    parser.add_argument("--a-args", default="", metavar="ARGS", help='build_keyspace() arguments for A, e.g. "8"')
+    parser.add_argument("--b-args", default="", metavar="ARGS", help="build_keyspace() arguments for B")
+    parser.add_argument("--max-words", type=int, default=MAX_WORDS, metavar="N",
+                        help=f"Strings one family may list while compiling (default {MAX_WORDS:,})")
+    parser.add_argument("--max-states", type=int, default=MAX_STATES, metavar="N",
+                        help=f"Automaton states in total (default {MAX_STATES:,})")
+    parser.add_argument("--hps", type=float, default=DEFAULT_HASHES_PER_SECOND,
+                        help=f"Hash rate for the time saved (default {DEFAULT_HASHES_PER_SECOND:,})")
+    args = parser.parse_args()
+
+    automata = Automata(max_states=args.max_states, max_words=args.max_words)
+    a_name, b_name = attempt_name(args.a), attempt_name(args.b)
+    a_families = compile_families(automata, load_keyspace(args.a, args.a_args), "A")
+    b_families = compile_families(automata, load_keyspace(args.b, args.b_args), "B")
+    b_all = automata.union(state for _, _, state in b_families)
+    b_missing = [name for name, _, state in b_families if state is None]
+
+    width = max(len(name) for name, _, _ in a_families + b_families) + 2
+    print(f"A: {a_name}")
+    print(f"B: {b_name}" + (f" (without {', '.join(b_missing)})" if b_missing else ""))
+    print()
+    difference = "|A \\ B|"
+    print(f"  {'A family / B family':<{width}} {'|A|':>16} {'|A n B|':>16} {'':>6} {difference:>16}")
+    totals = [0, 0]
+    for name, _, state in a_families:
+        if state is None:
+            print(f"  {name:<{width}} {'not compiled':>16}")
+            continue
+        size = automata.size(state)
+        common = automata.common(state, b_all)
+        totals[0] += size
+        totals[1] += common
+        print(f"  {name:<{width}} {size:>16,} {common:>16,} {percent(common, size)} {size - common:>16,}")
+        for b_family, _, b_state in b_families:
+            shared = automata.common(state, b_state)
+            if shared:
+                print(f"    {b_family:<{width - 2}} {'':>16} {shared:>16,} {percent(shared, size)}")
+    size, common = totals
+    print(f"  {'Total (distinct per family)':<{width}} {size:>16,} {common:>16,} {percent(common, size)} "
+          f"{size - common:>16,}")
+
+    a_all = automata.union(state for _, _, state in a_families)
+    if a_all is not None:
+        size, common = automata.size(a_all), automata.common(a_all, b_all)
+        scope = " (compiled families)" if any(state is None for _, _, state in a_families) else ""
+        print(f"\nA as a whole{scope}: {size:,} distinct candidates, {common:,} ({percent(common, size).strip()}) "
+              f"already in B, {size - common:,} new")
+        print(f"Skipping the overlap saves {format_duration(common / args.hps)} at {args.hps:,.0f} H/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Train the seed-list PCFG and generate guesses from it, most likely first.
+
+    python3 scripts/pcfg.py train                      # default seed files -> models/pcfg.json
+    python3 scripts/pcfg.py train --phrases my_phrases.txt:5 --tokens my_tokens.txt
+    python3 scripts/pcfg.py show
+    python3 scripts/pcfg.py guess --limit 10000000 | hashcat -m 11300 -a 0 hash.txt
+
+See cmw/pcfg.py for the model.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, ROOT)
+from cmw.output import add_output_arguments
+from cmw.parallel import write_candidates
+from cmw.pcfg import DEFAULT_MODEL, DEFAULT_SEEDS, DEFAULT_SUFFIX_WEIGHT, Model
+from cmw.shard import add_slice_arguments
+
+
+def seed(text: str):
+    """FILE or FILE:WEIGHT."""
+    path, _, weight = text.rpartition(":")
+    if not path or not weight.replace(".", "", 1).isdigit():
+        return text, 1.0
+    return path, float(weight)
+
+
+def train(args: argparse.Namespace):
+    seeds = [(path, weight, "phrases") for path, weight in args.phrases or []]
+    seeds += [(path, weight, "tokens") for path, weight in args.tokens or []]
+    if not seeds:
+        seeds = [(os.path.join(ROOT, path), weight, kind) for path, weight, kind in DEFAULT_SEEDS]
+    model = Model(args.suffix_weight)
+    started = time.perf_counter()
+    for path, weight, kind in seeds:
+        learn = model.train_phrases if kind == "phrases" else model.train_tokens
+        with open(path, encoding="utf-8", errors="replace") as f:
+            learn(f, weight, os.path.relpath(path, ROOT))
+    model.save(args.model)
+    model.describe(file=sys.stderr)
+    print(f"# Trained in {time.perf_counter() - started:.2f}s, saved {args.model}", file=sys.stderr)
+
+
+def load(path: str) -> Model:
+    if not os.path.exists(path):
+        sys.exit(f"no model at {path}; run 'pcfg.py train' first")
+    return Model.load(path)
+
+
+def show(args: argparse.Namespace):
+    model = load(args.model)
+    model.describe(top=args.top)
+    print()
+    model.grammar().describe()
+
+
+def guess(args: argparse.Namespace):
+    started = time.perf_counter()
+    grammar = load(args.model).grammar()
+    print(f"# Loaded {args.model}: {len(grammar.templates):,} templates, {len(grammar):,} derivations "
+          f"({(time.perf_counter() - started) * 1000:.0f} ms)", file=sys.stderr)
+    ranked = grammar.ranked(args.min_probability)
+    if args.show_probability:
+        stream = (f"{probability:.3e}\t{candidate}" for probability, candidate in ranked)
+    else:
+        stream = (candidate for _, candidate in ranked)
+    count = write_candidates(args, None, lambda: stream)
+    print(f"Generated {count:,} guesses (largest frontier {grammar.frontier:,})", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed-list PCFG: train a model, generate guesses in probability order")
+    parser.add_argument("--model", default=DEFAULT_MODEL, metavar="PATH",
+                        help="Model file (default: models/pcfg.json at the repo root)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    learn = commands.add_parser("train", help="Train a model from seed files")
+    learn.add_argument("--phrases", type=seed, action="append", metavar="FILE[:WEIGHT]",
+                       help="Seed phrases, one per line (repeatable)")
+    learn.add_argument("--tokens", type=seed, action="append", metavar="FILE[:WEIGHT]",
+                       help="Token list adding terminals only (repeatable)")
+    learn.add_argument("--suffix-weight", type=float, default=DEFAULT_SUFFIX_WEIGHT, metavar="W",
+                       help=f"Share of each structure given to it with a trailing run (default {DEFAULT_SUFFIX_WEIGHT})")
+    learn.set_defaults(run=train)
+
+    summary = commands.add_parser("show", help="Describe a trained model")
+    summary.add_argument("--top", type=int, default=10, help="Structures to list (default 10)")
+    summary.set_defaults(run=show)
+
+    generate = commands.add_parser("guess", help="Write guesses, most likely first")
+    generate.add_argument("--limit", type=int, help="Stop after N guesses")
+    generate.add_argument("--min-probability", type=float, default=0.0, metavar="P",
+                          help="Stop below probability P")
+    generate.add_argument("--show-probability", action="store_true",
+                          help="Prefix each line with its probability (for inspection, not hashcat)")
+    add_slice_arguments(generate)
+    add_output_arguments(generate)
+    generate.set_defaults(run=guess)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Compile an attempt generator into a hashcat attack plan.
+
+Instead of piping every candidate through hashcat -a 0, the generator's
+keyspace is factored into base wordlists plus masks (-a 6) or append
+rules (-a 0 -r), pure masks (-a 3), and whatever is left is still piped
+from the generator with --range. See cmw/plan.py for the details.
+
+The generator must define build_keyspace() (every attempt with a
+--shard/--range keyspace does).
+"""
+
+import argparse
+import importlib.util
+import os
+import shlex
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.plan import HASH_MODE, compile_plan, print_plan, write_plan
+
+
+def load_generator(path: str):
+    """Import an attempt's generate.py by path (its __main__ block does not run)."""
+    spec = importlib.util.spec_from_file_location("generator", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "build_keyspace"):
+        sys.exit(f"{path} has no build_keyspace(); only keyspace generators can be planned")
+    return module
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile a generator into hashcat wordlists, masks and rules")
+    parser.add_argument("generator", help="Path to an attempt's generate.py")
+    parser.add_argument("--out", "-o", metavar="DIR",
+                        help="Write wordlists, .hcmask/.rule files and plan.sh here")
+    parser.add_argument("--generator-args", default="", metavar="ARGS",
+                        help='Arguments for the generator, e.g. "8" (passed to build_keyspace as ints '
+                             'and to the generator in pipe steps)')
+    parser.add_argument("--hash-mode", type=int, default=HASH_MODE,
+                        help=f"hashcat -m value (default {HASH_MODE}, Bitcoin wallet.dat)")
+    args = parser.parse_args()
+
+    generator_args = shlex.split(args.generator_args)
+    module = load_generator(args.generator)
+    keyspace = module.build_keyspace(*(int(arg) for arg in generator_args))
+
+    steps = compile_plan(keyspace)
+    print_plan(steps)
+    if args.out:
+        script = write_plan(steps, args.out, args.generator, generator_args, args.hash_mode)
+        print(f"\nWrote {script}")
+        print(f"Run: {script} <hash_file>")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Run generator | hashcat as a named session that survives crashes.
+
+    python3 scripts/session.py run comp-2of4 --generator "python3 generate.py --shard 2/4" \\
+        --hashcat "hashcat -m 11300 -a 0 -w 3 -O hash.txt"
+    python3 scripts/session.py run comp-2of4          # after a crash or reboot: resumes
+    python3 scripts/session.py show comp-2of4
+    python3 scripts/session.py list
+
+Shards started from the same sessions directory are siblings: when one
+cracks the hash, all of them stop (CRACKED.json records the session,
+shard, family and index). See cmw/session.py for how hashcat's progress
+maps back to generator indices.
+"""
+
+import argparse
+import glob
+import os
+import shlex
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.session import CRACKED_FILE, DEFAULT_DIR, DEFAULT_STATUS_TIMER, Session, read_cracked
+
+
+def run(args: argparse.Namespace) -> int:
+    try:
+        return Session(args.name, args.directory).run(
+            shlex.split(args.generator) if args.generator else None,
+            shlex.split(args.hashcat) if args.hashcat else None,
+            args.status_timer)
+    except ValueError as error:
+        sys.exit(str(error))
+
+
+def show(args: argparse.Namespace) -> int:
+    Session(args.name, args.directory).describe()
+    return 0
+
+
+def list_sessions(args: argparse.Namespace) -> int:
+    cracked = read_cracked(args.directory)
+    if cracked is not None:
+        print(f"CRACKED by session {cracked['session']}: {cracked['passphrase']!r} "
+              f"({os.path.join(args.directory, CRACKED_FILE)})")
+    for path in sorted(glob.glob(os.path.join(args.directory, "*.json"))):
+        if os.path.basename(path) != CRACKED_FILE:
+            Session(os.path.basename(path)[:-len(".json")], args.directory).describe()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Resumable generator | hashcat sessions")
+    parser.add_argument("--directory", default=DEFAULT_DIR, metavar="DIR",
+                        help="Where session files are kept (default: sessions/ at the repo root)")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    start = commands.add_parser("run", help="Start a session, or resume it when it exists")
+    start.add_argument("name", help="Session name (one per host and slice)")
+    start.add_argument("--generator", metavar="COMMAND",
+                       help="Generator command line (new sessions only; run from the current directory)")
+    start.add_argument("--hashcat", metavar="COMMAND", help="hashcat command line reading stdin (new sessions only)")
+    start.add_argument("--status-timer", type=int, default=DEFAULT_STATUS_TIMER, metavar="SECONDS",
+                       help=f"Seconds between hashcat status updates, i.e. saves (default {DEFAULT_STATUS_TIMER})")
+    start.set_defaults(run=run)
+
+    summary = commands.add_parser("show", help="Describe a session")
+    summary.add_argument("name")
+    summary.set_defaults(run=show)
+
+    every = commands.add_parser("list", help="Describe every session")
+    every.set_defaults(run=list_sessions)
+
+    args = parser.parse_args()
+    return args.run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
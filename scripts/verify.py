@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Check candidates against the wallet hash on the CPU (no hashcat, no GPU).
+
+    python3 generate.py --range 0:10000 | python3 scripts/verify.py
+    python3 scripts/verify.py candidates.txt --hash hash.txt --workers 4
+    python3 scripts/verify.py --benchmark      # NumPy SHA-512 kernel vs hashlib
+    python3 scripts/verify.py --self-test      # the kernel's known answers, against hashlib
+
+Prints HASH:PASSPHRASE and exits 0 on a hit (like hashcat), exits 1 when
+every candidate was checked. See cmw/verify.py.
+"""
+
+import argparse
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from cmw.count import format_duration
+from cmw.parallel import resolve_workers
+from cmw import sha512
+from cmw.verify import DEFAULT_BATCH_SIZE, ENGINES, choose_engine, load_hash, verify
+
+
+def candidates(paths):
+    """Lines of each file ('-' or none: stdin) as bytes, without the newline."""
+    for path in paths or ["-"]:
+        f = sys.stdin.buffer if path == "-" else open(path, "rb")
+        with f:
+            for line in f:
+                yield line.rstrip(b"\r\n")
+
+
+def benchmark(iterations: int, rounds: int) -> int:
+    """Time both SHA-512 engines at a few lane counts on this host."""
+    if not sha512.available():
+        sys.exit("--benchmark needs NumPy")
+    print(f"# {rounds} SHA-512 rounds per lane, microseconds per lane-round; "
+          f"derivations/s per core at {iterations:,} iterations")
+    print(f"{'lanes':>8} {'numpy':>8} {'hashlib':>8} {'speedup':>8} {'numpy/s':>9} {'hashlib/s':>9}")
+    for lanes in (1024, 4096, sha512.DEFAULT_LANES, 65536):
+        kernel, scalar = sha512.benchmark(lanes, rounds)
+        print(f"{lanes:>8,} {kernel * 1e6:>8.2f} {scalar * 1e6:>8.2f} {scalar / kernel:>7.2f}x "
+              f"{1 / (kernel * iterations):>9.1f} {1 / (scalar * iterations):>9.1f}")
+    return 0
+
+
+def self_test() -> int:
+    """Check the NumPy SHA-512 kernel against a known answer and hashlib (sha512.self_test)."""
+    if not sha512.available():
+        print("# SHA-512 self-test skipped: no NumPy, so the verifier uses hashlib", file=sys.stderr)
+        return 0
+    started = time.perf_counter()
+    failures = sha512.self_test()
+    print(f"# SHA-512 kernel vs hashlib ({len(sha512.SELF_TEST_SHAPES)} lane/batch shapes) in "
+          f"{time.perf_counter() - started:.1f}s: {'FAILED' if failures else 'OK'}", file=sys.stderr)
+    for failure in failures:
+        print(f"#   disagrees: {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CPU reference verifier for $bitcoin$ wallet hashes")
+    parser.add_argument("files", nargs="*", metavar="FILE", help="Candidate files (default: stdin)")
+    parser.add_argument("--hash", metavar="HASH|FILE",
+                        help="A $bitcoin$ hash or a file holding one (default: the challenge hash in README.md)")
+    parser.add_argument("--workers", type=int, default=0, metavar="N",
+                        help="Processes (default 0 = one per CPU core)")
+    parser.add_argument("--engine", choices=ENGINES, default="auto",
+                        help="SHA-512 chain: hashlib, the NumPy lane-parallel kernel, "
+                             "or auto = whichever benchmarks faster here (default)")
+    parser.add_argument("--batch-size", type=int, metavar="N",
+                        help=f"Candidates per task (default {DEFAULT_BATCH_SIZE} with hashlib, "
+                             f"{sha512.DEFAULT_LANES:,} lanes with numpy)")
+    parser.add_argument("--benchmark", action="store_true",
+                        help="Time the NumPy kernel against hashlib and exit")
+    parser.add_argument("--benchmark-rounds", type=int, default=20, metavar="N",
+                        help="SHA-512 rounds per lane for --benchmark (default 20)")
+    parser.add_argument("--self-test", action="store_true",
+                        help="Check the NumPy kernel against a known answer and hashlib, and exit")
+    parser.add_argument("--limit", type=int, help="Stop after N candidates")
+    parser.add_argument("--report-every", type=float, default=60.0, metavar="SECONDS",
+                        help="Log the rate every SECONDS (default 60, 0 = at the end only)")
+    args = parser.parse_args()
+    if args.self_test:
+        return self_test()
+
+    try:
+        target = load_hash(args.hash)
+    except (OSError, ValueError) as error:
+        sys.exit(str(error))
+    if args.benchmark:
+        return benchmark(target.iterations, args.benchmark_rounds)
+    if args.engine == "numpy" and not sha512.available():
+        sys.exit("--engine numpy needs NumPy")
+    engine, why = choose_engine(args.engine)
+    batch_size = args.batch_size or (DEFAULT_BATCH_SIZE if engine == "hashlib" else sha512.DEFAULT_LANES)
+    workers = resolve_workers(args.workers)
+    print(f"# {target.iterations:,} SHA-512 iterations, {workers} worker(s), batches of {batch_size:,}, "
+          f"{engine} engine ({why})", file=sys.stderr)
+
+    stream = itertools.islice(candidates(args.files), args.limit)
+    checked, busy, found = 0, 0.0, None
+    started = last_report = time.perf_counter()
+
+    def report(final: bool = False):
+        elapsed = max(time.perf_counter() - started, 1e-9)
+        per_core = checked / busy if busy else 0.0
+        print(f"# {'Checked' if final else 'Checking:'} {checked:,} candidates in {format_duration(elapsed)}: "
+              f"{checked / elapsed:,.1f}/s, {per_core:,.1f}/s per core", file=sys.stderr)
+
+    try:
+        for result in verify(stream, target, workers, batch_size, engine):
+            checked += result.checked
+            busy += result.seconds
+            if result.found is not None:
+                found = result.found
+            elif args.report_every and time.perf_counter() - last_report >= args.report_every:
+                last_report = time.perf_counter()
+                report()
+    except KeyboardInterrupt:
+        print("# Interrupted", file=sys.stderr)
+    report(final=True)
+    if found is None:
+        return 1
+    print(f"{target}:{found.decode('utf-8', errors='replace')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
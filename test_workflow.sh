@@ -49,6 +49,41 @@ EOF
 echo "[+] Test wordlist created: $TEST_WORDLIST (18 candidates)"
 echo ""
 
+# Self-checks of the CPU-side tooling; the script exits 1 if any fails
+SCRIPT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
+STATUS=0
+
+echo "=========================================="
+echo "  Self-checks"
+echo "=========================================="
+echo ""
+echo "[*] NumPy SHA-512 kernel vs hashlib (known answer, lane counts, odd batch sizes)"
+if python3 "$SCRIPT_DIR/scripts/verify.py" --self-test; then
+    echo "[+] SHA-512 kernel agrees with hashlib"
+else
+    echo "[-] SHA-512 kernel disagrees with hashlib: run scripts/verify.py with --engine hashlib"
+    STATUS=1
+fi
+echo ""
+
+# A wallet.dat whose passphrase is in the test wordlist, at 10 iterations so checking is instant
+WALLET_DIR="$(mktemp -d)"
+WALLET_PASSPHRASE="this is a bad password!"
+echo "[*] Wallet round trip: cmw/wallet.py -> wallet.dat -> cmw/walletdat.py -> cmw/verify.py"
+if python3 "$SCRIPT_DIR/scripts/make_wallet.py" "$WALLET_PASSPHRASE" --iterations 10 --seed 1 \
+        --wallet-dat "$WALLET_DIR/wallet.dat" --size 5 > "$WALLET_DIR/expected.txt" \
+    && python3 "$SCRIPT_DIR/scripts/extract_hash.py" "$WALLET_DIR/wallet.dat" > "$WALLET_DIR/hash.txt" \
+    && cmp -s "$WALLET_DIR/expected.txt" "$WALLET_DIR/hash.txt" \
+    && python3 "$SCRIPT_DIR/scripts/verify.py" "$TEST_WORDLIST" --hash "$WALLET_DIR/hash.txt" --workers 1 \
+        | grep -qF ":$WALLET_PASSPHRASE"; then
+    echo "[+] Extracted hash matches the wallet's, and the verifier finds \"$WALLET_PASSPHRASE\" in $TEST_WORDLIST"
+else
+    echo "[-] Wallet round trip failed: the extracted hash differs, or the verifier missed the passphrase"
+    STATUS=1
+fi
+rm -rf "$WALLET_DIR"
+echo ""
+
 echo "=========================================="
 echo "  Testing Instructions"
 echo "=========================================="
@@ -104,3 +139,5 @@ echo "  - $TEST_WORDLIST (small test wordlist)"
 echo ""
 echo "When you crack it, tweet the password to @deanpierce!"
 echo "=========================================="
+
+exit $STATUS